@@ -1,6 +1,7 @@
 #pragma once
 
 #include "gcore/inference/layer_trace.hpp"
+#include "gcore/inference/load_pipeline.hpp"
 #include "gcore/inference/model_config.hpp"
 #include "gcore/inference/trace.hpp"
 #include "gcore/rt/greta_runtime.hpp"
@@ -79,9 +80,17 @@ public:
   bool allocate_activations(size_t batch_size, size_t max_seq_len,
                             std::string *err);
 
-  /// Load weights from a WeightLoader into GPU buffers.
+  /// Load weights from a WeightLoader into GPU buffers (token embedding,
+  /// layers in order, then the LM head). With GRETA_LOAD_FIRST_LAYERS=1 it
+  /// returns once the load has started: forward() waits for the weights of
+  /// each layer right before running it, so prefill of layer 0 overlaps the
+  /// load of the last layers. The loader must stay alive until the load
+  /// completes (wait_weights()).
   bool load_weights(WeightLoader &loader, std::string *err);
 
+  /// Block until every weight is on the device (no-op once loaded).
+  bool wait_weights(std::string *err);
+
   /// Execute a forward pass for a single layer.
   bool execute_layer(size_t layer_idx, size_t seq_start, size_t seq_len,
                      const int32_t *tokens, std::string *err);
@@ -115,6 +124,8 @@ public:
   size_t num_layers() const { return blocks_.size(); }
 
 private:
+  bool wait_loaded(size_t count, std::string *err);
+
   ModelConfig config_;
   std::vector<BlockBuffers> blocks_;
   ActivationBuffers activations_;
@@ -139,6 +150,11 @@ private:
   gcore::rt::GretaGraph *graph_ = nullptr;
   bool graph_captured_ = false;
   std::vector<hipGraphNode_t> layer_nodes_; // To update 'pos' later if needed
+
+  // Carga en segundo plano (GRETA_LOAD_FIRST_LAYERS=1): cargas necesarias
+  // antes de cada capa, en el orden de load_weights
+  std::unique_ptr<LoadPipeline> pending_load_;
+  std::vector<size_t> layer_loads_end_;
 };
 
 } // namespace gcore::inference
@@ -0,0 +1,103 @@
+#pragma once
+
+#include "gcore/inference/host_tensor_reader.hpp"
+#include "gcore/inference/model_config.hpp"
+
+#include <cstddef>
+#include <cstdint>
+#include <string>
+#include <vector>
+
+namespace gcore::inference {
+
+/// Host copies of a single transformer block's weights.
+/// Linear weights are FP16 bits in [out, in] layout (same bits the GPU path
+/// uploads); norms are FP32.
+struct CpuBlockWeights {
+  std::vector<uint16_t> wq, wk, wv, wo; // [D, D], [KV, D], [KV, D], [D, D]
+  std::vector<uint16_t> w1, w2, w3;     // gate [F, D], down [D, F], up [F, D]
+  std::vector<float> attn_norm, ffn_norm; // [D]
+};
+
+/// CPU Block Scheduler: runs the same layer pipeline as
+/// BlockScheduler::execute_layer (RMSNorm, Q/K/V, RoPE, KV update, causal
+/// GQA attention, WO, SwiGLU FFN, residuals) on threaded CPU kernels.
+/// HIP-free, so it builds and runs on machines without a GPU.
+class CpuBlockScheduler {
+public:
+  /// Initialize the scheduler with model configuration.
+  bool init(const ModelConfig &config, std::string *err);
+
+  /// Allocate activations and KV cache for batch_size and max sequence length.
+  /// Only batch_size == 1 is supported.
+  bool allocate_activations(size_t batch_size, size_t max_seq_len,
+                            std::string *err);
+
+  /// Read all weights through a host tensor reader.
+  bool load_weights(HostTensorReader &reader, std::string *err);
+
+  /// Execute a forward pass for a single layer on the current hidden state.
+  bool execute_layer(size_t layer_idx, size_t seq_start, size_t seq_len,
+                     std::string *err);
+
+  /// Execute forward pass through all layers and the LM head.
+  /// The LM head only runs on the last position (see last_logits()).
+  bool forward(const int32_t *tokens, size_t seq_start, size_t seq_len,
+               std::string *err);
+
+  /// Logits of the last position of the last forward call: [vocab_size].
+  const std::vector<float> &get_logits() const { return logits_; }
+
+  /// Logits row of the last position of the last forward call.
+  const float *last_logits() const;
+
+  /// Argmax of the last logits row.
+  int32_t sample_greedy() const;
+
+  /// Final hidden state of the last forward call (rows [0, seq_len) of
+  /// [max_seq_len, dim]).
+  const std::vector<float> &get_hidden_state() const { return x_; }
+
+  /// Threads used by the kernels (0 = whole CpuThreadPool).
+  void set_threads(int threads) { threads_ = threads; }
+
+  /// Threads the kernels actually use.
+  size_t num_threads() const;
+
+  /// Get model configuration.
+  const ModelConfig &config() const { return config_; }
+
+  /// Get number of allocated layers.
+  size_t num_layers() const { return blocks_.size(); }
+
+  /// Bytes held by weights, activations and KV cache.
+  size_t memory_bytes() const;
+
+private:
+  /// y[S, N] = x[S, K] * W[N, K]^T with W in FP16 bits.
+  void linear(const float *x, const std::vector<uint16_t> &w, float *y,
+              size_t rows, size_t n, size_t k) const;
+  void rmsnorm(const float *x, const std::vector<float> &w, float *y,
+               size_t rows) const;
+  void rope(float *x, size_t rows, size_t heads, size_t seq_start) const;
+  void attention(size_t layer_idx, size_t seq_start, size_t seq_len);
+
+  ModelConfig config_;
+  std::vector<CpuBlockWeights> blocks_;
+  std::vector<float> token_embd_;        // [V, D]
+  std::vector<float> output_norm_;       // [D]
+  std::vector<uint16_t> output_weight_;  // [V, D]
+  std::vector<float> rope_inv_freq_;     // [Dh / 2]
+
+  // Activations [max_seq, *] (reused across layers)
+  std::vector<float> x_, norm_out_, q_, k_, v_, attn_out_, tmp_;
+  std::vector<float> ffn_gate_, ffn_up_;
+  std::vector<float> logits_;
+  // KV cache [L, Hkv, max_seq, Dh], same layout as the GPU cache
+  std::vector<float> kv_k_, kv_v_;
+  size_t max_seq_len_ = 0;
+  int threads_ = 0;
+  bool initialized_ = false;
+};
+
+} // namespace gcore::inference
@@ -2,7 +2,9 @@
 
 #include "gcore/inference/block_scheduler.hpp"
 #include "gcore/inference/model_config.hpp"
+#include "gcore/inference/sampler.hpp"
 #include "gcore/inference/tokenizer.hpp"
+#include "gcore/rt/telemetry.hpp"
 
 #include <cstdint>
 #include <functional>
@@ -12,16 +14,6 @@
 
 namespace gcore::inference {
 
-/// Sampling parameters for text generation.
-struct SamplingParams {
-  float temperature = 1.0f; // Temperature for softmax
-  int32_t top_k = 50;       // Top-K sampling (0 = disabled)
-  float top_p = 1.0f;       // Top-P nucleus sampling (1.0 = disabled)
-  int32_t max_tokens = 128; // Maximum tokens to generate
-  int32_t seed = 42;        // Random seed for reproducibility
-  bool greedy = false;      // Use greedy decoding (argmax)
-};
-
 /// Statistics from generation.
 struct GenerationStats {
   size_t prompt_tokens = 0;
@@ -35,6 +27,19 @@ struct GenerationStats {
   double tokenize_time_ms = 0.0;
 };
 
+/// B3.98: Latency distributions of every generation loop, kept in the
+/// global telemetry registry (exported with MetricsRegistry::to_json /
+/// to_prometheus): generator.prefill_ns, generator.ttft_ns,
+/// generator.token_ns (one sample per decoded token) and generator.tokens.
+struct GeneratorMetrics {
+  gcore::rt::Histogram &prefill_ns;
+  gcore::rt::Histogram &ttft_ns;
+  gcore::rt::Histogram &token_ns;
+  gcore::rt::Counter &tokens;
+
+  static GeneratorMetrics &global();
+};
+
 /// Stats per generation step (for alignment/debugging).
 struct AlignmentStep {
   uint32_t step;
@@ -81,10 +86,14 @@ public:
                   GenerationStats *stats = nullptr, std::string *err = nullptr,
                   AlignmentCallback align_callback = nullptr);
 
-  /// Sample next token from logits.
+  /// Sample next token from logits (temperature, top-k and top-p, see
+  /// Sampler). The RNG carries over from one call to the next.
   int32_t sample(const float *logits, size_t vocab_size,
                  const SamplingParams &params);
 
+  /// Restart the sampling RNG; generate_tokens() does it with params.seed.
+  void reseed(int32_t seed) { sampler_.reseed(seed); }
+
 private:
   ModelConfig config_;
   BlockScheduler *scheduler_ = nullptr;
@@ -93,6 +102,7 @@ private:
 
   // Internal state
   size_t current_pos_ = 0;
+  Sampler sampler_;
 };
 
 } // namespace gcore::inference
@@ -0,0 +1,48 @@
+#pragma once
+
+#include <cstddef>
+#include <cstdint>
+#include <string>
+
+namespace gcore::inference::quant {
+
+/// GGML block formats dequantized by the weight loaders.
+enum class BlockType { Q4_0, Q8_0, Q4_K, Q6_K };
+
+/// "Q4_0", "Q8_0", "Q4_K" or "Q6_K" (TensorInfo::dtype); false otherwise.
+bool block_type_from_name(const std::string &dtype, BlockType &out);
+size_t block_elems(BlockType t); // elements per block
+size_t block_bytes(BlockType t); // bytes per block
+
+float fp16_to_fp32(uint16_t h);
+uint16_t fp32_to_fp16(float f);
+
+// Batched engine. Block ranges (and INT8/INT4 groups) are split across
+// OpenMP threads; called from inside a parallel region (per-tensor loads)
+// it runs on the calling thread. Per-block loops are `omp simd` so they
+// vectorize at -O2. Results are bit-identical to the *_ref functions.
+
+/// n_blocks blocks of src -> n_blocks * block_elems(t) FP32 values.
+void dequantize_f32(BlockType t, const uint8_t *src, size_t n_blocks,
+                    float *dst);
+/// Same values converted with fp32_to_fp16, without an FP32 copy of the
+/// tensor.
+void dequantize_fp16(BlockType t, const uint8_t *src, size_t n_blocks,
+                     uint16_t *dst);
+
+/// GRETA INT8 layout (load_tensor_int8): groups of 32, scale = max|x| / 127,
+/// q = round(x / scale). scales holds (n + 31) / 32 values.
+void quantize_int8(const float *src, size_t n, int8_t *q, float *scales);
+/// GRETA INT4 layout (load_tensor_int4): groups of 32, scale = max|x| / 7,
+/// values clamped to [-8, 7], two per byte (even element in the low nibble).
+void quantize_int4(const float *src, size_t n, uint8_t *packed,
+                   float *scales);
+
+/// Scalar references: one block / group at a time, as the loader did before
+/// the engine (used to check bit-exactness).
+void dequantize_block_ref(BlockType t, const uint8_t *src, float *dst);
+void quantize_int8_ref(const float *src, size_t n, int8_t *q, float *scales);
+void quantize_int4_ref(const float *src, size_t n, uint8_t *packed,
+                       float *scales);
+
+} // namespace gcore::inference::quant
@@ -0,0 +1,28 @@
+#pragma once
+
+#include <cstdint>
+#include <string>
+#include <vector>
+
+namespace gcore::inference {
+
+/// Host-side (HIP-free) access to model tensors.
+///
+/// Tensors are returned with exactly the values and layout the GPU upload
+/// path uses (same dequantization, same FP16 conversion, K/V weights already
+/// in [KV, D]), so a CPU backend sees bit-identical weights.
+class HostTensorReader {
+public:
+  virtual ~HostTensorReader() = default;
+
+  /// Read a tensor converted to FP32 (same values as load_tensor).
+  virtual bool read_tensor_f32(const std::string &name,
+                               std::vector<float> &out, std::string *err) = 0;
+
+  /// Read a tensor converted to FP16 bits (same values as load_tensor_fp16).
+  virtual bool read_tensor_fp16(const std::string &name,
+                                std::vector<uint16_t> &out,
+                                std::string *err) = 0;
+};
+
+} // namespace gcore::inference
@@ -2,12 +2,12 @@
 
 #include "gcore/inference/model_config.hpp"
 #include "gcore/inference/trace.hpp"
+#include "gcore/inference/trace_sink.hpp"
 
 #include <hip/hip_runtime.h>
 #include <hip/hip_fp16.h>
 
 #include <cstdint>
-#include <fstream>
 #include <string>
 #include <vector>
 
@@ -49,7 +49,7 @@ public:
 
 private:
   LayerTraceConfig cfg_{};
-  std::ofstream out_;
+  TraceSink *sink_ = nullptr;
 };
 
 void layer_trace_emit_step_header(int step, size_t pos_id, size_t seq_len,
@@ -0,0 +1,153 @@
+#pragma once
+
+#include "gcore/rt/greta_runtime.hpp"
+
+#include <condition_variable>
+#include <cstddef>
+#include <cstdint>
+#include <functional>
+#include <memory>
+#include <mutex>
+#include <string>
+#include <thread>
+#include <vector>
+
+namespace gcore::inference {
+
+/// Device layout of one tensor prepared on the host (WeightLoader::
+/// pack_tensor): weights plus optional scales / head scales, each either
+/// owned or a view into a mapped weight file.
+struct PackedTensor {
+  struct Part {
+    const void *data = nullptr;
+    size_t bytes = 0; // 0: part not produced
+    gcore::rt::GretaDataType type = gcore::rt::GretaDataType::FP32;
+    std::shared_ptr<const void> owner; // null for views
+
+    template <typename T>
+    void own(std::vector<T> v, gcore::rt::GretaDataType t) {
+      auto h = std::make_shared<std::vector<T>>(std::move(v));
+      data = h->data();
+      bytes = h->size() * sizeof(T);
+      type = t;
+      owner = std::move(h);
+    }
+    void view(const void *p, size_t n, gcore::rt::GretaDataType t) {
+      data = p;
+      bytes = n;
+      type = t;
+      owner.reset();
+    }
+  };
+
+  Part weights, scales, head_scales;
+  bool has_quant = false; // set quant info on upload (INT8 / INT4)
+  uint32_t group_size = 0;
+  uint32_t num_heads = 0; // head_scales entries
+
+  /// Host memory held until upload (views are not counted).
+  size_t host_bytes() const;
+  size_t bytes() const {
+    return weights.bytes + scales.bytes + head_scales.bytes;
+  }
+};
+
+/// Bounds of a LoadPipeline.
+struct LoadPipelineOptions {
+  int converters = 2;
+  size_t max_inflight = 6;                 // read but not yet uploaded
+  size_t max_inflight_bytes = 2ull << 30;  // packed host bytes not uploaded
+
+  /// GRETA_LOAD_THREADS (converters, default min(4, hardware threads)),
+  /// GRETA_LOAD_INFLIGHT (default 2 * converters + 2) and
+  /// GRETA_LOAD_INFLIGHT_MB.
+  static LoadPipelineOptions from_env();
+};
+
+/// Stage callbacks; i is the item index. Only convert and upload are
+/// required.
+struct LoadStages {
+  std::function<bool(size_t i, std::string *err)> read; // I/O thread
+  std::function<bool(size_t i, PackedTensor &out, std::string *err)> convert;
+  std::function<bool(size_t i, PackedTensor &in, std::string *err)> upload;
+  std::function<void()> converter_init; // once on each converter thread
+  std::function<void()> uploader_init;  // once on the uploader thread
+};
+
+struct LoadPipelineStats {
+  size_t items = 0;
+  int converters = 0;
+  size_t uploaded = 0;
+  size_t peak_inflight = 0;
+  size_t peak_host_bytes = 0;
+  uint64_t bytes = 0; // uploaded bytes
+  double read_s = 0, convert_s = 0, upload_s = 0; // busy time per stage
+  double wall_s = 0;                              // start() -> finish()
+};
+
+/// Three-stage bounded load pipeline: one reader thread (page-in), a pool of
+/// converter threads and one uploader that consumes items strictly in index
+/// order. The reader stays at most max_inflight items ahead of the
+/// uploader and converters pause while max_inflight_bytes of packed data
+/// wait for upload (the next item to upload always proceeds), so host
+/// memory stays bounded whatever the stage speeds. wait(k) returns as soon
+/// as items [0, k) are uploaded, which lets layer 0 run while the rest of
+/// the model is still loading. The first failure stops every stage.
+class LoadPipeline {
+public:
+  explicit LoadPipeline(LoadPipelineOptions options = {});
+  ~LoadPipeline(); // cancel() + join
+
+  LoadPipeline(const LoadPipeline &) = delete;
+  LoadPipeline &operator=(const LoadPipeline &) = delete;
+
+  /// Start the threads for n items (once).
+  bool start(size_t n, LoadStages stages, std::string *err);
+
+  /// Block until items [0, count) are uploaded; false if the pipeline failed
+  /// (or was cancelled) before that.
+  bool wait(size_t count, std::string *err);
+
+  /// wait(size()) and join the threads.
+  bool finish(std::string *err);
+
+  /// Stop every stage after the callbacks in progress and join.
+  void cancel();
+
+  size_t size() const { return n_; }
+  size_t uploaded() const;
+  LoadPipelineStats stats() const;
+
+  /// An already finished pipeline of n items (synchronous loads).
+  static std::unique_ptr<LoadPipeline> completed(size_t n);
+
+private:
+  void reader();
+  void converter();
+  void uploader();
+  void fail(std::string e); // requires mu_
+  bool stopped() const { return failed_ || cancelled_; }
+  void join();
+
+  LoadPipelineOptions opt_;
+  LoadStages stages_;
+  size_t n_ = 0;
+  bool started_ = false;
+
+  mutable std::mutex mu_;
+  std::condition_variable cv_;
+  std::vector<PackedTensor> slots_;
+  std::vector<char> converted_;
+  size_t read_done_ = 0;
+  size_t next_convert_ = 0;
+  size_t uploaded_ = 0;
+  size_t held_bytes_ = 0;
+  bool failed_ = false;
+  bool cancelled_ = false;
+  std::string error_;
+  LoadPipelineStats stats_;
+  uint64_t t_start_ = 0;
+  std::vector<std::thread> threads_;
+};
+
+} // namespace gcore::inference
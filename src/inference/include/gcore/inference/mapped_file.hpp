@@ -0,0 +1,44 @@
+#pragma once
+
+#include <cstddef>
+#include <cstdint>
+#include <string>
+
+namespace gcore::inference {
+
+/// Read-only mmap of a whole weight file.
+///
+/// Loaders parse metadata and hand tensor bytes to the convert/upload path
+/// straight from the mapping (no intermediate read buffer). The advise_*
+/// calls are best-effort madvise hints on page-rounded ranges; views stay
+/// valid after dont_need() (the pages are simply faulted in again).
+class MappedFile final {
+public:
+  MappedFile() = default;
+  ~MappedFile();
+
+  MappedFile(const MappedFile &) = delete;
+  MappedFile &operator=(const MappedFile &) = delete;
+
+  bool open(const std::string &path, std::string *err);
+  void close();
+
+  bool is_open() const { return data_ != nullptr; }
+  const uint8_t *data() const { return data_; }
+  size_t size() const { return size_; }
+
+  /// [offset, offset + bytes) or nullptr if it is not inside the file.
+  const uint8_t *view(size_t offset, size_t bytes) const;
+
+  void advise_sequential() const;
+  void advise_willneed(size_t offset, size_t bytes) const;
+  void advise_dontneed(size_t offset, size_t bytes) const;
+
+private:
+  void advise(size_t offset, size_t bytes, int advice) const;
+
+  const uint8_t *data_ = nullptr;
+  size_t size_ = 0;
+};
+
+} // namespace gcore::inference
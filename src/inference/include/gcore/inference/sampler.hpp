@@ -0,0 +1,71 @@
+#pragma once
+
+#include <cstddef>
+#include <cstdint>
+#include <random>
+#include <utility>
+#include <vector>
+
+namespace gcore::inference {
+
+/// Sampling parameters for text generation.
+struct SamplingParams {
+  float temperature = 1.0f; // Temperature for softmax
+  int32_t top_k = 50;       // Top-K sampling (0 = disabled)
+  float top_p = 1.0f;       // Top-P nucleus sampling (1.0 = disabled)
+  int32_t max_tokens = 128; // Maximum tokens to generate
+  int32_t seed = 42;        // Random seed for reproducibility
+  bool greedy = false;      // Use greedy decoding (argmax)
+};
+
+/// Host token sampler over FP32 logits rows.
+///
+/// Temperature softmax restricted to the top_k logits (heap scan for small
+/// k, nth_element otherwise: O(V)) and then to the smallest set of most
+/// likely tokens whose probability reaches top_p: a histogram of mass over
+/// logit buckets finds the cut and only the bucket holding it is sorted, so
+/// the nucleus is a truncated sorted prefix without sorting the vocabulary.
+/// Scratch buffers are reused across calls and the RNG persists between
+/// tokens, so reseed(SamplingParams::seed) at the start of a generation
+/// makes the token sequence reproducible. NaN logits are never sampled.
+/// Not thread-safe: one Sampler per generation loop.
+class Sampler {
+public:
+  explicit Sampler(int32_t seed = 42);
+
+  /// Restart the RNG stream (seed < 0: non-deterministic seed).
+  void reseed(int32_t seed);
+
+  /// Next token for one row of vocab logits. greedy, temperature <= 0 or
+  /// top_k == 1 return argmax() without touching the RNG.
+  int32_t sample(const float *logits, size_t vocab,
+                 const SamplingParams &params);
+
+  /// sample() for each of `rows` row-major rows of vocab logits into
+  /// out[rows]; RNG draws happen in row order.
+  void sample_batch(const float *logits, size_t rows, size_t vocab,
+                    const SamplingParams &params, int32_t *out);
+
+  /// Index of the largest non-NaN logit (lowest index on ties, 0 if none).
+  static int32_t argmax(const float *logits, size_t vocab);
+
+  /// The k largest (logit, id) pairs, largest first (ties: lower id first),
+  /// in O(V + k log k). NaN logits are skipped.
+  static void top_k(const float *logits, size_t vocab, size_t k,
+                    std::vector<std::pair<float, int32_t>> &out);
+
+private:
+  struct Candidate {
+    float logit;
+    int32_t id;
+    float weight; // exp((logit - max) / temperature)
+  };
+
+  double uniform(); // [0, 1), 53 bits
+
+  std::mt19937_64 rng_;
+  std::vector<Candidate> cand_;
+  std::vector<Candidate> tail_; // cubo del corte de top-p
+};
+
+} // namespace gcore::inference
@@ -17,6 +17,7 @@ struct StageTraceConfig {
   uint32_t sample = 256;
   const char *out_path = nullptr;
   bool debug_input = false;
+  bool binary = false; // GRETA_TRACE_STAGE_FORMAT=bin
 };
 
 struct StageInputMeta {
@@ -47,6 +48,88 @@ struct StageLogitsStats {
   size_t vocab = 0;
 };
 
+// Binary stage trace (GRETA_TRACE_STAGE_FORMAT=bin), little-endian.
+// Stream of records: StageBinRecordHeader followed by `payload_bytes` bytes.
+//   HEADER  payload: char[8] "GRETASTG", u32 version, u32 reserved. Starts
+//           every file/shard/appended run and resets the string table.
+//   STRING  payload: u32 id, then the UTF-8 bytes (not NUL-terminated).
+//           Defines an interned string (prompt_id, phase, point, src_kind,
+//           route). Id 0 is always "".
+//   TENSOR  payload: StageTensorRecord followed by sample_n float32 samples.
+//   LOGITS  payload: StageLogitsRecord.
+// Reader: tools/benchmarks/stage_trace_bin.py
+enum class StageBinRecordType : uint32_t {
+  HEADER = 0,
+  STRING = 1,
+  TENSOR = 2,
+  LOGITS = 3,
+};
+
+constexpr uint32_t kStageBinVersion = 1;
+
+struct StageBinRecordHeader {
+  uint32_t type = 0;
+  uint32_t payload_bytes = 0;
+};
+
+struct StageTensorRecord {
+  uint64_t token_index = 0;
+  uint64_t stride_elems = 0;
+  uint64_t ptr = 0;
+  uint64_t offset_bytes = 0;
+  uint64_t hash = 0;
+  uint64_t nz_count = 0;
+  uint64_t in_offset_bytes = 0; // StageInputMeta (flags & 1)
+  uint64_t in_alloc_bytes = 0;
+  uint32_t prompt_id = 0;
+  uint32_t phase_id = 0;
+  uint32_t point_id = 0;
+  int32_t layer = 0;
+  uint32_t step = 0;
+  uint32_t pos_id = 0;
+  uint32_t seq_len = 0;
+  uint32_t tokens_total = 0;
+  uint32_t sample_n = 0;
+  int32_t nan = 0;
+  int32_t inf = 0;
+  uint32_t flags = 0; // bit 0: input meta present
+  float min = 0.0f;
+  float max = 0.0f;
+  float mean = 0.0f;
+  float abs_sum = 0.0f;
+  uint32_t src_kind_id = 0;
+  uint32_t token_index_used = 0;
+  uint32_t prompt_tokens = 0;
+  uint32_t kv_pos = 0;
+  uint32_t decode_step = 0;
+  uint32_t token_id = 0;
+  uint32_t route_id = 0;
+  uint32_t reserved = 0;
+};
+static_assert(sizeof(StageTensorRecord) == 160, "StageTensorRecord layout");
+
+struct StageLogitsRecord {
+  uint64_t hash = 0;
+  uint64_t vocab = 0;
+  uint64_t logits_ptr = 0;
+  uint64_t logits_offset_bytes = 0;
+  uint32_t prompt_id = 0;
+  uint32_t phase_id = 0;
+  uint32_t step = 0;
+  uint32_t pos_id = 0;
+  uint32_t seq_len = 0;
+  uint32_t tokens_total = 0;
+  float min = 0.0f;
+  float max = 0.0f;
+  float mean = 0.0f;
+  int32_t top1_id = -1;
+  float top1_logit = 0.0f;
+  int32_t top2_id = -1;
+  float top2_logit = 0.0f;
+  float gap = 0.0f;
+};
+static_assert(sizeof(StageLogitsRecord) == 88, "StageLogitsRecord layout");
+
 StageTraceConfig stage_trace_config();
 
 bool stage_trace_enabled();
@@ -0,0 +1,102 @@
+#pragma once
+
+#include <atomic>
+#include <chrono>
+#include <condition_variable>
+#include <cstddef>
+#include <cstdint>
+#include <cstdio>
+#include <mutex>
+#include <string>
+#include <string_view>
+#include <thread>
+
+namespace gcore::inference {
+
+// Persistent, buffered JSONL sink shared by StageTrace and LayerTracer.
+//
+// Lines are appended to an in-memory buffer and written in large chunks
+// instead of opening/closing the file per traced tensor. One sink exists per
+// output path per process (see trace_sink()); all sinks are flushed on exit
+// and by trace_sinks_flush_all(). A crash or kill loses what is still
+// buffered (at most GRETA_TRACE_FLUSH_MS / GRETA_TRACE_BUFFER_KB worth).
+//
+// Env (read once, apply to every sink):
+//   GRETA_TRACE_BUFFER_KB   write buffer size (default 1024)
+//   GRETA_TRACE_FLUSH_MS    periodic flush interval, 0 = only when full (default 1000)
+//   GRETA_TRACE_ASYNC=1     background writer thread does the file I/O
+//   GRETA_TRACE_ROTATE_MB   rotate to <path>.1, <path>.2, ... past this size (default 0 = off)
+struct TraceSinkOptions {
+  size_t buffer_bytes = 1u << 20;
+  uint32_t flush_interval_ms = 1000;
+  bool async = false;
+  size_t rotate_bytes = 0;
+};
+
+TraceSinkOptions trace_sink_options_from_env();
+
+class TraceSink {
+public:
+  TraceSink(std::string path, const TraceSinkOptions &opts, bool truncate);
+  ~TraceSink();
+
+  TraceSink(const TraceSink &) = delete;
+  TraceSink &operator=(const TraceSink &) = delete;
+
+  bool is_open() const { return open_; }
+  const std::string &path() const { return path_; }
+
+  // Appends `line` plus '\n'. Thread-safe.
+  void write_line(std::string_view line);
+  // Appends raw bytes (binary records). Thread-safe; one call is never split
+  // across shards.
+  void write(const void *data, size_t size);
+  // Bytes written at the start of every rotated shard (<path>.1, ...), e.g. a
+  // binary file header. Not written to the first shard.
+  void set_shard_preamble(std::string preamble);
+  // Writes everything buffered so far to the current shard.
+  void flush();
+
+  uint32_t shard_index() const { return shard_.load(); }
+  uint64_t bytes_written() const { return bytes_total_.load(); }
+
+private:
+  void append(std::string_view a, std::string_view b);
+  void drain();                   // swap buffer out and write it (takes io_mu_)
+  void write_out(const std::string &chunk);
+  void rotate();
+  void writer_loop();
+  std::string shard_path(uint32_t idx) const;
+
+  std::string path_;
+  TraceSinkOptions opts_;
+  std::FILE *file_ = nullptr;
+  bool open_ = false;             // set once by the constructor
+  bool rotate_failed_ = false;    // next shard could not be created
+  std::atomic<uint32_t> shard_{0};       // atomic: read without io_mu_
+  uint64_t bytes_in_shard_ = 0;
+  std::atomic<uint64_t> bytes_total_{0};
+
+  std::mutex mu_;                 // guards buf_, stop_
+  std::mutex io_mu_;              // guards file_, spare_, shard/rotation state, preamble_
+  std::string preamble_;
+  std::string buf_;
+  std::string spare_;
+  std::chrono::steady_clock::time_point last_flush_;
+
+  std::condition_variable cv_;
+  std::thread writer_;
+  bool stop_ = false;
+};
+
+// Process-wide sink for `path`, created on first use. The first caller decides
+// whether an existing file is truncated or appended to; rotated shards follow
+// (truncate removes stale <path>.N, append resumes in the last shard). Returns nullptr if
+// path is empty or the file cannot be opened.
+TraceSink *trace_sink(const std::string &path, bool truncate = false);
+
+// Flush every open sink (also done automatically at process exit). greta_infer
+// calls it after each generation so a later failure cannot lose its trace.
+void trace_sinks_flush_all();
+
+} // namespace gcore::inference
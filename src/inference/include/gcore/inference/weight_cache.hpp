@@ -0,0 +1,140 @@
+#pragma once
+
+#include "gcore/inference/weight_loader.hpp"
+
+#include <cstdint>
+#include <memory>
+#include <string>
+#include <vector>
+
+namespace gcore::inference {
+
+/// Bump whenever a load_tensor* call changes the bytes, dtype or quant info
+/// it leaves in its buffers: blobs written with another version are misses.
+constexpr uint32_t kWeightCacheLayoutVersion = 1;
+
+/// Settings for the pre-converted weight cache.
+struct WeightCacheConfig {
+  std::string dir;                  // GRETA_WEIGHT_CACHE_DIR (empty: off)
+  uint64_t max_bytes = 64ull << 30; // GRETA_WEIGHT_CACHE_MAX_GB
+  bool verify = false;              // GRETA_WEIGHT_CACHE_VERIFY=1
+
+  static WeightCacheConfig from_env();
+};
+
+/// One blob of the cache directory (WeightCache::list / validate).
+struct WeightCacheBlob {
+  std::string path;
+  uint64_t bytes = 0;
+  int64_t last_used = 0; // mtime, refreshed on every hit (seconds)
+  std::string quant;     // "fp16", "int8" or "int4"
+  uint64_t tensors = 0;
+  bool valid = false;
+  std::string error; // why the blob is not valid
+};
+
+/// On-disk cache of the device layouts left by WeightLoader::load_tensors.
+///
+/// Each blob is one file named `<model fingerprint>-<quant>-v<layout>.gwc`
+/// holding a 64-byte header, every buffer of the batch (bytes, dtype and
+/// quant info, 4 KiB aligned) and an index at the end; a restore mmaps it
+/// and copies the buffers to the device without touching the model file.
+/// The fingerprint covers size, mtime and sampled bytes of the model file;
+/// the header also records the batch (tensor names and formats) so a
+/// different load list is a miss. Blobs are written to a temporary file
+/// and renamed, so readers never see a partial blob.
+class WeightCache {
+public:
+  explicit WeightCache(WeightCacheConfig config);
+
+  const WeightCacheConfig &config() const { return config_; }
+
+  /// Fingerprint of a regular model file (directories are not supported).
+  static bool fingerprint(const std::string &model_path, uint64_t &out,
+                          std::string *err);
+
+  /// Blob path for the model fingerprint and the quant mode of loads.
+  std::string blob_path(uint64_t model_fp,
+                        const std::vector<TensorLoad> &loads) const;
+
+  /// Allocate and fill every buffer of loads from the blob. false on a
+  /// missing, stale or corrupt blob; buffers may be partially written.
+  bool restore(const std::string &blob, uint64_t model_fp,
+               const std::vector<TensorLoad> &loads, std::string *err) const;
+
+  /// Write the device contents of loads (after a successful load) as a blob.
+  bool store(const std::string &blob, uint64_t model_fp,
+             const std::vector<TensorLoad> &loads, std::string *err) const;
+
+  /// Header and index checks; with check_data also every buffer hash.
+  bool validate(const std::string &blob, bool check_data,
+                WeightCacheBlob *info, std::string *err) const;
+
+  /// Blobs of the directory, least recently used first.
+  std::vector<WeightCacheBlob> list() const;
+
+  /// Delete least recently used blobs (never keep) until the directory
+  /// holds at most max_bytes, plus temporaries left by killed writers.
+  /// Returns the bytes freed.
+  uint64_t evict(uint64_t max_bytes, const std::string &keep = "") const;
+
+private:
+  WeightCacheConfig config_;
+};
+
+/// WeightLoader that serves load_tensors() from a WeightCache.
+///
+/// Every other call goes to the wrapped loader. On a hit no tensor of the
+/// model file is read; on a miss the wrapped loader runs, its buffers are
+/// read back and stored, and the directory is trimmed to max_bytes. Cache
+/// errors are logged and never fail a load. create_weight_loader() wraps
+/// its loader when GRETA_WEIGHT_CACHE_DIR is set.
+class CachedWeightLoader : public WeightLoader {
+public:
+  CachedWeightLoader(std::unique_ptr<WeightLoader> inner,
+                     WeightCacheConfig config);
+  ~CachedWeightLoader() override;
+
+  bool open(const std::string &path, std::string *err) override;
+  std::vector<TensorInfo> list_tensors() const override;
+  bool read_tensor_f32(const std::string &name, std::vector<float> &out,
+                       std::string *err) override;
+  bool read_tensor_fp16(const std::string &name, std::vector<uint16_t> &out,
+                        std::string *err) override;
+  bool load_tensor(const std::string &name, gcore::rt::hip::Buffer &buffer,
+                   std::string *err) override;
+  bool load_tensor_fp16(const std::string &name, gcore::rt::hip::Buffer &buffer,
+                        std::string *err) override;
+  bool load_tensor_int8(const std::string &name, gcore::rt::hip::Buffer &buffer,
+                        gcore::rt::hip::Buffer &scales,
+                        std::string *err) override;
+  bool load_tensor_int4(const std::string &name, gcore::rt::hip::Buffer &buffer,
+                        gcore::rt::hip::Buffer &scales,
+                        gcore::rt::hip::Buffer &head_scales,
+                        std::string *err) override;
+  bool load_tensors(const std::vector<TensorLoad> &loads,
+                    std::string *err) override;
+  void prefetch_tensor(const std::string &name) override;
+  bool pack_tensor(const TensorLoad &load, PackedTensor &out,
+                   std::string *err) override;
+  bool upload_packed(const TensorLoad &load, PackedTensor &packed,
+                     std::string *err) override;
+  /// Runs load_tensors() (restore or load + store) before returning an
+  /// already finished pipeline.
+  std::unique_ptr<LoadPipeline> start_load(std::vector<TensorLoad> loads,
+                                           std::string *err) override;
+  ModelConfig get_config() const override;
+
+  const WeightCache &cache() const { return cache_; }
+  /// Whether the last load_tensors() was served from the cache.
+  bool last_load_hit() const { return last_hit_; }
+
+private:
+  std::unique_ptr<WeightLoader> inner_;
+  WeightCache cache_;
+  uint64_t model_fp_ = 0;
+  bool has_fp_ = false;
+  bool last_hit_ = false;
+};
+
+} // namespace gcore::inference
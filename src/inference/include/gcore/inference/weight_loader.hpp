@@ -1,5 +1,7 @@
 #pragma once
 
+#include "gcore/inference/host_tensor_reader.hpp"
+#include "gcore/inference/load_pipeline.hpp"
 #include "gcore/inference/model_config.hpp"
 #include "gcore/rt/hip/buffer.hpp"
 
@@ -20,8 +22,26 @@ struct TensorInfo {
   std::string dtype; // "F32", "F16", "BF16", etc.
 };
 
+/// Zero-copy view of a tensor's bytes inside a mapped weight file (valid
+/// while the loader that returned it stays open).
+struct TensorView {
+  const TensorInfo *info = nullptr;
+  const uint8_t *data = nullptr; // info->size_bytes bytes, file dtype
+};
+
+/// One tensor of a batched load (WeightLoader::load_tensors).
+struct TensorLoad {
+  enum class Format { F32, FP16, INT8, INT4 };
+
+  std::string name;
+  Format format = Format::FP16;
+  gcore::rt::hip::Buffer *buffer = nullptr;
+  gcore::rt::hip::Buffer *scales = nullptr;      // INT8 / INT4
+  gcore::rt::hip::Buffer *head_scales = nullptr; // INT4 (Q/K/V only)
+};
+
 /// Abstract interface for weight loading.
-class WeightLoader {
+class WeightLoader : public HostTensorReader {
 public:
   virtual ~WeightLoader() = default;
 
@@ -54,11 +74,46 @@ public:
                                 gcore::rt::hip::Buffer &head_scales,
                                 std::string *err) = 0;
 
+  /// Load a batch of tensors with the load_tensor* call matching each
+  /// format. The default runs them in order; loaders may run them
+  /// concurrently. err names the first tensor that failed.
+  virtual bool load_tensors(const std::vector<TensorLoad> &loads,
+                            std::string *err);
+
+  /// Page in the file bytes of `name` (pipeline read stage). No-op by
+  /// default.
+  virtual void prefetch_tensor(const std::string &name);
+
+  /// Convert `load` on the host into its device layout, without touching the
+  /// device (pipeline convert stage). The default handles F32/FP16 through
+  /// read_tensor_*; INT8/INT4 need a loader override.
+  virtual bool pack_tensor(const TensorLoad &load, PackedTensor &out,
+                           std::string *err);
+
+  /// Allocate the buffers of `load`, copy `packed` into them and link the
+  /// quant info (pipeline upload stage).
+  virtual bool upload_packed(const TensorLoad &load, PackedTensor &packed,
+                             std::string *err);
+
+  /// Start loading `loads` on a LoadPipeline (prefetch -> pack -> upload,
+  /// uploads in list order) and return without waiting: wait(k) on the
+  /// result blocks until loads [0, k) are on the device. The loader and the
+  /// buffers must outlive the pipeline. nullptr if it could not start.
+  virtual std::unique_ptr<LoadPipeline>
+  start_load(std::vector<TensorLoad> loads, std::string *err);
+
   /// Get model configuration (if embedded in file).
   virtual ModelConfig get_config() const = 0;
 };
 
 /// GGUF format weight loader (llama.cpp compatible).
+///
+/// The file is mmap'ed: metadata is parsed from the mapped bytes and tensor
+/// data goes from the mapping to the convert/upload path (F32/F16 tensors
+/// that need no conversion are uploaded straight from it). load_tensors()
+/// runs start_load(): a reader thread pages tensors in, GRETA_LOAD_THREADS
+/// converters pack them (default min(4, hardware threads), OpenMP threads
+/// split between them) and one uploader copies them in list order.
 class GGUFLoader : public WeightLoader {
 public:
   GGUFLoader();
@@ -66,6 +121,10 @@ public:
 
   bool open(const std::string &path, std::string *err) override;
   std::vector<TensorInfo> list_tensors() const override;
+  bool read_tensor_f32(const std::string &name, std::vector<float> &out,
+                       std::string *err) override;
+  bool read_tensor_fp16(const std::string &name, std::vector<uint16_t> &out,
+                        std::string *err) override;
   bool load_tensor(const std::string &name, gcore::rt::hip::Buffer &buffer,
                    std::string *err) override;
   bool load_tensor_fp16(const std::string &name, gcore::rt::hip::Buffer &buffer,
@@ -77,14 +136,34 @@ public:
                         gcore::rt::hip::Buffer &scales,
                         gcore::rt::hip::Buffer &head_scales,
                         std::string *err) override;
+  bool load_tensors(const std::vector<TensorLoad> &loads,
+                    std::string *err) override;
+  void prefetch_tensor(const std::string &name) override;
+  bool pack_tensor(const TensorLoad &load, PackedTensor &out,
+                   std::string *err) override;
+  bool upload_packed(const TensorLoad &load, PackedTensor &packed,
+                     std::string *err) override;
   ModelConfig get_config() const override;
 
 private:
+  bool load_packed(const TensorLoad &load, std::string *err);
+
   struct Impl;
   std::unique_ptr<Impl> impl_;
 };
 
-/// SafeTensors format weight loader.
+/// SafeTensors format weight loader (Hugging Face checkpoints).
+///
+/// open() accepts a `.safetensors` file, a `model.safetensors.index.json`
+/// (every shard of its weight_map is mapped) or a directory holding either.
+/// Each shard is mmap'ed and its JSON header parsed once; tensor names and
+/// shapes are the checkpoint's own (row-major, HF order). `config.json` next
+/// to the weights fills get_config() when present.
+///
+/// F32/F16/BF16 tensors are converted to FP32/FP16 in chunks written straight
+/// into the upload staging (OpenMP inside each chunk); tensors already in the
+/// target dtype are uploaded from the mapping. INT8/INT4 quantization is
+/// GGUF-only.
 class SafeTensorsLoader : public WeightLoader {
 public:
   SafeTensorsLoader();
@@ -92,6 +171,10 @@ public:
 
   bool open(const std::string &path, std::string *err) override;
   std::vector<TensorInfo> list_tensors() const override;
+  bool read_tensor_f32(const std::string &name, std::vector<float> &out,
+                       std::string *err) override;
+  bool read_tensor_fp16(const std::string &name, std::vector<uint16_t> &out,
+                        std::string *err) override;
   bool load_tensor(const std::string &name, gcore::rt::hip::Buffer &buffer,
                    std::string *err) override;
   bool load_tensor_fp16(const std::string &name, gcore::rt::hip::Buffer &buffer,
@@ -105,12 +188,18 @@ public:
                         std::string *err) override;
   ModelConfig get_config() const override;
 
+  /// Bytes of `name` in its shard's mapping, without copy or conversion.
+  bool view(const std::string &name, TensorView &out, std::string *err) const;
+
 private:
   struct Impl;
   std::unique_ptr<Impl> impl_;
 };
 
-/// Factory function to create appropriate loader based on file extension.
+/// Factory function to create appropriate loader based on file extension
+/// (`.gguf`, `.safetensors`, `.index.json` or a checkpoint directory).
+/// With GRETA_WEIGHT_CACHE_DIR set the loader is wrapped in a
+/// CachedWeightLoader (weight_cache.hpp).
 std::unique_ptr<WeightLoader> create_weight_loader(const std::string &path,
                                                    std::string *err);
 
@@ -1464,6 +1464,7 @@ static bool trace_embed_verify_once(const int32_t *tokens, size_t seq_len,
 BlockScheduler::BlockScheduler() = default;
 
 BlockScheduler::~BlockScheduler() {
+  pending_load_.reset(); // para la carga antes de liberar sus buffers
   if (stream_ != nullptr) {
     delete stream_;
     stream_ = nullptr;
@@ -1655,85 +1656,76 @@ bool BlockScheduler::load_weights(WeightLoader &loader, std::string *err) {
             << (int8_mode ? "ON" : "OFF")
             << ", INT4: " << (int4_mode ? "ON" : "OFF") << ")" << std::endl;
 
+  // Un solo lote en orden de uso: embedding, capas, cabeza LM. El loader
+  // lee, convierte y sube en paralelo (load_tensors / start_load)
+  using Format = TensorLoad::Format;
+  const Format wfmt =
+      int4_mode ? Format::INT4 : (int8_mode ? Format::INT8 : Format::FP16);
+  std::vector<TensorLoad> loads;
+  loads.reserve(config_.num_layers * 9 + 3);
+  auto add = [&](std::string name, Format format, gcore::rt::hip::Buffer &buf,
+                 gcore::rt::hip::Buffer *scales = nullptr,
+                 gcore::rt::hip::Buffer *head_scales = nullptr) {
+    TensorLoad ld;
+    ld.name = std::move(name);
+    ld.format = format;
+    ld.buffer = &buf;
+    ld.scales = scales;
+    ld.head_scales = head_scales;
+    loads.push_back(std::move(ld));
+  };
+
+  add("token_embd.weight", Format::F32, token_embd_);
+  layer_loads_end_.assign(config_.num_layers, 0);
   for (size_t i = 0; i < config_.num_layers; ++i) {
-    if (i % 8 == 0)
-      std::cout << "[GRETA_SCHED] Loading layer " << i << "/"
-                << config_.num_layers << "..." << std::endl;
     std::string prefix = "blk." + std::to_string(i) + ".";
     auto &b = blocks_[i];
-    if (!loader.load_tensor(prefix + "attn_norm.weight", b.attn_norm, err))
-      return false;
-    if (!loader.load_tensor(prefix + "ffn_norm.weight", b.ffn_norm, err))
-      return false;
-
-    if (int4_mode) {
-      if (!loader.load_tensor_int4(prefix + "attn_q.weight", b.wq, b.s_wq,
-                                   b.sh_wq, err))
-        return false;
-      if (!loader.load_tensor_int4(prefix + "attn_k.weight", b.wk, b.s_wk,
-                                   b.sh_wk, err))
-        return false;
-      if (!loader.load_tensor_int4(prefix + "attn_v.weight", b.wv, b.s_wv,
-                                   b.sh_wv, err))
-        return false;
-      if (!loader.load_tensor_int4(prefix + "attn_output.weight", b.wo, b.s_wo,
-                                   b.sh_wo, err))
-        return false;
-      if (!loader.load_tensor_int4(prefix + "ffn_gate.weight", b.w1, b.s_w1,
-                                   b.sh_wo,
-                                   err)) // sh_wo reused for FFN (dummy)
-        return false;
-      if (!loader.load_tensor_int4(prefix + "ffn_down.weight", b.w2, b.s_w2,
-                                   b.sh_wo, err))
-        return false;
-      if (!loader.load_tensor_int4(prefix + "ffn_up.weight", b.w3, b.s_w3,
-                                   b.sh_wo, err))
-        return false;
-    } else if (int8_mode) {
-      if (!loader.load_tensor_int8(prefix + "attn_q.weight", b.wq, b.s_wq, err))
-        return false;
-      if (!loader.load_tensor_int8(prefix + "attn_k.weight", b.wk, b.s_wk, err))
-        return false;
-      if (!loader.load_tensor_int8(prefix + "attn_v.weight", b.wv, b.s_wv, err))
-        return false;
-      if (!loader.load_tensor_int8(prefix + "attn_output.weight", b.wo, b.s_wo,
-                                   err))
-        return false;
-      if (!loader.load_tensor_int8(prefix + "ffn_gate.weight", b.w1, b.s_w1,
-                                   err))
-        return false;
-      if (!loader.load_tensor_int8(prefix + "ffn_down.weight", b.w2, b.s_w2,
-                                   err))
-        return false;
-      if (!loader.load_tensor_int8(prefix + "ffn_up.weight", b.w3, b.s_w3, err))
-        return false;
-    } else {
-      if (!loader.load_tensor_fp16(prefix + "attn_q.weight", b.wq, err))
-        return false;
-      if (!loader.load_tensor_fp16(prefix + "attn_k.weight", b.wk, err))
-        return false;
-      if (!loader.load_tensor_fp16(prefix + "attn_v.weight", b.wv, err))
-        return false;
-      if (!loader.load_tensor_fp16(prefix + "attn_output.weight", b.wo, err))
-        return false;
-      if (!loader.load_tensor_fp16(prefix + "ffn_gate.weight", b.w1, err))
-        return false;
-      if (!loader.load_tensor_fp16(prefix + "ffn_down.weight", b.w2, err))
-        return false;
-      if (!loader.load_tensor_fp16(prefix + "ffn_up.weight", b.w3, err))
-        return false;
-    }
-  }
-
-  if (!loader.load_tensor("token_embd.weight", token_embd_, err))
-    return false;
-  if (!loader.load_tensor("output_norm.weight", output_norm_, err))
-    return false;
-  if (!loader.load_tensor_fp16("output.weight", output_weight_, err))
+    add(prefix + "attn_norm.weight", Format::F32, b.attn_norm);
+    add(prefix + "ffn_norm.weight", Format::F32, b.ffn_norm);
+    add(prefix + "attn_q.weight", wfmt, b.wq, &b.s_wq, &b.sh_wq);
+    add(prefix + "attn_k.weight", wfmt, b.wk, &b.s_wk, &b.sh_wk);
+    add(prefix + "attn_v.weight", wfmt, b.wv, &b.s_wv, &b.sh_wv);
+    add(prefix + "attn_output.weight", wfmt, b.wo, &b.s_wo, &b.sh_wo);
+    // sh_wo reused for FFN (dummy: head scales are only written for Q/K/V)
+    add(prefix + "ffn_gate.weight", wfmt, b.w1, &b.s_w1, &b.sh_wo);
+    add(prefix + "ffn_down.weight", wfmt, b.w2, &b.s_w2, &b.sh_wo);
+    add(prefix + "ffn_up.weight", wfmt, b.w3, &b.s_w3, &b.sh_wo);
+    layer_loads_end_[i] = loads.size();
+  }
+  add("output_norm.weight", Format::F32, output_norm_);
+  add("output.weight", Format::FP16, output_weight_);
+
+  const char *first_layers = std::getenv("GRETA_LOAD_FIRST_LAYERS");
+  if (!first_layers || std::string(first_layers) != "1")
+    return loader.load_tensors(loads, err);
+
+  pending_load_.reset();
+  pending_load_ = loader.start_load(std::move(loads), err);
+  if (!pending_load_)
     return false;
+  std::cout << "[GRETA_SCHED] First-layers-first load started" << std::endl;
   return true;
 }
 
+bool BlockScheduler::wait_loaded(size_t count, std::string *err) {
+  if (!pending_load_)
+    return true;
+  if (count < pending_load_->size())
+    return pending_load_->wait(count, err);
+  const bool ok = pending_load_->finish(err);
+  if (ok) {
+    const LoadPipelineStats st = pending_load_->stats();
+    std::cout << "[GRETA_SCHED] Background load complete: " << st.items
+              << " tensors in " << st.wall_s << " s" << std::endl;
+  }
+  pending_load_.reset();
+  return ok;
+}
+
+bool BlockScheduler::wait_weights(std::string *err) {
+  return wait_loaded(std::numeric_limits<size_t>::max(), err);
+}
+
 #define CHECK_HIP_KERNEL(cmd, name)                                            \
   do {                                                                         \
     cmd;                                                                       \
@@ -1762,6 +1754,8 @@ bool BlockScheduler::load_weights(WeightLoader &loader, std::string *err) {
 bool BlockScheduler::execute_layer(size_t layer_idx, size_t seq_start,
                                    size_t seq_len, const int32_t *tokens,
                                    std::string *err) {
+  if (pending_load_ && !wait_loaded(layer_loads_end_[layer_idx], err))
+    return false;
   auto &b = blocks_[layer_idx];
   uint32_t D = static_cast<uint32_t>(config_.dim);
   uint32_t Hq = static_cast<uint32_t>(config_.num_heads);
@@ -4275,6 +4269,9 @@ bool BlockScheduler::forward(const int32_t *tokens, size_t seq_start,
     }
     return false;
   }
+  // Carga en segundo plano: sólo el embedding antes de empezar
+  if (pending_load_ && !wait_loaded(1, err))
+    return false;
   uint32_t S = static_cast<uint32_t>(seq_len);
   uint32_t D = static_cast<uint32_t>(config_.dim);
   uint32_t V = static_cast<uint32_t>(config_.vocab_size);
@@ -4375,6 +4372,8 @@ bool BlockScheduler::forward(const int32_t *tokens, size_t seq_start,
         return false;
     }
 
+    if (pending_load_ && !wait_weights(err))
+      return false;
     float *norm_out = static_cast<float *>(activations_.norm_out.data());
     const float *onorm_w = static_cast<const float *>(output_norm_.data());
 
@@ -0,0 +1,386 @@
+#include "gcore/inference/cpu_block_scheduler.hpp"
+
+#include <gcore/rt/ref/cpu_gemm.hpp>
+
+#include <algorithm>
+#include <cmath>
+#include <cstring>
+#include <iostream>
+#include <limits>
+
+namespace gcore::inference {
+
+using gcore::rt::ref::CpuGemm;
+using gcore::rt::ref::CpuThreadPool;
+using gcore::rt::ref::GemmInput;
+
+namespace {
+
+void add_inplace(float *x, const float *y, size_t n) {
+  for (size_t i = 0; i < n; ++i)
+    x[i] += y[i];
+}
+
+} // namespace
+
+bool CpuBlockScheduler::init(const ModelConfig &config, std::string *err) {
+  if (config.dim == 0 || config.num_heads == 0 || config.num_layers == 0 ||
+      config.vocab_size == 0 || config.hidden_dim == 0) {
+    *err = "CpuBlockScheduler: invalid model config";
+    return false;
+  }
+  config_ = config;
+  if (config_.num_heads_kv == 0)
+    config_.num_heads_kv = config_.num_heads;
+  if (config_.head_dim == 0)
+    config_.head_dim = config_.dim / config_.num_heads;
+  if (config_.num_heads % config_.num_heads_kv != 0 ||
+      config_.head_dim % 2 != 0) {
+    *err = "CpuBlockScheduler: unsupported head layout (heads=" +
+           std::to_string(config_.num_heads) +
+           ", kv_heads=" + std::to_string(config_.num_heads_kv) +
+           ", head_dim=" + std::to_string(config_.head_dim) + ")";
+    return false;
+  }
+  blocks_.assign(config_.num_layers, CpuBlockWeights{});
+
+  // Misma frecuencia que rope_kernel: base^(-2i/Dh) en float
+  const size_t half = config_.head_dim / 2;
+  rope_inv_freq_.resize(half);
+  for (size_t i = 0; i < half; ++i)
+    rope_inv_freq_[i] = powf(config_.rope_base, -2.0f * (float)i /
+                                                    (float)config_.head_dim);
+
+  initialized_ = true;
+  return true;
+}
+
+bool CpuBlockScheduler::allocate_activations(size_t batch_size,
+                                             size_t max_seq_len,
+                                             std::string *err) {
+  if (!initialized_) {
+    *err = "CpuBlockScheduler not initialized";
+    return false;
+  }
+  if (batch_size != 1) {
+    *err = "CpuBlockScheduler supports batch_size=1 only";
+    return false;
+  }
+  if (max_seq_len == 0) {
+    *err = "CpuBlockScheduler: max_seq_len must be > 0";
+    return false;
+  }
+  max_seq_len_ = max_seq_len;
+  const size_t S = max_seq_len;
+  const size_t D = config_.dim;
+  const size_t QD = (size_t)config_.num_heads * config_.head_dim;
+  const size_t KV = (size_t)config_.num_heads_kv * config_.head_dim;
+  const size_t F = config_.hidden_dim;
+
+  x_.assign(S * D, 0.0f);
+  norm_out_.assign(S * D, 0.0f);
+  tmp_.assign(S * D, 0.0f);
+  q_.assign(S * QD, 0.0f);
+  attn_out_.assign(S * QD, 0.0f);
+  k_.assign(S * KV, 0.0f);
+  v_.assign(S * KV, 0.0f);
+  ffn_gate_.assign(S * F, 0.0f);
+  ffn_up_.assign(S * F, 0.0f);
+  kv_k_.assign((size_t)config_.num_layers * S * KV, 0.0f);
+  kv_v_.assign((size_t)config_.num_layers * S * KV, 0.0f);
+  logits_.clear();
+  return true;
+}
+
+bool CpuBlockScheduler::load_weights(HostTensorReader &reader,
+                                     std::string *err) {
+  if (!initialized_) {
+    *err = "CpuBlockScheduler not initialized";
+    return false;
+  }
+  const size_t D = config_.dim;
+  const size_t QD = (size_t)config_.num_heads * config_.head_dim;
+  const size_t KV = (size_t)config_.num_heads_kv * config_.head_dim;
+  const size_t F = config_.hidden_dim;
+  const size_t V = config_.vocab_size;
+
+  auto check = [&](const std::string &name, size_t got, size_t expected) {
+    if (got == expected)
+      return true;
+    *err = "CPU load " + name + ": expected " + std::to_string(expected) +
+           " elements, got " + std::to_string(got);
+    return false;
+  };
+  auto read_f16 = [&](const std::string &name, std::vector<uint16_t> &dst,
+                      size_t expected) {
+    err->clear();
+    if (!reader.read_tensor_fp16(name, dst, err)) {
+      if (err->empty())
+        *err = "Failed to read tensor " + name;
+      return false;
+    }
+    return check(name, dst.size(), expected);
+  };
+  auto read_f32 = [&](const std::string &name, std::vector<float> &dst,
+                      size_t expected) {
+    err->clear();
+    if (!reader.read_tensor_f32(name, dst, err)) {
+      if (err->empty())
+        *err = "Failed to read tensor " + name;
+      return false;
+    }
+    return check(name, dst.size(), expected);
+  };
+
+  for (size_t i = 0; i < blocks_.size(); ++i) {
+    auto &b = blocks_[i];
+    const std::string prefix = "blk." + std::to_string(i) + ".";
+    if (!read_f32(prefix + "attn_norm.weight", b.attn_norm, D) ||
+        !read_f32(prefix + "ffn_norm.weight", b.ffn_norm, D) ||
+        !read_f16(prefix + "attn_q.weight", b.wq, QD * D) ||
+        !read_f16(prefix + "attn_k.weight", b.wk, KV * D) ||
+        !read_f16(prefix + "attn_v.weight", b.wv, KV * D) ||
+        !read_f16(prefix + "attn_output.weight", b.wo, D * QD) ||
+        !read_f16(prefix + "ffn_gate.weight", b.w1, F * D) ||
+        !read_f16(prefix + "ffn_down.weight", b.w2, D * F) ||
+        !read_f16(prefix + "ffn_up.weight", b.w3, F * D))
+      return false;
+  }
+  if (!read_f32("token_embd.weight", token_embd_, V * D) ||
+      !read_f32("output_norm.weight", output_norm_, D) ||
+      !read_f16("output.weight", output_weight_, V * D))
+    return false;
+  return true;
+}
+
+void CpuBlockScheduler::linear(const float *x, const std::vector<uint16_t> &w,
+                               float *y, size_t rows, size_t n,
+                               size_t k) const {
+  // GEMV por filas de W en decode, GEMM bloqueada (trans_b) en prefill
+  CpuGemm::linear(x, w.data(), GemmInput::F16, y, (int)rows, (int)n, (int)k,
+                  threads_);
+}
+
+void CpuBlockScheduler::rmsnorm(const float *x, const std::vector<float> &w,
+                                float *y, size_t rows) const {
+  const size_t D = config_.dim;
+  const float eps = config_.rms_eps;
+  CpuThreadPool::instance().parallel_for(
+      rows,
+      [&](size_t s) {
+        const float *xr = x + s * D;
+        float *yr = y + s * D;
+        double ss = 0.0;
+        for (size_t i = 0; i < D; ++i)
+          ss += (double)xr[i] * xr[i];
+        const float inv = 1.0f / std::sqrt((float)(ss / D) + eps);
+        for (size_t i = 0; i < D; ++i)
+          yr[i] = xr[i] * inv * w[i];
+      },
+      (size_t)threads_);
+}
+
+void CpuBlockScheduler::rope(float *x, size_t rows, size_t heads,
+                             size_t seq_start) const {
+  // NeoX (mitades): pares (i, i + Dh/2), igual que rope_kernel
+  const size_t Dh = config_.head_dim;
+  const size_t half = Dh / 2;
+  CpuThreadPool::instance().parallel_for(
+      rows,
+      [&](size_t s) {
+        const float pos = (float)(seq_start + s);
+        for (size_t i = 0; i < half; ++i) {
+          const float theta = pos * rope_inv_freq_[i];
+          const float c = cosf(theta);
+          const float sn = sinf(theta);
+          for (size_t h = 0; h < heads; ++h) {
+            float *hx = x + (s * heads + h) * Dh;
+            const float v0 = hx[i];
+            const float v1 = hx[i + half];
+            hx[i] = v0 * c - v1 * sn;
+            hx[i + half] = v0 * sn + v1 * c;
+          }
+        }
+      },
+      (size_t)threads_);
+}
+
+void CpuBlockScheduler::attention(size_t layer_idx, size_t seq_start,
+                                  size_t seq_len) {
+  const size_t H = config_.num_heads;
+  const size_t Hkv = config_.num_heads_kv;
+  const size_t Dh = config_.head_dim;
+  const size_t group = H / Hkv;
+  const size_t S = max_seq_len_;
+  const float scale = 1.0f / std::sqrt((float)Dh);
+  const float *ck = kv_k_.data() + layer_idx * S * Hkv * Dh;
+  const float *cv = kv_v_.data() + layer_idx * S * Hkv * Dh;
+
+  // Una tarea por (query, head): la query s atiende a las posiciones [0, pos]
+  CpuThreadPool::instance().parallel_for(
+      seq_len * H,
+      [&](size_t t) {
+        const size_t s = t / H;
+        const size_t h = t % H;
+        const size_t pos = seq_start + s;
+        const size_t hk = h / group;
+        const float *qh = q_.data() + (s * H + h) * Dh;
+        const float *kh = ck + hk * S * Dh;
+        const float *vh = cv + hk * S * Dh;
+        float *out = attn_out_.data() + (s * H + h) * Dh;
+
+        thread_local std::vector<float> scores;
+        scores.resize(pos + 1);
+        float m = -std::numeric_limits<float>::infinity();
+        for (size_t j = 0; j <= pos; ++j) {
+          scores[j] = CpuGemm::dot(qh, kh + j * Dh, Dh) * scale;
+          m = std::max(m, scores[j]);
+        }
+        float sum = 0.0f;
+        for (size_t j = 0; j <= pos; ++j) {
+          scores[j] = std::exp(scores[j] - m);
+          sum += scores[j];
+        }
+        const float inv = 1.0f / sum;
+        std::fill(out, out + Dh, 0.0f);
+        for (size_t j = 0; j <= pos; ++j) {
+          const float p = scores[j] * inv;
+          const float *vr = vh + j * Dh;
+          for (size_t d = 0; d < Dh; ++d)
+            out[d] += p * vr[d];
+        }
+      },
+      (size_t)threads_);
+}
+
+bool CpuBlockScheduler::execute_layer(size_t layer_idx, size_t seq_start,
+                                      size_t seq_len, std::string *err) {
+  if (layer_idx >= blocks_.size()) {
+    *err = "Invalid layer index";
+    return false;
+  }
+  const auto &b = blocks_[layer_idx];
+  const size_t D = config_.dim;
+  const size_t H = config_.num_heads;
+  const size_t Hkv = config_.num_heads_kv;
+  const size_t Dh = config_.head_dim;
+  const size_t QD = H * Dh;
+  const size_t KV = Hkv * Dh;
+  const size_t F = config_.hidden_dim;
+  const size_t S = max_seq_len_;
+
+  // 1. Attention RMSNorm + Q/K/V
+  rmsnorm(x_.data(), b.attn_norm, norm_out_.data(), seq_len);
+  linear(norm_out_.data(), b.wq, q_.data(), seq_len, QD, D);
+  linear(norm_out_.data(), b.wk, k_.data(), seq_len, KV, D);
+  linear(norm_out_.data(), b.wv, v_.data(), seq_len, KV, D);
+
+  // 2. RoPE + KV cache update ([Hkv][max_seq][Dh] por capa)
+  rope(q_.data(), seq_len, H, seq_start);
+  rope(k_.data(), seq_len, Hkv, seq_start);
+  float *ck = kv_k_.data() + layer_idx * S * KV;
+  float *cv = kv_v_.data() + layer_idx * S * KV;
+  for (size_t s = 0; s < seq_len; ++s) {
+    for (size_t h = 0; h < Hkv; ++h) {
+      const size_t dst = (h * S + seq_start + s) * Dh;
+      std::memcpy(ck + dst, k_.data() + (s * Hkv + h) * Dh,
+                  Dh * sizeof(float));
+      std::memcpy(cv + dst, v_.data() + (s * Hkv + h) * Dh,
+                  Dh * sizeof(float));
+    }
+  }
+
+  // 3. Causal attention + WO + residual
+  attention(layer_idx, seq_start, seq_len);
+  linear(attn_out_.data(), b.wo, tmp_.data(), seq_len, D, QD);
+  add_inplace(x_.data(), tmp_.data(), seq_len * D);
+
+  // 4. FFN RMSNorm + SwiGLU + down + residual
+  rmsnorm(x_.data(), b.ffn_norm, norm_out_.data(), seq_len);
+  linear(norm_out_.data(), b.w1, ffn_gate_.data(), seq_len, F, D);
+  linear(norm_out_.data(), b.w3, ffn_up_.data(), seq_len, F, D);
+  CpuThreadPool::instance().parallel_for(
+      seq_len,
+      [&](size_t s) {
+        float *g = ffn_gate_.data() + s * F;
+        const float *u = ffn_up_.data() + s * F;
+        for (size_t i = 0; i < F; ++i)
+          g[i] = g[i] / (1.0f + std::exp(-g[i])) * u[i];
+      },
+      (size_t)threads_);
+  linear(ffn_gate_.data(), b.w2, tmp_.data(), seq_len, D, F);
+  add_inplace(x_.data(), tmp_.data(), seq_len * D);
+  return true;
+}
+
+bool CpuBlockScheduler::forward(const int32_t *tokens, size_t seq_start,
+                                size_t seq_len, std::string *err) {
+  if (token_embd_.empty()) {
+    *err = "CpuBlockScheduler: weights not loaded";
+    return false;
+  }
+  if (seq_len == 0 || seq_start + seq_len > max_seq_len_) {
+    *err = "CpuBlockScheduler: sequence [" + std::to_string(seq_start) + ", " +
+           std::to_string(seq_start + seq_len) + ") exceeds max_seq_len " +
+           std::to_string(max_seq_len_);
+    return false;
+  }
+  const size_t D = config_.dim;
+  const size_t V = config_.vocab_size;
+
+  for (size_t s = 0; s < seq_len; ++s) {
+    const int32_t id = tokens[s];
+    if (id < 0 || (size_t)id >= V) {
+      *err = "Token id out of range: " + std::to_string(id);
+      return false;
+    }
+    std::memcpy(x_.data() + s * D, token_embd_.data() + (size_t)id * D,
+                D * sizeof(float));
+  }
+
+  for (size_t l = 0; l < blocks_.size(); ++l) {
+    if (!execute_layer(l, seq_start, seq_len, err))
+      return false;
+  }
+
+  // Sólo se muestrea la última posición: LM head sobre una fila
+  const float *last = x_.data() + (seq_len - 1) * D;
+  rmsnorm(last, output_norm_, norm_out_.data(), 1);
+  logits_.resize(V);
+  linear(norm_out_.data(), output_weight_, logits_.data(), 1, V, D);
+  return true;
+}
+
+const float *CpuBlockScheduler::last_logits() const {
+  return logits_.size() < config_.vocab_size ? nullptr : logits_.data();
+}
+
+int32_t CpuBlockScheduler::sample_greedy() const {
+  const float *row = last_logits();
+  if (!row)
+    return -1;
+  return (int32_t)(std::max_element(row, row + config_.vocab_size) - row);
+}
+
+size_t CpuBlockScheduler::num_threads() const {
+  const size_t pool = CpuThreadPool::instance().size();
+  return threads_ > 0 ? std::min(pool, (size_t)threads_) : pool;
+}
+
+size_t CpuBlockScheduler::memory_bytes() const {
+  size_t bytes = 0;
+  for (const auto &b : blocks_) {
+    bytes += (b.wq.size() + b.wk.size() + b.wv.size() + b.wo.size() +
+              b.w1.size() + b.w2.size() + b.w3.size()) *
+             sizeof(uint16_t);
+    bytes += (b.attn_norm.size() + b.ffn_norm.size()) * sizeof(float);
+  }
+  bytes += output_weight_.size() * sizeof(uint16_t);
+  for (const auto *v : {&token_embd_, &output_norm_, &x_, &norm_out_, &q_,
+                        &k_, &v_, &attn_out_, &tmp_, &ffn_gate_, &ffn_up_,
+                        &logits_, &kv_k_, &kv_v_})
+    bytes += v->size() * sizeof(float);
+  return bytes;
+}
+
+} // namespace gcore::inference
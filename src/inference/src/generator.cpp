@@ -5,6 +5,7 @@
 #include "gcore/inference/stage_trace.hpp"
 #include "gcore/inference/tokenizer.hpp"
 #include "gcore/inference/trace.hpp"
+#include "gcore/rt/span_tracer.hpp"
 
 #include <algorithm>
 #include <chrono>
@@ -15,11 +16,19 @@
 #include <fstream>
 #include <hip/hip_fp16.h>
 #include <iostream>
-#include <random>
 #include <sstream>
 
 namespace gcore::inference {
 
+GeneratorMetrics &GeneratorMetrics::global() {
+  auto &reg = gcore::rt::MetricsRegistry::global();
+  static GeneratorMetrics m{reg.histogram("generator.prefill_ns"),
+                            reg.histogram("generator.ttft_ns"),
+                            reg.histogram("generator.token_ns"),
+                            reg.counter("generator.tokens")};
+  return m;
+}
+
 struct F32Stats {
   float min = 0.0f;
   float max = 0.0f;
@@ -700,79 +709,36 @@ bool Generator::init(const ModelConfig &config, BlockScheduler *scheduler,
 
 int32_t Generator::sample(const float *logits, size_t vocab_size,
                           const SamplingParams &params) {
-  // Diagnostic: Check if logits are sane
-  float min_l = logits[0], max_l = logits[0], sum_l = 0.0f;
-  int nan_count = 0;
-  for (size_t i = 0; i < vocab_size; ++i) {
-    float v = logits[i];
-    if (std::isnan(v))
-      nan_count++;
-    else {
-      if (v < min_l)
-        min_l = v;
-      if (v > max_l)
-        max_l = v;
-      sum_l += v;
-    }
-  }
-
   static int sample_count = 0;
   if (sample_count++ < 3) { // Print only for first 3 tokens
+    // Diagnostic: Check if logits are sane
+    float min_l = logits[0], max_l = logits[0], sum_l = 0.0f;
+    int nan_count = 0;
+    for (size_t i = 0; i < vocab_size; ++i) {
+      float v = logits[i];
+      if (std::isnan(v))
+        nan_count++;
+      else {
+        if (v < min_l)
+          min_l = v;
+        if (v > max_l)
+          max_l = v;
+        sum_l += v;
+      }
+    }
     std::cout << "[SAMPLE DEBUG] Logits stats: min=" << min_l
               << " max=" << max_l << " avg=" << (sum_l / vocab_size)
               << " NaNs=" << nan_count << std::endl;
     // Print top 5 logits
-    std::vector<std::pair<float, int>> top;
-    for (int i = 0; i < (int)vocab_size; ++i)
-      top.push_back({logits[i], i});
-    std::sort(top.rbegin(), top.rend());
+    std::vector<std::pair<float, int32_t>> top;
+    Sampler::top_k(logits, vocab_size, 5, top);
     std::cout << "  Top tokens: ";
-    for (int i = 0; i < 5; ++i)
-      std::cout << top[i].second << "(" << top[i].first << ") ";
+    for (const auto &t : top)
+      std::cout << t.second << "(" << t.first << ") ";
     std::cout << std::endl;
   }
 
-  if (params.greedy) {
-    int32_t max_id = 0;
-    float max_val = logits[0];
-    for (size_t i = 1; i < vocab_size; ++i) {
-      if (logits[i] > max_val) {
-        max_val = logits[i];
-        max_id = static_cast<int32_t>(i);
-      }
-    }
-    return max_id;
-  }
-
-  // Softmax with temperature
-  std::vector<float> probs(vocab_size);
-  float sum = 0.0f;
-  float max_logit = -INFINITY;
-  for (size_t i = 0; i < vocab_size; ++i) {
-    if (logits[i] > max_logit)
-      max_logit = logits[i];
-  }
-
-  for (size_t i = 0; i < vocab_size; ++i) {
-    float p = std::exp((logits[i] - max_logit) / params.temperature);
-    probs[i] = p;
-    sum += p;
-  }
-
-  // Random sample
-  std::random_device rd;
-  std::mt19937 gen(rd());
-  std::uniform_real_distribution<float> dis(0, sum);
-  float r = dis(gen);
-
-  float cumulative = 0.0f;
-  for (size_t i = 0; i < vocab_size; ++i) {
-    cumulative += probs[i];
-    if (r <= cumulative)
-      return static_cast<int32_t>(i);
-  }
-
-  return 0;
+  return sampler_.sample(logits, vocab_size, params);
 }
 
 std::vector<int32_t>
@@ -784,11 +750,14 @@ Generator::generate_tokens(const std::vector<int32_t> &prompt_tokens,
       *err = "Generator not initialized";
     return {};
   }
+  sampler_.reseed(params.seed);
 
   std::vector<int32_t> output = prompt_tokens;
   auto start = std::chrono::high_resolution_clock::now();
   auto first_token_time = start;
   bool first_token = true;
+  GeneratorMetrics &metrics = GeneratorMetrics::global();
+  const uint64_t start_ns = gcore::rt::now_ns();
 
   std::vector<float> logits_host(config_.vocab_size);
 
@@ -840,6 +809,7 @@ Generator::generate_tokens(const std::vector<int32_t> &prompt_tokens,
 
   // 1. Prefill: Process all prompt tokens at once
   auto prefill_start = std::chrono::high_resolution_clock::now();
+  const uint64_t prefill_ns0 = gcore::rt::now_ns();
   if (!scheduler_->forward(prompt_tokens.data(), 0, prompt_tokens.size(),
                            err)) {
     return output;
@@ -1133,6 +1103,14 @@ Generator::generate_tokens(const std::vector<int32_t> &prompt_tokens,
 
   first_token_time = std::chrono::high_resolution_clock::now();
   first_token = false;
+  uint64_t token_t0 = gcore::rt::now_ns();
+  metrics.prefill_ns.record(token_t0 - prefill_ns0);
+  metrics.ttft_ns.record(token_t0 - start_ns);
+  metrics.tokens.inc(1);
+  if (gcore::rt::SpanTracer::enabled())
+    gcore::rt::SpanTracer::instance().complete(
+        "gen.prefill", "gen", prefill_ns0, token_t0, nullptr,
+        prompt_tokens.size());
 
   // 2. Decode loop: Generate remaining tokens one-by-one
   auto decode_start = std::chrono::high_resolution_clock::now();
@@ -1473,6 +1451,14 @@ Generator::generate_tokens(const std::vector<int32_t> &prompt_tokens,
     }
 
     output.push_back(next_token);
+    const uint64_t token_t1 = gcore::rt::now_ns();
+    metrics.token_ns.record(token_t1 - token_t0);
+    metrics.tokens.inc(1);
+    if (gcore::rt::SpanTracer::enabled())
+      gcore::rt::SpanTracer::instance().complete(
+          "gen.decode_step", "gen", token_t0, token_t1, nullptr,
+          static_cast<uint64_t>(i));
+    token_t0 = token_t1;
   }
 
   auto end = std::chrono::high_resolution_clock::now();
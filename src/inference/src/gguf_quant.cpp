@@ -0,0 +1,422 @@
+#include "gcore/inference/gguf_quant.hpp"
+
+#include <algorithm>
+#include <cmath>
+#include <cstring>
+
+namespace gcore::inference::quant {
+
+namespace {
+
+// Por debajo de esto el reparto entre hilos cuesta más que el trabajo
+constexpr size_t kParallelBlocks = 256;
+
+uint16_t load_u16(const uint8_t *p) {
+  uint16_t v;
+  std::memcpy(&v, p, 2);
+  return v;
+}
+
+// ---------------------------------------------------------------------------
+// Referencias escalares (código original del loader, bloque a bloque)
+
+void q4_k_scales(const uint8_t *s, uint8_t sc8[8], uint8_t m8[8]) {
+  sc8[0] = s[0] & 0x3f;
+  sc8[1] = s[1] & 0x3f;
+  sc8[2] = s[2] & 0x3f;
+  sc8[3] = s[3] & 0x3f;
+  sc8[4] = (s[0] >> 6) | ((s[4] & 0x0f) << 2);
+  sc8[5] = (s[1] >> 6) | ((s[4] >> 4) << 2);
+  sc8[6] = (s[2] >> 6) | ((s[5] & 0x0f) << 2);
+  sc8[7] = (s[3] >> 6) | ((s[5] >> 4) << 2);
+  m8[0] = s[6] & 0x3f;
+  m8[1] = s[7] & 0x3f;
+  m8[2] = s[8] & 0x3f;
+  m8[3] = s[9] & 0x3f;
+  m8[4] = (s[6] >> 6) | ((s[10] & 0x0f) << 2);
+  m8[5] = (s[7] >> 6) | ((s[10] >> 4) << 2);
+  m8[6] = (s[8] >> 6) | ((s[11] & 0x0f) << 2);
+  m8[7] = (s[9] >> 6) | ((s[11] >> 4) << 2);
+}
+
+// d(f16) dmin(f16) scales[12] qs[128]
+void q4_k_block_ref(const uint8_t *src, float *dst) {
+  const float d = fp16_to_fp32(load_u16(src));
+  const float dmin = fp16_to_fp32(load_u16(src + 2));
+  uint8_t sc8[8], m8[8];
+  q4_k_scales(src + 4, sc8, m8);
+  const uint8_t *qs = src + 16;
+  for (int j = 0; j < 8; ++j) {
+    float scale = d * sc8[j];
+    float min_val = dmin * m8[j];
+    for (int l = 0; l < 16; ++l) {
+      uint8_t q = qs[j * 16 + l];
+      dst[j * 32 + l * 2 + 0] = scale * (q & 0x0F) - min_val;
+      dst[j * 32 + l * 2 + 1] = scale * (q >> 4) - min_val;
+    }
+  }
+}
+
+// ql[128] qh[64] scales[16] (int8) d(f16)
+void q6_k_block_ref(const uint8_t *src, float *dst) {
+  const uint8_t *ql = src;
+  const uint8_t *qh = src + 128;
+  const int8_t *scales = reinterpret_cast<const int8_t *>(src + 192);
+  float d = fp16_to_fp32(load_u16(src + 208));
+  for (int i = 0; i < 256; ++i) {
+    int l_idx = i / 2;
+    int shift = (i % 2) * 4;
+    uint8_t l_val = (ql[l_idx] >> shift) & 0x0F;
+    int h_idx = i / 4;
+    int h_shift = (i % 4) * 2;
+    uint8_t h_val = (qh[h_idx] >> h_shift) & 0x03;
+    int q = (l_val | (h_val << 4)) - 32;
+    int sc_idx = i / 16;
+    dst[i] = d * q * scales[sc_idx];
+  }
+}
+
+// d(f16) qs[16]: nibble bajo -> [0, 16), alto -> [16, 32) (ggml)
+void q4_0_block_ref(const uint8_t *src, float *dst) {
+  const float d = fp16_to_fp32(load_u16(src));
+  const uint8_t *qs = src + 2;
+  for (int j = 0; j < 16; ++j) {
+    dst[j] = static_cast<float>((qs[j] & 0x0F) - 8) * d;
+    dst[j + 16] = static_cast<float>((qs[j] >> 4) - 8) * d;
+  }
+}
+
+// d(f16) qs[32] (int8)
+void q8_0_block_ref(const uint8_t *src, float *dst) {
+  const float d = fp16_to_fp32(load_u16(src));
+  const int8_t *qs = reinterpret_cast<const int8_t *>(src + 2);
+  for (int j = 0; j < 32; ++j)
+    dst[j] = static_cast<float>(qs[j]) * d;
+}
+
+// ---------------------------------------------------------------------------
+// Kernels del motor: mismas operaciones en el mismo orden, con los bucles
+// internos sin índices dependientes de i para que se vectoricen
+
+inline void q4_k_block(const uint8_t *src, float *dst) {
+  const float d = fp16_to_fp32(load_u16(src));
+  const float dmin = fp16_to_fp32(load_u16(src + 2));
+  uint8_t sc8[8], m8[8];
+  q4_k_scales(src + 4, sc8, m8);
+  const uint8_t *qs = src + 16;
+  for (int j = 0; j < 8; ++j) {
+    const float scale = d * sc8[j];
+    const float min_val = dmin * m8[j];
+    const uint8_t *q = qs + j * 16;
+    float *o = dst + j * 32;
+#pragma omp simd
+    for (int l = 0; l < 16; ++l) {
+      o[2 * l] = scale * (q[l] & 0x0F) - min_val;
+      o[2 * l + 1] = scale * (q[l] >> 4) - min_val;
+    }
+  }
+}
+
+inline void q6_k_block(const uint8_t *src, float *dst) {
+  const uint8_t *ql = src;
+  const uint8_t *qh = src + 128;
+  const int8_t *scales = reinterpret_cast<const int8_t *>(src + 192);
+  const float d = fp16_to_fp32(load_u16(src + 208));
+  // Elementos 4m..4m+3: nibbles de ql[2m], ql[2m+1] y pares de bits de qh[m]
+  int32_t q[256];
+#pragma omp simd
+  for (int m = 0; m < 64; ++m) {
+    const int b0 = ql[2 * m], b1 = ql[2 * m + 1], h = qh[m];
+    q[4 * m + 0] = ((b0 & 0x0F) | ((h & 0x03) << 4)) - 32;
+    q[4 * m + 1] = ((b0 >> 4) | (((h >> 2) & 0x03) << 4)) - 32;
+    q[4 * m + 2] = ((b1 & 0x0F) | (((h >> 4) & 0x03) << 4)) - 32;
+    q[4 * m + 3] = ((b1 >> 4) | (((h >> 6) & 0x03) << 4)) - 32;
+  }
+  for (int s = 0; s < 16; ++s) {
+    const float sc = scales[s];
+#pragma omp simd
+    for (int k = 0; k < 16; ++k)
+      dst[16 * s + k] = d * static_cast<float>(q[16 * s + k]) * sc;
+  }
+}
+
+inline void q4_0_block(const uint8_t *src, float *dst) {
+  const float d = fp16_to_fp32(load_u16(src));
+  const uint8_t *qs = src + 2;
+#pragma omp simd
+  for (int j = 0; j < 16; ++j) {
+    dst[j] = static_cast<float>((qs[j] & 0x0F) - 8) * d;
+    dst[j + 16] = static_cast<float>((qs[j] >> 4) - 8) * d;
+  }
+}
+
+inline void q8_0_block(const uint8_t *src, float *dst) {
+  const float d = fp16_to_fp32(load_u16(src));
+  const int8_t *qs = reinterpret_cast<const int8_t *>(src + 2);
+#pragma omp simd
+  for (int j = 0; j < 32; ++j)
+    dst[j] = static_cast<float>(qs[j]) * d;
+}
+
+// fn(bloque, salida) sobre [0, n_blocks) repartido entre hilos; los kernels
+// llegan como lambdas para que se inlineen en el bucle
+template <typename Out, typename Fn>
+void for_blocks(const uint8_t *src, size_t n_blocks, size_t bytes,
+                size_t elems, Out *dst, Fn fn) {
+#pragma omp parallel for schedule(static) if (n_blocks >= kParallelBlocks)
+  for (size_t b = 0; b < n_blocks; ++b)
+    fn(src + b * bytes, dst + b * elems);
+}
+
+template <typename Block>
+void dequant_f32(Block block, const uint8_t *src, size_t n_blocks,
+                 size_t bytes, size_t elems, float *dst) {
+  for_blocks(src, n_blocks, bytes, elems, dst, block);
+}
+
+template <typename Block>
+void dequant_fp16(Block block, const uint8_t *src, size_t n_blocks,
+                  size_t bytes, size_t elems, uint16_t *dst) {
+  for_blocks(src, n_blocks, bytes, elems, dst,
+             [&](const uint8_t *s, uint16_t *o) {
+               float tmp[256];
+               block(s, tmp);
+#pragma omp simd
+               for (size_t i = 0; i < elems; ++i)
+                 o[i] = fp32_to_fp16(tmp[i]);
+             });
+}
+
+// max(acc, |x|) como std::max: los NaN no entran, así que el orden da igual
+// y se puede acumular por carriles
+inline float group_absmax(const float *x) {
+  float lane[8] = {0, 0, 0, 0, 0, 0, 0, 0};
+  for (int i = 0; i < 32; i += 8) {
+#pragma omp simd
+    for (int k = 0; k < 8; ++k) {
+      const float a = std::fabs(x[i + k]);
+      lane[k] = lane[k] < a ? a : lane[k];
+    }
+  }
+  float m = 0.0f;
+  for (int k = 0; k < 8; ++k)
+    m = std::max(m, lane[k]);
+  return m;
+}
+
+// std::round (mitad lejos de cero) para |x| < 2^31: x - trunc(x) es exacto
+inline int32_t round_away(float x) {
+  int32_t t = static_cast<int32_t>(x);
+  const float r = x - static_cast<float>(t);
+  t += (r >= 0.5f) - (r <= -0.5f);
+  return t;
+}
+
+void quantize_int8_group_ref(const float *x, size_t n, int8_t *q,
+                             float *scale_out) {
+  float max_val = 0.0f;
+  for (size_t i = 0; i < n; ++i)
+    max_val = std::max(max_val, std::abs(x[i]));
+  float scale = max_val / 127.0f;
+  *scale_out = scale;
+  float inv_scale = scale > 1e-9f ? 1.0f / scale : 0.0f;
+  for (size_t i = 0; i < n; ++i)
+    q[i] = (int8_t)std::round(x[i] * inv_scale);
+}
+
+void quantize_int4_group_ref(const float *x, size_t n, uint8_t *packed,
+                             float *scale_out) {
+  float max_val = 0.0f;
+  for (size_t i = 0; i < n; ++i)
+    max_val = std::max(max_val, std::abs(x[i]));
+  float scale = max_val / 7.0f;
+  *scale_out = scale;
+  float inv_scale = (scale > 1e-9f) ? 1.0f / scale : 0.0f;
+  for (size_t i = 0; i < n; i += 2) {
+    int8_t v0 = (int8_t)std::round(x[i] * inv_scale);
+    v0 = std::max((int8_t)-8, std::min((int8_t)7, v0));
+    int8_t v1 = 0;
+    if (i + 1 < n) {
+      v1 = (int8_t)std::round(x[i + 1] * inv_scale);
+      v1 = std::max((int8_t)-8, std::min((int8_t)7, v1));
+    }
+    packed[i / 2] = (v0 & 0x0F) | ((v1 & 0x0F) << 4);
+  }
+}
+
+} // namespace
+
+bool block_type_from_name(const std::string &dtype, BlockType &out) {
+  if (dtype == "Q4_0")
+    out = BlockType::Q4_0;
+  else if (dtype == "Q8_0")
+    out = BlockType::Q8_0;
+  else if (dtype == "Q4_K")
+    out = BlockType::Q4_K;
+  else if (dtype == "Q6_K")
+    out = BlockType::Q6_K;
+  else
+    return false;
+  return true;
+}
+
+size_t block_elems(BlockType t) {
+  return t == BlockType::Q4_K || t == BlockType::Q6_K ? 256 : 32;
+}
+
+size_t block_bytes(BlockType t) {
+  switch (t) {
+  case BlockType::Q4_0:
+    return 18;
+  case BlockType::Q8_0:
+    return 34;
+  case BlockType::Q4_K:
+    return 144;
+  case BlockType::Q6_K:
+    return 210;
+  }
+  return 0;
+}
+
+float fp16_to_fp32(uint16_t h) {
+  uint32_t sign = (h >> 15) & 0x1;
+  uint32_t exp = (h >> 10) & 0x1F;
+  uint32_t mant = h & 0x3FF;
+  if (exp == 0) {
+    if (mant == 0)
+      return sign ? -0.0f : 0.0f;
+    exp = 1;
+    while ((mant & 0x400) == 0) {
+      mant <<= 1;
+      exp--;
+    }
+    mant &= ~0x400;
+  } else if (exp == 31)
+    return sign ? -INFINITY : INFINITY;
+  uint32_t f = (sign << 31) | ((exp + 112) << 23) | (mant << 13);
+  float result;
+  std::memcpy(&result, &f, 4);
+  return result;
+}
+
+uint16_t fp32_to_fp16(float f) {
+  uint32_t x;
+  std::memcpy(&x, &f, 4);
+  uint32_t sign = (x >> 16) & 0x8000;
+  int32_t exp = ((x >> 23) & 0xFF) - 127 + 15;
+  uint32_t mant = x & 0x7FFFFF;
+  if (exp <= 0)
+    return sign;
+  else if (exp >= 31)
+    return sign | 0x7C00;
+  return sign | (exp << 10) | (mant >> 13);
+}
+
+void dequantize_f32(BlockType t, const uint8_t *src, size_t n_blocks,
+                    float *dst) {
+  const size_t bytes = block_bytes(t), elems = block_elems(t);
+  switch (t) {
+  case BlockType::Q4_0:
+    return dequant_f32([](const uint8_t *b, float *o) { q4_0_block(b, o); },
+                       src, n_blocks, bytes, elems, dst);
+  case BlockType::Q8_0:
+    return dequant_f32([](const uint8_t *b, float *o) { q8_0_block(b, o); },
+                       src, n_blocks, bytes, elems, dst);
+  case BlockType::Q4_K:
+    return dequant_f32([](const uint8_t *b, float *o) { q4_k_block(b, o); },
+                       src, n_blocks, bytes, elems, dst);
+  case BlockType::Q6_K:
+    return dequant_f32([](const uint8_t *b, float *o) { q6_k_block(b, o); },
+                       src, n_blocks, bytes, elems, dst);
+  }
+}
+
+void dequantize_fp16(BlockType t, const uint8_t *src, size_t n_blocks,
+                     uint16_t *dst) {
+  const size_t bytes = block_bytes(t), elems = block_elems(t);
+  switch (t) {
+  case BlockType::Q4_0:
+    return dequant_fp16([](const uint8_t *b, float *o) { q4_0_block(b, o); },
+                        src, n_blocks, bytes, elems, dst);
+  case BlockType::Q8_0:
+    return dequant_fp16([](const uint8_t *b, float *o) { q8_0_block(b, o); },
+                        src, n_blocks, bytes, elems, dst);
+  case BlockType::Q4_K:
+    return dequant_fp16([](const uint8_t *b, float *o) { q4_k_block(b, o); },
+                        src, n_blocks, bytes, elems, dst);
+  case BlockType::Q6_K:
+    return dequant_fp16([](const uint8_t *b, float *o) { q6_k_block(b, o); },
+                        src, n_blocks, bytes, elems, dst);
+  }
+}
+
+void quantize_int8(const float *src, size_t n, int8_t *q, float *scales) {
+  const size_t full = n / 32;
+#pragma omp parallel for schedule(static) if (full >= kParallelBlocks)
+  for (size_t g = 0; g < full; ++g) {
+    const float *x = src + g * 32;
+    const float scale = group_absmax(x) / 127.0f;
+    scales[g] = scale;
+    const float inv_scale = scale > 1e-9f ? 1.0f / scale : 0.0f;
+    int8_t *o = q + g * 32;
+#pragma omp simd
+    for (int i = 0; i < 32; ++i)
+      o[i] = static_cast<int8_t>(round_away(x[i] * inv_scale));
+  }
+  if (n % 32)
+    quantize_int8_group_ref(src + full * 32, n % 32, q + full * 32,
+                            scales + full);
+}
+
+void quantize_int4(const float *src, size_t n, uint8_t *packed,
+                   float *scales) {
+  const size_t full = n / 32;
+#pragma omp parallel for schedule(static) if (full >= kParallelBlocks)
+  for (size_t g = 0; g < full; ++g) {
+    const float *x = src + g * 32;
+    const float scale = group_absmax(x) / 7.0f;
+    scales[g] = scale;
+    const float inv_scale = scale > 1e-9f ? 1.0f / scale : 0.0f;
+    uint8_t *o = packed + g * 16;
+#pragma omp simd
+    for (int i = 0; i < 16; ++i) {
+      const int32_t v0 =
+          std::max(-8, std::min(7, round_away(x[2 * i] * inv_scale)));
+      const int32_t v1 =
+          std::max(-8, std::min(7, round_away(x[2 * i + 1] * inv_scale)));
+      o[i] = static_cast<uint8_t>((v0 & 0x0F) | ((v1 & 0x0F) << 4));
+    }
+  }
+  if (n % 32)
+    quantize_int4_group_ref(src + full * 32, n % 32, packed + full * 16,
+                            scales + full);
+}
+
+void dequantize_block_ref(BlockType t, const uint8_t *src, float *dst) {
+  switch (t) {
+  case BlockType::Q4_0:
+    return q4_0_block_ref(src, dst);
+  case BlockType::Q8_0:
+    return q8_0_block_ref(src, dst);
+  case BlockType::Q4_K:
+    return q4_k_block_ref(src, dst);
+  case BlockType::Q6_K:
+    return q6_k_block_ref(src, dst);
+  }
+}
+
+void quantize_int8_ref(const float *src, size_t n, int8_t *q,
+                       float *scales) {
+  for (size_t g = 0; g * 32 < n; ++g)
+    quantize_int8_group_ref(src + g * 32, std::min<size_t>(32, n - g * 32),
+                            q + g * 32, scales + g);
+}
+
+void quantize_int4_ref(const float *src, size_t n, uint8_t *packed,
+                       float *scales) {
+  for (size_t g = 0; g * 32 < n; ++g)
+    quantize_int4_group_ref(src + g * 32, std::min<size_t>(32, n - g * 32),
+                            packed + g * 16, scales + g);
+}
+
+} // namespace gcore::inference::quant
@@ -1,6 +1,7 @@
 #include "gcore/inference/layer_trace.hpp"
 
 #include "gcore/inference/d2h_safe.hpp"
+#include "gcore/inference/trace_sink.hpp"
 
 #include <algorithm>
 #include <cmath>
@@ -180,7 +181,7 @@ void LayerTracer::init_from_env(const ModelConfig &config) {
   }
 
   if (!cfg_.out_path.empty()) {
-    out_.open(cfg_.out_path, std::ios::out | std::ios::trunc);
+    sink_ = trace_sink(cfg_.out_path, /*truncate=*/true);
   }
 }
 
@@ -235,8 +236,8 @@ void LayerTracer::trace_tensor(const char *tag, int step, int layer,
       << ",\"mean\":" << s.mean << ",\"nan\":" << s.nan
       << ",\"inf\":" << s.inf << "}";
 
-  if (out_.is_open()) {
-    out_ << oss.str() << "\n";
+  if (sink_) {
+    sink_->write_line(oss.str());
   } else {
     std::cout << oss.str() << "\n";
   }
@@ -279,8 +280,8 @@ void LayerTracer::trace_tensor_f16(const char *tag, int step, int layer,
       << ",\"mean\":" << s.mean << ",\"nan\":" << s.nan
       << ",\"inf\":" << s.inf << "}";
 
-  if (out_.is_open()) {
-    out_ << oss.str() << "\n";
+  if (sink_) {
+    sink_->write_line(oss.str());
   } else {
     std::cout << oss.str() << "\n";
   }
@@ -298,8 +299,9 @@ void layer_trace_emit_step_header(int step, size_t pos_id, size_t seq_len,
   const char *layers = std::getenv("GRETA_TRACE_LAYER_LAYERS");
   const char *points = std::getenv("GRETA_TRACE_LAYER_POINTS");
 
-  std::ofstream f(out, std::ios::out | std::ios::app);
-  if (!f.is_open())
+  // Same process-wide sink as LayerTracer, so headers and tensors stay ordered
+  TraceSink *sink = trace_sink(out);
+  if (!sink)
     return;
 
   std::ostringstream oss;
@@ -316,7 +318,7 @@ void layer_trace_emit_step_header(int step, size_t pos_id, size_t seq_len,
       << ",\"layers\":\"" << (layers ? layers : "") << "\""
       << ",\"points\":\"" << (points ? points : "") << "\""
       << "}";
-  f << oss.str() << "\n";
+  sink->write_line(oss.str());
 }
 
 } // namespace gcore::inference
@@ -0,0 +1,241 @@
+#include "gcore/inference/load_pipeline.hpp"
+
+#include <algorithm>
+#include <chrono>
+#include <cstdlib>
+#include <string>
+
+namespace gcore::inference {
+
+static uint64_t mono_ns() {
+  return static_cast<uint64_t>(
+      std::chrono::duration_cast<std::chrono::nanoseconds>(
+          std::chrono::steady_clock::now().time_since_epoch())
+          .count());
+}
+
+static double since_s(uint64_t t0) {
+  return static_cast<double>(mono_ns() - t0) * 1e-9;
+}
+
+static long env_long(const char *name) {
+  const char *v = std::getenv(name);
+  return v ? std::strtol(v, nullptr, 10) : 0;
+}
+
+size_t PackedTensor::host_bytes() const {
+  size_t n = 0;
+  for (const Part *p : {&weights, &scales, &head_scales})
+    if (p->owner)
+      n += p->bytes;
+  return n;
+}
+
+LoadPipelineOptions LoadPipelineOptions::from_env() {
+  LoadPipelineOptions o;
+  const unsigned hw = std::max(1u, std::thread::hardware_concurrency());
+  o.converters = static_cast<int>(std::min(4u, hw));
+  if (const long n = env_long("GRETA_LOAD_THREADS"); n > 0)
+    o.converters = static_cast<int>(n);
+  o.max_inflight = 2 * static_cast<size_t>(o.converters) + 2;
+  if (const long n = env_long("GRETA_LOAD_INFLIGHT"); n > 0)
+    o.max_inflight = static_cast<size_t>(n);
+  if (const long mb = env_long("GRETA_LOAD_INFLIGHT_MB"); mb > 0)
+    o.max_inflight_bytes = static_cast<size_t>(mb) << 20;
+  return o;
+}
+
+LoadPipeline::LoadPipeline(LoadPipelineOptions options) : opt_(options) {
+  opt_.converters = std::max(1, opt_.converters);
+  opt_.max_inflight = std::max<size_t>(1, opt_.max_inflight);
+}
+
+LoadPipeline::~LoadPipeline() { cancel(); }
+
+std::unique_ptr<LoadPipeline> LoadPipeline::completed(size_t n) {
+  auto p = std::make_unique<LoadPipeline>();
+  p->n_ = n;
+  p->started_ = true;
+  p->read_done_ = p->next_convert_ = p->uploaded_ = n;
+  p->stats_.items = p->stats_.uploaded = n;
+  return p;
+}
+
+bool LoadPipeline::start(size_t n, LoadStages stages, std::string *err) {
+  if (started_ || !stages.convert || !stages.upload) {
+    if (err)
+      *err = started_ ? "load pipeline already started"
+                      : "load pipeline needs convert and upload stages";
+    return false;
+  }
+  started_ = true;
+  stages_ = std::move(stages);
+  n_ = n;
+  slots_.resize(n);
+  converted_.assign(n, 0);
+  stats_.items = n;
+  t_start_ = mono_ns();
+
+  // Hilos al final: todo el estado ya está listo
+  const size_t converters =
+      std::min<size_t>(opt_.converters, std::max<size_t>(n, 1));
+  stats_.converters = static_cast<int>(converters);
+  threads_.emplace_back(&LoadPipeline::reader, this);
+  for (size_t c = 0; c < converters; ++c)
+    threads_.emplace_back(&LoadPipeline::converter, this);
+  threads_.emplace_back(&LoadPipeline::uploader, this);
+  return true;
+}
+
+void LoadPipeline::fail(std::string e) {
+  if (!failed_) {
+    failed_ = true;
+    error_ = std::move(e);
+  }
+  cv_.notify_all();
+}
+
+// Lectura en orden, como mucho max_inflight por delante del uploader
+void LoadPipeline::reader() {
+  for (size_t i = 0; i < n_; ++i) {
+    {
+      std::unique_lock<std::mutex> lk(mu_);
+      cv_.wait(lk, [&] {
+        return stopped() || i < uploaded_ + opt_.max_inflight;
+      });
+      if (stopped())
+        return;
+    }
+    std::string e;
+    const uint64_t t0 = mono_ns();
+    const bool ok = !stages_.read || stages_.read(i, &e);
+    std::lock_guard<std::mutex> lk(mu_);
+    stats_.read_s += since_s(t0);
+    if (!ok) {
+      fail(e.empty() ? "read failed" : e);
+      return;
+    }
+    read_done_ = i + 1;
+    stats_.peak_inflight =
+        std::max(stats_.peak_inflight, read_done_ - uploaded_);
+    cv_.notify_all();
+  }
+}
+
+// Los conversores toman índices en orden; con max_inflight_bytes pendientes
+// de subida sólo avanza el siguiente a subir (evita el bloqueo mutuo)
+void LoadPipeline::converter() {
+  if (stages_.converter_init)
+    stages_.converter_init();
+  for (;;) {
+    size_t i;
+    {
+      std::unique_lock<std::mutex> lk(mu_);
+      cv_.wait(lk, [&] {
+        return stopped() || next_convert_ >= n_ ||
+               (next_convert_ < read_done_ &&
+                (held_bytes_ < opt_.max_inflight_bytes ||
+                 next_convert_ == uploaded_));
+      });
+      if (stopped() || next_convert_ >= n_)
+        return;
+      i = next_convert_++;
+    }
+    PackedTensor packed;
+    std::string e;
+    const uint64_t t0 = mono_ns();
+    const bool ok = stages_.convert(i, packed, &e);
+    std::lock_guard<std::mutex> lk(mu_);
+    stats_.convert_s += since_s(t0);
+    if (!ok) {
+      fail(e.empty() ? "convert failed" : e);
+      return;
+    }
+    held_bytes_ += packed.host_bytes();
+    stats_.peak_host_bytes = std::max(stats_.peak_host_bytes, held_bytes_);
+    slots_[i] = std::move(packed);
+    converted_[i] = 1;
+    cv_.notify_all();
+  }
+}
+
+void LoadPipeline::uploader() {
+  if (stages_.uploader_init)
+    stages_.uploader_init();
+  for (size_t i = 0; i < n_; ++i) {
+    PackedTensor packed;
+    {
+      std::unique_lock<std::mutex> lk(mu_);
+      cv_.wait(lk, [&] { return stopped() || converted_[i]; });
+      if (stopped())
+        return;
+      packed = std::move(slots_[i]);
+    }
+    std::string e;
+    const uint64_t t0 = mono_ns();
+    const bool ok = stages_.upload(i, packed, &e);
+    const double sec = since_s(t0);
+    const size_t held = packed.host_bytes(), bytes = packed.bytes();
+    packed = PackedTensor(); // libera el host antes de avisar
+    std::lock_guard<std::mutex> lk(mu_);
+    stats_.upload_s += sec;
+    held_bytes_ -= held;
+    if (!ok) {
+      fail(e.empty() ? "upload failed" : e);
+      return;
+    }
+    stats_.bytes += bytes;
+    uploaded_ = i + 1;
+    stats_.uploaded = uploaded_;
+    cv_.notify_all();
+  }
+}
+
+bool LoadPipeline::wait(size_t count, std::string *err) {
+  count = std::min(count, n_);
+  std::unique_lock<std::mutex> lk(mu_);
+  cv_.wait(lk, [&] { return stopped() || uploaded_ >= count; });
+  if (uploaded_ >= count)
+    return true;
+  if (err)
+    *err = failed_ ? error_ : "load pipeline cancelled";
+  return false;
+}
+
+void LoadPipeline::join() {
+  for (std::thread &t : threads_)
+    if (t.joinable())
+      t.join();
+  threads_.clear();
+}
+
+bool LoadPipeline::finish(std::string *err) {
+  const bool ok = wait(n_, err);
+  join();
+  std::lock_guard<std::mutex> lk(mu_);
+  if (stats_.wall_s == 0 && t_start_)
+    stats_.wall_s = since_s(t_start_);
+  return ok;
+}
+
+void LoadPipeline::cancel() {
+  {
+    std::lock_guard<std::mutex> lk(mu_);
+    if (uploaded_ < n_)
+      cancelled_ = true;
+    cv_.notify_all();
+  }
+  join();
+}
+
+size_t LoadPipeline::uploaded() const {
+  std::lock_guard<std::mutex> lk(mu_);
+  return uploaded_;
+}
+
+LoadPipelineStats LoadPipeline::stats() const {
+  std::lock_guard<std::mutex> lk(mu_);
+  return stats_;
+}
+
+} // namespace gcore::inference
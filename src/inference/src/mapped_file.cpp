@@ -0,0 +1,81 @@
+#include "gcore/inference/mapped_file.hpp"
+
+#include <cerrno>
+#include <cstring>
+
+#include <fcntl.h>
+#include <sys/mman.h>
+#include <sys/stat.h>
+#include <unistd.h>
+
+namespace gcore::inference {
+
+MappedFile::~MappedFile() { close(); }
+
+bool MappedFile::open(const std::string &path, std::string *err) {
+  close();
+  const int fd = ::open(path.c_str(), O_RDONLY | O_CLOEXEC);
+  if (fd < 0) {
+    if (err)
+      *err = "Cannot open " + path + ": " + std::strerror(errno);
+    return false;
+  }
+  struct stat st {};
+  if (::fstat(fd, &st) != 0 || st.st_size <= 0) {
+    if (err)
+      *err = "Cannot map " + path + ": empty or unreadable file";
+    ::close(fd);
+    return false;
+  }
+  void *p = ::mmap(nullptr, static_cast<size_t>(st.st_size), PROT_READ,
+                   MAP_PRIVATE, fd, 0);
+  // El mapping mantiene su propia referencia al archivo
+  ::close(fd);
+  if (p == MAP_FAILED) {
+    if (err)
+      *err = "mmap failed for " + path + ": " + std::strerror(errno);
+    return false;
+  }
+  data_ = static_cast<const uint8_t *>(p);
+  size_ = static_cast<size_t>(st.st_size);
+  return true;
+}
+
+void MappedFile::close() {
+  if (data_)
+    ::munmap(const_cast<uint8_t *>(data_), size_);
+  data_ = nullptr;
+  size_ = 0;
+}
+
+const uint8_t *MappedFile::view(size_t offset, size_t bytes) const {
+  if (!data_ || offset > size_ || bytes > size_ - offset)
+    return nullptr;
+  return data_ + offset;
+}
+
+void MappedFile::advise(size_t offset, size_t bytes, int advice) const {
+  if (!data_ || offset >= size_ || bytes == 0)
+    return;
+  if (bytes > size_ - offset)
+    bytes = size_ - offset;
+  // madvise exige dirección alineada a página
+  static const size_t page = static_cast<size_t>(::sysconf(_SC_PAGESIZE));
+  const size_t begin = offset & ~(page - 1);
+  const size_t end = offset + bytes;
+  (void)::madvise(const_cast<uint8_t *>(data_) + begin, end - begin, advice);
+}
+
+void MappedFile::advise_sequential() const {
+  advise(0, size_, MADV_SEQUENTIAL);
+}
+
+void MappedFile::advise_willneed(size_t offset, size_t bytes) const {
+  advise(offset, bytes, MADV_WILLNEED);
+}
+
+void MappedFile::advise_dontneed(size_t offset, size_t bytes) const {
+  advise(offset, bytes, MADV_DONTNEED);
+}
+
+} // namespace gcore::inference
@@ -0,0 +1,183 @@
+#include "gcore/inference/sampler.hpp"
+
+#include <algorithm>
+#include <array>
+#include <cmath>
+
+namespace gcore::inference {
+
+// Hasta este k la selección es un montículo de k elementos sobre una sola
+// pasada; por encima, nth_element sobre todo el vocabulario
+static constexpr size_t kHeapMaxK = 256;
+// Cubos de top-p sobre (max - logit) / T: kNucleusRange nats repartidos en
+// kNucleusBins (el último recoge los pesos < e^-32)
+static constexpr size_t kNucleusBins = 256;
+static constexpr float kNucleusRange = 32.0f;
+
+// Orden de los candidatos: logit mayor primero, id menor en empates
+template <typename T> static bool better(const T &a, const T &b) {
+  return a.logit > b.logit || (a.logit == b.logit && a.id < b.id);
+}
+
+// Los k mejores logits (sin NaN) en out, sin ordenar
+template <typename T>
+static void select_top(const float *logits, size_t vocab, size_t k,
+                       std::vector<T> &out) {
+  out.clear();
+  if (k == 0)
+    return;
+  if (k <= kHeapMaxK && k < vocab) {
+    // Montículo con el peor candidato arriba: casi todo se descarta con
+    // una comparación (en empate gana el id menor, que llegó antes)
+    out.reserve(k);
+    for (size_t i = 0; i < vocab; ++i) {
+      const float v = logits[i];
+      if (std::isnan(v))
+        continue;
+      if (out.size() < k) {
+        out.push_back({v, static_cast<int32_t>(i), 0.0f});
+        std::push_heap(out.begin(), out.end(), better<T>);
+      } else if (v > out.front().logit) {
+        std::pop_heap(out.begin(), out.end(), better<T>);
+        out.back() = {v, static_cast<int32_t>(i), 0.0f};
+        std::push_heap(out.begin(), out.end(), better<T>);
+      }
+    }
+    return;
+  }
+  out.resize(vocab);
+  size_t n = 0;
+  for (size_t i = 0; i < vocab; ++i) {
+    out[n] = {logits[i], static_cast<int32_t>(i), 0.0f};
+    n += !std::isnan(logits[i]);
+  }
+  out.resize(n);
+  if (k < n) {
+    std::nth_element(out.begin(), out.begin() + k, out.end(), better<T>);
+    out.resize(k);
+  }
+}
+
+Sampler::Sampler(int32_t seed) { reseed(seed); }
+
+void Sampler::reseed(int32_t seed) {
+  rng_.seed(seed < 0 ? static_cast<uint64_t>(std::random_device{}())
+                     : static_cast<uint64_t>(seed));
+}
+
+double Sampler::uniform() {
+  return static_cast<double>(rng_() >> 11) * 0x1.0p-53;
+}
+
+int32_t Sampler::argmax(const float *logits, size_t vocab) {
+  int32_t best = 0;
+  float best_v = 0.0f;
+  bool found = false;
+  for (size_t i = 0; i < vocab; ++i) {
+    const float v = logits[i];
+    if (found ? v > best_v : !std::isnan(v)) {
+      best = static_cast<int32_t>(i);
+      best_v = v;
+      found = true;
+    }
+  }
+  return best;
+}
+
+void Sampler::top_k(const float *logits, size_t vocab, size_t k,
+                    std::vector<std::pair<float, int32_t>> &out) {
+  std::vector<Candidate> top;
+  select_top(logits, vocab, std::min(k, vocab), top);
+  std::sort(top.begin(), top.end(), better<Candidate>);
+  out.clear();
+  for (const Candidate &c : top)
+    out.emplace_back(c.logit, c.id);
+}
+
+int32_t Sampler::sample(const float *logits, size_t vocab,
+                        const SamplingParams &params) {
+  if (vocab == 0)
+    return 0;
+  if (params.greedy || !(params.temperature > 0.0f) || params.top_k == 1)
+    return argmax(logits, vocab);
+
+  const size_t k = params.top_k > 0
+                       ? std::min(static_cast<size_t>(params.top_k), vocab)
+                       : vocab;
+  select_top(logits, vocab, k, cand_);
+  if (cand_.empty())
+    return 0;
+  float max_logit = cand_[0].logit;
+  for (const Candidate &c : cand_)
+    max_logit = std::max(max_logit, c.logit);
+  if (std::isinf(max_logit)) // +inf domina; todo -inf no tiene masa
+    return argmax(logits, vocab);
+
+  // Softmax sólo sobre los candidatos
+  const float inv_t = 1.0f / params.temperature;
+  double mass = 0.0;
+  for (Candidate &c : cand_) {
+    c.weight = std::exp((c.logit - max_logit) * inv_t);
+    mass += c.weight;
+  }
+
+  size_t n = cand_.size();
+  if (params.top_p > 0.0f && params.top_p < 1.0f) {
+    // Núcleo sin ordenar el vocabulario: masa por cubos de (max - logit) / T
+    // (monótonos con better()); los cubos antes del corte entran enteros y
+    // sólo el cubo del corte se ordena para truncarlo
+    const double target = params.top_p * mass;
+    const float scale = inv_t * (kNucleusBins / kNucleusRange);
+    auto bin = [&](const Candidate &c) {
+      return static_cast<size_t>(
+          std::min((max_logit - c.logit) * scale,
+                   static_cast<float>(kNucleusBins - 1)));
+    };
+    std::array<double, kNucleusBins> bin_mass{};
+    for (const Candidate &c : cand_)
+      bin_mass[bin(c)] += c.weight;
+    size_t cut = 0;
+    double prefix = 0.0;
+    while (cut + 1 < kNucleusBins && prefix + bin_mass[cut] < target)
+      prefix += bin_mass[cut++];
+
+    // Compactación sin saltos: cubos < cut delante, el del corte a tail_
+    tail_.resize(n);
+    size_t keep = 0, tail = 0;
+    for (size_t j = 0; j < n; ++j) {
+      const Candidate c = cand_[j];
+      const size_t b = bin(c);
+      cand_[keep] = c;
+      keep += b < cut;
+      tail_[tail] = c;
+      tail += b == cut;
+    }
+    std::sort(tail_.begin(), tail_.begin() + tail, better<Candidate>);
+    for (size_t j = 0; j < tail && prefix < target; ++j) {
+      cand_[keep++] = tail_[j];
+      prefix += tail_[j].weight;
+    }
+    n = keep;
+    mass = prefix;
+  }
+
+  double r = uniform() * mass;
+  size_t pick = 0;
+  for (size_t j = 0; j < n; ++j) {
+    if (cand_[j].weight <= 0.0f)
+      continue;
+    pick = j;
+    r -= cand_[j].weight;
+    if (r < 0.0)
+      break;
+  }
+  return cand_[pick].id;
+}
+
+void Sampler::sample_batch(const float *logits, size_t rows, size_t vocab,
+                           const SamplingParams &params, int32_t *out) {
+  for (size_t r = 0; r < rows; ++r)
+    out[r] = sample(logits + r * vocab, vocab, params);
+}
+
+} // namespace gcore::inference
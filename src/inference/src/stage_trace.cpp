@@ -1,13 +1,16 @@
 #include "gcore/inference/stage_trace.hpp"
 
 #include "gcore/inference/d2h_safe.hpp"
+#include "gcore/inference/trace_sink.hpp"
+#include "gcore/rt/span_tracer.hpp"
 
 #include <algorithm>
 #include <cmath>
 #include <cstdlib>
 #include <cstring>
-#include <fstream>
+#include <mutex>
 #include <sstream>
+#include <unordered_map>
 
 namespace gcore::inference {
 
@@ -112,10 +115,114 @@ static uint64_t hash_f32(const float *p, size_t n) {
 static void append_line(const char *path, const std::string &line) {
   if (!path || !*path)
     return;
-  std::ofstream f(path, std::ios::out | std::ios::app);
-  if (!f.is_open())
+  // Persistent buffered sink; opening the file per line dominated trace runs
+  TraceSink *sink = trace_sink(path);
+  if (!sink)
     return;
-  f << line << "\n";
+  sink->write_line(line);
+}
+
+// Binary format writer (GRETA_TRACE_STAGE_FORMAT=bin). One per process; the
+// string table lives as long as the sink, and its STRING records are kept as
+// shard preamble so every rotated shard is self-contained.
+struct StageBinWriter {
+  std::mutex mu;
+  bool started = false;
+  TraceSink *sink = nullptr;
+  std::unordered_map<std::string, uint32_t> ids;
+  std::string preamble;
+};
+
+static StageBinWriter &stage_bin_writer() {
+  static StageBinWriter w;
+  return w;
+}
+
+static void bin_append_record(std::string &out, StageBinRecordType type,
+                              const void *payload, size_t payload_bytes,
+                              const void *tail = nullptr,
+                              size_t tail_bytes = 0) {
+  StageBinRecordHeader h;
+  h.type = static_cast<uint32_t>(type);
+  h.payload_bytes = static_cast<uint32_t>(payload_bytes + tail_bytes);
+  out.append(reinterpret_cast<const char *>(&h), sizeof(h));
+  out.append(static_cast<const char *>(payload), payload_bytes);
+  if (tail_bytes)
+    out.append(static_cast<const char *>(tail), tail_bytes);
+}
+
+// Requires w.mu held.
+static bool bin_begin(StageBinWriter &w, const char *path) {
+  if (!w.started) {
+    w.started = true;
+    w.sink = trace_sink(path);
+    if (!w.sink)
+      return false;
+    char header[16] = {'G', 'R', 'E', 'T', 'A', 'S', 'T', 'G'};
+    const uint32_t version = kStageBinVersion;
+    std::memcpy(header + 8, &version, sizeof(version));
+    bin_append_record(w.preamble, StageBinRecordType::HEADER, header,
+                      sizeof(header));
+    w.ids.emplace("", 0);
+    w.sink->write(w.preamble.data(), w.preamble.size());
+    w.sink->set_shard_preamble(w.preamble);
+  }
+  return w.sink != nullptr;
+}
+
+// Requires w.mu held and bin_begin() == true.
+static uint32_t bin_intern(StageBinWriter &w, const char *str) {
+  if (!str || !*str)
+    return 0;
+  auto it = w.ids.find(str);
+  if (it != w.ids.end())
+    return it->second;
+  const uint32_t id = static_cast<uint32_t>(w.ids.size());
+  w.ids.emplace(str, id);
+  std::string rec;
+  bin_append_record(rec, StageBinRecordType::STRING, &id, sizeof(id), str,
+                    std::strlen(str));
+  w.sink->write(rec.data(), rec.size());
+  w.preamble += rec;
+  w.sink->set_shard_preamble(w.preamble);
+  return id;
+}
+
+static void bin_write_tensor(const char *path, const char *prompt_id,
+                             const char *phase, const char *point,
+                             const StageInputMeta *input_meta,
+                             StageTensorRecord &rec,
+                             const std::vector<float> &sample) {
+  auto &w = stage_bin_writer();
+  std::lock_guard<std::mutex> lk(w.mu);
+  if (!bin_begin(w, path))
+    return;
+  rec.prompt_id = bin_intern(w, prompt_id);
+  rec.phase_id = bin_intern(w, phase);
+  rec.point_id = bin_intern(w, point);
+  if (input_meta) {
+    rec.src_kind_id = bin_intern(w, input_meta->src_kind);
+    rec.route_id = bin_intern(w, input_meta->route);
+  }
+  std::string out;
+  out.reserve(sizeof(StageBinRecordHeader) + sizeof(rec) +
+              sample.size() * sizeof(float));
+  bin_append_record(out, StageBinRecordType::TENSOR, &rec, sizeof(rec),
+                    sample.data(), sample.size() * sizeof(float));
+  w.sink->write(out.data(), out.size());
+}
+
+static void bin_write_logits(const char *path, const char *prompt_id,
+                             const char *phase, StageLogitsRecord &rec) {
+  auto &w = stage_bin_writer();
+  std::lock_guard<std::mutex> lk(w.mu);
+  if (!bin_begin(w, path))
+    return;
+  rec.prompt_id = bin_intern(w, prompt_id);
+  rec.phase_id = bin_intern(w, phase);
+  std::string out;
+  bin_append_record(out, StageBinRecordType::LOGITS, &rec, sizeof(rec));
+  w.sink->write(out.data(), out.size());
 }
 
 StageTraceConfig stage_trace_config() {
@@ -134,6 +241,9 @@ StageTraceConfig stage_trace_config() {
     const char *dbg = std::getenv("GRETA_TRACE_STAGE_DEBUG_INPUT");
     if (dbg && (dbg[0] == '1' || dbg[0] == 'y' || dbg[0] == 'Y'))
       cfg.debug_input = true;
+    const char *fmt = std::getenv("GRETA_TRACE_STAGE_FORMAT");
+    if (fmt && (std::strcmp(fmt, "bin") == 0 || std::strcmp(fmt, "binary") == 0))
+      cfg.binary = true;
     const char *s = std::getenv("GRETA_TRACE_STAGE_SAMPLE");
     if (s && *s) {
       char *e = nullptr;
@@ -210,6 +320,13 @@ void stage_trace_tensor(const char *point, const char *phase,
     return;
   if (!base || stride_elems == 0)
     return;
+  // Volcado sincrónico (D2H + escritura): visible en la traza de spans
+  gcore::rt::TraceScope span(
+      "stage_trace.tensor", "trace",
+      gcore::rt::SpanTracer::enabled()
+          ? gcore::rt::SpanTracer::instance().intern(point)
+          : nullptr,
+      layer);
 
   size_t offset_elems = token_index * stride_elems;
   const float *ptr = base + offset_elems;
@@ -238,6 +355,45 @@ void stage_trace_tensor(const char *point, const char *phase,
     }
   }
 
+  uint32_t final_token_id = (input_meta ? input_meta->token_id : 0);
+  if (final_token_id == 0 && debug_token_id != 0)
+    final_token_id = debug_token_id;
+
+  if (cfg.binary) {
+    StageTensorRecord rec;
+    rec.token_index = token_index;
+    rec.stride_elems = stride_elems;
+    rec.ptr = reinterpret_cast<uintptr_t>(base);
+    rec.offset_bytes = offset_elems * sizeof(float);
+    rec.hash = hash;
+    rec.nz_count = stats.nz_count;
+    rec.layer = static_cast<int32_t>(layer);
+    rec.step = step;
+    rec.pos_id = pos_id;
+    rec.seq_len = seq_len;
+    rec.tokens_total = tokens_total;
+    rec.sample_n = sample_n;
+    rec.nan = stats.nan;
+    rec.inf = stats.inf;
+    rec.min = stats.min;
+    rec.max = stats.max;
+    rec.mean = stats.mean;
+    rec.abs_sum = stats.abs_sum;
+    if (input_meta) {
+      rec.flags |= 1u;
+      rec.in_offset_bytes = input_meta->offset_bytes;
+      rec.in_alloc_bytes = input_meta->alloc_bytes;
+      rec.token_index_used = input_meta->token_index_used;
+      rec.prompt_tokens = input_meta->prompt_tokens;
+      rec.kv_pos = input_meta->kv_pos;
+      rec.decode_step = input_meta->decode_step;
+      rec.token_id = final_token_id;
+    }
+    bin_write_tensor(cfg.out_path, prompt_id, phase, point, input_meta, rec,
+                     host);
+    return;
+  }
+
   std::ostringstream oss;
   oss << "{\"event\":\"stage_trace\"";
   if (prompt_id && *prompt_id)
@@ -263,10 +419,6 @@ void stage_trace_tensor(const char *point, const char *phase,
   }
   oss << "]";
 
-  uint32_t final_token_id = (input_meta ? input_meta->token_id : 0);
-  if (final_token_id == 0 && debug_token_id != 0)
-    final_token_id = debug_token_id;
-
   if (input_meta) {
     const char *kind = input_meta->src_kind ? input_meta->src_kind : "";
     oss << ",\"src_kind\":\"" << kind << "\""
@@ -294,6 +446,34 @@ void stage_trace_logits(const char *phase, const char *prompt_id, uint32_t step,
     return;
   if (!stage_trace_point_enabled("logits"))
     return;
+  gcore::rt::TraceScope span(
+      "stage_trace.logits", "trace",
+      gcore::rt::SpanTracer::enabled()
+          ? gcore::rt::SpanTracer::instance().intern(phase)
+          : nullptr,
+      step);
+
+  if (cfg.binary) {
+    StageLogitsRecord rec;
+    rec.hash = stats.hash;
+    rec.vocab = stats.vocab;
+    rec.logits_ptr = stats.logits_ptr;
+    rec.logits_offset_bytes = stats.logits_offset_bytes;
+    rec.step = step;
+    rec.pos_id = pos_id;
+    rec.seq_len = seq_len;
+    rec.tokens_total = tokens_total;
+    rec.min = stats.min;
+    rec.max = stats.max;
+    rec.mean = stats.mean;
+    rec.top1_id = stats.top1_id;
+    rec.top1_logit = stats.top1_logit;
+    rec.top2_id = stats.top2_id;
+    rec.top2_logit = stats.top2_logit;
+    rec.gap = stats.gap;
+    bin_write_logits(cfg.out_path, prompt_id, phase, rec);
+    return;
+  }
 
   std::ostringstream oss;
   oss << "{\"event\":\"stage_logits\"";
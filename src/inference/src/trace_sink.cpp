@@ -0,0 +1,237 @@
+#include "gcore/inference/trace_sink.hpp"
+
+#include <cerrno>
+#include <cstdlib>
+#include <cstring>
+#include <map>
+#include <memory>
+
+#include <sys/stat.h>
+
+namespace gcore::inference {
+
+static size_t env_size(const char *k, size_t def) {
+  const char *v = std::getenv(k);
+  if (!v || !*v)
+    return def;
+  char *e = nullptr;
+  unsigned long long val = std::strtoull(v, &e, 10);
+  if (e == v)
+    return def;
+  return static_cast<size_t>(val);
+}
+
+TraceSinkOptions trace_sink_options_from_env() {
+  static TraceSinkOptions opts;
+  static bool initialized = false;
+  if (!initialized) {
+    opts.buffer_bytes = env_size("GRETA_TRACE_BUFFER_KB", 1024) * 1024;
+    if (opts.buffer_bytes == 0)
+      opts.buffer_bytes = 1;
+    opts.flush_interval_ms =
+        static_cast<uint32_t>(env_size("GRETA_TRACE_FLUSH_MS", 1000));
+    const char *async = std::getenv("GRETA_TRACE_ASYNC");
+    opts.async = async && (async[0] == '1' || async[0] == 'y' || async[0] == 'Y');
+    opts.rotate_bytes = env_size("GRETA_TRACE_ROTATE_MB", 0) * 1024 * 1024;
+    initialized = true;
+  }
+  return opts;
+}
+
+TraceSink::TraceSink(std::string path, const TraceSinkOptions &opts,
+                     bool truncate)
+    : path_(std::move(path)), opts_(opts) {
+  // Rotated shards follow the base file: truncating also removes the
+  // <path>.N left by an earlier run, appending resumes at the last shard
+  uint32_t last = 0;
+  struct stat st;
+  while (::stat(shard_path(last + 1).c_str(), &st) == 0 &&
+         S_ISREG(st.st_mode))
+    ++last;
+  if (truncate) {
+    for (uint32_t i = 1; i <= last; ++i)
+      std::remove(shard_path(i).c_str());
+    last = 0;
+  }
+  file_ = std::fopen(shard_path(last).c_str(), truncate ? "w" : "a");
+  if (!file_)
+    return;
+  open_ = true;
+  shard_ = last;
+  if (!truncate && std::fseek(file_, 0, SEEK_END) == 0) {
+    const long size = std::ftell(file_);
+    bytes_in_shard_ = size > 0 ? static_cast<uint64_t>(size) : 0;
+  }
+  // Lines are batched in buf_; stdio buffering would only add a copy
+  std::setvbuf(file_, nullptr, _IONBF, 0);
+  buf_.reserve(opts_.buffer_bytes + 4096);
+  spare_.reserve(opts_.buffer_bytes + 4096);
+  last_flush_ = std::chrono::steady_clock::now();
+  if (opts_.async)
+    writer_ = std::thread(&TraceSink::writer_loop, this);
+}
+
+TraceSink::~TraceSink() {
+  if (writer_.joinable()) {
+    {
+      std::lock_guard<std::mutex> lk(mu_);
+      stop_ = true;
+    }
+    cv_.notify_all();
+    writer_.join();
+  }
+  drain();
+  if (file_)
+    std::fclose(file_);
+}
+
+void TraceSink::write_line(std::string_view line) { append(line, "\n"); }
+
+void TraceSink::write(const void *data, size_t size) {
+  append(std::string_view(static_cast<const char *>(data), size), {});
+}
+
+void TraceSink::set_shard_preamble(std::string preamble) {
+  std::lock_guard<std::mutex> io(io_mu_);
+  preamble_ = std::move(preamble);
+}
+
+void TraceSink::append(std::string_view a, std::string_view b) {
+  // open_ no cambia tras el constructor; file_ sólo se toca bajo io_mu_
+  if (!open_)
+    return;
+  bool write_now = false;
+  {
+    std::lock_guard<std::mutex> lk(mu_);
+    buf_.append(a.data(), a.size());
+    buf_.append(b.data(), b.size());
+    const bool full = buf_.size() >= opts_.buffer_bytes;
+    const bool due =
+        opts_.flush_interval_ms != 0 &&
+        std::chrono::steady_clock::now() - last_flush_ >=
+            std::chrono::milliseconds(opts_.flush_interval_ms);
+    if (opts_.async) {
+      if (full || due)
+        cv_.notify_one();
+      // Backpressure: writer thread fell behind, write from the caller
+      write_now = buf_.size() >= 4 * opts_.buffer_bytes;
+    } else {
+      write_now = full || due;
+    }
+  }
+  if (write_now)
+    drain();
+}
+
+void TraceSink::flush() { drain(); }
+
+void TraceSink::drain() {
+  std::lock_guard<std::mutex> io(io_mu_);
+  {
+    std::lock_guard<std::mutex> lk(mu_);
+    spare_.swap(buf_);
+    last_flush_ = std::chrono::steady_clock::now();
+  }
+  if (!spare_.empty()) {
+    write_out(spare_);
+    spare_.clear();
+  }
+}
+
+void TraceSink::write_out(const std::string &chunk) {
+  if (!file_)
+    return;
+  std::fwrite(chunk.data(), 1, chunk.size(), file_);
+  bytes_in_shard_ += chunk.size();
+  bytes_total_ += chunk.size();
+  // Chunks hold whole lines/records, so shards never split one
+  if (opts_.rotate_bytes != 0 && !rotate_failed_ &&
+      bytes_in_shard_ >= opts_.rotate_bytes)
+    rotate();
+}
+
+void TraceSink::rotate() {
+  // The next shard is opened before closing the current one: if it cannot
+  // be created, rotation stops and writes keep going to the current shard
+  const std::string next_path = shard_path(shard_ + 1);
+  std::FILE *next = std::fopen(next_path.c_str(), "w");
+  if (!next) {
+    rotate_failed_ = true;
+    std::fprintf(stderr,
+                 "[GRETA_TRACE] Cannot open %s (%s); rotation disabled, "
+                 "writing on to %s\n",
+                 next_path.c_str(), std::strerror(errno),
+                 shard_path(shard_).c_str());
+    return;
+  }
+  std::fclose(file_);
+  file_ = next;
+  ++shard_;
+  bytes_in_shard_ = 0;
+  std::setvbuf(file_, nullptr, _IONBF, 0);
+  if (!preamble_.empty()) {
+    std::fwrite(preamble_.data(), 1, preamble_.size(), file_);
+    bytes_in_shard_ += preamble_.size();
+    bytes_total_ += preamble_.size();
+  }
+}
+
+std::string TraceSink::shard_path(uint32_t idx) const {
+  if (idx == 0)
+    return path_;
+  return path_ + "." + std::to_string(idx);
+}
+
+void TraceSink::writer_loop() {
+  std::unique_lock<std::mutex> lk(mu_);
+  auto ready = [this] { return stop_ || buf_.size() >= opts_.buffer_bytes; };
+  while (!stop_) {
+    if (opts_.flush_interval_ms != 0)
+      cv_.wait_for(lk, std::chrono::milliseconds(opts_.flush_interval_ms),
+                   ready);
+    else
+      cv_.wait(lk, ready);
+    lk.unlock();
+    drain();
+    lk.lock();
+  }
+}
+
+namespace {
+
+struct TraceSinkRegistry {
+  std::mutex mu;
+  std::map<std::string, std::unique_ptr<TraceSink>> sinks;
+};
+
+// Function-local static: destroyed (and every sink flushed) at process exit
+TraceSinkRegistry &registry() {
+  static TraceSinkRegistry r;
+  return r;
+}
+
+} // namespace
+
+TraceSink *trace_sink(const std::string &path, bool truncate) {
+  if (path.empty())
+    return nullptr;
+  auto &reg = registry();
+  std::lock_guard<std::mutex> lk(reg.mu);
+  auto it = reg.sinks.find(path);
+  if (it == reg.sinks.end()) {
+    it = reg.sinks
+             .emplace(path, std::make_unique<TraceSink>(
+                                path, trace_sink_options_from_env(), truncate))
+             .first;
+  }
+  return it->second->is_open() ? it->second.get() : nullptr;
+}
+
+void trace_sinks_flush_all() {
+  auto &reg = registry();
+  std::lock_guard<std::mutex> lk(reg.mu);
+  for (auto &kv : reg.sinks)
+    kv.second->flush();
+}
+
+} // namespace gcore::inference
@@ -0,0 +1,631 @@
+#include "gcore/inference/weight_cache.hpp"
+#include "gcore/inference/mapped_file.hpp"
+#include "gcore/rt/span_tracer.hpp"
+
+#include <algorithm>
+#include <array>
+#include <cerrno>
+#include <cstdio>
+#include <cstdlib>
+#include <cstring>
+#include <ctime>
+#include <filesystem>
+#include <iostream>
+
+#include <fcntl.h>
+#include <sys/stat.h>
+#include <unistd.h>
+
+namespace gcore::inference {
+
+namespace {
+
+namespace fs = std::filesystem;
+
+constexpr char kBlobMagic[8] = {'G', 'R', 'E', 'T', 'A', 'W', 'C', 'H'};
+constexpr uint64_t kBlobAlign = 4096;
+constexpr size_t kCopyChunkBytes = 64u << 20;
+constexpr uint32_t kMaxNameLen = 4096;
+constexpr int64_t kStaleTmpSeconds = 3600;
+const char *const kQuantNames[] = {"fp16", "int8", "int4"};
+
+// Little-endian, 64 bytes; el índice va al final y el header se escribe
+// el último, justo antes del rename
+struct BlobHeader {
+  char magic[8];
+  uint32_t version;
+  uint32_t quant; // kQuantNames
+  uint64_t model_fp;
+  uint64_t loads_sig;
+  uint64_t n_entries;
+  uint64_t index_offset;
+  uint64_t index_bytes;
+  uint64_t index_hash;
+};
+static_assert(sizeof(BlobHeader) == 64, "blob header layout");
+
+struct BlobSlot {
+  uint64_t offset;
+  uint64_t bytes;
+  uint64_t hash;
+  uint32_t dtype; // rt::GretaDataType
+  uint32_t present;
+};
+
+// Un registro por TensorLoad, en el orden del lote; slots = buffer, scales
+// y head_scales. Le sigue el nombre, con padding a 8 bytes
+struct BlobRecord {
+  BlobSlot slot[3];
+  float zero_point;
+  uint32_t group_size;
+  uint32_t num_heads;
+  uint32_t flags;
+  uint32_t format; // TensorLoad::Format
+  uint32_t name_len;
+};
+static_assert(sizeof(BlobRecord) == 120, "blob record layout");
+
+constexpr uint32_t kHasQuantInfo = 1;
+
+// Hash por palabras de 64 bits: varios GB/s, suficiente para detectar
+// blobs corruptos (no es criptográfico)
+uint64_t hash_bytes(const void *data, size_t n,
+                    uint64_t h = 0xcbf29ce484222325ull) {
+  constexpr uint64_t kMul = 0x9E3779B97F4A7C15ull;
+  const auto *p = static_cast<const uint8_t *>(data);
+  size_t i = 0;
+  for (; i + 8 <= n; i += 8) {
+    uint64_t w;
+    std::memcpy(&w, p + i, 8);
+    h = (h ^ w) * kMul;
+    h ^= h >> 32;
+  }
+  for (; i < n; ++i) {
+    h = (h ^ p[i]) * kMul;
+    h ^= h >> 32;
+  }
+  return h;
+}
+
+uint32_t quant_mode(const std::vector<TensorLoad> &loads) {
+  uint32_t mode = 0;
+  for (const auto &ld : loads) {
+    if (ld.format == TensorLoad::Format::INT4)
+      return 2;
+    if (ld.format == TensorLoad::Format::INT8)
+      mode = 1;
+  }
+  return mode;
+}
+
+uint64_t loads_signature(const std::vector<TensorLoad> &loads) {
+  uint64_t h = hash_bytes("greta-wcache-loads", 18);
+  for (const auto &ld : loads) {
+    h = hash_bytes(ld.name.data(), ld.name.size(), h);
+    const uint32_t f = static_cast<uint32_t>(ld.format);
+    h = hash_bytes(&f, sizeof(f), h);
+  }
+  return h;
+}
+
+uint64_t pad_to(uint64_t v, uint64_t a) { return (v + a - 1) / a * a; }
+
+int64_t mtime_of(const std::string &path, uint64_t *size = nullptr) {
+  struct stat st {};
+  if (::stat(path.c_str(), &st) != 0)
+    return 0;
+  if (size)
+    *size = static_cast<uint64_t>(st.st_size);
+  return static_cast<int64_t>(st.st_mtime);
+}
+
+// Buffers que el loader dejó asociados a ld: scales/head_scales solo si
+// quant_info apunta a ellos (el dummy sh_wo del FFN no se guarda)
+std::array<const rt::hip::Buffer *, 3> slot_buffers(const TensorLoad &ld) {
+  const rt::GretaQuantInfo q = ld.buffer->quant_info();
+  std::array<const rt::hip::Buffer *, 3> b{ld.buffer, nullptr, nullptr};
+  if (ld.scales && q.scales && q.scales == ld.scales->data())
+    b[1] = ld.scales;
+  if (ld.head_scales && q.head_scales &&
+      q.head_scales == ld.head_scales->data())
+    b[2] = ld.head_scales;
+  return b;
+}
+
+struct ParsedBlob {
+  MappedFile file;
+  BlobHeader header{};
+  std::vector<BlobRecord> records;
+  std::vector<std::string> names;
+};
+
+bool parse_blob(const std::string &path, ParsedBlob &b, std::string *err) {
+  auto fail = [&](const std::string &why) {
+    if (err)
+      *err = why;
+    return false;
+  };
+  if (!b.file.open(path, err))
+    return false;
+  const size_t size = b.file.size();
+  if (size < sizeof(BlobHeader))
+    return fail("truncated header");
+  std::memcpy(&b.header, b.file.data(), sizeof(BlobHeader));
+  const BlobHeader &h = b.header;
+  if (std::memcmp(h.magic, kBlobMagic, sizeof(kBlobMagic)) != 0)
+    return fail("bad magic");
+  if (h.version != kWeightCacheLayoutVersion)
+    return fail("layout version " + std::to_string(h.version) +
+                " (expected " + std::to_string(kWeightCacheLayoutVersion) +
+                ")");
+  if (h.quant > 2)
+    return fail("bad quant mode");
+  if (h.index_offset < kBlobAlign || h.index_offset > size ||
+      h.index_bytes != size - h.index_offset)
+    return fail("index outside the file (truncated blob?)");
+  const uint8_t *idx = b.file.data() + h.index_offset;
+  if (hash_bytes(idx, h.index_bytes) != h.index_hash)
+    return fail("index hash mismatch");
+
+  size_t pos = 0;
+  for (uint64_t i = 0; i < h.n_entries; ++i) {
+    BlobRecord r;
+    if (h.index_bytes - pos < sizeof(r))
+      return fail("index truncated");
+    std::memcpy(&r, idx + pos, sizeof(r));
+    pos += sizeof(r);
+    const size_t name_bytes = pad_to(r.name_len, 8);
+    if (r.name_len > kMaxNameLen || h.index_bytes - pos < name_bytes)
+      return fail("bad tensor name in index");
+    for (const BlobSlot &s : r.slot)
+      if (s.present && (s.offset % kBlobAlign != 0 || s.offset < kBlobAlign ||
+                        s.offset > h.index_offset ||
+                        s.bytes > h.index_offset - s.offset))
+        return fail("buffer outside the data area");
+    b.names.emplace_back(reinterpret_cast<const char *>(idx + pos),
+                         r.name_len);
+    b.records.push_back(r);
+    pos += name_bytes;
+  }
+  if (pos != h.index_bytes)
+    return fail("trailing bytes in index");
+  return true;
+}
+
+bool check_hashes(const ParsedBlob &b, std::string *err) {
+  for (size_t i = 0; i < b.records.size(); ++i)
+    for (const BlobSlot &s : b.records[i].slot)
+      if (s.present &&
+          hash_bytes(b.file.data() + s.offset, s.bytes) != s.hash) {
+        if (err)
+          *err = "data hash mismatch in " + b.names[i];
+        return false;
+      }
+  return true;
+}
+
+} // namespace
+
+WeightCacheConfig WeightCacheConfig::from_env() {
+  WeightCacheConfig c;
+  if (const char *v = std::getenv("GRETA_WEIGHT_CACHE_DIR"))
+    c.dir = v;
+  if (const char *v = std::getenv("GRETA_WEIGHT_CACHE_MAX_GB")) {
+    const double gb = std::strtod(v, nullptr);
+    if (gb > 0)
+      c.max_bytes = static_cast<uint64_t>(gb * (1ull << 30));
+  }
+  if (const char *v = std::getenv("GRETA_WEIGHT_CACHE_VERIFY"))
+    c.verify = std::string(v) == "1";
+  return c;
+}
+
+WeightCache::WeightCache(WeightCacheConfig config)
+    : config_(std::move(config)) {}
+
+bool WeightCache::fingerprint(const std::string &model_path, uint64_t &out,
+                              std::string *err) {
+  struct stat st {};
+  if (::stat(model_path.c_str(), &st) != 0 || !S_ISREG(st.st_mode)) {
+    if (err)
+      *err = model_path + " is not a regular file";
+    return false;
+  }
+  MappedFile mf;
+  if (!mf.open(model_path, err))
+    return false;
+  const uint64_t size = mf.size();
+  const int64_t mtime[2] = {static_cast<int64_t>(st.st_mtim.tv_sec),
+                            static_cast<int64_t>(st.st_mtim.tv_nsec)};
+  uint64_t h = hash_bytes(&size, sizeof(size));
+  h = hash_bytes(mtime, sizeof(mtime), h);
+  // Cabecera GGUF/safetensors completa, el final y 16 ventanas intermedias
+  auto sample = [&](uint64_t off, uint64_t bytes) {
+    off = std::min(off, size);
+    bytes = std::min(bytes, size - off);
+    h = hash_bytes(mf.data() + off, bytes, h);
+  };
+  sample(0, 4u << 20);
+  for (uint64_t i = 1; i <= 16; ++i)
+    sample(size / 17 * i, 64u << 10);
+  sample(size > (1u << 20) ? size - (1u << 20) : 0, 1u << 20);
+  out = h;
+  return true;
+}
+
+std::string WeightCache::blob_path(uint64_t model_fp,
+                                   const std::vector<TensorLoad> &loads) const {
+  char fp[17];
+  std::snprintf(fp, sizeof(fp), "%016llx",
+                static_cast<unsigned long long>(model_fp));
+  return (fs::path(config_.dir) /
+          (std::string(fp) + "-" + kQuantNames[quant_mode(loads)] + "-v" +
+           std::to_string(kWeightCacheLayoutVersion) + ".gwc"))
+      .string();
+}
+
+bool WeightCache::restore(const std::string &blob, uint64_t model_fp,
+                          const std::vector<TensorLoad> &loads,
+                          std::string *err) const {
+  rt::TraceScope span("load.cache_restore", "load", nullptr, loads.size());
+  ParsedBlob b;
+  if (!parse_blob(blob, b, err))
+    return false;
+  if (b.header.model_fp != model_fp ||
+      b.header.loads_sig != loads_signature(loads) ||
+      b.header.n_entries != loads.size()) {
+    if (err)
+      *err = "stale blob (model file or load list changed)";
+    return false;
+  }
+  for (size_t i = 0; i < loads.size(); ++i) {
+    const BlobRecord &r = b.records[i];
+    const TensorLoad &ld = loads[i];
+    if (b.names[i] != ld.name ||
+        r.format != static_cast<uint32_t>(ld.format) || !ld.buffer ||
+        (r.slot[1].present && !ld.scales) ||
+        (r.slot[2].present && !ld.head_scales)) {
+      if (err)
+        *err = "index does not match the load of " + ld.name;
+      return false;
+    }
+  }
+  if (config_.verify && !check_hashes(b, err))
+    return false;
+
+  b.file.advise_sequential();
+  for (size_t i = 0; i < loads.size(); ++i) {
+    const BlobRecord &r = b.records[i];
+    const TensorLoad &ld = loads[i];
+    rt::hip::Buffer *bufs[3] = {ld.buffer, ld.scales, ld.head_scales};
+    for (int s = 0; s < 3; ++s) {
+      const BlobSlot &slot = r.slot[s];
+      if (!slot.present)
+        continue;
+      if (!bufs[s]->allocate(slot.bytes, rt::hip::BufferUsage::DeviceOnly,
+                             static_cast<rt::GretaDataType>(slot.dtype),
+                             err) ||
+          !bufs[s]->copy_to_device(b.file.data() + slot.offset, slot.bytes,
+                                   err))
+        return false;
+    }
+    if (r.flags & kHasQuantInfo) {
+      rt::GretaQuantInfo q;
+      q.scales = r.slot[1].present ? ld.scales->data() : nullptr;
+      q.head_scales = r.slot[2].present ? ld.head_scales->data() : nullptr;
+      q.zero_point = r.zero_point;
+      q.group_size = r.group_size;
+      q.num_heads = r.num_heads;
+      ld.buffer->set_quant_info(q);
+    }
+  }
+  // mtime = último uso: evict() borra primero los menos usados
+  (void)::utimensat(AT_FDCWD, blob.c_str(), nullptr, 0);
+  return true;
+}
+
+bool WeightCache::store(const std::string &blob, uint64_t model_fp,
+                        const std::vector<TensorLoad> &loads,
+                        std::string *err) const {
+  rt::TraceScope span("load.cache_store", "load", nullptr, loads.size());
+  std::error_code ec;
+  fs::create_directories(fs::path(blob).parent_path(), ec);
+  const std::string tmp = blob + ".tmp." + std::to_string(::getpid());
+  std::FILE *f = std::fopen(tmp.c_str(), "wb");
+  auto fail = [&](const std::string &why) {
+    if (f)
+      std::fclose(f);
+    std::remove(tmp.c_str());
+    if (err)
+      *err = why;
+    return false;
+  };
+  if (!f)
+    return fail("cannot create " + tmp + ": " + std::strerror(errno));
+
+  static const uint8_t zeros[kBlobAlign] = {};
+  uint64_t pos = 0;
+  auto write = [&](const void *p, size_t n) {
+    pos += n;
+    return std::fwrite(p, 1, n, f) == n;
+  };
+  auto pad = [&](uint64_t a) { return write(zeros, pad_to(pos, a) - pos); };
+  if (!write(zeros, kBlobAlign)) // el header real se escribe al final
+    return fail("write failed");
+
+  std::vector<uint8_t> chunk;
+  std::vector<uint8_t> index;
+  for (const TensorLoad &ld : loads) {
+    if (!ld.buffer)
+      return fail("load of " + ld.name + " has no buffer");
+    BlobRecord r{};
+    const auto bufs = slot_buffers(ld);
+    for (int s = 0; s < 3; ++s) {
+      const rt::hip::Buffer *buf = bufs[s];
+      if (!buf || !buf->data())
+        continue;
+      BlobSlot &slot = r.slot[s];
+      slot.offset = pos;
+      slot.bytes = buf->size();
+      slot.dtype = static_cast<uint32_t>(buf->data_type());
+      slot.present = 1;
+      slot.hash = hash_bytes(nullptr, 0);
+      // Lectura del dispositivo por trozos (los tensores pasan de 500 MB)
+      chunk.resize(std::min<size_t>(kCopyChunkBytes, slot.bytes));
+      for (uint64_t off = 0; off < slot.bytes; off += chunk.size()) {
+        const size_t n = static_cast<size_t>(
+            std::min<uint64_t>(chunk.size(), slot.bytes - off));
+        std::string e;
+        if (!buf->copy_to_host_offset(chunk.data(), off, n, &e))
+          return fail(ld.name + ": " + e);
+        slot.hash = hash_bytes(chunk.data(), n, slot.hash);
+        if (!write(chunk.data(), n))
+          return fail("write failed");
+      }
+      if (!pad(kBlobAlign))
+        return fail("write failed");
+    }
+    const rt::GretaQuantInfo q = ld.buffer->quant_info();
+    if (q.scales || q.head_scales || q.group_size || q.num_heads ||
+        q.zero_point != 0.0f)
+      r.flags |= kHasQuantInfo;
+    r.zero_point = q.zero_point;
+    r.group_size = q.group_size;
+    r.num_heads = q.num_heads;
+    r.format = static_cast<uint32_t>(ld.format);
+    r.name_len = static_cast<uint32_t>(ld.name.size());
+    const auto *rp = reinterpret_cast<const uint8_t *>(&r);
+    index.insert(index.end(), rp, rp + sizeof(r));
+    index.insert(index.end(), ld.name.begin(), ld.name.end());
+    index.resize(pad_to(index.size(), 8), 0);
+  }
+
+  BlobHeader h{};
+  std::memcpy(h.magic, kBlobMagic, sizeof(kBlobMagic));
+  h.version = kWeightCacheLayoutVersion;
+  h.quant = quant_mode(loads);
+  h.model_fp = model_fp;
+  h.loads_sig = loads_signature(loads);
+  h.n_entries = loads.size();
+  h.index_offset = pos;
+  h.index_bytes = index.size();
+  h.index_hash = hash_bytes(index.data(), index.size());
+  if (!write(index.data(), index.size()) || std::fseek(f, 0, SEEK_SET) != 0 ||
+      std::fwrite(&h, sizeof(h), 1, f) != 1 || std::fflush(f) != 0 ||
+      ::fsync(::fileno(f)) != 0)
+    return fail("write failed: " + std::string(std::strerror(errno)));
+  std::fclose(f);
+  f = nullptr;
+  if (std::rename(tmp.c_str(), blob.c_str()) != 0)
+    return fail("rename to " + blob + " failed: " + std::strerror(errno));
+  return true;
+}
+
+bool WeightCache::validate(const std::string &blob, bool check_data,
+                           WeightCacheBlob *info, std::string *err) const {
+  WeightCacheBlob local;
+  WeightCacheBlob &out = info ? *info : local;
+  out = WeightCacheBlob{};
+  out.path = blob;
+  out.last_used = mtime_of(blob, &out.bytes);
+  ParsedBlob b;
+  out.valid = parse_blob(blob, b, &out.error) &&
+              (!check_data || check_hashes(b, &out.error));
+  if (b.file.is_open() && out.bytes >= sizeof(BlobHeader)) {
+    out.quant = b.header.quant <= 2 ? kQuantNames[b.header.quant] : "?";
+    out.tensors = b.header.n_entries;
+  }
+  if (!out.valid && err)
+    *err = out.error;
+  return out.valid;
+}
+
+std::vector<WeightCacheBlob> WeightCache::list() const {
+  std::vector<WeightCacheBlob> blobs;
+  std::error_code ec;
+  for (const auto &e : fs::directory_iterator(config_.dir, ec)) {
+    if (e.path().extension() != ".gwc")
+      continue;
+    WeightCacheBlob info;
+    validate(e.path().string(), false, &info, nullptr);
+    blobs.push_back(std::move(info));
+  }
+  std::sort(blobs.begin(), blobs.end(),
+            [](const WeightCacheBlob &a, const WeightCacheBlob &b) {
+              return a.last_used < b.last_used;
+            });
+  return blobs;
+}
+
+uint64_t WeightCache::evict(uint64_t max_bytes, const std::string &keep) const {
+  struct Entry {
+    std::string path;
+    uint64_t bytes;
+    int64_t mtime;
+  };
+  std::vector<Entry> blobs;
+  uint64_t total = 0, freed = 0;
+  const int64_t now = static_cast<int64_t>(std::time(nullptr));
+  std::error_code ec;
+  for (const auto &e : fs::directory_iterator(config_.dir, ec)) {
+    const std::string path = e.path().string();
+    const std::string name = e.path().filename().string();
+    uint64_t bytes = 0;
+    const int64_t mtime = mtime_of(path, &bytes);
+    if (name.find(".gwc.tmp.") != std::string::npos) {
+      // Temporales de escritores que murieron (timeouts de los executors)
+      if (now - mtime > kStaleTmpSeconds && std::remove(path.c_str()) == 0)
+        freed += bytes;
+    } else if (e.path().extension() == ".gwc") {
+      blobs.push_back({path, bytes, mtime});
+      total += bytes;
+    }
+  }
+  std::sort(blobs.begin(), blobs.end(), [](const Entry &a, const Entry &b) {
+    return a.mtime < b.mtime;
+  });
+  for (const Entry &b : blobs) {
+    if (total <= max_bytes)
+      break;
+    if (b.path == keep || std::remove(b.path.c_str()) != 0)
+      continue;
+    total -= b.bytes;
+    freed += b.bytes;
+    std::cout << "[GRETA_LOAD] Weight cache: evicted " << b.path << " ("
+              << b.bytes / (1024.0 * 1024.0) << " MB)" << std::endl;
+  }
+  return freed;
+}
+
+CachedWeightLoader::CachedWeightLoader(std::unique_ptr<WeightLoader> inner,
+                                       WeightCacheConfig config)
+    : inner_(std::move(inner)), cache_(std::move(config)) {}
+
+CachedWeightLoader::~CachedWeightLoader() = default;
+
+bool CachedWeightLoader::open(const std::string &path, std::string *err) {
+  if (!inner_->open(path, err))
+    return false;
+  std::string e;
+  has_fp_ = !cache_.config().dir.empty() &&
+            WeightCache::fingerprint(path, model_fp_, &e);
+  if (!has_fp_ && !e.empty())
+    std::cout << "[GRETA_LOAD] Weight cache disabled: " << e << std::endl;
+  return true;
+}
+
+std::vector<TensorInfo> CachedWeightLoader::list_tensors() const {
+  return inner_->list_tensors();
+}
+
+bool CachedWeightLoader::read_tensor_f32(const std::string &name,
+                                         std::vector<float> &out,
+                                         std::string *err) {
+  return inner_->read_tensor_f32(name, out, err);
+}
+
+bool CachedWeightLoader::read_tensor_fp16(const std::string &name,
+                                          std::vector<uint16_t> &out,
+                                          std::string *err) {
+  return inner_->read_tensor_fp16(name, out, err);
+}
+
+bool CachedWeightLoader::load_tensor(const std::string &name,
+                                     rt::hip::Buffer &buffer,
+                                     std::string *err) {
+  return inner_->load_tensor(name, buffer, err);
+}
+
+bool CachedWeightLoader::load_tensor_fp16(const std::string &name,
+                                          rt::hip::Buffer &buffer,
+                                          std::string *err) {
+  return inner_->load_tensor_fp16(name, buffer, err);
+}
+
+bool CachedWeightLoader::load_tensor_int8(const std::string &name,
+                                          rt::hip::Buffer &buffer,
+                                          rt::hip::Buffer &scales,
+                                          std::string *err) {
+  return inner_->load_tensor_int8(name, buffer, scales, err);
+}
+
+bool CachedWeightLoader::load_tensor_int4(const std::string &name,
+                                          rt::hip::Buffer &buffer,
+                                          rt::hip::Buffer &scales,
+                                          rt::hip::Buffer &head_scales,
+                                          std::string *err) {
+  return inner_->load_tensor_int4(name, buffer, scales, head_scales, err);
+}
+
+bool CachedWeightLoader::load_tensors(const std::vector<TensorLoad> &loads,
+                                      std::string *err) {
+  last_hit_ = false;
+  if (!has_fp_)
+    return inner_->load_tensors(loads, err);
+
+  const std::string blob = cache_.blob_path(model_fp_, loads);
+  const uint64_t t0 = rt::now_ns();
+  std::string why;
+  std::error_code ec;
+  if (fs::exists(blob, ec)) {
+    if (cache_.restore(blob, model_fp_, loads, &why)) {
+      last_hit_ = true;
+      std::cout << "[GRETA_LOAD] Weight cache hit: " << blob << " ("
+                << static_cast<double>(rt::now_ns() - t0) * 1e-9 << " s)"
+                << std::endl;
+      return true;
+    }
+    std::cout << "[GRETA_LOAD] Weight cache: discarding " << blob << ": "
+              << why << std::endl;
+    std::remove(blob.c_str());
+  } else {
+    std::cout << "[GRETA_LOAD] Weight cache miss: " << blob << std::endl;
+  }
+
+  if (!inner_->load_tensors(loads, err))
+    return false;
+  const uint64_t t1 = rt::now_ns();
+  if (!cache_.store(blob, model_fp_, loads, &why)) {
+    std::cout << "[GRETA_LOAD] Weight cache: not stored: " << why << std::endl;
+    return true;
+  }
+  uint64_t bytes = 0;
+  mtime_of(blob, &bytes);
+  std::cout << "[GRETA_LOAD] Weight cache stored " << blob << " ("
+            << bytes / (1024.0 * 1024.0) << " MB in "
+            << static_cast<double>(rt::now_ns() - t1) * 1e-9 << " s)"
+            << std::endl;
+  cache_.evict(cache_.config().max_bytes, blob);
+  return true;
+}
+
+void CachedWeightLoader::prefetch_tensor(const std::string &name) {
+  inner_->prefetch_tensor(name);
+}
+
+bool CachedWeightLoader::pack_tensor(const TensorLoad &load, PackedTensor &out,
+                                     std::string *err) {
+  return inner_->pack_tensor(load, out, err);
+}
+
+bool CachedWeightLoader::upload_packed(const TensorLoad &load,
+                                       PackedTensor &packed,
+                                       std::string *err) {
+  return inner_->upload_packed(load, packed, err);
+}
+
+// El blob se escribe con el lote completo: la carga es síncrona y el
+// pipeline devuelto ya está terminado
+std::unique_ptr<LoadPipeline>
+CachedWeightLoader::start_load(std::vector<TensorLoad> loads,
+                               std::string *err) {
+  if (!load_tensors(loads, err))
+    return nullptr;
+  return LoadPipeline::completed(loads.size());
+}
+
+ModelConfig CachedWeightLoader::get_config() const {
+  return inner_->get_config();
+}
+
+} // namespace gcore::inference
@@ -1,10 +1,21 @@
 #include "gcore/inference/weight_loader.hpp"
-
+#include "gcore/inference/gguf_quant.hpp"
+#include "gcore/inference/mapped_file.hpp"
+#include "gcore/inference/weight_cache.hpp"
+#include "gcore/rt/hip/staging_copier.hpp"
+#include "gcore/rt/span_tracer.hpp"
+#include "gcore/rt/staging_pool.hpp"
+
+#include <algorithm>
 #include <cmath>
+#include <cstdlib>
 #include <cstring>
-#include <fstream>
+#include <filesystem>
+#include <functional>
 #include <iostream>
+#include <mutex>
 #include <omp.h>
+#include <unordered_map>
 
 namespace gcore::inference {
 
@@ -32,6 +43,12 @@ enum class GGMLType : uint32_t {
   COUNT = 19,
 };
 
+// Nombre del tensor para los spans (sólo se interna con traza activa)
+static const char *span_detail(const std::string &name) {
+  return rt::SpanTracer::enabled() ? rt::SpanTracer::instance().intern(name)
+                                   : nullptr;
+}
+
 static constexpr size_t QK_K = 256;
 static constexpr size_t QK4_0 = 32;
 
@@ -81,100 +98,8 @@ static size_t ggml_type_size(GGMLType type) {
   }
 }
 
-struct block_q4_k {
-  uint16_t d;
-  uint16_t dmin;
-  uint8_t scales[12];
-  uint8_t qs[128];
-};
-
-static float fp16_to_fp32(uint16_t h) {
-  uint32_t sign = (h >> 15) & 0x1;
-  uint32_t exp = (h >> 10) & 0x1F;
-  uint32_t mant = h & 0x3FF;
-  if (exp == 0) {
-    if (mant == 0)
-      return sign ? -0.0f : 0.0f;
-    exp = 1;
-    while ((mant & 0x400) == 0) {
-      mant <<= 1;
-      exp--;
-    }
-    mant &= ~0x400;
-  } else if (exp == 31)
-    return sign ? -INFINITY : INFINITY;
-  uint32_t f = (sign << 31) | ((exp + 112) << 23) | (mant << 13);
-  float result;
-  memcpy(&result, &f, 4);
-  return result;
-}
-
-static uint16_t fp32_to_fp16(float f) {
-  uint32_t x;
-  std::memcpy(&x, &f, 4);
-  uint32_t sign = (x >> 16) & 0x8000;
-  int32_t exp = ((x >> 23) & 0xFF) - 127 + 15;
-  uint32_t mant = x & 0x7FFFFF;
-  if (exp <= 0)
-    return sign;
-  else if (exp >= 31)
-    return sign | 0x7C00;
-  return sign | (exp << 10) | (mant >> 13);
-}
-
-static void dequantize_q4_k_block(const uint8_t *src, float *dst,
-                                  size_t n_elements) {
-  const block_q4_k *block = reinterpret_cast<const block_q4_k *>(src);
-  float d = fp16_to_fp32(block->d);
-  float dmin = fp16_to_fp32(block->dmin);
-  uint8_t sc8[8], m8[8];
-  sc8[0] = block->scales[0] & 0x3f;
-  sc8[1] = block->scales[1] & 0x3f;
-  sc8[2] = block->scales[2] & 0x3f;
-  sc8[3] = block->scales[3] & 0x3f;
-  sc8[4] = (block->scales[0] >> 6) | ((block->scales[4] & 0x0f) << 2);
-  sc8[5] = (block->scales[1] >> 6) | ((block->scales[4] >> 4) << 2);
-  sc8[6] = (block->scales[2] >> 6) | ((block->scales[5] & 0x0f) << 2);
-  sc8[7] = (block->scales[3] >> 6) | ((block->scales[5] >> 4) << 2);
-  m8[0] = block->scales[6] & 0x3f;
-  m8[1] = block->scales[7] & 0x3f;
-  m8[2] = block->scales[8] & 0x3f;
-  m8[3] = block->scales[9] & 0x3f;
-  m8[4] = (block->scales[6] >> 6) | ((block->scales[10] & 0x0f) << 2);
-  m8[5] = (block->scales[7] >> 6) | ((block->scales[10] >> 4) << 2);
-  m8[6] = (block->scales[8] >> 6) | ((block->scales[11] & 0x0f) << 2);
-  m8[7] = (block->scales[9] >> 6) | ((block->scales[11] >> 4) << 2);
-  for (int j = 0; j < 8; ++j) {
-    float scale = d * sc8[j];
-    float min_val = dmin * m8[j];
-    for (int l = 0; l < 16; ++l) {
-      uint8_t qs = block->qs[j * 16 + l];
-      dst[j * 32 + l * 2 + 0] = scale * (qs & 0x0F) - min_val;
-      dst[j * 32 + l * 2 + 1] = scale * (qs >> 4) - min_val;
-    }
-  }
-}
-
-static void dequantize_q6_k_block(const uint8_t *src, float *dst,
-                                  size_t n_elements) {
-  const uint8_t *ql = src;
-  const uint8_t *qh = src + 128;
-  const int8_t *scales = reinterpret_cast<const int8_t *>(src + 192);
-  uint16_t d_raw;
-  memcpy(&d_raw, src + 208, 2);
-  float d = fp16_to_fp32(d_raw);
-  for (int i = 0; i < 256; ++i) {
-    int l_idx = i / 2;
-    int shift = (i % 2) * 4;
-    uint8_t l_val = (ql[l_idx] >> shift) & 0x0F;
-    int h_idx = i / 4;
-    int h_shift = (i % 4) * 2;
-    uint8_t h_val = (qh[h_idx] >> h_shift) & 0x03;
-    int q = (l_val | (h_val << 4)) - 32;
-    int sc_idx = i / 16;
-    dst[i] = d * q * scales[sc_idx];
-  }
-}
+using quant::fp16_to_fp32;
+using quant::fp32_to_fp16;
 
 static std::string ggml_type_name(GGMLType type) {
   switch (type) {
@@ -184,6 +109,8 @@ static std::string ggml_type_name(GGMLType type) {
     return "F16";
   case GGMLType::Q4_0:
     return "Q4_0";
+  case GGMLType::Q8_0:
+    return "Q8_0";
   case GGMLType::Q4_K:
     return "Q4_K";
   case GGMLType::Q6_K:
@@ -200,6 +127,8 @@ static GGMLType ggml_type_from_name(const std::string &name) {
     return GGMLType::F16;
   if (name == "Q4_0")
     return GGMLType::Q4_0;
+  if (name == "Q8_0")
+    return GGMLType::Q8_0;
   if (name == "Q4_K")
     return GGMLType::Q4_K;
   if (name == "Q6_K")
@@ -207,132 +136,331 @@ static GGMLType ggml_type_from_name(const std::string &name) {
   return GGMLType::F32;
 }
 
+// Tipos por bloques GGML (Q4_0/Q8_0/Q4_K/Q6_K) -> FP32 con el motor de
+// quant; bloques incompletos al final quedan sin escribir
+static bool dequantize_blocks(const std::string &dtype, const uint8_t *raw,
+                              size_t n_elem, float *dst) {
+  quant::BlockType bt;
+  if (!quant::block_type_from_name(dtype, bt))
+    return false;
+  quant::dequantize_f32(bt, raw, n_elem / quant::block_elems(bt), dst);
+  return true;
+}
+
+static bool dequantize_blocks_fp16(const std::string &dtype,
+                                   const uint8_t *raw, size_t n_elem,
+                                   uint16_t *dst) {
+  quant::BlockType bt;
+  if (!quant::block_type_from_name(dtype, bt))
+    return false;
+  quant::dequantize_fp16(bt, raw, n_elem / quant::block_elems(bt), dst);
+  return true;
+}
+
+// Lectura acotada sobre el mapping: leer fuera del archivo deja ok=false y
+// devuelve ceros (un header truncado no lee memoria ajena)
+struct ByteReader {
+  const uint8_t *p;
+  const uint8_t *end;
+  bool ok = true;
+
+  const uint8_t *take(size_t n) {
+    if (!ok || static_cast<size_t>(end - p) < n) {
+      ok = false;
+      return nullptr;
+    }
+    const uint8_t *q = p;
+    p += n;
+    return q;
+  }
+
+  template <typename T> T get() {
+    T v{};
+    if (const uint8_t *q = take(sizeof(T)))
+      std::memcpy(&v, q, sizeof(T));
+    return v;
+  }
+
+  void skip(size_t n) { take(n); }
+
+  std::string str(size_t n) {
+    const uint8_t *q = take(n);
+    return q ? std::string(reinterpret_cast<const char *>(q), n)
+             : std::string();
+  }
+};
+
+static bool is_kv_weight_name(const std::string &name) {
+  return name.find("attn_k.weight") != std::string::npos ||
+         name.find("attn_v.weight") != std::string::npos;
+}
+
+// Subida host->device compartida por los loaders: directa con hipMemcpy o
+// por el pool de staging fijado (tensores grandes)
+struct Uploader {
+  // Staging fijado (huge pages + NUMA del GPU) para subidas grandes.
+  // GRETA_STAGING=0 lo desactiva; GRETA_STAGING_HUGEPAGES=off|thp|explicit,
+  // GRETA_STAGING_CHUNK_MB. Si init() falla se usa hipMemcpy directo.
+  static constexpr size_t kStagingMinBytes = size_t{1} << 20;
+  std::unique_ptr<rt::hip::HipStagingCopier> copier;
+  std::unique_ptr<rt::StagingPool> staging;
+  bool staging_tried = false;
+  // Creación perezosa del pool y una subida a la vez (load_tensors)
+  std::mutex staging_mu;
+
+  rt::StagingPool *staging_pool() {
+    if (staging_tried)
+      return staging.get();
+    staging_tried = true;
+    const char *on = std::getenv("GRETA_STAGING");
+    if (on && std::string(on) == "0")
+      return nullptr;
+
+    rt::StagingOptions opt;
+    if (const char *hp = std::getenv("GRETA_STAGING_HUGEPAGES")) {
+      const std::string v(hp);
+      if (v == "off")
+        opt.huge_pages = rt::HugePages::Off;
+      else if (v == "explicit")
+        opt.huge_pages = rt::HugePages::Explicit;
+    }
+    if (const char *mb = std::getenv("GRETA_STAGING_CHUNK_MB")) {
+      const long v = std::strtol(mb, nullptr, 10);
+      if (v > 0)
+        opt.chunk_bytes = static_cast<size_t>(v) << 20;
+    }
+    int device = 0;
+    if (hipGetDevice(&device) == hipSuccess)
+      opt.numa_node = rt::hip::HipStagingCopier::device_numa_node(device);
+
+    std::string serr;
+    auto cp = std::make_unique<rt::hip::HipStagingCopier>(opt.chunks);
+    auto pool = std::make_unique<rt::StagingPool>(opt, cp.get());
+    if (!cp->init(&serr) || !pool->init(&serr)) {
+      std::cerr << "[GRETA_STAGING] disabled: " << serr << std::endl;
+      return nullptr;
+    }
+    const auto &pl = pool->placement();
+    std::cout << "[GRETA_STAGING] chunks=" << opt.chunks
+              << " chunk_mb=" << (opt.chunk_bytes >> 20)
+              << " numa_node=" << pl.numa_node
+              << " numa_observed=" << pl.numa_observed
+              << (pl.notes.empty() ? "" : " notes=" + pl.notes) << std::endl;
+    copier = std::move(cp);
+    staging = std::move(pool);
+    return staging.get();
+  }
+
+  bool upload(rt::hip::Buffer &buffer, const void *src, size_t bytes,
+              std::string *err) {
+    rt::TraceScope span("load.upload", "load", nullptr, bytes);
+    if (bytes >= kStagingMinBytes && bytes <= buffer.size()) {
+      std::lock_guard<std::mutex> lk(staging_mu);
+      if (auto *pool = staging_pool())
+        return pool->upload(buffer.data(), src, bytes, err);
+    }
+    return buffer.copy_to_device(src, bytes, err);
+  }
+
+  // Conversión por trozos directamente hacia el destino: fill(dst, off, n)
+  // escribe los bytes [off, off + n) ya convertidos. Con staging se rellena
+  // el chunk fijado; si no, un buffer host de kConvertChunkBytes reutilizado
+  static constexpr size_t kConvertChunkBytes = size_t{4} << 20;
+
+  bool upload_converted(rt::hip::Buffer &buffer, size_t bytes,
+                        const rt::StagingPool::FillFn &fill,
+                        std::string *err) {
+    rt::TraceScope span("load.upload", "load", nullptr, bytes);
+    if (bytes > buffer.size()) {
+      if (err)
+        *err = "destination buffer too small";
+      return false;
+    }
+    if (bytes >= kStagingMinBytes) {
+      std::lock_guard<std::mutex> lk(staging_mu);
+      if (auto *pool = staging_pool())
+        return pool->upload(buffer.data(), bytes, fill, err);
+    }
+    std::vector<uint8_t> host(std::min(bytes, kConvertChunkBytes));
+    for (size_t off = 0; off < bytes; off += host.size()) {
+      const size_t n = std::min(host.size(), bytes - off);
+      if (!fill(host.data(), off, n)) {
+        if (err)
+          *err = "tensor conversion failed";
+        return false;
+      }
+      const hipError_t res =
+          hipMemcpy(static_cast<uint8_t *>(buffer.data()) + off, host.data(),
+                    n, hipMemcpyHostToDevice);
+      if (res != hipSuccess) {
+        if (err)
+          *err = "hipMemcpy H2D failed: " +
+                 std::string(hipGetErrorString(res));
+        return false;
+      }
+    }
+    return true;
+  }
+};
+
+// WILLNEED mientras se convierte/sube, DONTNEED al terminar: la lectura
+// anticipada corre por delante y el RSS no crece con el modelo entero
+struct MappedPages {
+  const MappedFile &file;
+  const TensorInfo &t;
+  MappedPages(const MappedFile &f, const TensorInfo &info) : file(f), t(info) {
+    file.advise_willneed(t.offset, t.size_bytes);
+  }
+  ~MappedPages() { file.advise_dontneed(t.offset, t.size_bytes); }
+};
+
 struct GGUFLoader::Impl {
   std::string path;
-  std::ifstream file;
+  MappedFile file;
   std::vector<TensorInfo> tensors;
+  std::unordered_map<std::string, size_t> index;
   ModelConfig config;
   bool loaded = false;
   size_t data_offset = 0;
 
-  bool skip_value(uint32_t value_type, std::string *err) {
+  Uploader up;
+
+  const TensorInfo *find(const std::string &name) const {
+    auto it = index.find(name);
+    return it == index.end() ? nullptr : &tensors[it->second];
+  }
+
+  // Bytes del tensor en el mapping (sin copia)
+  const uint8_t *tensor_bytes(const TensorInfo &t, std::string *err) const {
+    const uint8_t *raw = file.view(t.offset, t.size_bytes);
+    if (!raw && err)
+      *err = "Tensor " + t.name + " lies outside " + path + " (truncated?)";
+    return raw;
+  }
+
+  // Conversión a INT8 / INT4 de GRETA (etapa de conversión del pipeline)
+  bool pack_int8(const std::string &name, PackedTensor &out,
+                 std::string *err) const;
+  bool pack_int4(const std::string &name, PackedTensor &out,
+                 std::string *err) const;
+
+  bool skip_value(ByteReader &r, uint32_t value_type, std::string *err) {
     switch (value_type) {
     case 0:
     case 1:
     case 7:
-      file.seekg(1, std::ios::cur);
+      r.skip(1);
       break;
     case 2:
     case 3:
-      file.seekg(2, std::ios::cur);
+      r.skip(2);
       break;
     case 4:
     case 5:
     case 6:
-      file.seekg(4, std::ios::cur);
+      r.skip(4);
       break;
     case 8: {
-      uint64_t len;
-      file.read(reinterpret_cast<char *>(&len), 8);
-      if (len > 1000000)
+      const uint64_t len = r.get<uint64_t>();
+      if (len > 1000000) {
+        *err = "string of " + std::to_string(len) + " bytes (max 1000000)";
         return false;
-      file.seekg(len, std::ios::cur);
+      }
+      r.skip(len);
       break;
     }
     case 9: {
-      uint32_t arr_type;
-      uint64_t arr_len;
-      file.read(reinterpret_cast<char *>(&arr_type), 4);
-      file.read(reinterpret_cast<char *>(&arr_len), 8);
-      if (arr_len > 1000000)
+      const uint32_t arr_type = r.get<uint32_t>();
+      const uint64_t arr_len = r.get<uint64_t>();
+      if (arr_len > 1000000) {
+        *err = "array of " + std::to_string(arr_len) +
+               " entries (max 1000000)";
         return false;
+      }
       if (arr_type == 8) {
-        for (uint64_t i = 0; i < arr_len; ++i) {
-          uint64_t slen;
-          file.read(reinterpret_cast<char *>(&slen), 8);
-          if (slen > 1000000)
+        for (uint64_t i = 0; i < arr_len && r.ok; ++i) {
+          const uint64_t slen = r.get<uint64_t>();
+          if (slen > 1000000) {
+            *err = "array string of " + std::to_string(slen) +
+                   " bytes (max 1000000)";
             return false;
-          file.seekg(slen, std::ios::cur);
+          }
+          r.skip(slen);
         }
+      } else if (arr_type > 12 || arr_type == 9) {
+        *err = "array of unsupported value type " + std::to_string(arr_type);
+        return false;
       } else {
         size_t es = (arr_type <= 1 || arr_type == 7)
                         ? 1
                         : (arr_type <= 3 ? 2 : (arr_type <= 6 ? 4 : 8));
-        file.seekg(arr_len * es, std::ios::cur);
+        r.skip(arr_len * es);
       }
       break;
     }
     case 10:
     case 11:
     case 12:
-      file.seekg(8, std::ios::cur);
+      r.skip(8);
       break;
     default:
+      *err = "unknown value type " + std::to_string(value_type);
       return false;
     }
-    return true;
+    return r.ok;
   }
 
-  bool parse_kv_pair(std::string *err) {
-    uint64_t key_len;
-    file.read(reinterpret_cast<char *>(&key_len), 8);
-    if (!file || key_len > 1024)
+  bool parse_kv_pair(ByteReader &r, std::string *err) {
+    const uint64_t key_len = r.get<uint64_t>();
+    if (!r.ok)
       return false;
-    std::string key(key_len, '\0');
-    file.read(&key[0], key_len);
-    uint32_t val_type;
-    file.read(reinterpret_cast<char *>(&val_type), 4);
-    if (!file)
+    if (key_len > 1024) {
+      *err = "GGUF metadata key of " + std::to_string(key_len) +
+             " bytes (max 1024)";
       return false;
+    }
+    const std::string key = r.str(key_len);
+    const uint32_t val_type = r.get<uint32_t>();
+    if (!r.ok)
+      return false;
+    auto bad_type = [&](const char *expected) {
+      *err = "GGUF metadata " + key + " has value type " +
+             std::to_string(val_type) + ", expected " + expected;
+      return false;
+    };
 
+    // Tipos GGUF: 0-7 u8 i8 u16 i16 u32 i32 f32 bool, 8 string, 9 array,
+    // 10-12 u64 i64 f64
     auto read_u32 = [&](uint32_t t, uint32_t &out) -> bool {
-      if (t == 4) {
-        uint32_t v = 0;
-        file.read(reinterpret_cast<char *>(&v), 4);
-        out = v;
-        return static_cast<bool>(file);
-      } else if (t == 5) {
-        int32_t v = 0;
-        file.read(reinterpret_cast<char *>(&v), 4);
-        out = static_cast<uint32_t>(v);
-        return static_cast<bool>(file);
-      } else if (t == 2) {
-        uint16_t v = 0;
-        file.read(reinterpret_cast<char *>(&v), 2);
-        out = v;
-        return static_cast<bool>(file);
-      } else if (t == 3) {
-        int16_t v = 0;
-        file.read(reinterpret_cast<char *>(&v), 2);
-        out = static_cast<uint32_t>(v);
-        return static_cast<bool>(file);
-      } else if (t == 6) {
-        float v = 0.0f;
-        file.read(reinterpret_cast<char *>(&v), 4);
-        out = static_cast<uint32_t>(v);
-        return static_cast<bool>(file);
-      } else if (t == 7) {
-        double v = 0.0;
-        file.read(reinterpret_cast<char *>(&v), 8);
-        out = static_cast<uint32_t>(v);
-        return static_cast<bool>(file);
-      }
-      return false;
+      if (t == 4)
+        out = r.get<uint32_t>();
+      else if (t == 5)
+        out = static_cast<uint32_t>(r.get<int32_t>());
+      else if (t == 2)
+        out = r.get<uint16_t>();
+      else if (t == 3)
+        out = static_cast<uint32_t>(r.get<int16_t>());
+      else if (t == 10)
+        out = static_cast<uint32_t>(r.get<uint64_t>());
+      else if (t == 11)
+        out = static_cast<uint32_t>(r.get<int64_t>());
+      else if (t == 6)
+        out = static_cast<uint32_t>(r.get<float>());
+      else if (t == 12)
+        out = static_cast<uint32_t>(r.get<double>());
+      else
+        return bad_type("a number");
+      return r.ok;
     };
 
     auto read_f32 = [&](uint32_t t, float &out) -> bool {
-      if (t == 6) {
-        float v = 0.0f;
-        file.read(reinterpret_cast<char *>(&v), 4);
-        out = v;
-        return static_cast<bool>(file);
-      } else if (t == 7) {
-        double v = 0.0;
-        file.read(reinterpret_cast<char *>(&v), 8);
-        out = static_cast<float>(v);
-        return static_cast<bool>(file);
-      }
-      return false;
+      if (t == 6)
+        out = r.get<float>();
+      else if (t == 12)
+        out = static_cast<float>(r.get<double>());
+      else
+        return bad_type("a float");
+      return r.ok;
     };
 
     if (key == "llama.embedding_length") {
@@ -399,59 +527,61 @@ struct GGUFLoader::Impl {
     }
 
     if (key == "tokenizer.ggml.tokens" && val_type == 9) {
-      uint32_t arr_type;
-      uint64_t arr_len;
-      file.read(reinterpret_cast<char *>(&arr_type), 4);
-      file.read(reinterpret_cast<char *>(&arr_len), 8);
-      if (arr_type != 8 || arr_len > 1000000)
+      const uint32_t arr_type = r.get<uint32_t>();
+      const uint64_t arr_len = r.get<uint64_t>();
+      if (!r.ok)
+        return false;
+      if (arr_type != 8)
+        return bad_type("an array of strings");
+      if (arr_len > 1000000) {
+        *err = "GGUF tokenizer.ggml.tokens has " + std::to_string(arr_len) +
+               " entries (max 1000000)";
         return false;
+      }
       config.vocabulary.clear();
       config.vocabulary.reserve(arr_len);
-      for (uint64_t i = 0; i < arr_len; ++i) {
-        uint64_t slen;
-        file.read(reinterpret_cast<char *>(&slen), 8);
+      for (uint64_t i = 0; i < arr_len && r.ok; ++i) {
+        const uint64_t slen = r.get<uint64_t>();
         if (slen > 1024) {
-          file.seekg(slen, std::ios::cur);
+          r.skip(slen);
           config.vocabulary.push_back("<too_long>");
           continue;
         }
-        std::string s(slen, '\0');
-        file.read(&s[0], slen);
-        config.vocabulary.push_back(s);
+        config.vocabulary.push_back(r.str(slen));
       }
       config.vocab_size = static_cast<uint32_t>(arr_len);
-    } else {
-      if (!skip_value(val_type, err))
-        return false;
+    } else if (!skip_value(r, val_type, err)) {
+      if (r.ok)
+        *err = "GGUF metadata " + key + ": " + *err;
+      return false;
     }
-    return true;
+    return r.ok;
   }
 
-  bool parse_tensor_info(TensorInfo &info, std::string *err) {
-    uint64_t name_len;
-    file.read(reinterpret_cast<char *>(&name_len), 8);
-    if (name_len > 512)
+  bool parse_tensor_info(ByteReader &r, TensorInfo &info, std::string *err) {
+    const uint64_t name_len = r.get<uint64_t>();
+    if (name_len > 512) {
+      *err = "GGUF tensor name of " + std::to_string(name_len) +
+             " bytes (max 512)";
       return false;
-    info.name.resize(name_len);
-    file.read(&info.name[0], name_len);
-    uint32_t n_dims;
-    file.read(reinterpret_cast<char *>(&n_dims), 4);
-    if (n_dims > 8)
+    }
+    info.name = r.str(name_len);
+    const uint32_t n_dims = r.get<uint32_t>();
+    if (n_dims > 8) {
+      *err = "GGUF tensor " + info.name + " has " + std::to_string(n_dims) +
+             " dims (max 8)";
       return false;
+    }
     info.shape.resize(n_dims);
     size_t n_elements = 1;
     for (uint32_t i = 0; i < n_dims; ++i) {
-      uint64_t d;
-      file.read(reinterpret_cast<char *>(&d), 8);
+      const uint64_t d = r.get<uint64_t>();
       info.shape[i] = d;
       n_elements *= d;
     }
-    uint32_t type;
-    file.read(reinterpret_cast<char *>(&type), 4);
+    const uint32_t type = r.get<uint32_t>();
     info.dtype = ggml_type_name(static_cast<GGMLType>(type));
-    uint64_t offset;
-    file.read(reinterpret_cast<char *>(&offset), 8);
-    info.offset = offset; // Relative to data section
+    info.offset = r.get<uint64_t>(); // Relative to data section
 
     GGMLType gtype = static_cast<GGMLType>(type);
     size_t ts = ggml_type_size(gtype), bs = ggml_block_size(gtype);
@@ -461,44 +591,60 @@ struct GGUFLoader::Impl {
       info.size_bytes = ((n_elements + bs - 1) / bs) * ts;
     else
       info.size_bytes = n_elements * 2;
-    return true;
+    return r.ok;
   }
 
   bool parse_header(std::string *err) {
-    file.seekg(0);
-    char buf[4];
-    file.read(buf, 4);
-    if (std::memcmp(buf, "GGUF", 4) != 0) {
+    ByteReader r{file.data(), file.data() + file.size()};
+    const uint8_t *magic = r.take(4);
+    if (!magic || std::memcmp(magic, "GGUF", 4) != 0) {
       *err = "Not GGUF";
       return false;
     }
-    uint32_t version;
-    file.read(reinterpret_cast<char *>(&version), 4);
+    const uint32_t version = r.get<uint32_t>();
+    const uint64_t t_count = r.get<uint64_t>();
+    const uint64_t kv_count = r.get<uint64_t>();
+    if (!r.ok) {
+      *err = "GGUF header truncated";
+      return false;
+    }
     if (version < 2) {
       *err = "Old GGUF";
       return false;
     }
-    uint64_t t_count, kv_count;
-    file.read(reinterpret_cast<char *>(&t_count), 8);
-    file.read(reinterpret_cast<char *>(&kv_count), 8);
-    if (kv_count > 2000)
+    if (kv_count > 2000) {
+      *err = "GGUF metadata count " + std::to_string(kv_count) +
+             " out of range (max 2000)";
       return false;
+    }
     config = ModelConfig::llama2_7b();
     for (uint64_t i = 0; i < kv_count; ++i)
-      if (!parse_kv_pair(err))
+      if (!parse_kv_pair(r, err)) {
+        if (!r.ok)
+          *err = "GGUF header truncated";
         return false;
+      }
+    if (t_count > file.size() / 24) { // cada entrada ocupa >= 24 bytes
+      *err = "GGUF tensor count out of range";
+      return false;
+    }
     tensors.reserve(t_count);
     for (uint64_t i = 0; i < t_count; ++i) {
       TensorInfo info;
-      if (!parse_tensor_info(info, err))
+      if (!parse_tensor_info(r, info, err)) {
+        if (!r.ok)
+          *err = "GGUF header truncated";
         return false;
-      tensors.push_back(info);
+      }
+      tensors.push_back(std::move(info));
     }
-    size_t pos = file.tellg();
+    const size_t pos = static_cast<size_t>(r.p - file.data());
     data_offset = (pos + 31) & ~31ULL;
-    for (auto &t : tensors) {
-      t.offset += data_offset;
-    } // Map relative to absolute
+    index.reserve(tensors.size());
+    for (size_t i = 0; i < tensors.size(); ++i) {
+      tensors[i].offset += data_offset; // Map relative to absolute
+      index.emplace(tensors[i].name, i);
+    }
     loaded = true;
     return true;
   }
@@ -507,10 +653,11 @@ struct GGUFLoader::Impl {
 GGUFLoader::GGUFLoader() : impl_(std::make_unique<Impl>()) {}
 GGUFLoader::~GGUFLoader() = default;
 bool GGUFLoader::open(const std::string &path, std::string *err) {
+  rt::TraceScope span("load.open", "load");
   impl_->path = path;
-  impl_->file.open(path, std::ios::binary);
-  if (!impl_->file.is_open())
+  if (!impl_->file.open(path, err))
     return false;
+  impl_->file.advise_sequential();
   return impl_->parse_header(err);
 }
 std::vector<TensorInfo> GGUFLoader::list_tensors() const {
@@ -518,103 +665,64 @@ std::vector<TensorInfo> GGUFLoader::list_tensors() const {
 }
 ModelConfig GGUFLoader::get_config() const { return impl_->config; }
 
-bool GGUFLoader::load_tensor(const std::string &name,
-                             gcore::rt::hip::Buffer &buffer, std::string *err) {
-  const TensorInfo *it = nullptr;
-  for (const auto &t : impl_->tensors)
-    if (t.name == name) {
-      it = &t;
-      break;
-    }
+bool GGUFLoader::read_tensor_f32(const std::string &name,
+                                 std::vector<float> &out, std::string *err) {
+  rt::TraceScope span("load.read_f32", "load", span_detail(name));
+  const TensorInfo *it = impl_->find(name);
   if (!it)
     return false;
   GGMLType gtype = ggml_type_from_name(it->dtype);
-  std::vector<uint8_t> raw(it->size_bytes);
-  impl_->file.seekg(it->offset);
-  impl_->file.read((char *)raw.data(), it->size_bytes);
+  const uint8_t *raw = impl_->tensor_bytes(*it, err);
+  if (!raw)
+    return false;
+  MappedPages pages(impl_->file, *it);
   size_t n_elem = 1;
   for (auto d : it->shape)
     n_elem *= d;
-  std::vector<float> fp32;
-  const void *up = nullptr;
-  size_t ups = 0;
+  out.resize(n_elem);
   if (gtype == GGMLType::F32) {
-    up = raw.data();
-    ups = it->size_bytes;
+    std::memcpy(out.data(), raw, n_elem * 4);
   } else if (gtype == GGMLType::F16) {
-    fp32.resize(n_elem);
-    const uint16_t *s = (uint16_t *)raw.data();
+    const uint16_t *s = (const uint16_t *)raw;
     for (size_t i = 0; i < n_elem; ++i)
-      fp32[i] = fp16_to_fp32(s[i]);
-    up = fp32.data();
-    ups = n_elem * 4;
-  } else if (gtype == GGMLType::Q4_K) {
-    fp32.resize(n_elem);
-    size_t bs = 256, ts = 144, nb = n_elem / bs;
-    for (size_t b = 0; b < nb; ++b)
-      dequantize_q4_k_block(raw.data() + b * ts, fp32.data() + b * bs, bs);
-    up = fp32.data();
-    ups = n_elem * 4;
-  } else if (gtype == GGMLType::Q6_K) {
-    fp32.resize(n_elem);
-    size_t bs = 256, ts = 210, nb = n_elem / bs;
-    for (size_t b = 0; b < nb; ++b)
-      dequantize_q6_k_block(raw.data() + b * ts, fp32.data() + b * bs, bs);
-    up = fp32.data();
-    ups = n_elem * 4;
-  } else
-    return false;
-  if (!buffer.allocate(ups, gcore::rt::hip::BufferUsage::DeviceOnly,
-                       gcore::rt::GretaDataType::FP32, err))
+      out[i] = fp16_to_fp32(s[i]);
+  } else if (!dequantize_blocks(it->dtype, raw, n_elem, out.data()))
     return false;
-  return buffer.copy_to_device(up, ups, err);
+  return true;
 }
 
-bool GGUFLoader::load_tensor_fp16(const std::string &name,
-                                  gcore::rt::hip::Buffer &buffer,
+bool GGUFLoader::load_tensor(const std::string &name,
+                             gcore::rt::hip::Buffer &buffer, std::string *err) {
+  rt::TraceScope span("load.tensor", "load", span_detail(name));
+  return load_packed({name, TensorLoad::Format::F32, &buffer}, err);
+}
+
+bool GGUFLoader::read_tensor_fp16(const std::string &name,
+                                  std::vector<uint16_t> &fp16,
                                   std::string *err) {
-  const TensorInfo *it = nullptr;
-  for (const auto &t : impl_->tensors)
-    if (t.name == name) {
-      it = &t;
-      break;
-    }
+  rt::TraceScope span("load.read_fp16", "load", span_detail(name));
+  const TensorInfo *it = impl_->find(name);
   if (!it)
     return false;
   GGMLType gtype = ggml_type_from_name(it->dtype);
-  std::vector<uint8_t> raw(it->size_bytes);
-  impl_->file.seekg(it->offset);
-  impl_->file.read((char *)raw.data(), it->size_bytes);
+  const uint8_t *raw = impl_->tensor_bytes(*it, err);
+  if (!raw)
+    return false;
+  MappedPages pages(impl_->file, *it);
   size_t n_elem = 1;
   for (auto d : it->shape)
     n_elem *= d;
-  std::vector<uint16_t> fp16(n_elem);
+  fp16.assign(n_elem, 0);
   if (gtype == GGMLType::F32) {
-    const float *s = (float *)raw.data();
+    const float *s = (const float *)raw;
     for (size_t i = 0; i < n_elem; ++i)
       fp16[i] = fp32_to_fp16(s[i]);
   } else if (gtype == GGMLType::F16)
-    std::memcpy(fp16.data(), raw.data(), n_elem * 2);
-  else if (gtype == GGMLType::Q4_K) {
-    std::vector<float> tmp(n_elem);
-    size_t bs = 256, ts = 144, nb = n_elem / bs;
-    for (size_t b = 0; b < nb; ++b)
-      dequantize_q4_k_block(raw.data() + b * ts, tmp.data() + b * bs, bs);
-    for (size_t i = 0; i < n_elem; ++i)
-      fp16[i] = fp32_to_fp16(tmp[i]);
-  } else if (gtype == GGMLType::Q6_K) {
-    std::vector<float> tmp(n_elem);
-    size_t bs = 256, ts = 210, nb = n_elem / bs;
-    for (size_t b = 0; b < nb; ++b)
-      dequantize_q6_k_block(raw.data() + b * ts, tmp.data() + b * bs, bs);
-    for (size_t i = 0; i < n_elem; ++i)
-      fp16[i] = fp32_to_fp16(tmp[i]);
-  } else
+    std::memcpy(fp16.data(), raw, n_elem * 2);
+  else if (!dequantize_blocks_fp16(it->dtype, raw, n_elem, fp16.data()))
     return false;
 
-  const bool is_kv_weight =
-      (name.find("attn_k.weight") != std::string::npos ||
-       name.find("attn_v.weight") != std::string::npos);
+  const bool is_kv_weight = is_kv_weight_name(name);
   if (is_kv_weight && impl_->config.num_heads_kv > 0 &&
       impl_->config.head_dim > 0) {
     const uint32_t kv_dim = impl_->config.num_heads_kv * impl_->config.head_dim;
@@ -658,23 +766,68 @@ bool GGUFLoader::load_tensor_fp16(const std::string &name,
     }
   }
 
-  size_t ups = n_elem * 2;
-  if (!buffer.allocate(ups, gcore::rt::hip::BufferUsage::DeviceOnly,
-                       gcore::rt::GretaDataType::FP16, err))
-    return false;
-  return buffer.copy_to_device(fp16.data(), ups, err);
+  return true;
 }
 
-bool GGUFLoader::load_tensor_int8(const std::string &name,
+bool GGUFLoader::load_tensor_fp16(const std::string &name,
                                   gcore::rt::hip::Buffer &buffer,
-                                  gcore::rt::hip::Buffer &scales,
                                   std::string *err) {
-  const TensorInfo *it = nullptr;
-  for (const auto &t : impl_->tensors)
-    if (t.name == name) {
-      it = &t;
-      break;
-    }
+  rt::TraceScope span("load.tensor", "load", span_detail(name));
+  return load_packed({name, TensorLoad::Format::FP16, &buffer}, err);
+}
+
+static bool check_load(const TensorLoad &ld, std::string *err) {
+  const char *why = nullptr;
+  if (!ld.buffer)
+    why = "no destination buffer";
+  else if ((ld.format == TensorLoad::Format::INT8 && !ld.scales) ||
+           (ld.format == TensorLoad::Format::INT4 &&
+            (!ld.scales || !ld.head_scales)))
+    why = "missing scale buffers";
+  if (why && err)
+    *err = why;
+  return !why;
+}
+
+static std::string load_error(const TensorLoad &ld, const std::string &e) {
+  return "Failed to load tensor " + ld.name + (e.empty() ? "" : ": " + e);
+}
+
+using CopyFn = std::function<bool(rt::hip::Buffer &, const void *, size_t,
+                                  std::string *)>;
+
+// Reserva cada parte empaquetada en su buffer, la copia y enlaza las escalas
+static bool upload_parts(const TensorLoad &ld, const PackedTensor &packed,
+                         const CopyFn &copy, std::string *err) {
+  if (!check_load(ld, err))
+    return false;
+  const std::pair<rt::hip::Buffer *, const PackedTensor::Part *> parts[] = {
+      {ld.buffer, &packed.weights},
+      {ld.scales, &packed.scales},
+      {ld.head_scales, &packed.head_scales}};
+  for (const auto &[buf, part] : parts) {
+    if (part->bytes == 0)
+      continue;
+    if (!buf->allocate(part->bytes, rt::hip::BufferUsage::DeviceOnly,
+                       part->type, err) ||
+        !copy(*buf, part->data, part->bytes, err))
+      return false;
+  }
+  if (packed.has_quant) {
+    gcore::rt::GretaQuantInfo qinfo;
+    qinfo.group_size = packed.group_size;
+    qinfo.scales = packed.scales.bytes ? ld.scales->data() : nullptr;
+    const bool heads = packed.head_scales.bytes != 0;
+    qinfo.head_scales = heads ? ld.head_scales->data() : nullptr;
+    qinfo.num_heads = heads ? packed.num_heads : 0;
+    ld.buffer->set_quant_info(qinfo);
+  }
+  return true;
+}
+
+bool GGUFLoader::Impl::pack_int8(const std::string &name, PackedTensor &out,
+                                 std::string *err) const {
+  const TensorInfo *it = find(name);
   if (!it)
     return false;
 
@@ -682,15 +835,15 @@ bool GGUFLoader::load_tensor_int8(const std::string &name,
   std::cout << "[GRETA_LOAD] Loading tensor: " << name
             << " (Type: " << it->dtype << ", Size: " << it->size_bytes
             << " bytes)" << std::endl;
-  static bool omp_logged = false;
-  if (!omp_logged) {
+  static std::once_flag omp_logged;
+  std::call_once(omp_logged, [] {
     std::cout << "[GRETA_LOAD] OpenMP Max Threads: " << omp_get_max_threads()
               << std::endl;
-    omp_logged = true;
-  }
-  std::vector<uint8_t> raw(it->size_bytes);
-  impl_->file.seekg(it->offset);
-  impl_->file.read((char *)raw.data(), it->size_bytes);
+  });
+  const uint8_t *raw = tensor_bytes(*it, err);
+  if (!raw)
+    return false;
+  MappedPages pages(file, *it);
 
   size_t n_elem = 1;
   for (auto d : it->shape)
@@ -704,7 +857,7 @@ bool GGUFLoader::load_tensor_int8(const std::string &name,
     size_t nb = n_elem / 32;
     scale_data.resize(nb);
     for (size_t b = 0; b < nb; ++b) {
-      const uint8_t *src = raw.data() + b * 34;
+      const uint8_t *src = raw + b * 34;
       uint16_t d_raw;
       std::memcpy(&d_raw, src, 2);
       scale_data[b] = fp16_to_fp32(d_raw);
@@ -713,34 +866,24 @@ bool GGUFLoader::load_tensor_int8(const std::string &name,
   } else {
     // Convert FP32/FP16/Other to INT8 with scales
     std::vector<float> fp32(n_elem);
-    const bool is_kv_weight =
-        (name.find("attn_k.weight") != std::string::npos ||
-         name.find("attn_v.weight") != std::string::npos);
+    const bool is_kv_weight = is_kv_weight_name(name);
     if (gtype == GGMLType::F32) {
-      std::memcpy(fp32.data(), raw.data(), n_elem * 4);
+      std::memcpy(fp32.data(), raw, n_elem * 4);
     } else if (gtype == GGMLType::F16) {
-      const uint16_t *s = (const uint16_t *)raw.data();
+      const uint16_t *s = (const uint16_t *)raw;
       for (size_t i = 0; i < n_elem; ++i)
         fp32[i] = fp16_to_fp32(s[i]);
-    } else if (gtype == GGMLType::Q4_K) {
-      size_t bs = 256, ts = 144, nb = n_elem / bs;
-      for (size_t b = 0; b < nb; ++b)
-        dequantize_q4_k_block(raw.data() + b * ts, fp32.data() + b * bs, bs);
-    } else if (gtype == GGMLType::Q6_K) {
-      size_t bs = 256, ts = 210, nb = n_elem / bs;
-      for (size_t b = 0; b < nb; ++b)
-        dequantize_q6_k_block(raw.data() + b * ts, fp32.data() + b * bs, bs);
-    } else {
+    } else if (!dequantize_blocks(it->dtype, raw, n_elem, fp32.data())) {
       if (err)
         *err = "Unsupported INT8 conversion for type " + it->dtype;
       return false;
     }
 
-    if (is_kv_weight && impl_->config.num_heads_kv > 0 &&
-        impl_->config.head_dim > 0) {
+    if (is_kv_weight && config.num_heads_kv > 0 &&
+        config.head_dim > 0) {
       const uint32_t kv_dim =
-          impl_->config.num_heads_kv * impl_->config.head_dim;
-      const uint32_t model_dim = impl_->config.dim;
+          config.num_heads_kv * config.head_dim;
+      const uint32_t model_dim = config.dim;
       if (it->shape.size() != 2 || kv_dim == 0 || model_dim == 0) {
         if (err) {
           *err = "GQA KV INT8 load failed for " + name +
@@ -784,55 +927,21 @@ bool GGUFLoader::load_tensor_int8(const std::string &name,
     scale_data.resize(nb);
     std::cout << "[GRETA_LOAD] Quantizing " << n_elem << " elements to INT8..."
               << std::endl;
-#pragma omp parallel for
-    for (size_t b = 0; b < nb; ++b) {
-      if (b % 100000 == 0 && b > 0)
-        std::cout << "  - Block " << b << "/" << nb << std::endl;
-      float max_val = 0.0f;
-      for (size_t i = 0; i < 32 && (b * 32 + i) < n_elem; ++i) {
-        max_val = std::max(max_val, std::abs(fp32[b * 32 + i]));
-      }
-      float scale = max_val / 127.0f;
-      scale_data[b] = scale;
-      float inv_scale = scale > 1e-9f ? 1.0f / scale : 0.0f;
-      for (size_t i = 0; i < 32 && (b * 32 + i) < n_elem; ++i) {
-        weights[b * 32 + i] = (int8_t)std::round(fp32[b * 32 + i] * inv_scale);
-      }
-    }
+    quant::quantize_int8(fp32.data(), n_elem, weights.data(),
+                         scale_data.data());
     std::cout << "[GRETA_LOAD] Quantization complete." << std::endl;
   }
 
-  if (!buffer.allocate(n_elem, rt::hip::BufferUsage::DeviceOnly,
-                       rt::GretaDataType::INT8, err))
-    return false;
-  if (!scales.allocate(scale_data.size() * 4, rt::hip::BufferUsage::DeviceOnly,
-                       rt::GretaDataType::FP32, err))
-    return false;
-
-  if (!buffer.copy_to_device(weights.data(), n_elem, err))
-    return false;
-  if (!scales.copy_to_device(scale_data.data(), scale_data.size() * 4, err))
-    return false;
-
-  gcore::rt::GretaQuantInfo qinfo;
-  qinfo.group_size = group_size;
-  qinfo.scales = scales.data();
-  buffer.set_quant_info(qinfo);
-
+  out.weights.own(std::move(weights), rt::GretaDataType::INT8);
+  out.scales.own(std::move(scale_data), rt::GretaDataType::FP32);
+  out.has_quant = true;
+  out.group_size = group_size;
   return true;
 }
 
-bool GGUFLoader::load_tensor_int4(const std::string &name,
-                                  gcore::rt::hip::Buffer &buffer,
-                                  gcore::rt::hip::Buffer &scales,
-                                  gcore::rt::hip::Buffer &head_scales,
-                                  std::string *err) {
-  const TensorInfo *it = nullptr;
-  for (const auto &t : impl_->tensors)
-    if (t.name == name) {
-      it = &t;
-      break;
-    }
+bool GGUFLoader::Impl::pack_int4(const std::string &name, PackedTensor &out,
+                                 std::string *err) const {
+  const TensorInfo *it = find(name);
   if (!it)
     return false;
 
@@ -841,9 +950,10 @@ bool GGUFLoader::load_tensor_int4(const std::string &name,
             << " (Type: " << it->dtype << ", Size: " << it->size_bytes
             << " bytes)" << std::endl;
 
-  std::vector<uint8_t> raw(it->size_bytes);
-  impl_->file.seekg(it->offset);
-  impl_->file.read((char *)raw.data(), it->size_bytes);
+  const uint8_t *raw = tensor_bytes(*it, err);
+  if (!raw)
+    return false;
+  MappedPages pages(file, *it);
 
   size_t n_elem = 1;
   for (auto d : it->shape)
@@ -851,34 +961,24 @@ bool GGUFLoader::load_tensor_int4(const std::string &name,
 
   // 1. Dequantize to FP32
   std::vector<float> fp32(n_elem);
-  const bool is_kv_weight =
-      (name.find("attn_k.weight") != std::string::npos ||
-       name.find("attn_v.weight") != std::string::npos);
+  const bool is_kv_weight = is_kv_weight_name(name);
   if (gtype == GGMLType::F32) {
-    std::memcpy(fp32.data(), raw.data(), n_elem * 4);
+    std::memcpy(fp32.data(), raw, n_elem * 4);
   } else if (gtype == GGMLType::F16) {
-    const uint16_t *s = (const uint16_t *)raw.data();
+    const uint16_t *s = (const uint16_t *)raw;
     for (size_t i = 0; i < n_elem; ++i)
       fp32[i] = fp16_to_fp32(s[i]);
-  } else if (gtype == GGMLType::Q4_K) {
-    size_t bs = 256, ts = 144, nb = n_elem / bs;
-    for (size_t b = 0; b < nb; ++b)
-      dequantize_q4_k_block(raw.data() + b * ts, fp32.data() + b * bs, bs);
-  } else if (gtype == GGMLType::Q6_K) {
-    size_t bs = 256, ts = 210, nb = n_elem / bs;
-    for (size_t b = 0; b < nb; ++b)
-      dequantize_q6_k_block(raw.data() + b * ts, fp32.data() + b * bs, bs);
-  } else {
+  } else if (!dequantize_blocks(it->dtype, raw, n_elem, fp32.data())) {
     if (err)
       *err = "Unsupported INT4 conversion for type " + it->dtype;
     return false;
   }
 
-  if (is_kv_weight && impl_->config.num_heads_kv > 0 &&
-      impl_->config.head_dim > 0) {
+  if (is_kv_weight && config.num_heads_kv > 0 &&
+      config.head_dim > 0) {
     const uint32_t kv_dim =
-        impl_->config.num_heads_kv * impl_->config.head_dim;
-    const uint32_t model_dim = impl_->config.dim;
+        config.num_heads_kv * config.head_dim;
+    const uint32_t model_dim = config.dim;
     if (it->shape.size() != 2 || kv_dim == 0 || model_dim == 0) {
       if (err) {
         *err = "GQA KV INT4 load failed for " + name +
@@ -925,130 +1025,949 @@ bool GGUFLoader::load_tensor_int4(const std::string &name,
   std::cout << "[GRETA_LOAD] Quantizing " << n_elem << " elements to INT4..."
             << std::endl;
 
-#pragma omp parallel for
-  for (size_t g = 0; g < n_groups; ++g) {
-    if (g % 200000 == 0 && g > 0)
-      std::cout << "  - Group " << g << "/" << n_groups << std::endl;
+  quant::quantize_int4(fp32.data(), n_elem, packed_weights.data(),
+                       scale_data.data());
+
+  // 3. Per-head Scaling (Phase 5.3)
+  uint32_t num_heads = config.num_heads;
+  if (is_kv_weight && config.num_heads_kv > 0)
+    num_heads = config.num_heads_kv;
+  const uint32_t head_dim = config.head_dim;
+  std::vector<float> h_scales(num_heads, 1.0f);
+  bool is_qkv = (name.find("attn_q") != std::string::npos ||
+                 name.find("attn_k") != std::string::npos ||
+                 name.find("attn_v") != std::string::npos);
 
-    float max_val = 0.0f;
-    for (size_t i = 0; i < 32 && (g * 32 + i) < n_elem; ++i) {
-      max_val = std::max(max_val, std::abs(fp32[g * 32 + i]));
+  if (is_qkv && num_heads > 0 && head_dim > 0) {
+    size_t D = config.dim;
+    size_t Dh = head_dim;
+#pragma omp parallel for
+    for (uint32_t h = 0; h < num_heads; ++h) {
+      float h_max = 0.0f;
+      for (size_t i = 0; i < Dh * D; ++i) {
+        h_max = std::max(h_max, std::abs(fp32[h * Dh * D + i]));
+      }
+      h_scales[h] = h_max > 1e-9f ? h_max : 1.0f;
     }
+    out.head_scales.own(std::move(h_scales), rt::GretaDataType::FP32);
+    out.num_heads = num_heads;
+  }
 
-    float scale = max_val / 7.0f;
-    scale_data[g] = scale;
-    float inv_scale = (scale > 1e-9f) ? 1.0f / scale : 0.0f;
+  out.weights.own(std::move(packed_weights), rt::GretaDataType::INT4);
+  out.scales.own(std::move(scale_data), rt::GretaDataType::FP32);
+  out.has_quant = true;
+  out.group_size = 32;
+  return true;
+}
 
-    for (size_t i = 0; i < 32 && (g * 32 + i) < n_elem; i += 2) {
-      size_t idx0 = g * 32 + i;
-      size_t idx1 = idx0 + 1;
+bool GGUFLoader::load_tensor_int8(const std::string &name,
+                                  gcore::rt::hip::Buffer &buffer,
+                                  gcore::rt::hip::Buffer &scales,
+                                  std::string *err) {
+  rt::TraceScope span("load.tensor", "load", span_detail(name));
+  return load_packed({name, TensorLoad::Format::INT8, &buffer, &scales}, err);
+}
 
-      int8_t v0 = (int8_t)std::round(fp32[idx0] * inv_scale);
-      v0 = std::max((int8_t)-8, std::min((int8_t)7, v0));
+bool GGUFLoader::load_tensor_int4(const std::string &name,
+                                  gcore::rt::hip::Buffer &buffer,
+                                  gcore::rt::hip::Buffer &scales,
+                                  gcore::rt::hip::Buffer &head_scales,
+                                  std::string *err) {
+  rt::TraceScope span("load.tensor", "load", span_detail(name));
+  return load_packed(
+      {name, TensorLoad::Format::INT4, &buffer, &scales, &head_scales}, err);
+}
 
-      int8_t v1 = 0;
-      if (idx1 < n_elem) {
-        v1 = (int8_t)std::round(fp32[idx1] * inv_scale);
-        v1 = std::max((int8_t)-8, std::min((int8_t)7, v1));
-      }
+bool GGUFLoader::load_packed(const TensorLoad &load, std::string *err) {
+  PackedTensor packed;
+  return pack_tensor(load, packed, err) && upload_packed(load, packed, err);
+}
+
+void GGUFLoader::prefetch_tensor(const std::string &name) {
+  const TensorInfo *it = impl_->find(name);
+  const uint8_t *raw = it ? impl_->file.view(it->offset, it->size_bytes)
+                          : nullptr;
+  if (!raw)
+    return;
+  impl_->file.advise_willneed(it->offset, it->size_bytes);
+  // Una lectura por página: los fallos de página (la E/S) se pagan en el
+  // hilo lector y no en los conversores
+  constexpr size_t kPage = 4096;
+  uint8_t acc = 0;
+  for (size_t off = 0; off < it->size_bytes; off += kPage)
+    acc ^= reinterpret_cast<const volatile uint8_t *>(raw)[off];
+  (void)acc;
+}
 
-      packed_weights[idx0 / 2] = (v0 & 0x0F) | ((v1 & 0x0F) << 4);
+bool GGUFLoader::pack_tensor(const TensorLoad &load, PackedTensor &out,
+                             std::string *err) {
+  const TensorInfo *it = impl_->find(load.name);
+  switch (load.format) {
+  case TensorLoad::Format::F32:
+  case TensorLoad::Format::FP16: {
+    // Ya en el dtype destino (y sin transponer K/V): vista del mapping, se
+    // sube sin copia y upload_packed() suelta las páginas
+    const bool f32 = load.format == TensorLoad::Format::F32;
+    if (it && (f32 ? it->dtype == "F32"
+                   : it->dtype == "F16" && !is_kv_weight_name(load.name))) {
+      const uint8_t *raw = impl_->tensor_bytes(*it, err);
+      if (!raw)
+        return false;
+      out.weights.view(raw, it->size_bytes,
+                       f32 ? rt::GretaDataType::FP32 : rt::GretaDataType::FP16);
+      return true;
     }
+    return WeightLoader::pack_tensor(load, out, err);
+  }
+  case TensorLoad::Format::INT8:
+    return impl_->pack_int8(load.name, out, err);
+  case TensorLoad::Format::INT4:
+    return impl_->pack_int4(load.name, out, err);
   }
+  return false;
+}
 
-  // 3. Upload to Device
-  if (!buffer.allocate(packed_weights.size(), rt::hip::BufferUsage::DeviceOnly,
-                       rt::GretaDataType::INT4, err))
-    return false;
-  if (!scales.allocate(scale_data.size() * 4, rt::hip::BufferUsage::DeviceOnly,
-                       rt::GretaDataType::FP32, err))
+bool GGUFLoader::upload_packed(const TensorLoad &load, PackedTensor &packed,
+                               std::string *err) {
+  const bool ok = upload_parts(
+      load, packed,
+      [this](rt::hip::Buffer &buf, const void *src, size_t bytes,
+             std::string *e) { return impl_->up.upload(buf, src, bytes, e); },
+      err);
+  if (!packed.weights.owner)
+    if (const TensorInfo *it = impl_->find(load.name))
+      impl_->file.advise_dontneed(it->offset, it->size_bytes);
+  return ok;
+}
+
+static bool load_one(WeightLoader &loader, const TensorLoad &ld,
+                     std::string *err) {
+  if (!check_load(ld, err))
     return false;
+  switch (ld.format) {
+  case TensorLoad::Format::F32:
+    return loader.load_tensor(ld.name, *ld.buffer, err);
+  case TensorLoad::Format::FP16:
+    return loader.load_tensor_fp16(ld.name, *ld.buffer, err);
+  case TensorLoad::Format::INT8:
+    return loader.load_tensor_int8(ld.name, *ld.buffer, *ld.scales, err);
+  case TensorLoad::Format::INT4:
+    return loader.load_tensor_int4(ld.name, *ld.buffer, *ld.scales,
+                                   *ld.head_scales, err);
+  }
+  return false;
+}
 
-  if (!buffer.copy_to_device(packed_weights.data(), packed_weights.size(), err))
+bool WeightLoader::load_tensors(const std::vector<TensorLoad> &loads,
+                                std::string *err) {
+  for (const auto &ld : loads) {
+    std::string e;
+    if (!load_one(*this, ld, &e)) {
+      if (err)
+        *err = load_error(ld, e);
+      return false;
+    }
+  }
+  return true;
+}
+
+void WeightLoader::prefetch_tensor(const std::string &) {}
+
+bool WeightLoader::pack_tensor(const TensorLoad &load, PackedTensor &out,
+                               std::string *err) {
+  switch (load.format) {
+  case TensorLoad::Format::F32: {
+    std::vector<float> fp32;
+    if (!read_tensor_f32(load.name, fp32, err))
+      return false;
+    out.weights.own(std::move(fp32), rt::GretaDataType::FP32);
+    return true;
+  }
+  case TensorLoad::Format::FP16: {
+    std::vector<uint16_t> fp16;
+    if (!read_tensor_fp16(load.name, fp16, err))
+      return false;
+    out.weights.own(std::move(fp16), rt::GretaDataType::FP16);
+    return true;
+  }
+  case TensorLoad::Format::INT8:
+  case TensorLoad::Format::INT4:
+    break;
+  }
+  if (err)
+    *err = "INT8/INT4 packing is not supported by this loader";
+  return false;
+}
+
+bool WeightLoader::upload_packed(const TensorLoad &load, PackedTensor &packed,
+                                 std::string *err) {
+  return upload_parts(
+      load, packed,
+      [](rt::hip::Buffer &buf, const void *src, size_t bytes, std::string *e) {
+        return buf.copy_to_device(src, bytes, e);
+      },
+      err);
+}
+
+std::unique_ptr<LoadPipeline>
+WeightLoader::start_load(std::vector<TensorLoad> loads, std::string *err) {
+  const LoadPipelineOptions opt = LoadPipelineOptions::from_env();
+  auto list = std::make_shared<const std::vector<TensorLoad>>(std::move(loads));
+  // Los bucles OpenMP de la conversión se reparten entre los conversores
+  const int omp_threads = std::max(1, omp_get_max_threads() / opt.converters);
+  // El dispositivo HIP actual es por hilo: el uploader usa el del llamador
+  int device = 0;
+  const bool has_device = hipGetDevice(&device) == hipSuccess;
+
+  LoadStages st;
+  st.read = [this, list](size_t i, std::string *) {
+    const TensorLoad &ld = (*list)[i];
+    rt::TraceScope span("load.read", "load", span_detail(ld.name));
+    prefetch_tensor(ld.name);
+    return true;
+  };
+  st.convert = [this, list](size_t i, PackedTensor &out, std::string *e) {
+    const TensorLoad &ld = (*list)[i];
+    rt::TraceScope span("load.tensor", "load", span_detail(ld.name));
+    std::string why;
+    if (check_load(ld, &why) && pack_tensor(ld, out, &why))
+      return true;
+    *e = load_error(ld, why);
     return false;
-  if (!scales.copy_to_device(scale_data.data(), scale_data.size() * 4, err))
+  };
+  st.upload = [this, list](size_t i, PackedTensor &packed, std::string *e) {
+    const TensorLoad &ld = (*list)[i];
+    std::string why;
+    if (upload_packed(ld, packed, &why))
+      return true;
+    *e = load_error(ld, why);
     return false;
+  };
+  st.converter_init = [omp_threads] { omp_set_num_threads(omp_threads); };
+  if (has_device)
+    st.uploader_init = [device] { (void)hipSetDevice(device); };
+
+  auto pipe = std::make_unique<LoadPipeline>(opt);
+  if (!pipe->start(list->size(), std::move(st), err))
+    return nullptr;
+  return pipe;
+}
 
-  // 4. Per-head Scaling (Phase 5.3)
-  uint32_t num_heads = impl_->config.num_heads;
-  if (is_kv_weight && impl_->config.num_heads_kv > 0)
-    num_heads = impl_->config.num_heads_kv;
-  const uint32_t head_dim = impl_->config.head_dim;
-  std::vector<float> h_scales(num_heads, 1.0f);
-  bool is_qkv = (name.find("attn_q") != std::string::npos ||
-                 name.find("attn_k") != std::string::npos ||
-                 name.find("attn_v") != std::string::npos);
+bool GGUFLoader::load_tensors(const std::vector<TensorLoad> &loads,
+                              std::string *err) {
+  rt::TraceScope span("load.batch", "load", nullptr, loads.size());
+  std::unique_ptr<LoadPipeline> pipe = start_load(loads, err);
+  if (!pipe || !pipe->finish(err))
+    return false;
+  const LoadPipelineStats st = pipe->stats();
+  const double mb = static_cast<double>(st.bytes) / (1024.0 * 1024.0);
+  std::cout << "[GRETA_LOAD] " << loads.size() << " tensors, " << mb
+            << " MB in " << st.wall_s << " s ("
+            << (st.wall_s > 0 ? mb / st.wall_s : 0.0)
+            << " MB/s, converters=" << st.converters
+            << ", peak_inflight=" << st.peak_inflight << ", busy read/convert/"
+            << "upload=" << st.read_s << "/" << st.convert_s << "/"
+            << st.upload_s << " s)" << std::endl;
+  return true;
+}
 
-  if (is_qkv && num_heads > 0 && head_dim > 0) {
-    size_t D = impl_->config.dim;
-    size_t Dh = head_dim;
-#pragma omp parallel for
-    for (uint32_t h = 0; h < num_heads; ++h) {
-      float h_max = 0.0f;
-      for (size_t i = 0; i < Dh * D; ++i) {
-        h_max = std::max(h_max, std::abs(fp32[h * Dh * D + i]));
+// JSON mínimo para headers safetensors, index.json y config.json: recorre
+// el texto sin construir un árbol; cualquier error de sintaxis deja ok=false
+struct JsonReader {
+  const char *p;
+  const char *end;
+  bool ok = true;
+  int depth = 0;
+
+  bool fail() {
+    ok = false;
+    return false;
+  }
+  void ws() {
+    while (p < end && (*p == ' ' || *p == '\n' || *p == '\r' || *p == '\t'))
+      ++p;
+  }
+  bool peek(char c) {
+    ws();
+    return ok && p < end && *p == c;
+  }
+  bool eat(char c) {
+    if (!peek(c))
+      return fail();
+    ++p;
+    return true;
+  }
+
+  bool string(std::string &out) {
+    if (!eat('"'))
+      return false;
+    out.clear();
+    while (p < end && *p != '"') {
+      char c = *p++;
+      if (c != '\\') {
+        out += c;
+        continue;
+      }
+      if (p >= end)
+        return fail();
+      c = *p++;
+      switch (c) {
+      case 'n':
+        out += '\n';
+        break;
+      case 't':
+        out += '\t';
+        break;
+      case 'r':
+        out += '\r';
+        break;
+      case 'b':
+        out += '\b';
+        break;
+      case 'f':
+        out += '\f';
+        break;
+      case 'u': {
+        if (end - p < 4)
+          return fail();
+        const unsigned v =
+            static_cast<unsigned>(std::strtoul(std::string(p, 4).c_str(),
+                                               nullptr, 16));
+        p += 4;
+        // UTF-8 del punto BMP (los surrogates se copian tal cual)
+        if (v < 0x80) {
+          out += static_cast<char>(v);
+        } else if (v < 0x800) {
+          out += static_cast<char>(0xC0 | (v >> 6));
+          out += static_cast<char>(0x80 | (v & 0x3F));
+        } else {
+          out += static_cast<char>(0xE0 | (v >> 12));
+          out += static_cast<char>(0x80 | ((v >> 6) & 0x3F));
+          out += static_cast<char>(0x80 | (v & 0x3F));
+        }
+        break;
+      }
+      default: // " \ /
+        out += c;
       }
-      h_scales[h] = h_max > 1e-9f ? h_max : 1.0f;
     }
-    if (!head_scales.allocate(num_heads * 4, rt::hip::BufferUsage::DeviceOnly,
-                              rt::GretaDataType::FP32, err))
+    if (p >= end)
+      return fail();
+    ++p;
+    return true;
+  }
+
+  bool number(double &out) {
+    ws();
+    const char *q = p;
+    while (q < end && ((*q >= '0' && *q <= '9') || *q == '-' || *q == '+' ||
+                       *q == '.' || *q == 'e' || *q == 'E'))
+      ++q;
+    if (q == p)
+      return fail();
+    out = std::strtod(std::string(p, q).c_str(), nullptr);
+    p = q;
+    return true;
+  }
+
+  // Número si lo hay; cualquier otro valor (null, string...) se salta
+  bool number_or_skip(double &out, bool &got) {
+    ws();
+    got = p < end && ((*p >= '0' && *p <= '9') || *p == '-');
+    return got ? number(out) : skip();
+  }
+
+  template <typename F> bool object(F &&on_member) {
+    if (!eat('{'))
       return false;
-    if (!head_scales.copy_to_device(h_scales.data(), num_heads * 4, err))
+    if (peek('}'))
+      return eat('}');
+    std::string key;
+    for (;;) {
+      if (!string(key) || !eat(':') || !on_member(key))
+        return fail();
+      if (!peek(','))
+        break;
+      ++p;
+    }
+    return eat('}');
+  }
+
+  template <typename F> bool array(F &&on_item) {
+    if (!eat('['))
       return false;
+    if (peek(']'))
+      return eat(']');
+    for (;;) {
+      if (!on_item())
+        return fail();
+      if (!peek(','))
+        break;
+      ++p;
+    }
+    return eat(']');
   }
 
-  gcore::rt::GretaQuantInfo qinfo;
-  qinfo.group_size = 32;
-  qinfo.scales = scales.data();
-  qinfo.head_scales = is_qkv ? head_scales.data() : nullptr;
-  qinfo.num_heads = is_qkv ? num_heads : 0;
-  buffer.set_quant_info(qinfo);
+  bool literal(const char *word) {
+    const size_t n = std::strlen(word);
+    if (static_cast<size_t>(end - p) < n || std::memcmp(p, word, n) != 0)
+      return fail();
+    p += n;
+    return true;
+  }
 
-  return true;
+  bool skip() {
+    ws();
+    if (p >= end || ++depth > 64)
+      return fail();
+    bool r;
+    if (*p == '"') {
+      std::string tmp;
+      r = string(tmp);
+    } else if (*p == '{') {
+      r = object([&](const std::string &) { return skip(); });
+    } else if (*p == '[') {
+      r = array([&] { return skip(); });
+    } else if (*p == 't') {
+      r = literal("true");
+    } else if (*p == 'f') {
+      r = literal("false");
+    } else if (*p == 'n') {
+      r = literal("null");
+    } else {
+      double tmp;
+      r = number(tmp);
+    }
+    --depth;
+    return r;
+  }
+};
+
+static size_t safetensors_dtype_size(const std::string &d) {
+  if (d == "F64" || d == "I64" || d == "U64")
+    return 8;
+  if (d == "F32" || d == "I32" || d == "U32")
+    return 4;
+  if (d == "F16" || d == "BF16" || d == "I16" || d == "U16")
+    return 2;
+  if (d == "I8" || d == "U8" || d == "BOOL" || d == "F8_E4M3" ||
+      d == "F8_E5M2")
+    return 1;
+  return 0;
+}
+
+// Nombre Hugging Face (Llama) -> nombre GGUF, el que piden BlockScheduler y
+// CpuBlockScheduler. El layout de los datos es el mismo ([out, in] row-major);
+// los nombres que no son de Llama se quedan igual
+static std::string gguf_tensor_name(const std::string &hf) {
+  static const std::pair<const char *, const char *> kGlobal[] = {
+      {"model.embed_tokens.weight", "token_embd.weight"},
+      {"lm_head.weight", "output.weight"},
+      {"model.norm.weight", "output_norm.weight"}};
+  for (const auto &[from, to] : kGlobal)
+    if (hf == from)
+      return to;
+  static const std::string layers = "model.layers.";
+  if (hf.compare(0, layers.size(), layers) != 0)
+    return hf;
+  const size_t dot = hf.find('.', layers.size());
+  if (dot == std::string::npos || dot == layers.size() ||
+      hf.find_first_not_of("0123456789", layers.size()) != dot)
+    return hf;
+  static const std::pair<std::string, const char *> kLayer[] = {
+      {"self_attn.q_proj.", "attn_q."},
+      {"self_attn.k_proj.", "attn_k."},
+      {"self_attn.v_proj.", "attn_v."},
+      {"self_attn.o_proj.", "attn_output."},
+      {"mlp.gate_proj.", "ffn_gate."},
+      {"mlp.up_proj.", "ffn_up."},
+      {"mlp.down_proj.", "ffn_down."},
+      {"input_layernorm.", "attn_norm."},
+      {"post_attention_layernorm.", "ffn_norm."}};
+  for (const auto &[from, to] : kLayer)
+    if (hf.compare(dot + 1, from.size(), from) == 0)
+      return "blk." + hf.substr(layers.size(), dot - layers.size()) + "." +
+             to + hf.substr(dot + 1 + from.size());
+  return hf;
+}
+
+enum class FloatType { F32, F16, BF16, Other };
+
+static FloatType float_type(const std::string &dtype) {
+  if (dtype == "F32")
+    return FloatType::F32;
+  if (dtype == "F16")
+    return FloatType::F16;
+  if (dtype == "BF16")
+    return FloatType::BF16;
+  return FloatType::Other;
+}
+
+static float bf16_to_fp32(uint16_t h) {
+  const uint32_t f = static_cast<uint32_t>(h) << 16;
+  float result;
+  std::memcpy(&result, &f, 4);
+  return result;
+}
+
+// dst[i] = conv(src + i * src_size); los datos del mapping pueden no estar
+// alineados, conv lee con memcpy
+template <typename Dst, typename Conv>
+static void convert_elements(const uint8_t *src, size_t src_size, Dst *dst,
+                             size_t n, Conv conv) {
+#pragma omp parallel for if (n >= (size_t{1} << 16))
+  for (size_t i = 0; i < n; ++i)
+    dst[i] = conv(src + i * src_size);
+}
+
+static uint16_t load_u16(const uint8_t *s) {
+  uint16_t h;
+  std::memcpy(&h, s, 2);
+  return h;
 }
 
-struct SafeTensorsLoader::Impl {};
+static void convert_to_f32(FloatType t, const uint8_t *src, float *dst,
+                           size_t n) {
+  switch (t) {
+  case FloatType::F32:
+    std::memcpy(dst, src, n * 4);
+    break;
+  case FloatType::F16:
+    convert_elements(src, 2, dst, n, [](const uint8_t *s) {
+      return fp16_to_fp32(load_u16(s));
+    });
+    break;
+  case FloatType::BF16:
+    convert_elements(src, 2, dst, n, [](const uint8_t *s) {
+      return bf16_to_fp32(load_u16(s));
+    });
+    break;
+  case FloatType::Other:
+    break;
+  }
+}
+
+static void convert_to_f16(FloatType t, const uint8_t *src, uint16_t *dst,
+                           size_t n) {
+  switch (t) {
+  case FloatType::F32:
+    convert_elements(src, 4, dst, n, [](const uint8_t *s) {
+      float f;
+      std::memcpy(&f, s, 4);
+      return fp32_to_fp16(f);
+    });
+    break;
+  case FloatType::F16:
+    std::memcpy(dst, src, n * 2);
+    break;
+  case FloatType::BF16:
+    convert_elements(src, 2, dst, n, [](const uint8_t *s) {
+      return fp32_to_fp16(bf16_to_fp32(load_u16(s)));
+    });
+    break;
+  case FloatType::Other:
+    break;
+  }
+}
+
+struct SafeTensorsLoader::Impl {
+  std::string path;
+  std::vector<std::unique_ptr<MappedFile>> shards;
+  std::vector<std::string> shard_names;
+  std::vector<TensorInfo> tensors; // offset: absoluto dentro de su shard
+  std::vector<uint32_t> shard_of;
+  std::unordered_map<std::string, size_t> index;
+  ModelConfig config = ModelConfig::llama2_7b();
+  Uploader up;
+
+  const TensorInfo *find(const std::string &name) const {
+    auto it = index.find(name);
+    return it == index.end() ? nullptr : &tensors[it->second];
+  }
+
+  const MappedFile &file_of(const TensorInfo &t) const {
+    return *shards[shard_of[static_cast<size_t>(&t - tensors.data())]];
+  }
+
+  bool view(const std::string &name, TensorView &out, std::string *err) const {
+    const TensorInfo *t = find(name);
+    if (!t) {
+      if (err)
+        *err = "Tensor " + name + " not found in " + path;
+      return false;
+    }
+    // Rango validado al parsear el header
+    out.info = t;
+    out.data = file_of(*t).view(t->offset, t->size_bytes);
+    return true;
+  }
+
+  // 8 bytes de longitud (LE), header JSON y los datos a continuación
+  bool parse_shard(const std::string &file, const std::string &shard_name,
+                   std::string *err) {
+    auto mf = std::make_unique<MappedFile>();
+    if (!mf->open(file, err))
+      return false;
+    mf->advise_sequential();
+    ByteReader r{mf->data(), mf->data() + mf->size()};
+    const uint64_t n = r.get<uint64_t>();
+    const uint8_t *hdr = r.ok && n <= mf->size() - 8 ? r.take(n) : nullptr;
+    if (!hdr) {
+      *err = "SafeTensors header truncated: " + file;
+      return false;
+    }
+    const size_t data_begin = 8 + n;
+    const size_t data_bytes = mf->size() - data_begin;
+    const uint32_t shard = static_cast<uint32_t>(shards.size());
+
+    JsonReader j{reinterpret_cast<const char *>(hdr),
+                 reinterpret_cast<const char *>(hdr) + n};
+    std::string bad;
+    const bool parsed = j.object([&](const std::string &name) {
+      if (name == "__metadata__")
+        return j.skip();
+      TensorInfo info;
+      info.name = gguf_tensor_name(name);
+      uint64_t offs[2] = {0, 0};
+      int n_offs = 0;
+      const bool fields = j.object([&](const std::string &key) {
+        double v;
+        if (key == "dtype")
+          return j.string(info.dtype);
+        if (key == "shape")
+          return j.array([&] {
+            if (!j.number(v) || v < 0)
+              return false;
+            info.shape.push_back(static_cast<size_t>(v));
+            return true;
+          });
+        if (key == "data_offsets")
+          return j.array([&] {
+            if (!j.number(v) || v < 0 || n_offs >= 2)
+              return false;
+            offs[n_offs++] = static_cast<uint64_t>(v);
+            return true;
+          });
+        return j.skip();
+      });
+      if (!fields)
+        return false;
+      size_t n_elem = 1;
+      for (size_t d : info.shape) {
+        if (d != 0 && n_elem > SIZE_MAX / d)
+          n_elem = SIZE_MAX;
+        else
+          n_elem *= d;
+      }
+      const size_t es = safetensors_dtype_size(info.dtype);
+      if (n_offs != 2 || es == 0 || offs[1] < offs[0] ||
+          offs[1] > data_bytes || n_elem > SIZE_MAX / es ||
+          offs[1] - offs[0] != n_elem * es) {
+        bad = name;
+        return false;
+      }
+      info.offset = data_begin + offs[0];
+      info.size_bytes = offs[1] - offs[0];
+      if (!index.emplace(info.name, tensors.size()).second) {
+        bad = name + " (duplicate " + info.name + ")";
+        return false;
+      }
+      tensors.push_back(std::move(info));
+      shard_of.push_back(shard);
+      return true;
+    });
+    if (!parsed) {
+      *err = bad.empty() ? "SafeTensors header is not valid JSON: " + file
+                         : "SafeTensors tensor " + bad +
+                               " has an invalid dtype, shape or data_offsets "
+                               "in " +
+                               file;
+      return false;
+    }
+    shards.push_back(std::move(mf));
+    shard_names.push_back(shard_name);
+    return true;
+  }
+
+  // model.safetensors.index.json: {"weight_map": {tensor: shard, ...}}
+  bool parse_index(const std::string &index_path, std::string *err) {
+    MappedFile f;
+    if (!f.open(index_path, err))
+      return false;
+    JsonReader j{reinterpret_cast<const char *>(f.data()),
+                 reinterpret_cast<const char *>(f.data()) + f.size()};
+    std::vector<std::pair<std::string, std::string>> weight_map;
+    const bool parsed = j.object([&](const std::string &key) {
+      if (key != "weight_map")
+        return j.skip();
+      return j.object([&](const std::string &name) {
+        std::string shard;
+        if (!j.string(shard))
+          return false;
+        weight_map.emplace_back(name, std::move(shard));
+        return true;
+      });
+    });
+    if (!parsed || weight_map.empty()) {
+      *err = "Invalid SafeTensors index (no weight_map): " + index_path;
+      return false;
+    }
+    const std::filesystem::path dir =
+        std::filesystem::path(index_path).parent_path();
+    std::unordered_map<std::string, uint32_t> opened;
+    for (const auto &[name, shard] : weight_map) {
+      if (opened.count(shard))
+        continue;
+      opened.emplace(shard, static_cast<uint32_t>(shards.size()));
+      if (!parse_shard((dir / shard).string(), shard, err))
+        return false;
+    }
+    for (const auto &[name, shard] : weight_map) {
+      const TensorInfo *t = find(gguf_tensor_name(name));
+      if (!t || shard_of[static_cast<size_t>(t - tensors.data())] !=
+                    opened[shard]) {
+        *err = "SafeTensors index maps " + name + " to " + shard +
+               " but the shard does not contain it";
+        return false;
+      }
+    }
+    return true;
+  }
+
+  // config.json de Hugging Face (Llama y derivados)
+  bool parse_config(const std::string &config_path, std::string *err) {
+    MappedFile f;
+    if (!f.open(config_path, err))
+      return false;
+    JsonReader j{reinterpret_cast<const char *>(f.data()),
+                 reinterpret_cast<const char *>(f.data()) + f.size()};
+    ModelConfig cfg = ModelConfig::llama2_7b();
+    bool has_kv = false, has_head_dim = false;
+    const bool parsed = j.object([&](const std::string &key) {
+      double v = 0.0;
+      bool got = false;
+      if (key == "hidden_size" || key == "intermediate_size" ||
+          key == "num_hidden_layers" || key == "num_attention_heads" ||
+          key == "num_key_value_heads" || key == "vocab_size" ||
+          key == "max_position_embeddings" || key == "head_dim" ||
+          key == "rope_theta" || key == "rms_norm_eps") {
+        if (!j.number_or_skip(v, got))
+          return false;
+      } else {
+        return j.skip();
+      }
+      if (!got)
+        return true;
+      const uint32_t u = static_cast<uint32_t>(v);
+      if (key == "hidden_size")
+        cfg.dim = u;
+      else if (key == "intermediate_size")
+        cfg.hidden_dim = u;
+      else if (key == "num_hidden_layers")
+        cfg.num_layers = u;
+      else if (key == "num_attention_heads")
+        cfg.num_heads = u;
+      else if (key == "num_key_value_heads")
+        cfg.num_heads_kv = u, has_kv = true;
+      else if (key == "vocab_size")
+        cfg.vocab_size = u;
+      else if (key == "max_position_embeddings")
+        cfg.max_seq_len = u;
+      else if (key == "head_dim")
+        cfg.head_dim = u, has_head_dim = true;
+      else if (key == "rope_theta")
+        cfg.rope_base = static_cast<float>(v);
+      else
+        cfg.rms_eps = static_cast<float>(v);
+      return true;
+    });
+    if (!parsed) {
+      *err = "Invalid config.json: " + config_path;
+      return false;
+    }
+    if (!has_kv)
+      cfg.num_heads_kv = cfg.num_heads;
+    if (!has_head_dim && cfg.num_heads > 0)
+      cfg.head_dim = cfg.dim / cfg.num_heads;
+    config = std::move(cfg);
+    return true;
+  }
+
+  // Tensor F32/F16/BF16 -> buffer FP32 o FP16
+  bool load_float(const std::string &name, rt::hip::Buffer &buffer, bool fp16,
+                  std::string *err) {
+    rt::TraceScope span("load.tensor", "load", span_detail(name));
+    TensorView v;
+    if (!view(name, v, err))
+      return false;
+    const FloatType ft = float_type(v.info->dtype);
+    if (ft == FloatType::Other) {
+      if (err)
+        *err =
+            "Unsupported SafeTensors dtype " + v.info->dtype + " for " + name;
+      return false;
+    }
+    MappedPages pages(file_of(*v.info), *v.info);
+    const size_t in_size = ft == FloatType::F32 ? 4 : 2;
+    const size_t out_size = fp16 ? 2 : 4;
+    const size_t n_elem = v.info->size_bytes / in_size;
+    const size_t bytes = n_elem * out_size;
+    if (!buffer.allocate(bytes, rt::hip::BufferUsage::DeviceOnly,
+                         fp16 ? rt::GretaDataType::FP16
+                              : rt::GretaDataType::FP32,
+                         err))
+      return false;
+    // Mismo dtype: subida directa desde el mapping
+    if ((ft == FloatType::F16 && fp16) || (ft == FloatType::F32 && !fp16))
+      return up.upload(buffer, v.data, bytes, err);
+    const uint8_t *src = v.data;
+    return up.upload_converted(
+        buffer, bytes,
+        [&](void *dst, size_t off, size_t n) {
+          if (off % out_size != 0 || n % out_size != 0)
+            return false;
+          const size_t first = off / out_size;
+          if (fp16)
+            convert_to_f16(ft, src + first * in_size,
+                           static_cast<uint16_t *>(dst), n / out_size);
+          else
+            convert_to_f32(ft, src + first * in_size,
+                           static_cast<float *>(dst), n / out_size);
+          return true;
+        },
+        err);
+  }
+};
+
 SafeTensorsLoader::SafeTensorsLoader() : impl_(std::make_unique<Impl>()) {}
 SafeTensorsLoader::~SafeTensorsLoader() = default;
+
 bool SafeTensorsLoader::open(const std::string &path, std::string *err) {
-  return false;
+  rt::TraceScope span("load.open", "load");
+  impl_ = std::make_unique<Impl>();
+  namespace fs = std::filesystem;
+  std::error_code ec;
+  std::string target = path;
+  if (fs::is_directory(path, ec)) {
+    const fs::path idx = fs::path(path) / "model.safetensors.index.json";
+    target = fs::exists(idx, ec)
+                 ? idx.string()
+                 : (fs::path(path) / "model.safetensors").string();
+  }
+  impl_->path = target;
+  const bool is_index = target.size() >= 5 &&
+                        target.compare(target.size() - 5, 5, ".json") == 0;
+  if (!(is_index ? impl_->parse_index(target, err)
+                 : impl_->parse_shard(target,
+                                      fs::path(target).filename().string(),
+                                      err)))
+    return false;
+  const fs::path config = fs::path(target).parent_path() / "config.json";
+  if (fs::exists(config, ec) && !impl_->parse_config(config.string(), err))
+    return false;
+  return true;
+}
+
+std::vector<TensorInfo> SafeTensorsLoader::list_tensors() const {
+  return impl_->tensors;
+}
+
+ModelConfig SafeTensorsLoader::get_config() const { return impl_->config; }
+
+bool SafeTensorsLoader::view(const std::string &name, TensorView &out,
+                             std::string *err) const {
+  return impl_->view(name, out, err);
+}
+
+bool SafeTensorsLoader::read_tensor_f32(const std::string &name,
+                                        std::vector<float> &out,
+                                        std::string *err) {
+  rt::TraceScope span("load.read_f32", "load", span_detail(name));
+  TensorView v;
+  if (!impl_->view(name, v, err))
+    return false;
+  const FloatType ft = float_type(v.info->dtype);
+  if (ft == FloatType::Other) {
+    if (err)
+      *err = "Unsupported SafeTensors dtype " + v.info->dtype + " for " + name;
+    return false;
+  }
+  MappedPages pages(impl_->file_of(*v.info), *v.info);
+  out.resize(v.info->size_bytes / (ft == FloatType::F32 ? 4 : 2));
+  convert_to_f32(ft, v.data, out.data(), out.size());
+  return true;
 }
-std::vector<TensorInfo> SafeTensorsLoader::list_tensors() const { return {}; }
+
+bool SafeTensorsLoader::read_tensor_fp16(const std::string &name,
+                                         std::vector<uint16_t> &out,
+                                         std::string *err) {
+  rt::TraceScope span("load.read_fp16", "load", span_detail(name));
+  TensorView v;
+  if (!impl_->view(name, v, err))
+    return false;
+  const FloatType ft = float_type(v.info->dtype);
+  if (ft == FloatType::Other) {
+    if (err)
+      *err = "Unsupported SafeTensors dtype " + v.info->dtype + " for " + name;
+    return false;
+  }
+  MappedPages pages(impl_->file_of(*v.info), *v.info);
+  out.resize(v.info->size_bytes / (ft == FloatType::F32 ? 4 : 2));
+  convert_to_f16(ft, v.data, out.data(), out.size());
+  return true;
+}
+
 bool SafeTensorsLoader::load_tensor(const std::string &name,
-                                    gcore::rt::hip::Buffer &b, std::string *e) {
-  return false;
+                                    gcore::rt::hip::Buffer &buffer,
+                                    std::string *err) {
+  return impl_->load_float(name, buffer, false, err);
 }
+
 bool SafeTensorsLoader::load_tensor_fp16(const std::string &name,
-                                         gcore::rt::hip::Buffer &b,
-                                         std::string *e) {
-  return false;
+                                         gcore::rt::hip::Buffer &buffer,
+                                         std::string *err) {
+  return impl_->load_float(name, buffer, true, err);
 }
+
 bool SafeTensorsLoader::load_tensor_int8(const std::string &name,
                                          gcore::rt::hip::Buffer &buffer,
                                          gcore::rt::hip::Buffer &scales,
                                          std::string *err) {
+  if (err)
+    *err = "INT8 quantization of " + name +
+           " is only supported for GGUF (load SafeTensors as FP16)";
   return false;
 }
+
 bool SafeTensorsLoader::load_tensor_int4(const std::string &name,
                                          gcore::rt::hip::Buffer &buffer,
                                          gcore::rt::hip::Buffer &scales,
                                          gcore::rt::hip::Buffer &head_scales,
                                          std::string *err) {
+  if (err)
+    *err = "INT4 quantization of " + name +
+           " is only supported for GGUF (load SafeTensors as FP16)";
   return false;
 }
-ModelConfig SafeTensorsLoader::get_config() const {
-  return ModelConfig::llama2_7b();
-}
 
 std::unique_ptr<WeightLoader> create_weight_loader(const std::string &p,
                                                    std::string *e) {
+  std::unique_ptr<WeightLoader> l;
+  std::error_code ec;
   if (p.find(".gguf") != std::string::npos) {
-    auto l = std::make_unique<GGUFLoader>();
-    if (!l->open(p, e))
-      return nullptr;
-    return l;
+    l = std::make_unique<GGUFLoader>();
+  } else if (p.find(".safetensors") != std::string::npos ||
+             std::filesystem::is_directory(p, ec)) {
+    l = std::make_unique<SafeTensorsLoader>();
+  } else {
+    *e = "Unsupported format";
+    return nullptr;
   }
-  *e = "Unsupported format";
-  return nullptr;
+  WeightCacheConfig cache = WeightCacheConfig::from_env();
+  if (!cache.dir.empty())
+    l = std::make_unique<CachedWeightLoader>(std::move(l), std::move(cache));
+  if (!l->open(p, e))
+    return nullptr;
+  return l;
 }
 } // namespace gcore::inference
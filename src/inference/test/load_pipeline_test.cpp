@@ -0,0 +1,205 @@
+#include "gcore/inference/load_pipeline.hpp"
+
+#include <atomic>
+#include <chrono>
+#include <condition_variable>
+#include <cstring>
+#include <iostream>
+#include <mutex>
+#include <string>
+#include <thread>
+#include <vector>
+
+using gcore::inference::LoadPipeline;
+using gcore::inference::LoadPipelineOptions;
+using gcore::inference::LoadStages;
+using gcore::inference::PackedTensor;
+using gcore::rt::GretaDataType;
+
+static bool check(bool ok, const char *what) {
+  std::cout << (ok ? "PASS: " : "FAIL: ") << what << "\n";
+  return ok;
+}
+
+// Sumidero de subida falso: copia cada tensor a "dispositivo" (host) y
+// registra el orden y cuántos había convertidos sin subir
+struct MockSink {
+  std::mutex mu;
+  std::vector<size_t> order;
+  std::vector<std::vector<uint32_t>> device;
+  std::atomic<size_t> converted{0};
+  std::atomic<size_t> uploaded{0};
+  std::atomic<size_t> peak_pending{0};
+  size_t elems = 0;
+
+  MockSink(size_t n, size_t elems_per_item)
+      : device(n), elems(elems_per_item) {}
+
+  LoadStages stages(int slow_convert_every = 0) {
+    LoadStages st;
+    st.read = [](size_t, std::string *) { return true; };
+    st.convert = [this, slow_convert_every](size_t i, PackedTensor &out,
+                                            std::string *) {
+      // Conversión desigual: los índices altos pueden terminar antes
+      if (slow_convert_every && i % slow_convert_every == 0)
+        std::this_thread::sleep_for(std::chrono::milliseconds(2));
+      std::vector<uint32_t> v(elems);
+      for (size_t k = 0; k < elems; ++k)
+        v[k] = static_cast<uint32_t>(i * 1000003u + k);
+      out.weights.own(std::move(v), GretaDataType::FP32);
+      const size_t pending = ++converted - uploaded.load();
+      size_t peak = peak_pending.load();
+      while (pending > peak &&
+             !peak_pending.compare_exchange_weak(peak, pending))
+        ;
+      return true;
+    };
+    st.upload = [this](size_t i, PackedTensor &in, std::string *) {
+      std::this_thread::sleep_for(std::chrono::microseconds(200));
+      std::vector<uint32_t> dst(in.weights.bytes / 4);
+      std::memcpy(dst.data(), in.weights.data, in.weights.bytes);
+      {
+        std::lock_guard<std::mutex> lk(mu);
+        order.push_back(i);
+        device[i] = std::move(dst);
+      }
+      ++uploaded;
+      return true;
+    };
+    return st;
+  }
+
+  bool contents_ok() const {
+    for (size_t i = 0; i < device.size(); ++i)
+      for (size_t k = 0; k < elems; ++k)
+        if (device[i].size() != elems ||
+            device[i][k] != static_cast<uint32_t>(i * 1000003u + k))
+          return false;
+    return true;
+  }
+};
+
+int main() {
+  std::cout << "GRETA CORE: Load Pipeline Test\n";
+  bool ok = true;
+
+  // Orden de subida y contenido con conversores desordenados
+  {
+    const size_t n = 64;
+    LoadPipelineOptions opt;
+    opt.converters = 4;
+    opt.max_inflight = 6;
+    MockSink sink(n, 1024);
+    LoadPipeline pipe(opt);
+    std::string err;
+    ok &= check(pipe.start(n, sink.stages(3), &err), "start");
+    ok &= check(pipe.finish(&err), "finish");
+    bool in_order = sink.order.size() == n;
+    for (size_t i = 0; i < sink.order.size() && in_order; ++i)
+      in_order = sink.order[i] == i;
+    ok &= check(in_order, "uploads strictly in index order");
+    ok &= check(sink.contents_ok(), "uploaded bytes match converted bytes");
+    const auto st = pipe.stats();
+    std::cout << "peak_inflight=" << st.peak_inflight
+              << " peak_pending=" << sink.peak_pending.load() << "\n";
+    ok &= check(st.peak_inflight <= opt.max_inflight &&
+                    sink.peak_pending.load() <= opt.max_inflight,
+                "in-flight items bounded by max_inflight");
+    ok &= check(st.uploaded == n && st.bytes == n * 1024 * 4, "stats");
+  }
+
+  // Backpressure por bytes: con el límite casi a 0 sólo se convierte el
+  // siguiente a subir (más los que ya estaban en marcha y el que se sube)
+  {
+    const size_t n = 32;
+    LoadPipelineOptions opt;
+    opt.converters = 4;
+    opt.max_inflight = 16;
+    opt.max_inflight_bytes = 1;
+    MockSink sink(n, 4096);
+    LoadPipeline pipe(opt);
+    std::string err;
+    pipe.start(n, sink.stages(), &err);
+    ok &= check(pipe.finish(&err) && sink.contents_ok(),
+                "bytes-limited load completes");
+    const size_t item = 4096 * 4;
+    std::cout << "peak_host_bytes=" << pipe.stats().peak_host_bytes << "\n";
+    ok &= check(pipe.stats().peak_host_bytes <=
+                    static_cast<size_t>(opt.converters + 1) * item,
+                "host bytes bounded (one item per converter + uploader)");
+  }
+
+  // wait(k) vuelve antes de que termine el resto (primeras capas primero)
+  {
+    const size_t n = 20;
+    std::mutex gate_mu;
+    std::condition_variable gate_cv;
+    bool open = false;
+    MockSink sink(n, 16);
+    LoadStages st = sink.stages();
+    auto upload = st.upload;
+    st.upload = [&, upload](size_t i, PackedTensor &in, std::string *e) {
+      if (i == 5) {
+        std::unique_lock<std::mutex> lk(gate_mu);
+        gate_cv.wait(lk, [&] { return open; });
+      }
+      return upload(i, in, e);
+    };
+    LoadPipeline pipe;
+    std::string err;
+    pipe.start(n, std::move(st), &err);
+    ok &= check(pipe.wait(5, &err) && pipe.uploaded() == 5,
+                "wait(5) returns while item 5 is still pending");
+    {
+      std::lock_guard<std::mutex> lk(gate_mu);
+      open = true;
+    }
+    gate_cv.notify_all();
+    ok &= check(pipe.finish(&err) && sink.contents_ok(), "rest completes");
+  }
+
+  // Un error para todas las etapas y llega a wait()/finish()
+  {
+    const size_t n = 40;
+    MockSink sink(n, 16);
+    LoadStages st = sink.stages();
+    auto convert = st.convert;
+    st.convert = [convert](size_t i, PackedTensor &out, std::string *e) {
+      if (i == 7) {
+        *e = "bad tensor 7";
+        return false;
+      }
+      return convert(i, out, e);
+    };
+    LoadPipelineOptions opt;
+    opt.converters = 3;
+    opt.max_inflight = 4;
+    LoadPipeline pipe(opt);
+    std::string err;
+    pipe.start(n, std::move(st), &err);
+    const bool waited = pipe.wait(n, &err);
+    ok &= check(!waited && err == "bad tensor 7", "failure reaches wait()");
+    ok &= check(!pipe.finish(&err) && err == "bad tensor 7",
+                "failure reported by finish()");
+    ok &= check(sink.uploaded.load() <= 7,
+                "nothing uploaded at or past the failed item");
+  }
+
+  // Pipeline ya terminado (cargas síncronas) y cancelación en destructor
+  {
+    auto done = LoadPipeline::completed(3);
+    std::string err;
+    ok &= check(done->wait(3, &err) && done->finish(&err),
+                "completed() pipeline");
+    MockSink sink(1000, 1 << 14);
+    {
+      LoadPipeline pipe;
+      pipe.start(1000, sink.stages(), &err);
+      pipe.wait(2, &err);
+    }
+    ok &= check(sink.uploaded.load() < 1000, "destructor cancels the load");
+  }
+
+  std::cout << "\nSTATUS=" << (ok ? "OK" : "FAIL") << "\n";
+  return ok ? 0 : 1;
+}
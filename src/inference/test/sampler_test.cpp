@@ -0,0 +1,201 @@
+#include "gcore/inference/sampler.hpp"
+
+#include <algorithm>
+#include <cmath>
+#include <iostream>
+#include <limits>
+#include <random>
+#include <set>
+#include <vector>
+
+using gcore::inference::Sampler;
+using gcore::inference::SamplingParams;
+
+static bool check(bool ok, const char *what) {
+  std::cout << (ok ? "PASS: " : "FAIL: ") << what << "\n";
+  return ok;
+}
+
+static std::vector<float> random_logits(size_t n, uint32_t seed) {
+  std::mt19937 rng(seed);
+  std::normal_distribution<float> d(0.0f, 2.0f);
+  std::vector<float> v(n);
+  for (float &x : v)
+    x = d(rng);
+  return v;
+}
+
+// Ids ordenados por logit (mayor primero, id menor en empates)
+static std::vector<int32_t> sorted_ids(const std::vector<float> &l) {
+  std::vector<int32_t> ids(l.size());
+  for (size_t i = 0; i < ids.size(); ++i)
+    ids[i] = static_cast<int32_t>(i);
+  std::stable_sort(ids.begin(), ids.end(),
+                   [&](int32_t a, int32_t b) { return l[a] > l[b]; });
+  return ids;
+}
+
+int main() {
+  std::cout << "GRETA CORE: Sampler Test\n";
+  bool ok = true;
+  const float nan = std::numeric_limits<float>::quiet_NaN();
+
+  // argmax / top_k frente a una ordenación completa
+  {
+    std::vector<float> l = random_logits(32000, 1);
+    l[0] = nan;
+    l[777] = l[31000] = 50.0f;
+    ok &= check(Sampler::argmax(l.data(), l.size()) == 777,
+                "argmax skips NaN, lowest id on ties");
+    l[0] = 0.0f; // NaN fuera para comparar con la ordenación
+    const std::vector<int32_t> ref = sorted_ids(l);
+    bool same = true;
+    for (size_t k : {size_t{1}, size_t{5}, size_t{300}, size_t{5000}}) {
+      std::vector<std::pair<float, int32_t>> top;
+      Sampler::top_k(l.data(), l.size(), k, top);
+      same &= top.size() == k;
+      for (size_t i = 0; same && i < k; ++i)
+        same &= top[i].second == ref[i] && top[i].first == l[ref[i]];
+    }
+    ok &= check(same, "top_k (heap and nth_element) matches a full sort");
+  }
+
+  // Semilla: misma secuencia con la misma semilla, el RNG avanza entre tokens
+  {
+    const std::vector<float> l = random_logits(4096, 2);
+    SamplingParams p;
+    p.top_k = 0;
+    p.temperature = 1.5f;
+    auto run = [&](int32_t seed) {
+      Sampler s(seed);
+      std::vector<int32_t> out;
+      for (int i = 0; i < 64; ++i)
+        out.push_back(s.sample(l.data(), l.size(), p));
+      return out;
+    };
+    const auto a = run(7), b = run(7), c = run(8);
+    ok &= check(a == b && a != c, "same seed, same token sequence");
+    ok &= check(std::set<int32_t>(a.begin(), a.end()).size() > 1,
+                "RNG carries over between calls");
+  }
+
+  // top-k: sólo los k mejores y con frecuencias de su softmax
+  {
+    const std::vector<float> l = random_logits(32000, 3);
+    const std::vector<int32_t> ref = sorted_ids(l);
+    SamplingParams p;
+    p.top_k = 4;
+    p.temperature = 0.7f;
+    Sampler s(11);
+    std::vector<int> hits(4, 0);
+    bool inside = true;
+    const int draws = 20000;
+    for (int i = 0; i < draws; ++i) {
+      const int32_t t = s.sample(l.data(), l.size(), p);
+      const auto it = std::find(ref.begin(), ref.begin() + 4, t);
+      inside &= it != ref.begin() + 4;
+      if (it != ref.begin() + 4)
+        hits[it - ref.begin()]++;
+    }
+    double z = 0;
+    for (int j = 0; j < 4; ++j)
+      z += std::exp((l[ref[j]] - l[ref[0]]) / p.temperature);
+    bool freq = true;
+    for (int j = 0; j < 4; ++j) {
+      const double expect =
+          std::exp((l[ref[j]] - l[ref[0]]) / p.temperature) / z;
+      freq &= std::abs(hits[j] / double(draws) - expect) < 0.02;
+    }
+    ok &= check(inside, "top_k=4 only samples the 4 best logits");
+    ok &= check(freq, "top_k frequencies follow the truncated softmax");
+  }
+
+  // top-p: el núcleo más pequeño que cubre p (0.5 + 0.3 >= 0.75)
+  {
+    std::vector<float> l(32000, -30.0f);
+    l[9] = std::log(0.5f);
+    l[4] = std::log(0.3f);
+    l[100] = std::log(0.15f);
+    l[31999] = std::log(0.05f);
+    SamplingParams p;
+    p.top_k = 0;
+    p.top_p = 0.75f;
+    Sampler s(5);
+    std::set<int32_t> seen;
+    for (int i = 0; i < 2000; ++i)
+      seen.insert(s.sample(l.data(), l.size(), p));
+    ok &= check(seen == std::set<int32_t>{9, 4}, "top_p keeps the nucleus");
+    p.top_p = 0.9f;
+    seen.clear();
+    for (int i = 0; i < 4000; ++i)
+      seen.insert(s.sample(l.data(), l.size(), p));
+    ok &= check(seen == std::set<int32_t>{9, 4, 100},
+                "top_p adds tokens until the mass reaches p");
+  }
+
+  // top-p con cola plana: el núcleo abarca miles de tokens
+  {
+    const std::vector<float> l = random_logits(32000, 6);
+    const std::vector<int32_t> ref = sorted_ids(l);
+    SamplingParams p;
+    p.top_k = 0;
+    p.top_p = 0.6f;
+    p.temperature = 1.2f;
+    double z = 0;
+    for (float v : l)
+      z += std::exp((v - l[ref[0]]) / p.temperature);
+    std::vector<char> in_nucleus(l.size(), 0);
+    double acc = 0;
+    size_t size = 0;
+    while (acc < p.top_p * z) {
+      acc += std::exp((l[ref[size]] - l[ref[0]]) / p.temperature);
+      in_nucleus[ref[size++]] = 1;
+    }
+    Sampler s(9);
+    bool inside = true;
+    std::set<int32_t> seen;
+    for (int i = 0; i < 5000; ++i) {
+      const int32_t t = s.sample(l.data(), l.size(), p);
+      inside &= in_nucleus[t] != 0;
+      seen.insert(t);
+    }
+    std::cout << "nucleus=" << size << " distinct=" << seen.size() << "\n";
+    ok &= check(inside && seen.size() > 100,
+                "top_p over a flat tail stays in the exact nucleus");
+  }
+
+  // Lotes, NaN y casos degenerados
+  {
+    const size_t rows = 8, vocab = 1000;
+    std::vector<float> l = random_logits(rows * vocab, 4);
+    l[3 * vocab + 10] = nan;
+    SamplingParams p;
+    p.top_k = 40;
+    p.top_p = 0.9f;
+    Sampler a(3), b(3);
+    std::vector<int32_t> batch(rows);
+    a.sample_batch(l.data(), rows, vocab, p, batch.data());
+    bool same = true;
+    for (size_t r = 0; r < rows; ++r)
+      same &= batch[r] == b.sample(l.data() + r * vocab, vocab, p);
+    ok &= check(same, "sample_batch == per-row sample with the same seed");
+
+    std::vector<float> nans(16, nan);
+    nans[6] = 1.0f;
+    SamplingParams q;
+    q.top_k = 0;
+    bool never_nan = true;
+    for (int i = 0; i < 200; ++i)
+      never_nan &= a.sample(nans.data(), nans.size(), q) == 6;
+    std::fill(nans.begin(), nans.end(), nan);
+    ok &= check(never_nan && a.sample(nans.data(), nans.size(), q) == 0,
+                "NaN logits are never sampled");
+    q.temperature = 0.0f;
+    ok &= check(a.sample(l.data(), vocab, q) ==
+                    Sampler::argmax(l.data(), vocab),
+                "temperature 0 is greedy");
+  }
+
+  std::cout << "\nSTATUS=" << (ok ? "OK" : "FAIL") << "\n";
+  return ok ? 0 : 1;
+}
@@ -1,10 +1,511 @@
 #include "gcore/inference/model_config.hpp"
+#include "gcore/inference/weight_cache.hpp"
 #include "gcore/inference/weight_loader.hpp"
 
+#include <chrono>
+#include <cstdint>
+#include <cstdio>
+#include <cstdlib>
+#include <cstring>
+#include <filesystem>
+#include <fstream>
 #include <iostream>
+#include <string>
+#include <vector>
+
+using gcore::inference::GGUFLoader;
+using gcore::inference::SafeTensorsLoader;
+using gcore::inference::TensorLoad;
+using gcore::inference::TensorView;
+
+static bool check(bool ok, const char *what) {
+  std::cout << (ok ? "PASS: " : "FAIL: ") << what << "\n";
+  return ok;
+}
+
+// Minimal GGUF v3 writer for the synthetic model
+struct GGUFWriter {
+  std::vector<uint8_t> out;
+
+  template <typename T> void put(T v) {
+    const auto *p = reinterpret_cast<const uint8_t *>(&v);
+    out.insert(out.end(), p, p + sizeof(T));
+  }
+  void str(const std::string &s) {
+    put<uint64_t>(s.size());
+    out.insert(out.end(), s.begin(), s.end());
+  }
+  void kv_u32(const std::string &key, uint32_t v) {
+    str(key);
+    put<uint32_t>(4);
+    put<uint32_t>(v);
+  }
+  void kv_str(const std::string &key, const std::string &v) {
+    str(key);
+    put<uint32_t>(8);
+    str(v);
+  }
+  void kv_tokens(const std::vector<std::string> &tokens) {
+    str("tokenizer.ggml.tokens");
+    put<uint32_t>(9);
+    put<uint32_t>(8);
+    put<uint64_t>(tokens.size());
+    for (const auto &t : tokens)
+      str(t);
+  }
+  void tensor(const std::string &name, std::vector<uint64_t> shape,
+              uint32_t type, uint64_t offset) {
+    str(name);
+    put<uint32_t>(static_cast<uint32_t>(shape.size()));
+    for (uint64_t d : shape)
+      put<uint64_t>(d);
+    put<uint32_t>(type);
+    put<uint64_t>(offset);
+  }
+  void align(size_t a) { out.resize((out.size() + a - 1) / a * a, 0); }
+};
+
+// F32 [8] "a" and F16 [2, 4] "b" (values i * 0.5)
+static std::vector<uint8_t> tiny_gguf() {
+  GGUFWriter w;
+  w.out.insert(w.out.end(), {'G', 'G', 'U', 'F'});
+  w.put<uint32_t>(3);
+  w.put<uint64_t>(2); // tensors
+  w.put<uint64_t>(4); // kv pairs
+  w.kv_str("general.name", "tiny");
+  w.kv_u32("llama.attention.head_count", 2);
+  w.kv_u32("llama.embedding_length", 8);
+  w.kv_tokens({"<s>", "a", "b"});
+  w.tensor("a", {8}, 0, 0);
+  w.tensor("b", {2, 4}, 1, 32);
+  w.align(32);
+  for (int i = 0; i < 8; ++i)
+    w.put<float>(static_cast<float>(i) * 0.5f);
+  // fp16 de i * 0.5: exponente 15 - 1 + log2, exactos para 0..3.5
+  const uint16_t halves[8] = {0x0000, 0x3800, 0x3C00, 0x3E00,
+                              0x4000, 0x4100, 0x4200, 0x4300};
+  for (uint16_t h : halves)
+    w.put<uint16_t>(h);
+  w.align(32);
+  return w.out;
+}
+
+static void write_file(const std::string &path, const std::vector<uint8_t> &b,
+                       size_t bytes) {
+  std::ofstream f(path, std::ios::binary | std::ios::trunc);
+  f.write(reinterpret_cast<const char *>(b.data()),
+          static_cast<std::streamsize>(bytes));
+}
+
+// mmap parse, tensor views, truncation and batch error reporting
+static bool test_synthetic_gguf() {
+  const std::string path = "weight_loader_test_tiny.gguf";
+  const std::vector<uint8_t> bytes = tiny_gguf();
+  write_file(path, bytes, bytes.size());
+  bool ok = true;
+
+  GGUFLoader loader;
+  std::string err;
+  ok &= check(loader.open(path, &err), "open synthetic GGUF");
+  const auto tensors = loader.list_tensors();
+  const auto cfg = loader.get_config();
+  ok &= check(tensors.size() == 2 && tensors[1].name == "b" &&
+                  tensors[1].dtype == "F16" && tensors[1].size_bytes == 16 &&
+                  tensors[0].offset % 32 == 0,
+              "tensor infos (names, dtype, size, aligned offsets)");
+  ok &= check(cfg.dim == 8 && cfg.num_heads == 2 && cfg.head_dim == 4 &&
+                  cfg.vocab_size == 3 && cfg.vocabulary[2] == "b",
+              "metadata parsed from the mapping");
+
+  std::vector<float> a, b;
+  std::vector<uint16_t> a16;
+  bool values = loader.read_tensor_f32("a", a, &err) &&
+                loader.read_tensor_f32("b", b, &err) &&
+                loader.read_tensor_fp16("a", a16, &err);
+  values &= a.size() == 8 && b.size() == 8 && a16.size() == 8;
+  for (size_t i = 0; values && i < 8; ++i)
+    values &= a[i] == i * 0.5f && b[i] == i * 0.5f;
+  values &= a16.size() == 8 && a16[2] == 0x3C00 && a16[7] == 0x4300;
+  ok &= check(values, "F32/F16 tensors read from the mapping");
+
+  // Pipeline: vistas del mapping (a F32, b FP16), conversión a FP16 e INT8
+  gcore::rt::hip::Buffer pa, pb, pa16, pb8, pb8s;
+  std::vector<TensorLoad> batch = {
+      {"a", TensorLoad::Format::F32, &pa},
+      {"b", TensorLoad::Format::FP16, &pb},
+      {"a", TensorLoad::Format::FP16, &pa16},
+      {"b", TensorLoad::Format::INT8, &pb8, &pb8s, &pb8s}};
+  auto pipe = loader.start_load(batch, &err);
+  std::vector<float> da(8);
+  std::vector<uint16_t> db(8), da16(8);
+  std::vector<int8_t> db8(8);
+  bool piped = pipe && pipe->wait(1, &err) &&
+               pa.copy_to_host(da.data(), 32, &err) && pipe->finish(&err) &&
+               pb.copy_to_host(db.data(), 16, &err) &&
+               pa16.copy_to_host(da16.data(), 16, &err) &&
+               pb8.copy_to_host(db8.data(), 8, &err);
+  piped &= da == a && da16 == a16 && db[7] == 0x4300 &&
+           pb8.data_type() == gcore::rt::GretaDataType::INT8 &&
+           pb8.quant_info().scales == pb8s.data() && db8[7] == 127;
+  ok &= check(piped, "start_load uploads views and conversions in order");
+
+  std::vector<TensorLoad> loads(1);
+  loads[0].name = "missing.weight";
+  gcore::rt::hip::Buffer dummy;
+  loads[0].buffer = &dummy;
+  err.clear();
+  ok &= check(!loader.load_tensors(loads, &err) &&
+                  err.find("missing.weight") != std::string::npos,
+              "load_tensors names the failing tensor");
+
+  // Datos truncados: la cabecera es válida pero "b" queda fuera del archivo
+  write_file(path, bytes, bytes.size() - 24);
+  GGUFLoader cut;
+  err.clear();
+  ok &= check(cut.open(path, &err) && !cut.read_tensor_f32("b", b, &err) &&
+                  err.find("outside") != std::string::npos,
+              "tensor past end of file is rejected");
+  // Cabecera truncada
+  write_file(path, bytes, 40);
+  GGUFLoader head;
+  err.clear();
+  ok &= check(!head.open(path, &err) && !err.empty(),
+              "truncated header is rejected");
+
+  // Metadatos fuera de rango o de tipo inesperado: error concreto
+  auto open_header = [&](uint64_t kv_count, uint32_t type, uint64_t value) {
+    GGUFWriter w;
+    w.out.insert(w.out.end(), {'G', 'G', 'U', 'F'});
+    w.put<uint32_t>(3);
+    w.put<uint64_t>(0);
+    w.put<uint64_t>(kv_count);
+    w.str("llama.norm_eps");
+    w.put<uint32_t>(type);
+    w.put<uint64_t>(value);
+    write_file(path, w.out, w.out.size());
+    GGUFLoader l;
+    err.clear();
+    const bool opened = l.open(path, &err);
+    return opened && l.get_config().rms_eps == 1e-5f;
+  };
+  double eps = 1e-5;
+  uint64_t eps_bits;
+  std::memcpy(&eps_bits, &eps, 8);
+  bool meta = open_header(1, 12, eps_bits);
+  meta &= !open_header(5000, 12, eps_bits) &&
+          err.find("metadata count 5000") != std::string::npos;
+  meta &= !open_header(1, 10, 1) &&
+          err.find("llama.norm_eps has value type 10") != std::string::npos;
+  ok &= check(meta, "f64 metadata, kv count and value type errors");
+  std::remove(path.c_str());
+  return ok;
+}
+
+struct STEntry {
+  std::string name, dtype;
+  std::vector<size_t> shape;
+  std::vector<uint8_t> data;
+};
+
+template <typename T> static std::vector<uint8_t> bytes_of(std::vector<T> v) {
+  const auto *p = reinterpret_cast<const uint8_t *>(v.data());
+  return std::vector<uint8_t>(p, p + v.size() * sizeof(T));
+}
+
+// Header JSON (con __metadata__) relleno a múltiplo de 8, luego los datos
+static std::vector<uint8_t> safetensors_file(const std::vector<STEntry> &es) {
+  std::string h = "{\"__metadata__\":{\"format\":\"pt\"}";
+  size_t off = 0;
+  for (const auto &e : es) {
+    h += ",\"" + e.name + "\":{\"dtype\":\"" + e.dtype + "\",\"shape\":[";
+    for (size_t i = 0; i < e.shape.size(); ++i)
+      h += (i ? "," : "") + std::to_string(e.shape[i]);
+    h += "],\"data_offsets\":[" + std::to_string(off) + "," +
+         std::to_string(off + e.data.size()) + "]}";
+    off += e.data.size();
+  }
+  h += "}";
+  h.resize((h.size() + 7) / 8 * 8, ' ');
+  std::vector<uint8_t> out(8);
+  const uint64_t n = h.size();
+  std::memcpy(out.data(), &n, 8);
+  out.insert(out.end(), h.begin(), h.end());
+  for (const auto &e : es)
+    out.insert(out.end(), e.data.begin(), e.data.end());
+  return out;
+}
+
+static void write_text(const std::string &path, const std::string &text) {
+  std::ofstream f(path, std::ios::trunc);
+  f << text;
+}
+
+static uint16_t bf16_of(float f) {
+  uint32_t x;
+  std::memcpy(&x, &f, 4);
+  return static_cast<uint16_t>(x >> 16);
+}
+
+// Single file, shards + index + config.json, chunked conversion and errors
+static bool test_synthetic_safetensors() {
+  namespace fs = std::filesystem;
+  const fs::path dir = "weight_loader_test_st";
+  fs::remove_all(dir);
+  fs::create_directories(dir);
+  bool ok = true;
+
+  std::vector<float> f32(6);
+  std::vector<uint16_t> bf16(4);
+  for (size_t i = 0; i < 6; ++i)
+    f32[i] = static_cast<float>(i) * 0.5f;
+  for (size_t i = 0; i < 4; ++i)
+    bf16[i] = bf16_of(-static_cast<float>(i) * 0.5f);
+  const std::vector<uint16_t> f16 = {0x0000, 0x3800, 0x3C00, 0x3E00};
+  const std::vector<STEntry> entries = {
+      {"w.f32", "F32", {2, 3}, bytes_of(f32)},
+      {"w.f16", "F16", {4}, bytes_of(f16)},
+      {"w.bf16", "BF16", {2, 2}, bytes_of(bf16)}};
+  const std::string single = (dir / "single.safetensors").string();
+  const std::vector<uint8_t> file = safetensors_file(entries);
+  write_file(single, file, file.size());
+
+  SafeTensorsLoader st;
+  std::string err;
+  ok &= check(st.open(single, &err), "open synthetic SafeTensors");
+  const auto tensors = st.list_tensors();
+  ok &= check(tensors.size() == 3 && tensors[0].name == "w.f32" &&
+                  tensors[0].shape == std::vector<size_t>{2, 3} &&
+                  tensors[2].dtype == "BF16" && tensors[2].size_bytes == 8,
+              "SafeTensors header (names, shapes, dtypes)");
+
+  TensorView v;
+  bool view_ok = st.view("w.f16", v, &err) && v.info->size_bytes == 8 &&
+                 std::memcmp(v.data, f16.data(), 8) == 0;
+  view_ok &= !st.view("w.none", v, &err) &&
+             err.find("w.none") != std::string::npos;
+  ok &= check(view_ok, "zero-copy view into the mapping");
+
+  std::vector<float> a, b;
+  std::vector<uint16_t> h;
+  bool values = st.read_tensor_f32("w.bf16", a, &err) &&
+                st.read_tensor_f32("w.f16", b, &err) &&
+                st.read_tensor_fp16("w.f32", h, &err);
+  values &= a.size() == 4 && b.size() == 4 && h.size() == 6;
+  for (size_t i = 0; values && i < 4; ++i)
+    values &= a[i] == -static_cast<float>(i) * 0.5f &&
+              b[i] == static_cast<float>(i) * 0.5f;
+  values &= h[1] == 0x3800 && h[2] == 0x3C00 && h[5] == 0x4100;
+  ok &= check(values, "F32/F16/BF16 conversion");
+
+  // Dos shards + index.json + config.json, abiertos por directorio
+  const fs::path sharded = dir / "sharded";
+  fs::create_directories(sharded);
+  const std::vector<uint8_t> s1 = safetensors_file({entries[0]});
+  const std::vector<uint8_t> s2 = safetensors_file({entries[1], entries[2]});
+  write_file((sharded / "model-00001-of-00002.safetensors").string(), s1,
+             s1.size());
+  write_file((sharded / "model-00002-of-00002.safetensors").string(), s2,
+             s2.size());
+  write_text((sharded / "model.safetensors.index.json").string(),
+             "{\"metadata\": {\"total_size\": 48},\n \"weight_map\": {\n"
+             "  \"w.f32\": \"model-00001-of-00002.safetensors\",\n"
+             "  \"w.f16\": \"model-00002-of-00002.safetensors\",\n"
+             "  \"w.bf16\": \"model-00002-of-00002.safetensors\"}}\n");
+  write_text((sharded / "config.json").string(),
+             "{\"architectures\": [\"LlamaForCausalLM\"], \"hidden_size\": 8,"
+             " \"intermediate_size\": 16, \"num_hidden_layers\": 2,"
+             " \"num_attention_heads\": 2, \"num_key_value_heads\": 1,"
+             " \"rope_scaling\": null, \"rope_theta\": 500000.0,"
+             " \"rms_norm_eps\": 1e-05, \"vocab_size\": 3,"
+             " \"torch_dtype\": \"bfloat16\"}\n");
+  auto loader = gcore::inference::create_weight_loader(sharded.string(), &err);
+  bool shards_ok = loader && loader->list_tensors().size() == 3 &&
+                   loader->read_tensor_f32("w.bf16", a, &err) &&
+                   a[3] == -1.5f && loader->read_tensor_f32("w.f32", a, &err) &&
+                   a[5] == 2.5f;
+  if (loader) {
+    const auto cfg = loader->get_config();
+    shards_ok &= cfg.dim == 8 && cfg.num_heads == 2 && cfg.num_heads_kv == 1 &&
+                 cfg.head_dim == 4 && cfg.hidden_dim == 16 &&
+                 cfg.num_layers == 2 && cfg.rope_base == 500000.0f &&
+                 cfg.rms_eps == 1e-5f;
+  }
+  ok &= check(shards_ok, "sharded checkpoint via index.json + config.json");
+
+  // Subida convertida por trozos (> 4 MiB, sin staging)
+  setenv("GRETA_STAGING", "0", 1);
+  std::vector<uint16_t> big(3u << 20);
+  for (size_t i = 0; i < big.size(); ++i)
+    big[i] = bf16_of((static_cast<float>(i % 256) - 128.0f) * 0.5f);
+  const std::vector<uint8_t> bigf =
+      safetensors_file({{"big", "BF16", {big.size()}, bytes_of(big)}});
+  const std::string big_path = (dir / "big.safetensors").string();
+  write_file(big_path, bigf, bigf.size());
+  SafeTensorsLoader bl;
+  gcore::rt::hip::Buffer buf16, buf32;
+  std::vector<uint16_t> ref16, dev16(big.size());
+  std::vector<float> ref32, dev32(big.size());
+  bool chunked = bl.open(big_path, &err) &&
+                 bl.load_tensor_fp16("big", buf16, &err) &&
+                 bl.load_tensor("big", buf32, &err) &&
+                 bl.read_tensor_fp16("big", ref16, &err) &&
+                 bl.read_tensor_f32("big", ref32, &err) &&
+                 buf16.copy_to_host(dev16.data(), dev16.size() * 2, &err) &&
+                 buf32.copy_to_host(dev32.data(), dev32.size() * 4, &err);
+  chunked &= dev16 == ref16 && dev32 == ref32 && ref32[1001] == 52.5f;
+  ok &= check(chunked, "chunked BF16 -> FP16/FP32 upload matches host read");
+
+  // Errores: shard sin el tensor del index, offsets fuera, header truncado
+  write_text((sharded / "model.safetensors.index.json").string(),
+             "{\"weight_map\": {\"w.f16\": "
+             "\"model-00001-of-00002.safetensors\"}}");
+  SafeTensorsLoader bad_index;
+  err.clear();
+  bool errors = !bad_index.open(sharded.string(), &err) &&
+                err.find("w.f16") != std::string::npos;
+  write_file(single, file, file.size() - 4);
+  SafeTensorsLoader cut;
+  err.clear();
+  errors &= !cut.open(single, &err) && err.find("w.bf16") != std::string::npos;
+  write_file(single, file, 20);
+  SafeTensorsLoader head;
+  err.clear();
+  errors &= !head.open(single, &err) &&
+            err.find("truncated") != std::string::npos;
+  ok &= check(errors, "bad index, out-of-range offsets, truncated header");
+
+  // Nombres Hugging Face -> GGUF (los que pide BlockScheduler)
+  const std::vector<uint8_t> hf = safetensors_file(
+      {{"model.embed_tokens.weight", "F16", {4}, bytes_of(f16)},
+       {"lm_head.weight", "F16", {4}, bytes_of(f16)},
+       {"model.norm.weight", "F16", {4}, bytes_of(f16)},
+       {"model.layers.0.self_attn.o_proj.weight", "F16", {4}, bytes_of(f16)},
+       {"model.layers.11.post_attention_layernorm.weight", "F16", {4},
+        bytes_of(f16)},
+       {"model.layers.3.mlp.gate_proj.weight", "F16", {4}, bytes_of(f16)},
+       {"model.rotary_emb.inv_freq", "F16", {4}, bytes_of(f16)}});
+  const std::string hf_path = (dir / "hf.safetensors").string();
+  write_file(hf_path, hf, hf.size());
+  SafeTensorsLoader hl;
+  std::vector<std::string> names;
+  if (hl.open(hf_path, &err))
+    for (const auto &t : hl.list_tensors())
+      names.push_back(t.name);
+  ok &= check(names == std::vector<std::string>{"token_embd.weight",
+                                                "output.weight",
+                                                "output_norm.weight",
+                                                "blk.0.attn_output.weight",
+                                                "blk.11.ffn_norm.weight",
+                                                "blk.3.ffn_gate.weight",
+                                                "model.rotary_emb.inv_freq"} &&
+                  hl.view("blk.0.attn_output.weight", v, &err),
+              "Hugging Face tensor names map to GGUF names");
+
+  fs::remove_all(dir);
+  return ok;
+}
+
+// Miss -> blob, hit sin releer el modelo, blob corrupto, evicción LRU
+static bool test_weight_cache() {
+  namespace fs = std::filesystem;
+  using gcore::inference::CachedWeightLoader;
+  using gcore::rt::hip::Buffer;
+  const fs::path dir = "weight_loader_test_cache";
+  const std::string model = "weight_loader_test_cache.gguf";
+  fs::remove_all(dir);
+  const std::vector<uint8_t> bytes = tiny_gguf();
+  write_file(model, bytes, bytes.size());
+  gcore::inference::WeightCacheConfig cfg;
+  cfg.dir = dir.string();
+  const gcore::inference::WeightCache cache(cfg);
+  bool ok = true;
+
+  struct Bufs {
+    Buffer a, a_scales, b;
+  };
+  auto run = [&](Bufs &bf, bool &hit) {
+    CachedWeightLoader l(std::make_unique<GGUFLoader>(), cfg);
+    std::vector<TensorLoad> loads(2);
+    loads[0].name = "a";
+    loads[0].format = TensorLoad::Format::INT8;
+    loads[0].buffer = &bf.a;
+    loads[0].scales = &bf.a_scales;
+    loads[1].name = "b";
+    loads[1].buffer = &bf.b;
+    std::string err;
+    const bool r = l.open(model, &err) && l.load_tensors(loads, &err);
+    hit = l.last_load_hit();
+    return r;
+  };
+  auto host = [](const Buffer &b) {
+    std::vector<uint8_t> v(b.size());
+    b.copy_to_host(v.data(), v.size(), nullptr);
+    return v;
+  };
+
+  Bufs cold, warm;
+  bool hit = true;
+  ok &= check(run(cold, hit) && !hit && cache.list().size() == 1 &&
+                  cache.list()[0].valid && cache.list()[0].quant == "int8",
+              "cache miss loads the model and stores a blob");
+  const std::string blob = cache.list()[0].path;
+  const auto qc = cold.a.quant_info();
+  bool same = run(warm, hit) && hit && host(warm.a) == host(cold.a) &&
+              host(warm.a_scales) == host(cold.a_scales) &&
+              host(warm.b) == host(cold.b) &&
+              warm.a.data_type() == cold.a.data_type() &&
+              warm.b.data_type() == cold.b.data_type();
+  same &= warm.a.quant_info().scales == warm.a_scales.data() &&
+          warm.a.quant_info().group_size == qc.group_size && qc.group_size;
+  ok &= check(same, "cache hit restores bytes, dtypes and quant info");
+
+  // Un byte del índice (al final) y luego uno de datos
+  std::vector<uint8_t> raw(fs::file_size(blob));
+  std::ifstream(blob, std::ios::binary)
+      .read(reinterpret_cast<char *>(raw.data()),
+            static_cast<std::streamsize>(raw.size()));
+  raw[raw.size() - 9] ^= 0x40;
+  write_file(blob, raw, raw.size());
+  Bufs again;
+  bool corrupt = !cache.validate(blob, false, nullptr, nullptr) &&
+                 run(again, hit) && !hit && host(again.b) == host(cold.b) &&
+                 cache.validate(blob, true, nullptr, nullptr);
+  std::ifstream(blob, std::ios::binary)
+      .read(reinterpret_cast<char *>(raw.data()),
+            static_cast<std::streamsize>(raw.size()));
+  raw[4096] ^= 0x01;
+  write_file(blob, raw, raw.size());
+  gcore::inference::WeightCacheBlob info;
+  corrupt &= cache.validate(blob, false, nullptr, nullptr) &&
+             !cache.validate(blob, true, &info, nullptr) &&
+             info.error.find("hash mismatch") != std::string::npos;
+  ok &= check(corrupt, "corrupt blob is rebuilt; data hashes are checked");
+
+  // Modelo tocado (mtime): otra huella, otro blob; evict deja solo el nuevo
+  const auto past = fs::last_write_time(blob) - std::chrono::hours(2);
+  fs::last_write_time(blob, past);
+  fs::last_write_time(model,
+                      fs::last_write_time(model) + std::chrono::hours(1));
+  write_file((dir / "x.gwc.tmp.1").string(), raw, 16);
+  fs::last_write_time(dir / "x.gwc.tmp.1", past);
+  Bufs touched;
+  bool evict = run(touched, hit) && !hit && cache.list().size() == 2;
+  const std::string fresh = cache.list()[1].path;
+  evict &= fresh != blob && cache.evict(0, fresh) > 0 &&
+           cache.list().size() == 1 && cache.list()[0].path == fresh &&
+           !fs::exists(dir / "x.gwc.tmp.1");
+  ok &= check(evict, "new model fingerprint and LRU eviction");
+
+  fs::remove_all(dir);
+  std::remove(model.c_str());
+  return ok;
+}
 
 int main(int argc, char *argv[]) {
   std::cout << "GRETA CORE: Weight Loader Test\n";
+  bool ok = test_synthetic_gguf();
+  ok &= test_synthetic_safetensors();
+  ok &= test_weight_cache();
 
   // Test ModelConfig
   auto cfg = gcore::inference::ModelConfig::llama2_7b();
@@ -45,6 +546,6 @@ int main(int argc, char *argv[]) {
     }
   }
 
-  std::cout << "\nSTATUS=OK\n";
-  return 0;
+  std::cout << "\nSTATUS=" << (ok ? "OK" : "FAIL") << "\n";
+  return ok ? 0 : 1;
 }
@@ -1,34 +1,61 @@
 #pragma once
 
+#include <atomic>
 #include <cstddef>
 #include <cstdint>
+#include <memory>
 #include <mutex>
 #include <vector>
 
 namespace gcore::rt {
 
 // HostAllocator: caching/pooling allocator for CPU memory.
-// - Small allocations go to power-of-two bins with freelists.
-// - Large allocations bypass bins.
+// - Small allocations use size classes with 4 steps per power of two
+//   (<= 25% internal waste) carved from slab segments. Blocks carry no
+//   per-block header: the segment header is found by masking the address.
+// - Each thread keeps a magazine cache per class in front of the shared
+//   per-class freelists, so the common alloc/free takes no lock.
+// - Large allocations (or alignment > 64) get their own segment and are
+//   recycled through a large-block cache trimmed to a byte budget.
 //
-// Thread-safety: coarse-grained mutex (v1). We can evolve to per-bin locks.
+// Thread-safety: alloc/free from any thread. Shared freelists use per-class
+// locks; stats are kept per thread and merged on demand by stats().
 class HostAllocator final {
 public:
   struct Stats {
     uint64_t alloc_calls = 0;
     uint64_t free_calls = 0;
-    uint64_t reuse_hits = 0; // satisfied from freelist
-    uint64_t os_allocs = 0;  // new allocations from OS
+    uint64_t reuse_hits = 0; // satisfied by a previously freed block
+    uint64_t os_allocs = 0;  // new allocations from OS (segments)
     uint64_t bytes_in_use = 0;
-    uint64_t bytes_reserved = 0; // total allocated from OS
+    uint64_t bytes_reserved = 0;    // total allocated from OS
+    uint64_t thread_cache_hits = 0; // served by the thread magazine
+    uint64_t large_cache_hits = 0;  // large blocks reused from the cache
+    uint64_t large_bytes_cached = 0;
+    uint64_t threads = 0; // threads with a live cache
   };
 
-  // bin_min_pow2: smallest bin size = 2^bin_min_pow2 bytes
-  // bin_max_pow2: largest bin size = 2^bin_max_pow2 bytes
-  // large_threshold_pow2: >= 2^large_threshold_pow2 uses direct allocation
+  // Where segments come from (default: posix_memalign/free). StagingPool
+  // plugs in mmap with huge pages and NUMA placement.
+  class PageSource {
+  public:
+    virtual ~PageSource() = default;
+    // `bytes` aligned to `alignment` (the segment alignment); nullptr on
+    // failure.
+    virtual void *map(std::size_t bytes, std::size_t alignment) = 0;
+    virtual void unmap(void *p, std::size_t bytes) = 0;
+  };
+
+  // bin_min_pow2: smallest class size = 2^bin_min_pow2 bytes (>= 64)
+  // bin_max_pow2: largest class size = 2^bin_max_pow2 bytes
+  // large_threshold_pow2: >= 2^large_threshold_pow2 uses a large block
+  // large_cache_bytes: free large blocks kept for reuse (trim budget)
+  // pages: segment source (not owned, must outlive the allocator)
   HostAllocator(int bin_min_pow2 = 6,  // 64 B
                 int bin_max_pow2 = 20, // 1 MiB
-                int large_threshold_pow2 = 20);
+                int large_threshold_pow2 = 20,
+                std::size_t large_cache_bytes = std::size_t{256} << 20,
+                PageSource *pages = nullptr);
 
   ~HostAllocator();
 
@@ -39,43 +66,86 @@ public:
   // Returns nullptr on failure.
   void *alloc(std::size_t size, std::size_t alignment = 64);
 
-  // Free memory previously allocated by this allocator.
+  // Free memory previously allocated by this allocator (any thread).
   void free(void *p);
 
-  // Returns a snapshot of stats.
+  // Returns a snapshot of stats (merges the per-thread counters).
   Stats stats() const;
 
-  // Release cached blocks back to OS (best-effort).
-  // Useful for tests; not required for normal operation.
+  // Trim the large-block cache down to `keep_bytes` (oldest first).
+  void trim(std::size_t keep_bytes = 0);
+
+  // Release cached blocks back to OS (best-effort): the calling thread's
+  // magazines, the large-block cache and slab segments with no live block
+  // outside the shared freelists.
   void release();
 
 private:
-  struct BlockHeader {
+  // Segment header, at the start of every OS allocation. Segments are
+  // aligned to seg_align_, so header = p & ~(seg_align_ - 1).
+  struct alignas(64) Segment {
     uint32_t magic;
-    uint16_t bin_index; // 0xFFFF for direct allocation
-    uint16_t reserved;
-    uint64_t requested; // requested payload size
-    uint64_t allocated; // payload capacity
-    BlockHeader *next;
+    uint16_t kind; // kSlab / kLarge
+    uint16_t cls;  // size class (slab)
+    const HostAllocator *owner;
+    std::size_t bytes;   // total bytes from OS
+    std::size_t payload; // slab: chunk size; large: capacity
+    std::size_t offset;  // large: payload offset from the segment
+    std::size_t carved;  // slab: bytes handed out to thread ranges
+    Segment *next;       // slab: segment list of the class
+    uint64_t reserved;
   };
 
+  struct ThreadCache;
+  struct TlsCaches;
+  struct SizeClass;
+
   static constexpr uint32_t kMagic = 0x47434F52; // 'GCOR'
 
   int bin_min_pow2_;
   int bin_max_pow2_;
   int large_threshold_pow2_;
-  int bin_count_;
-
-  mutable std::mutex mu_;
-
-  std::vector<BlockHeader *> freelists_;
-  Stats stats_;
-
-  int size_to_bin(std::size_t size) const;
-  std::size_t bin_to_size(int bin) const;
-
-  void *os_alloc(std::size_t bytes, std::size_t alignment);
-  void os_free(void *base);
+  std::size_t large_threshold_;
+  std::size_t large_cache_budget_;
+  std::size_t seg_align_;
+  uint64_t id_;
+  PageSource *pages_;
+
+  // Size classes: sizes, direct lookup for small sizes, shared state
+  std::vector<uint32_t> class_size_;
+  std::vector<uint16_t> small_lookup_; // need <= 4 KiB: (need / 64) -> class
+  std::vector<uint16_t> pow2_lookup_;  // need > 4 KiB: (log2, quarter) -> class
+  std::vector<std::unique_ptr<SizeClass>> classes_;
+
+  // Per-thread caches (owned here too: stats() walks them)
+  mutable std::mutex caches_mu_;
+  std::vector<std::shared_ptr<ThreadCache>> caches_;
+  Stats retired_; // counters of threads that already exited
+
+  // Large-block cache, oldest first
+  mutable std::mutex large_mu_;
+  std::vector<Segment *> large_free_;
+  std::size_t large_cached_bytes_ = 0;
+
+  std::atomic<uint64_t> os_allocs_{0};
+  std::atomic<uint64_t> bytes_reserved_{0};
+  std::atomic<uint64_t> large_hits_{0};
+
+  ThreadCache &cache();
+  void retire(ThreadCache &tc);
+  void drain(ThreadCache &tc);
+  void flush_magazine(ThreadCache &tc, int cls, uint32_t keep);
+  void *refill(ThreadCache &tc, int cls);
+
+  int size_to_class(std::size_t need) const;
+  Segment *segment_of(const void *p) const;
+
+  void *alloc_large(ThreadCache &tc, std::size_t need, std::size_t alignment);
+  void free_large(Segment *seg);
+  void trim_locked(std::size_t keep_bytes, std::vector<Segment *> &out);
+
+  Segment *os_alloc_segment(std::size_t bytes);
+  void os_free_segment(Segment *seg);
 
   static std::size_t align_up(std::size_t x, std::size_t a);
 };
@@ -0,0 +1,125 @@
+#pragma once
+
+#include "gcore/rt/allocator.hpp"
+
+#include <cstddef>
+#include <cstdint>
+#include <functional>
+#include <memory>
+#include <mutex>
+#include <string>
+#include <vector>
+
+namespace gcore::rt {
+
+enum class HugePages {
+  Off,
+  Transparent, // madvise(MADV_HUGEPAGE): THP when the kernel allows it
+  Explicit,    // MAP_HUGETLB 2 MiB pages (reserved pool); falls back to THP
+};
+
+struct StagingOptions {
+  std::size_t chunk_bytes = std::size_t{64} << 20;
+  int chunks = 2; // 2 = double buffering
+  HugePages huge_pages = HugePages::Transparent;
+  int numa_node = -1;       // -1: no placement (see numa_node_of_pci)
+  bool numa_strict = false; // MPOL_BIND instead of MPOL_PREFERRED
+  bool prefault = true;     // touch the pages in init(): placement now
+};
+
+// Device side of the pool. The HIP backend implements it
+// (hip::HipStagingCopier); tests stub it to run on CPU-only machines.
+class StagingCopier {
+public:
+  virtual ~StagingCopier() = default;
+
+  // Page-lock a chunk for DMA (hipHostRegister).
+  virtual bool pin(void *host, std::size_t bytes, std::string *err) = 0;
+  virtual void unpin(void *host) = 0;
+
+  // Start copying `bytes` from chunk `slot` (at `src`) to dst + offset.
+  virtual bool copy_async(void *dst, std::size_t offset, const void *src,
+                          std::size_t bytes, int slot, std::string *err) = 0;
+
+  // Block until the last copy issued from chunk `slot` has finished.
+  virtual bool wait(int slot, std::string *err) = 0;
+};
+
+// What init() actually got: placement is best-effort and every fallback
+// is recorded in notes.
+struct StagingPlacement {
+  HugePages huge_pages = HugePages::Off; // effective
+  int numa_node = -1;     // node the chunks were bound to (-1: none)
+  int numa_observed = -1; // node of the first page (get_mempolicy), -1 unknown
+  bool pinned = false;
+  std::string notes;
+};
+
+// Pinned host staging for host->device uploads: `chunks` buffers of
+// `chunk_bytes` from a HostAllocator backed by mmap (optional 2 MiB huge
+// pages, mbind near the target GPU), page-locked through the copier.
+// upload() fills chunk i while chunk i-1 is being copied (double
+// buffering) and returns when the whole range reached the device, like
+// hipMemcpy. One upload at a time per pool.
+class StagingPool final {
+public:
+  // Write bytes [offset, offset + bytes) of the source into dst.
+  using FillFn =
+      std::function<bool(void *dst, std::size_t offset, std::size_t bytes)>;
+
+  struct Stats {
+    uint64_t uploads = 0;
+    uint64_t bytes = 0;
+    uint64_t chunks_filled = 0;
+    uint64_t fill_ns = 0; // host side (memcpy / producer)
+    uint64_t wait_ns = 0; // blocked on the copier for a free chunk
+  };
+
+  explicit StagingPool(StagingOptions opt = {},
+                       StagingCopier *copier = nullptr);
+  ~StagingPool();
+
+  StagingPool(const StagingPool &) = delete;
+  StagingPool &operator=(const StagingPool &) = delete;
+
+  // Map, place, prefault and pin the chunks.
+  bool init(std::string *err);
+
+  bool upload(void *dst, const void *src, std::size_t bytes,
+              std::string *err);
+  bool upload(void *dst, std::size_t bytes, const FillFn &fill,
+              std::string *err);
+
+  const StagingPlacement &placement() const { return placement_; }
+  const StagingOptions &options() const { return opt_; }
+  void *chunk(int i) const { return chunks_[static_cast<size_t>(i)]; }
+  Stats stats() const;
+  HostAllocator::Stats allocator_stats() const { return alloc_->stats(); }
+
+private:
+  class Pages; // HostAllocator::PageSource over mmap + madvise + mbind
+
+  StagingOptions opt_;
+  StagingCopier *copier_;
+  StagingPlacement placement_;
+  std::unique_ptr<Pages> pages_;
+  std::unique_ptr<HostAllocator> alloc_;
+  std::vector<void *> chunks_;
+  std::vector<bool> in_flight_;
+  std::vector<bool> pinned_;
+  bool ready_ = false;
+
+  mutable std::mutex mu_;
+  Stats stats_;
+};
+
+// NUMA node of a PCI device from sysfs (<root>/bus/pci/devices/<id>/
+// numa_node), e.g. the bus id reported by hipDeviceGetPCIBusId. -1 when
+// unknown.
+int numa_node_of_pci(const std::string &pci_bus_id,
+                     const std::string &sysfs_root = "/sys");
+
+// NUMA node backing the (touched) page at p, -1 when unknown.
+int numa_node_of_address(const void *p);
+
+} // namespace gcore::rt
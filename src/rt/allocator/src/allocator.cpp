@@ -1,228 +1,560 @@
 #include "gcore/rt/allocator.hpp"
 
-#include <cassert>
+#include <algorithm>
 #include <cstdlib>
 #include <cstring>
 #include <new>
+#include <unordered_map>
+#include <unordered_set>
 
 namespace gcore::rt {
 
-static constexpr uint16_t kDirectBin = 0xFFFF;
+namespace {
+
+constexpr uint16_t kSlab = 1;
+constexpr uint16_t kLarge = 2;
+
+// Caché por hilo: hasta ~kMagazineBytes por clase, mínimo 2 bloques
+constexpr std::size_t kMagazineBytes = std::size_t{1} << 20;
+constexpr uint32_t kMagazineMax = 256;
+// Segmentos de slab: ~8 bloques, entre 256 KiB y la alineación de segmento
+constexpr std::size_t kSlabMinBytes = std::size_t{256} << 10;
+constexpr std::size_t kSegAlignMin = std::size_t{4} << 20;
+// Bloques grandes: granularidad y holgura máxima al reutilizar (1/4)
+constexpr std::size_t kLargeGranule = 4096;
+// Tabla directa de clases hasta 4 KiB (need / 64)
+constexpr int kSmallLookupLog2 = 12;
+constexpr std::size_t kSmallLookupMax = std::size_t{1} << kSmallLookupLog2;
+
+std::atomic<uint64_t> g_next_id{1};
+
+// Protege el vínculo ThreadCache -> allocator entre la salida de un hilo y
+// la destrucción del allocator. Nunca se destruye (salida del proceso).
+std::mutex &registry_mu() {
+  static std::mutex *mu = new std::mutex();
+  return *mu;
+}
+
+std::size_t next_pow2(std::size_t x) {
+  std::size_t p = 1;
+  while (p < x)
+    p <<= 1;
+  return p;
+}
+
+// Contadores escritos sólo por su hilo: load+store relajados, sin RMW
+inline void bump(std::atomic<uint64_t> &c, uint64_t v = 1) {
+  c.store(c.load(std::memory_order_relaxed) + v, std::memory_order_relaxed);
+}
+
+} // namespace
+
+struct HostAllocator::SizeClass {
+  std::mutex mu;
+  std::vector<void *> free; // freelist compartida
+  Segment *segs = nullptr;  // cabeza = segmento en corte
+  std::size_t size = 0;
+  std::size_t seg_bytes = 0;
+  uint32_t mag_cap = 0;
+  uint32_t batch = 0;
+};
+
+struct HostAllocator::ThreadCache {
+  // Arrays de punteros, no listas intrusivas: alloc/free no tocan la
+  // memoria del bloque (bloques grandes fríos no cuestan un fallo de caché)
+  struct Magazine {
+    void **slots = nullptr; // bloques libres de este hilo (mag_cap huecos)
+    uint32_t count = 0;
+    uint8_t *bump = nullptr; // rango reservado de un slab, aún sin tocar
+    uint8_t *bump_end = nullptr;
+  };
+
+  std::atomic<HostAllocator *> owner{nullptr};
+  std::vector<Magazine> mags;
+  std::vector<void *> storage;
+
+  std::atomic<uint64_t> alloc_calls{0};
+  std::atomic<uint64_t> free_calls{0};
+  std::atomic<uint64_t> fresh{0}; // bloques nuevos (no reutilizados)
+  std::atomic<uint64_t> hits{0};  // servidos sin lock
+  std::atomic<uint64_t> in_use{0}; // puede "restar" (aritmética mod 2^64)
+};
+
+// Cachés del hilo actual, una por allocator (normalmente una o dos)
+struct HostAllocator::TlsCaches {
+  struct Entry {
+    uint64_t id;
+    std::shared_ptr<ThreadCache> cache;
+  };
+  std::vector<Entry> entries;
+
+  ~TlsCaches() {
+    std::lock_guard<std::mutex> lk(registry_mu());
+    for (auto &e : entries)
+      if (HostAllocator *owner = e.cache->owner.load())
+        owner->retire(*e.cache);
+  }
+};
 
 std::size_t HostAllocator::align_up(std::size_t x, std::size_t a) {
   return (x + (a - 1)) & ~(a - 1);
 }
 
 HostAllocator::HostAllocator(int bin_min_pow2, int bin_max_pow2,
-                             int large_threshold_pow2)
+                             int large_threshold_pow2,
+                             std::size_t large_cache_bytes, PageSource *pages)
     : bin_min_pow2_(bin_min_pow2), bin_max_pow2_(bin_max_pow2),
-      large_threshold_pow2_(large_threshold_pow2) {
-  if (bin_min_pow2_ < 4)
-    bin_min_pow2_ = 4;
+      large_threshold_pow2_(large_threshold_pow2),
+      large_cache_budget_(large_cache_bytes),
+      id_(g_next_id.fetch_add(1, std::memory_order_relaxed)), pages_(pages) {
+  // 64 B mínimo: todos los bloques de slab quedan alineados a 64
+  if (bin_min_pow2_ < 6)
+    bin_min_pow2_ = 6;
   if (bin_max_pow2_ < bin_min_pow2_)
     bin_max_pow2_ = bin_min_pow2_;
   if (large_threshold_pow2_ < bin_min_pow2_)
     large_threshold_pow2_ = bin_max_pow2_;
+  large_threshold_ = std::size_t{1} << large_threshold_pow2_;
+
+  // 4 clases por potencia de 2 (múltiplos de 64): desperdicio <= 25%
+  const std::size_t lo = std::size_t{1} << bin_min_pow2_;
+  const std::size_t hi = std::size_t{1} << bin_max_pow2_;
+  for (std::size_t p = lo; p <= hi; p <<= 1) {
+    for (std::size_t j = 0; j < 4; j++) {
+      const std::size_t sz = align_up(p + j * (p / 4), 64);
+      if (sz > hi)
+        break;
+      if (class_size_.empty() || sz > class_size_.back())
+        class_size_.push_back(static_cast<uint32_t>(sz));
+    }
+  }
+  seg_align_ = std::max(kSegAlignMin, next_pow2(4 * hi));
+
+  // Búsqueda sin ramas impredecibles (lower_bound sobre tamaños aleatorios
+  // falla la predicción varias veces por llamada)
+  auto class_at_least = [&](std::size_t need) {
+    auto it = std::lower_bound(class_size_.begin(), class_size_.end(),
+                               static_cast<uint32_t>(need));
+    return static_cast<uint16_t>(it - class_size_.begin());
+  };
+  small_lookup_.resize(kSmallLookupMax / 64 + 1);
+  for (std::size_t i = 0; i < small_lookup_.size(); i++)
+    small_lookup_[i] = class_at_least(std::min(std::max<std::size_t>(i * 64, 64), hi));
+  // Por encima de 4 KiB las clases son exactamente p + j*p/4
+  for (int k = kSmallLookupLog2; k < bin_max_pow2_; k++) {
+    const std::size_t p = std::size_t{1} << k;
+    for (std::size_t q = 1; q <= 4; q++)
+      pow2_lookup_.push_back(class_at_least(p + q * (p / 4)));
+  }
 
-  bin_count_ = (bin_max_pow2_ - bin_min_pow2_) + 1;
-  freelists_.assign(static_cast<size_t>(bin_count_), nullptr);
+  for (uint32_t size : class_size_) {
+    auto sc = std::make_unique<SizeClass>();
+    sc->size = size;
+    sc->seg_bytes =
+        std::clamp(next_pow2(sizeof(Segment) + 8 * std::size_t{size}),
+                   kSlabMinBytes, seg_align_);
+    sc->mag_cap = static_cast<uint32_t>(
+        std::clamp<std::size_t>(kMagazineBytes / size, 2, kMagazineMax));
+    sc->batch = std::max<uint32_t>(1, sc->mag_cap / 2);
+    classes_.push_back(std::move(sc));
+  }
 }
 
-HostAllocator::~HostAllocator() { release(); }
-
-int HostAllocator::size_to_bin(std::size_t size) const {
-  // include header overhead in bin sizing
-  const std::size_t need = size;
-  // find smallest pow2 >= need
-  std::size_t s = 1ull << static_cast<unsigned>(bin_min_pow2_);
-  int bin = 0;
-  while (s < need && (bin_min_pow2_ + bin) < bin_max_pow2_) {
-    s <<= 1;
-    bin++;
+HostAllocator::~HostAllocator() {
+  {
+    std::lock_guard<std::mutex> reg(registry_mu());
+    std::lock_guard<std::mutex> lk(caches_mu_);
+    for (auto &c : caches_)
+      c->owner.store(nullptr);
+    caches_.clear();
   }
-  return bin;
+  trim(0);
+  // Los bloques grandes aún en uso no se rastrean (igual que en v1)
+  for (auto &sc : classes_) {
+    Segment *seg = sc->segs;
+    while (seg) {
+      Segment *next = seg->next;
+      os_free_segment(seg);
+      seg = next;
+    }
+    sc->segs = nullptr;
+    sc->free.clear();
+  }
+}
+
+int HostAllocator::size_to_class(std::size_t need) const {
+  if (need <= kSmallLookupMax)
+    return small_lookup_[need / 64];
+  // p = 2^k < need <= 2p; q = ceil((need - p) / (p / 4)) in 1..4
+  const int k = 63 - __builtin_clzll(static_cast<unsigned long long>(need - 1));
+  const std::size_t quarter = std::size_t{1} << (k - 2);
+  const std::size_t q = (need - (std::size_t{1} << k) + quarter - 1) >> (k - 2);
+  return pow2_lookup_[static_cast<size_t>(k - kSmallLookupLog2) * 4 + q - 1];
 }
 
-std::size_t HostAllocator::bin_to_size(int bin) const {
-  return 1ull << static_cast<unsigned>(bin_min_pow2_ + bin);
+HostAllocator::Segment *HostAllocator::segment_of(const void *p) const {
+  return reinterpret_cast<Segment *>(reinterpret_cast<uintptr_t>(p) &
+                                     ~(static_cast<uintptr_t>(seg_align_) - 1));
 }
 
-void *HostAllocator::os_alloc(std::size_t bytes, std::size_t alignment) {
-  // We need space for header + payload with requested alignment.
-  // We'll allocate a base pointer aligned at least to alignment.
+HostAllocator::Segment *HostAllocator::os_alloc_segment(std::size_t bytes) {
   void *p = nullptr;
-  const std::size_t a = std::max<std::size_t>(alignment, 64);
-  if (posix_memalign(&p, a, bytes) != 0)
+  if (pages_)
+    p = pages_->map(bytes, seg_align_);
+  else if (posix_memalign(&p, seg_align_, bytes) != 0)
+    p = nullptr;
+  if (!p)
     return nullptr;
-  return p;
+  os_allocs_.fetch_add(1, std::memory_order_relaxed);
+  bytes_reserved_.fetch_add(bytes, std::memory_order_relaxed);
+
+  auto *seg = static_cast<Segment *>(p);
+  std::memset(static_cast<void *>(seg), 0, sizeof(Segment));
+  seg->magic = kMagic;
+  seg->owner = this;
+  seg->bytes = bytes;
+  return seg;
 }
 
-void HostAllocator::os_free(void *base) { std::free(base); }
-
-void *HostAllocator::alloc(std::size_t size, std::size_t alignment) {
-  if (size == 0)
-    size = 1;
-
-  const std::size_t a = std::max<std::size_t>(alignment, 64);
-  const std::size_t header_bytes = align_up(sizeof(BlockHeader), 64);
-  const std::size_t need_payload = align_up(size, a);
-  const std::size_t need_total = header_bytes + need_payload;
-
-  std::lock_guard<std::mutex> lk(mu_);
-  stats_.alloc_calls++;
-
-  // Large allocations bypass bins
-  const std::size_t large_threshold =
-      1ull << static_cast<unsigned>(large_threshold_pow2_);
-  if (need_payload >= large_threshold) {
-    void *base = os_alloc(need_total, a);
-    if (!base)
-      return nullptr;
-
-    stats_.os_allocs++;
-    stats_.bytes_reserved += need_total;
-    stats_.bytes_in_use += need_payload;
+void HostAllocator::os_free_segment(Segment *seg) {
+  bytes_reserved_.fetch_sub(seg->bytes, std::memory_order_relaxed);
+  seg->magic = 0;
+  if (pages_)
+    pages_->unmap(seg, seg->bytes);
+  else
+    std::free(seg);
+}
 
-    auto *h = reinterpret_cast<BlockHeader *>(base);
-    std::memset(h, 0, header_bytes);
-    h->magic = kMagic;
-    h->bin_index = kDirectBin;
-    h->requested = size;
-    h->allocated = need_payload;
-    h->next = nullptr;
+HostAllocator::ThreadCache &HostAllocator::cache() {
+  thread_local TlsCaches tls;
+  auto &entries = tls.entries;
+  if (!entries.empty() && entries[0].id == id_)
+    return *entries[0].cache;
 
-    return reinterpret_cast<void *>(reinterpret_cast<std::uint8_t *>(base) +
-                                    header_bytes);
+  for (size_t i = 1; i < entries.size(); i++) {
+    if (entries[i].id == id_) {
+      std::swap(entries[0], entries[i]);
+      return *entries[0].cache;
+    }
   }
+  // Entradas de allocators ya destruidos
+  entries.erase(std::remove_if(entries.begin(), entries.end(),
+                               [](const TlsCaches::Entry &e) {
+                                 return e.cache->owner.load() == nullptr;
+                               }),
+                entries.end());
+
+  auto tc = std::make_shared<ThreadCache>();
+  tc->mags.resize(classes_.size());
+  std::size_t slots = 0;
+  for (const auto &sc : classes_)
+    slots += sc->mag_cap;
+  tc->storage.resize(slots);
+  slots = 0;
+  for (size_t cls = 0; cls < classes_.size(); cls++) {
+    tc->mags[cls].slots = tc->storage.data() + slots;
+    slots += classes_[cls]->mag_cap;
+  }
+  tc->owner.store(this);
+  {
+    std::lock_guard<std::mutex> lk(caches_mu_);
+    caches_.push_back(tc);
+  }
+  entries.insert(entries.begin(), {id_, std::move(tc)});
+  return *entries[0].cache;
+}
 
-  const int bin = size_to_bin(need_payload);
-  if (bin < 0 || bin >= bin_count_) {
-    // Should not happen with thresholds, but fallback direct
-    void *base = os_alloc(need_total, a);
-    if (!base)
-      return nullptr;
-
-    stats_.os_allocs++;
-    stats_.bytes_reserved += need_total;
-    stats_.bytes_in_use += need_payload;
-
-    auto *h = reinterpret_cast<BlockHeader *>(base);
-    std::memset(h, 0, header_bytes);
-    h->magic = kMagic;
-    h->bin_index = kDirectBin;
-    h->requested = size;
-    h->allocated = need_payload;
-    h->next = nullptr;
+// Hilo que termina (registry_mu tomado): devuelve sus bloques a las listas
+// compartidas y acumula sus contadores
+void HostAllocator::retire(ThreadCache &tc) {
+  drain(tc);
+
+  std::lock_guard<std::mutex> lk(caches_mu_);
+  const uint64_t allocs = tc.alloc_calls.load(std::memory_order_relaxed);
+  retired_.alloc_calls += allocs;
+  retired_.free_calls += tc.free_calls.load(std::memory_order_relaxed);
+  retired_.reuse_hits += allocs - tc.fresh.load(std::memory_order_relaxed);
+  retired_.thread_cache_hits += tc.hits.load(std::memory_order_relaxed);
+  retired_.bytes_in_use += tc.in_use.load(std::memory_order_relaxed);
+  tc.owner.store(nullptr);
+  caches_.erase(std::remove_if(caches_.begin(), caches_.end(),
+                               [&](const std::shared_ptr<ThreadCache> &c) {
+                                 return c.get() == &tc;
+                               }),
+                caches_.end());
+}
 
-    return reinterpret_cast<void *>(reinterpret_cast<std::uint8_t *>(base) +
-                                    header_bytes);
+// Vacía los magazines del hilo (y sus rangos sin usar) en las listas
+// compartidas
+void HostAllocator::drain(ThreadCache &tc) {
+  for (size_t cls = 0; cls < classes_.size(); cls++) {
+    flush_magazine(tc, static_cast<int>(cls), 0);
+    auto &m = tc.mags[cls];
+    if (m.bump == m.bump_end)
+      continue;
+    SizeClass &sc = *classes_[cls];
+    std::lock_guard<std::mutex> lk(sc.mu);
+    for (; m.bump < m.bump_end; m.bump += sc.size)
+      sc.free.push_back(m.bump);
+    m.bump = m.bump_end = nullptr;
   }
+}
 
-  const std::size_t bin_payload = bin_to_size(bin);
-  const std::size_t total = header_bytes + bin_payload;
-
-  // Try freelist
-  if (freelists_[static_cast<size_t>(bin)] != nullptr) {
-    BlockHeader *h = freelists_[static_cast<size_t>(bin)];
-    freelists_[static_cast<size_t>(bin)] = h->next;
-    h->next = nullptr;
+// Devuelve a la lista compartida todo salvo los primeros `keep` bloques
+void HostAllocator::flush_magazine(ThreadCache &tc, int cls, uint32_t keep) {
+  auto &m = tc.mags[static_cast<size_t>(cls)];
+  if (m.count <= keep)
+    return;
+  SizeClass &sc = *classes_[static_cast<size_t>(cls)];
+  std::lock_guard<std::mutex> lk(sc.mu);
+  sc.free.insert(sc.free.end(), m.slots + keep, m.slots + m.count);
+  m.count = keep;
+}
 
-    stats_.reuse_hits++;
-    stats_.bytes_in_use += bin_payload;
+// Magazine vacío: lote de la lista compartida o un rango nuevo de un slab
+void *HostAllocator::refill(ThreadCache &tc, int cls) {
+  auto &m = tc.mags[static_cast<size_t>(cls)];
+  SizeClass &sc = *classes_[static_cast<size_t>(cls)];
+  {
+    std::lock_guard<std::mutex> lk(sc.mu);
+    if (!sc.free.empty()) {
+      const std::size_t n = std::min<std::size_t>(sc.batch, sc.free.size());
+      auto first = sc.free.end() - static_cast<std::ptrdiff_t>(n);
+      std::copy(first + 1, sc.free.end(), m.slots);
+      m.count = static_cast<uint32_t>(n - 1);
+      void *p = *first;
+      sc.free.erase(first, sc.free.end());
+      return p;
+    }
 
-    // payload pointer
-    return reinterpret_cast<void *>(reinterpret_cast<std::uint8_t *>(h) +
-                                    header_bytes);
+    Segment *seg = sc.segs;
+    const std::size_t cap = (sc.seg_bytes - sizeof(Segment)) / sc.size * sc.size;
+    if (!seg || seg->carved + sc.size > cap) {
+      seg = os_alloc_segment(sc.seg_bytes);
+      if (!seg)
+        return nullptr;
+      seg->kind = kSlab;
+      seg->cls = static_cast<uint16_t>(cls);
+      seg->payload = sc.size;
+      seg->next = sc.segs;
+      sc.segs = seg;
+    }
+    const std::size_t take =
+        std::min<std::size_t>(std::size_t{sc.batch} * sc.size, cap - seg->carved);
+    m.bump = reinterpret_cast<uint8_t *>(seg) + sizeof(Segment) + seg->carved;
+    m.bump_end = m.bump + take;
+    seg->carved += take;
   }
+  void *p = m.bump;
+  m.bump += sc.size;
+  bump(tc.fresh);
+  return p;
+}
 
-  // OS allocate new
-  void *base = os_alloc(total, a);
-  if (!base)
+void *HostAllocator::alloc(std::size_t size, std::size_t alignment) {
+  if (alignment == 0 || (alignment & (alignment - 1)) != 0)
     return nullptr;
+  if (size == 0)
+    size = 1;
 
-  stats_.os_allocs++;
-  stats_.bytes_reserved += total;
-  stats_.bytes_in_use += bin_payload;
-
-  auto *h = reinterpret_cast<BlockHeader *>(base);
-  std::memset(h, 0, header_bytes);
-  h->magic = kMagic;
-  h->bin_index = static_cast<uint16_t>(bin);
-  h->requested = size;
-  h->allocated = bin_payload;
-  h->next = nullptr;
-
-  return reinterpret_cast<void *>(reinterpret_cast<std::uint8_t *>(base) +
-                                  header_bytes);
+  ThreadCache &tc = cache();
+  bump(tc.alloc_calls);
+
+  const std::size_t need = align_up(size, 64);
+  if (alignment <= 64 && need < large_threshold_ &&
+      need <= class_size_.back()) {
+    const int cls = size_to_class(need);
+    auto &m = tc.mags[static_cast<size_t>(cls)];
+    const std::size_t csize = class_size_[static_cast<size_t>(cls)];
+    void *p;
+    if (m.count > 0) {
+      p = m.slots[--m.count];
+      bump(tc.hits);
+    } else if (m.bump < m.bump_end) {
+      p = m.bump;
+      m.bump += csize;
+      bump(tc.hits);
+      bump(tc.fresh);
+    } else {
+      p = refill(tc, cls);
+      if (!p)
+        return nullptr;
+    }
+    bump(tc.in_use, csize);
+    return p;
+  }
+  return alloc_large(tc, need, alignment);
 }
 
 void HostAllocator::free(void *p) {
   if (!p)
     return;
 
-  const std::size_t header_bytes = align_up(sizeof(BlockHeader), 64);
-  auto *base = reinterpret_cast<std::uint8_t *>(p) - header_bytes;
-  auto *h = reinterpret_cast<BlockHeader *>(base);
+  Segment *seg = segment_of(p);
+  if (seg->magic != kMagic || seg->owner != this) {
+    // Not a GRETA block of this allocator: ignore (v1 behavior)
+    return;
+  }
 
-  std::lock_guard<std::mutex> lk(mu_);
-  stats_.free_calls++;
+  ThreadCache &tc = cache();
+  bump(tc.free_calls);
+  bump(tc.in_use, uint64_t{0} - seg->payload);
 
-  if (h->magic != kMagic) {
-    // Not a GRETA block: ignore hard fail in v1 (could be UB); we choose
-    // safety. In debug builds, this could assert.
+  if (seg->kind == kLarge) {
+    free_large(seg);
     return;
   }
 
-  const uint16_t bin = h->bin_index;
-  const std::size_t payload = static_cast<std::size_t>(h->allocated);
-  if (stats_.bytes_in_use >= payload)
-    stats_.bytes_in_use -= payload;
+  const int cls = seg->cls;
+  auto &m = tc.mags[static_cast<size_t>(cls)];
+  const uint32_t cap = classes_[static_cast<size_t>(cls)]->mag_cap;
+  if (m.count == cap)
+    flush_magazine(tc, cls, cap / 2);
+  m.slots[m.count++] = p;
+}
 
-  if (bin == kDirectBin) {
-    // direct free to OS
-    const std::size_t total = header_bytes + payload;
-    // bytes_reserved tracks OS allocations; reduce on free
-    if (stats_.bytes_reserved >= total)
-      stats_.bytes_reserved -= total;
-    os_free(base);
-    return;
+void *HostAllocator::alloc_large(ThreadCache &tc, std::size_t need,
+                                 std::size_t alignment) {
+  const std::size_t offset = std::max(sizeof(Segment), alignment);
+  if (offset >= seg_align_)
+    return nullptr; // alineación mayor que la de segmento
+  const std::size_t payload = align_up(need, kLargeGranule);
+
+  {
+    // Mejor ajuste con holgura acotada: un bloque cacheado de 64 MiB no
+    // sirve una petición de 1 MiB
+    std::lock_guard<std::mutex> lk(large_mu_);
+    size_t best = large_free_.size();
+    for (size_t i = 0; i < large_free_.size(); i++) {
+      const Segment *s = large_free_[i];
+      if (s->payload < payload || s->payload - payload > payload / 4 ||
+          s->offset % alignment != 0)
+        continue;
+      if (best == large_free_.size() ||
+          s->payload < large_free_[best]->payload)
+        best = i;
+    }
+    if (best != large_free_.size()) {
+      Segment *seg = large_free_[best];
+      large_free_.erase(large_free_.begin() + static_cast<std::ptrdiff_t>(best));
+      large_cached_bytes_ -= seg->bytes;
+      large_hits_.fetch_add(1, std::memory_order_relaxed);
+      bump(tc.in_use, seg->payload);
+      return reinterpret_cast<uint8_t *>(seg) + seg->offset;
+    }
   }
 
-  if (bin >= static_cast<uint16_t>(bin_count_)) {
-    // corrupt bin index -> safest: free to OS
-    const std::size_t total = header_bytes + payload;
-    if (stats_.bytes_reserved >= total)
-      stats_.bytes_reserved -= total;
-    os_free(base);
-    return;
+  Segment *seg = os_alloc_segment(offset + payload);
+  if (!seg) {
+    trim(0); // sin memoria: soltar la caché y reintentar una vez
+    seg = os_alloc_segment(offset + payload);
+    if (!seg)
+      return nullptr;
   }
+  seg->kind = kLarge;
+  seg->payload = payload;
+  seg->offset = offset;
+  bump(tc.fresh);
+  bump(tc.in_use, payload);
+  return reinterpret_cast<uint8_t *>(seg) + offset;
+}
 
-  // push to freelist
-  h->next = freelists_[static_cast<size_t>(bin)];
-  freelists_[static_cast<size_t>(bin)] = h;
+void HostAllocator::free_large(Segment *seg) {
+  std::vector<Segment *> victims;
+  {
+    std::lock_guard<std::mutex> lk(large_mu_);
+    large_free_.push_back(seg);
+    large_cached_bytes_ += seg->bytes;
+    if (large_cached_bytes_ > large_cache_budget_)
+      trim_locked(large_cache_budget_, victims);
+  }
+  for (Segment *v : victims)
+    os_free_segment(v);
+}
+
+void HostAllocator::trim_locked(std::size_t keep_bytes,
+                                std::vector<Segment *> &out) {
+  size_t n = 0;
+  while (n < large_free_.size() && large_cached_bytes_ > keep_bytes) {
+    large_cached_bytes_ -= large_free_[n]->bytes;
+    out.push_back(large_free_[n]);
+    n++;
+  }
+  large_free_.erase(large_free_.begin(),
+                    large_free_.begin() + static_cast<std::ptrdiff_t>(n));
+}
+
+void HostAllocator::trim(std::size_t keep_bytes) {
+  std::vector<Segment *> victims;
+  {
+    std::lock_guard<std::mutex> lk(large_mu_);
+    trim_locked(keep_bytes, victims);
+  }
+  for (Segment *v : victims)
+    os_free_segment(v);
 }
 
 HostAllocator::Stats HostAllocator::stats() const {
-  std::lock_guard<std::mutex> lk(mu_);
-  return stats_;
+  Stats s;
+  {
+    std::lock_guard<std::mutex> lk(caches_mu_);
+    s = retired_;
+    for (const auto &c : caches_) {
+      const uint64_t allocs = c->alloc_calls.load(std::memory_order_relaxed);
+      s.alloc_calls += allocs;
+      s.free_calls += c->free_calls.load(std::memory_order_relaxed);
+      s.reuse_hits += allocs - c->fresh.load(std::memory_order_relaxed);
+      s.thread_cache_hits += c->hits.load(std::memory_order_relaxed);
+      s.bytes_in_use += c->in_use.load(std::memory_order_relaxed);
+    }
+    s.threads = caches_.size();
+  }
+  {
+    std::lock_guard<std::mutex> lk(large_mu_);
+    s.large_bytes_cached = large_cached_bytes_;
+  }
+  s.os_allocs = os_allocs_.load(std::memory_order_relaxed);
+  s.bytes_reserved = bytes_reserved_.load(std::memory_order_relaxed);
+  s.large_cache_hits = large_hits_.load(std::memory_order_relaxed);
+  return s;
 }
 
 void HostAllocator::release() {
-  const std::size_t header_bytes = align_up(sizeof(BlockHeader), 64);
-
-  std::lock_guard<std::mutex> lk(mu_);
-  for (int bin = 0; bin < bin_count_; bin++) {
-    BlockHeader *h = freelists_[static_cast<size_t>(bin)];
-    freelists_[static_cast<size_t>(bin)] = nullptr;
-    while (h) {
-      BlockHeader *next = h->next;
-      const std::size_t payload = static_cast<std::size_t>(h->allocated);
-      const std::size_t total = header_bytes + payload;
-      if (stats_.bytes_reserved >= total)
-        stats_.bytes_reserved -= total;
-      os_free(reinterpret_cast<void *>(h));
-      h = next;
+  drain(cache());
+  trim(0);
+
+  // Slabs sin bloques vivos: todos sus bloques cortados están en la lista
+  // compartida (magazines y rangos de otros hilos los mantienen vivos)
+  for (auto &scp : classes_) {
+    SizeClass &sc = *scp;
+    std::unordered_set<Segment *> dead;
+    {
+      std::lock_guard<std::mutex> lk(sc.mu);
+      std::unordered_map<Segment *, std::size_t> free_count;
+      for (void *p : sc.free)
+        free_count[segment_of(p)]++;
+
+      Segment **link = &sc.segs;
+      while (*link) {
+        Segment *seg = *link;
+        auto it = free_count.find(seg);
+        const std::size_t carved = seg->carved / sc.size;
+        if (carved > 0 && it != free_count.end() && it->second == carved) {
+          *link = seg->next;
+          dead.insert(seg);
+        } else {
+          link = &seg->next;
+        }
+      }
+      if (!dead.empty())
+        sc.free.erase(std::remove_if(sc.free.begin(), sc.free.end(),
+                                     [&](void *p) {
+                                       return dead.count(segment_of(p)) != 0;
+                                     }),
+                      sc.free.end());
     }
+    for (Segment *seg : dead)
+      os_free_segment(seg);
   }
 }
 
@@ -0,0 +1,325 @@
+#include "gcore/rt/staging_pool.hpp"
+
+#include <algorithm>
+#include <cctype>
+#include <cerrno>
+#include <chrono>
+#include <cstdlib>
+#include <cstring>
+#include <fstream>
+#include <unordered_map>
+
+#ifdef __linux__
+#include <sys/mman.h>
+#include <sys/syscall.h>
+#include <unistd.h>
+#endif
+
+namespace gcore::rt {
+
+namespace {
+
+constexpr std::size_t kSmallPage = 4096;
+constexpr std::size_t kHugePage = std::size_t{2} << 20;
+
+// Constantes de <numaif.h> (libnuma es opcional: usamos la syscall)
+constexpr int kMpolPreferred = 1;
+constexpr int kMpolBind = 2;
+constexpr unsigned kMpolMfMove = 1u << 1;
+constexpr int kMpolFNode = 1 << 0;
+constexpr int kMpolFAddr = 1 << 1;
+constexpr int kMaxNodes = 1024;
+
+std::size_t align_up(std::size_t x, std::size_t a) {
+  return (x + (a - 1)) & ~(a - 1);
+}
+
+uint64_t elapsed_ns(std::chrono::steady_clock::time_point t0) {
+  return static_cast<uint64_t>(
+      std::chrono::duration_cast<std::chrono::nanoseconds>(
+          std::chrono::steady_clock::now() - t0)
+          .count());
+}
+
+void add_note(std::string &notes, const std::string &note) {
+  if (!notes.empty())
+    notes += "; ";
+  notes += note;
+}
+
+} // namespace
+
+// ---------------- Pages ----------------
+
+class StagingPool::Pages final : public HostAllocator::PageSource {
+public:
+  Pages(const StagingOptions &opt, StagingPlacement &placement)
+      : opt_(opt), placement_(placement) {
+    placement_.huge_pages = opt.huge_pages;
+    placement_.numa_node = opt.numa_node;
+  }
+
+  void *map(std::size_t bytes, std::size_t alignment) override {
+#ifdef __linux__
+    const bool hugetlb = placement_.huge_pages == HugePages::Explicit;
+    const std::size_t page = hugetlb ? kHugePage : kSmallPage;
+    const std::size_t len = align_up(bytes, page);
+    const std::size_t span = len + std::max(alignment, page);
+
+    int flags = MAP_PRIVATE | MAP_ANONYMOUS;
+    if (hugetlb)
+      flags |= MAP_HUGETLB | (21 << MAP_HUGE_SHIFT); // 2 MiB
+    void *raw = mmap(nullptr, span, PROT_READ | PROT_WRITE, flags, -1, 0);
+    if (raw == MAP_FAILED) {
+      if (!hugetlb)
+        return nullptr;
+      // Sin páginas reservadas (vm.nr_hugepages): THP como respaldo
+      add_note(placement_.notes, std::string("MAP_HUGETLB failed (") +
+                                     std::strerror(errno) + "), using THP");
+      placement_.huge_pages = HugePages::Transparent;
+      return map(bytes, alignment);
+    }
+
+    // Recortar a la alineación pedida (múltiplos de `page`)
+    auto *base = static_cast<uint8_t *>(raw);
+    auto *p = reinterpret_cast<uint8_t *>(
+        align_up(reinterpret_cast<uintptr_t>(base), alignment));
+    if (p != base)
+      munmap(base, static_cast<std::size_t>(p - base));
+    const std::size_t tail = span - static_cast<std::size_t>(p - base) - len;
+    if (tail)
+      munmap(p + len, tail);
+
+    if (placement_.huge_pages == HugePages::Transparent &&
+        madvise(p, len, MADV_HUGEPAGE) != 0) {
+      add_note(placement_.notes, std::string("madvise(MADV_HUGEPAGE) failed (") +
+                                     std::strerror(errno) + ")");
+      placement_.huge_pages = HugePages::Off;
+    }
+    if (placement_.numa_node >= 0 && !bind(p, len))
+      placement_.numa_node = -1;
+
+    std::lock_guard<std::mutex> lk(mu_);
+    mapped_[p] = len;
+    return p;
+#else
+    (void)placement_;
+    void *p = nullptr;
+    if (posix_memalign(&p, alignment, bytes) != 0)
+      return nullptr;
+    return p;
+#endif
+  }
+
+  void unmap(void *p, std::size_t bytes) override {
+#ifdef __linux__
+    std::size_t len = bytes;
+    {
+      std::lock_guard<std::mutex> lk(mu_);
+      auto it = mapped_.find(p);
+      if (it != mapped_.end()) {
+        len = it->second;
+        mapped_.erase(it);
+      }
+    }
+    munmap(p, len);
+#else
+    (void)bytes;
+    std::free(p);
+#endif
+  }
+
+private:
+#ifdef __linux__
+  // Antes del primer acceso: las páginas se crean ya en el nodo
+  bool bind(void *p, std::size_t len) {
+    const int node = placement_.numa_node;
+    if (node >= kMaxNodes) {
+      add_note(placement_.notes, "numa node out of range");
+      return false;
+    }
+    unsigned long mask[kMaxNodes / (8 * sizeof(unsigned long))] = {};
+    mask[node / (8 * sizeof(unsigned long))] |=
+        1ul << (node % (8 * sizeof(unsigned long)));
+    const int mode = opt_.numa_strict ? kMpolBind : kMpolPreferred;
+    if (syscall(SYS_mbind, p, len, mode, mask, kMaxNodes, kMpolMfMove) != 0) {
+      add_note(placement_.notes, "mbind(node " + std::to_string(node) +
+                                     ") failed (" + std::strerror(errno) + ")");
+      return false;
+    }
+    return true;
+  }
+
+  std::mutex mu_;
+  std::unordered_map<void *, std::size_t> mapped_;
+#endif
+
+  const StagingOptions &opt_;
+  StagingPlacement &placement_;
+};
+
+// ---------------- StagingPool ----------------
+
+StagingPool::StagingPool(StagingOptions opt, StagingCopier *copier)
+    : opt_(opt), copier_(copier) {
+  if (opt_.chunks < 1)
+    opt_.chunks = 1;
+  opt_.chunk_bytes = align_up(std::max<std::size_t>(opt_.chunk_bytes, 1),
+                              kSmallPage);
+  pages_ = std::make_unique<Pages>(opt_, placement_);
+  // Sólo bloques grandes y sin caché: cada chunk es un segmento propio
+  alloc_ = std::make_unique<HostAllocator>(6, 12, 12, 0, pages_.get());
+}
+
+StagingPool::~StagingPool() {
+  for (size_t i = 0; i < chunks_.size(); i++) {
+    if (copier_ && in_flight_[i])
+      copier_->wait(static_cast<int>(i), nullptr);
+    if (copier_ && pinned_[i])
+      copier_->unpin(chunks_[i]);
+    alloc_->free(chunks_[i]);
+  }
+}
+
+bool StagingPool::init(std::string *err) {
+  std::lock_guard<std::mutex> lk(mu_);
+  if (ready_)
+    return true;
+  if (!copier_) {
+    if (err)
+      *err = "StagingPool: no copier";
+    return false;
+  }
+
+  for (int i = 0; i < opt_.chunks; i++) {
+    // Alineación de página: el payload queda justo tras la cabecera del
+    // segmento (alinear a 2 MiB gastaría una página enorme por chunk)
+    void *p = alloc_->alloc(opt_.chunk_bytes, kSmallPage);
+    if (!p) {
+      if (err)
+        *err = "StagingPool: cannot map " + std::to_string(opt_.chunk_bytes) +
+               " bytes for chunk " + std::to_string(i);
+      return false;
+    }
+    chunks_.push_back(p);
+    in_flight_.push_back(false);
+    pinned_.push_back(false);
+
+    if (opt_.prefault) {
+      auto *bytes = static_cast<uint8_t *>(p);
+      for (std::size_t off = 0; off < opt_.chunk_bytes; off += kSmallPage)
+        bytes[off] = 0;
+    }
+    if (!copier_->pin(p, opt_.chunk_bytes, err))
+      return false;
+    pinned_.back() = true;
+  }
+
+  placement_.pinned = true;
+  if (opt_.prefault)
+    placement_.numa_observed = numa_node_of_address(chunks_[0]);
+  ready_ = true;
+  return true;
+}
+
+bool StagingPool::upload(void *dst, const void *src, std::size_t bytes,
+                         std::string *err) {
+  const auto *s = static_cast<const uint8_t *>(src);
+  return upload(dst, bytes,
+                [s](void *chunk, std::size_t offset, std::size_t n) {
+                  std::memcpy(chunk, s + offset, n);
+                  return true;
+                },
+                err);
+}
+
+bool StagingPool::upload(void *dst, std::size_t bytes, const FillFn &fill,
+                         std::string *err) {
+  std::lock_guard<std::mutex> lk(mu_);
+  if (!ready_) {
+    if (err)
+      *err = "StagingPool: init() not done";
+    return false;
+  }
+
+  auto wait_slot = [&](size_t slot) {
+    if (!in_flight_[slot])
+      return true;
+    const auto t0 = std::chrono::steady_clock::now();
+    const bool ok = copier_->wait(static_cast<int>(slot), err);
+    stats_.wait_ns += elapsed_ns(t0);
+    in_flight_[slot] = false;
+    return ok;
+  };
+
+  bool ok = true;
+  std::size_t i = 0;
+  for (std::size_t off = 0; ok && off < bytes; off += opt_.chunk_bytes, i++) {
+    const size_t slot = i % chunks_.size();
+    const std::size_t n = std::min(opt_.chunk_bytes, bytes - off);
+    // El chunk se rellena mientras el anterior sigue copiándose
+    if (!wait_slot(slot)) {
+      ok = false;
+      break;
+    }
+    const auto t0 = std::chrono::steady_clock::now();
+    if (!fill(chunks_[slot], off, n)) {
+      if (err && err->empty())
+        *err = "StagingPool: fill failed at offset " + std::to_string(off);
+      ok = false;
+      break;
+    }
+    stats_.fill_ns += elapsed_ns(t0);
+    if (!copier_->copy_async(dst, off, chunks_[slot], n,
+                             static_cast<int>(slot), err)) {
+      ok = false;
+      break;
+    }
+    in_flight_[slot] = true;
+    stats_.chunks_filled++;
+  }
+
+  // Síncrono como hipMemcpy: drenar también tras un error
+  for (size_t slot = 0; slot < chunks_.size(); slot++)
+    ok &= wait_slot(slot);
+
+  if (ok) {
+    stats_.uploads++;
+    stats_.bytes += bytes;
+  }
+  return ok;
+}
+
+StagingPool::Stats StagingPool::stats() const {
+  std::lock_guard<std::mutex> lk(mu_);
+  return stats_;
+}
+
+// ---------------- NUMA helpers ----------------
+
+int numa_node_of_pci(const std::string &pci_bus_id,
+                     const std::string &sysfs_root) {
+  std::string id = pci_bus_id;
+  std::transform(id.begin(), id.end(), id.begin(),
+                 [](unsigned char c) { return std::tolower(c); });
+  std::ifstream f(sysfs_root + "/bus/pci/devices/" + id + "/numa_node");
+  int node = -1;
+  if (!(f >> node))
+    return -1;
+  return node >= 0 ? node : -1;
+}
+
+int numa_node_of_address(const void *p) {
+#ifdef __linux__
+  int node = -1;
+  if (syscall(SYS_get_mempolicy, &node, nullptr, 0, const_cast<void *>(p),
+              kMpolFNode | kMpolFAddr) != 0)
+    return -1;
+  return node;
+#else
+  (void)p;
+  return -1;
+#endif
+}
+
+} // namespace gcore::rt
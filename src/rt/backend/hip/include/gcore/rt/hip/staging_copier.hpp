@@ -0,0 +1,39 @@
+#pragma once
+
+#include "gcore/rt/staging_pool.hpp"
+
+#include <hip/hip_runtime.h>
+#include <string>
+#include <vector>
+
+namespace gcore::rt::hip {
+
+// StagingCopier for HIP: chunks are page-locked with hipHostRegister and
+// copied with hipMemcpyAsync on a private non-blocking stream; one event
+// per chunk tells the pool when the chunk can be refilled.
+class HipStagingCopier final : public gcore::rt::StagingCopier {
+public:
+  explicit HipStagingCopier(int slots = 2);
+  ~HipStagingCopier() override;
+
+  HipStagingCopier(const HipStagingCopier &) = delete;
+  HipStagingCopier &operator=(const HipStagingCopier &) = delete;
+
+  // Create the stream and events on the current device.
+  bool init(std::string *err = nullptr);
+
+  bool pin(void *host, size_t bytes, std::string *err) override;
+  void unpin(void *host) override;
+  bool copy_async(void *dst, size_t offset, const void *src, size_t bytes,
+                  int slot, std::string *err) override;
+  bool wait(int slot, std::string *err) override;
+
+  // NUMA node closest to `device` (sysfs via its PCI bus id), -1 unknown.
+  static int device_numa_node(int device);
+
+private:
+  hipStream_t stream_ = nullptr;
+  std::vector<hipEvent_t> events_;
+};
+
+} // namespace gcore::rt::hip
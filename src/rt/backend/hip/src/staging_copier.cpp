@@ -0,0 +1,75 @@
+#include "gcore/rt/hip/staging_copier.hpp"
+
+namespace gcore::rt::hip {
+
+static bool hip_ok(hipError_t res, const char *what, std::string *err) {
+  if (res == hipSuccess)
+    return true;
+  if (err)
+    *err = std::string(what) + " failed: " + hipGetErrorString(res);
+  return false;
+}
+
+HipStagingCopier::HipStagingCopier(int slots)
+    : events_(static_cast<size_t>(slots > 0 ? slots : 1), nullptr) {}
+
+HipStagingCopier::~HipStagingCopier() {
+  for (auto &ev : events_) {
+    if (ev)
+      (void)hipEventDestroy(ev);
+  }
+  if (stream_)
+    (void)hipStreamDestroy(stream_);
+}
+
+bool HipStagingCopier::init(std::string *err) {
+  if (stream_)
+    return true;
+  if (!hip_ok(hipStreamCreateWithFlags(&stream_, hipStreamNonBlocking),
+              "hipStreamCreateWithFlags", err))
+    return false;
+  for (auto &ev : events_) {
+    if (!hip_ok(hipEventCreateWithFlags(&ev, hipEventDisableTiming),
+                "hipEventCreateWithFlags", err))
+      return false;
+  }
+  return true;
+}
+
+bool HipStagingCopier::pin(void *host, size_t bytes, std::string *err) {
+  return hip_ok(hipHostRegister(host, bytes, hipHostRegisterDefault),
+                "hipHostRegister", err);
+}
+
+void HipStagingCopier::unpin(void *host) { (void)hipHostUnregister(host); }
+
+bool HipStagingCopier::copy_async(void *dst, size_t offset, const void *src,
+                                  size_t bytes, int slot, std::string *err) {
+  if (slot < 0 || static_cast<size_t>(slot) >= events_.size()) {
+    if (err)
+      *err = "HipStagingCopier: slot " + std::to_string(slot) + " out of range";
+    return false;
+  }
+  char *d = static_cast<char *>(dst) + offset;
+  if (!hip_ok(hipMemcpyAsync(d, src, bytes, hipMemcpyHostToDevice, stream_),
+              "hipMemcpyAsync H2D", err))
+    return false;
+  return hip_ok(hipEventRecord(events_[static_cast<size_t>(slot)], stream_),
+                "hipEventRecord", err);
+}
+
+bool HipStagingCopier::wait(int slot, std::string *err) {
+  if (slot < 0 || static_cast<size_t>(slot) >= events_.size())
+    return false;
+  return hip_ok(hipEventSynchronize(events_[static_cast<size_t>(slot)]),
+                "hipEventSynchronize", err);
+}
+
+int HipStagingCopier::device_numa_node(int device) {
+  char bus_id[64] = {};
+  if (hipDeviceGetPCIBusId(bus_id, sizeof(bus_id), device) != hipSuccess)
+    return -1;
+  return gcore::rt::numa_node_of_pci(bus_id);
+}
+
+} // namespace gcore::rt::hip
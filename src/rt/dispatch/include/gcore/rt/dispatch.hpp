@@ -10,6 +10,9 @@
 namespace gcore::rt {
 
 // Minimal dispatch: submits work onto a Stream and instruments it.
+// Every task is recorded in the registry's histograms:
+// - dispatch.task_ns: time inside the work function
+// - dispatch.latency_ns: submit() -> work finished (includes queueing)
 class Dispatcher final {
 public:
   struct Stats {
@@ -18,13 +21,14 @@ public:
     uint64_t total_work_ns = 0; // aggregated measured work time (ns)
   };
 
-  Dispatcher();
+  explicit Dispatcher(MetricsRegistry &metrics = MetricsRegistry::global());
 
   Dispatcher(const Dispatcher &) = delete;
   Dispatcher &operator=(const Dispatcher &) = delete;
 
   // Submit work onto the stream. Work is executed in-order.
-  // - label is used for future tracing/logging.
+  // - label names the task's span in the SpanTracer (copied only while
+  //   tracing is enabled).
   // - returns an Event that completes after the work.
   Event submit(Stream &stream, std::function<void()> work,
                std::string_view label = "work");
@@ -35,6 +39,8 @@ private:
   Counter submits_;
   Counter completed_;
   Counter work_ns_;
+  Histogram &task_ns_;
+  Histogram &latency_ns_;
 };
 
 } // namespace gcore::rt
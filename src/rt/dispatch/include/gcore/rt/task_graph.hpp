@@ -0,0 +1,67 @@
+#pragma once
+
+#include <cstddef>
+#include <functional>
+#include <memory>
+#include <string>
+#include <vector>
+
+#include "gcore/rt/dispatch.hpp"
+#include "gcore/rt/executor.hpp"
+#include "gcore/rt/stream.hpp"
+
+namespace gcore::rt {
+
+// Host task graph over Dispatcher: a small DAG of CPU callables (weight
+// reads, dequantization, trace serialization...) whose independent nodes
+// overlap on the Executor.
+// - add() appends a node; its deps must be ids returned by earlier add()
+//   calls, so the graph is acyclic by construction.
+// - launch() submits every node through the Dispatcher on its own Stream,
+//   preceded by Stream::wait_event() on each dependency: dependencies are
+//   resolved by the executor (parked lanes), never by a sleeping thread.
+// - Nodes pinned to a caller Stream (add_on) also keep that stream's order.
+class TaskGraph final {
+public:
+  using TaskId = size_t;
+
+  explicit TaskGraph(Dispatcher &disp,
+                     Executor &exec = Executor::instance());
+  ~TaskGraph(); // waits for launched nodes
+
+  TaskGraph(const TaskGraph &) = delete;
+  TaskGraph &operator=(const TaskGraph &) = delete;
+
+  TaskId add(std::function<void()> work, std::vector<TaskId> deps = {},
+             std::string label = "task");
+  TaskId add_on(Stream &stream, std::function<void()> work,
+                std::vector<TaskId> deps = {}, std::string label = "task");
+
+  // Submit all nodes (once). Returns false (err) on an invalid dependency.
+  bool launch(std::string *err = nullptr);
+
+  // Block until every launched node completed.
+  void wait() const;
+
+  // Completion event of a node (valid after launch()).
+  const Event &done(TaskId id) const { return nodes_[id].done; }
+
+  size_t size() const { return nodes_.size(); }
+
+private:
+  struct Node {
+    std::function<void()> work;
+    std::vector<TaskId> deps;
+    std::string label;
+    Stream *stream = nullptr; // nullptr -> carril propio
+    Event done;
+  };
+
+  Dispatcher &disp_;
+  Executor &exec_;
+  std::vector<Node> nodes_;
+  std::vector<std::unique_ptr<Stream>> lanes_;
+  bool launched_ = false;
+};
+
+} // namespace gcore::rt
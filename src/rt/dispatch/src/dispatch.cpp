@@ -1,28 +1,40 @@
 #include "gcore/rt/dispatch.hpp"
+#include "gcore/rt/span_tracer.hpp"
 
 #include <atomic>
 
 namespace gcore::rt {
 
-Dispatcher::Dispatcher()
+Dispatcher::Dispatcher(MetricsRegistry &metrics)
     : submits_("dispatch_submits"), completed_("dispatch_completed"),
-      work_ns_("dispatch_work_ns") {}
+      work_ns_("dispatch_work_ns"),
+      task_ns_(metrics.histogram("dispatch.task_ns")),
+      latency_ns_(metrics.histogram("dispatch.latency_ns")) {}
 
 Event Dispatcher::submit(Stream &stream, std::function<void()> work,
-                         std::string_view /*label*/) {
+                         std::string_view label) {
   submits_.inc(1);
+  const uint64_t submitted = now_ns();
+  // label puede no sobrevivir a la tarea: sólo se interna con traza activa
+  const char *span_name = SpanTracer::enabled()
+                              ? SpanTracer::instance().intern(label)
+                              : nullptr;
 
+  // El Stream señala el Event tras la tarea (estado de Event de un pool)
   Event done;
-  Event done_copy = done; // handle copiable
-
-  stream.enqueue([this, work = std::move(work), done_copy]() mutable {
-    {
-      ScopedTimer t(work_ns_);
-      work();
-    }
-    completed_.inc(1);
-    done_copy.signal();
-  });
+  stream.enqueue(
+      [this, submitted, span_name, work = std::move(work)]() {
+        const uint64_t start = now_ns();
+        work();
+        const uint64_t end = now_ns();
+        if (span_name && SpanTracer::enabled())
+          SpanTracer::instance().complete(span_name, "dispatch", start, end);
+        work_ns_.inc(end - start);
+        task_ns_.record(end - start);
+        latency_ns_.record(end - submitted);
+        completed_.inc(1);
+      },
+      done);
 
   return done;
 }
@@ -0,0 +1,65 @@
+#include "gcore/rt/task_graph.hpp"
+
+namespace gcore::rt {
+
+TaskGraph::TaskGraph(Dispatcher &disp, Executor &exec)
+    : disp_(disp), exec_(exec) {}
+
+TaskGraph::~TaskGraph() {
+  if (launched_)
+    wait();
+}
+
+TaskGraph::TaskId TaskGraph::add(std::function<void()> work,
+                                 std::vector<TaskId> deps, std::string label) {
+  nodes_.push_back({std::move(work), std::move(deps), std::move(label),
+                    nullptr, Event()});
+  return nodes_.size() - 1;
+}
+
+TaskGraph::TaskId TaskGraph::add_on(Stream &stream, std::function<void()> work,
+                                    std::vector<TaskId> deps,
+                                    std::string label) {
+  const TaskId id = add(std::move(work), std::move(deps), std::move(label));
+  nodes_[id].stream = &stream;
+  return id;
+}
+
+bool TaskGraph::launch(std::string *err) {
+  if (launched_) {
+    if (err)
+      *err = "task graph already launched";
+    return false;
+  }
+  // Validar antes de encolar nada: un grafo a medias no se puede esperar
+  for (TaskId id = 0; id < nodes_.size(); id++) {
+    for (TaskId d : nodes_[id].deps) {
+      if (d >= id) {
+        if (err)
+          *err = "task '" + nodes_[id].label + "' depends on task " +
+                 std::to_string(d) + " not added before it";
+        return false;
+      }
+    }
+  }
+  launched_ = true;
+
+  for (Node &node : nodes_) {
+    Stream *s = node.stream;
+    if (!s) {
+      lanes_.push_back(std::make_unique<Stream>(exec_));
+      s = lanes_.back().get();
+    }
+    for (TaskId d : node.deps)
+      s->wait_event(nodes_[d].done);
+    node.done = disp_.submit(*s, std::move(node.work), node.label);
+  }
+  return true;
+}
+
+void TaskGraph::wait() const {
+  for (const Node &node : nodes_)
+    node.done.wait();
+}
+
+} // namespace gcore::rt
@@ -0,0 +1,610 @@
+#pragma once
+
+#include <gcore/rt/ref/cpu_reference.hpp>
+
+#include <algorithm>
+#include <atomic>
+#include <condition_variable>
+#include <cstdint>
+#include <cstdlib>
+#include <functional>
+#include <mutex>
+#include <thread>
+#include <vector>
+
+namespace gcore::rt::ref {
+
+/**
+ * @brief Pool de hilos persistente para los kernels CPU.
+ * Tamaño: GRETA_CPU_THREADS o hardware_concurrency(). El hilo que llama
+ * también trabaja; llamadas anidadas desde un worker se ejecutan en línea.
+ */
+class CpuThreadPool {
+public:
+    explicit CpuThreadPool(size_t threads) {
+        const size_t n = std::max<size_t>(threads, 1);
+        for (size_t i = 1; i < n; ++i) {
+            workers_.emplace_back([this] { worker_loop(); });
+        }
+    }
+
+    ~CpuThreadPool() {
+        {
+            std::lock_guard<std::mutex> lk(mu_);
+            stop_ = true;
+        }
+        cv_.notify_all();
+        for (auto& t : workers_) t.join();
+    }
+
+    CpuThreadPool(const CpuThreadPool&) = delete;
+    CpuThreadPool& operator=(const CpuThreadPool&) = delete;
+
+    static CpuThreadPool& instance() {
+        static CpuThreadPool pool(default_threads());
+        return pool;
+    }
+
+    static size_t default_threads() {
+        if (const char* v = std::getenv("GRETA_CPU_THREADS")) {
+            const long n = std::strtol(v, nullptr, 10);
+            if (n > 0) return static_cast<size_t>(n);
+        }
+        return std::max(1u, std::thread::hardware_concurrency());
+    }
+
+    size_t size() const { return workers_.size() + 1; }
+
+    /**
+     * @brief Ejecuta fn(i) para i en [0, n) y espera a que terminen todas.
+     * max_threads limita los hilos usados (0 = todo el pool).
+     */
+    void parallel_for(size_t n, const std::function<void(size_t)>& fn, size_t max_threads = 0) {
+        if (n == 0) return;
+        size_t helpers = workers_.size();
+        if (max_threads != 0) helpers = std::min(helpers, max_threads - 1);
+        helpers = std::min(helpers, n - 1);
+        if (helpers == 0 || in_worker()) {
+            for (size_t i = 0; i < n; ++i) fn(i);
+            return;
+        }
+        std::lock_guard<std::mutex> call(call_mu_); // un trabajo a la vez
+        {
+            std::lock_guard<std::mutex> lk(mu_);
+            job_ = &fn;
+            job_n_ = n;
+            job_helpers_ = helpers;
+            next_.store(0, std::memory_order_relaxed);
+            pending_ = workers_.size();
+            ++generation_;
+        }
+        cv_.notify_all();
+        run_chunks(fn, n);
+        std::unique_lock<std::mutex> lk(mu_);
+        done_cv_.wait(lk, [this] { return pending_ == 0; });
+        job_ = nullptr;
+    }
+
+private:
+    static bool& in_worker() {
+        thread_local bool flag = false;
+        return flag;
+    }
+
+    void run_chunks(const std::function<void(size_t)>& fn, size_t n) {
+        for (size_t i = next_.fetch_add(1, std::memory_order_relaxed); i < n;
+             i = next_.fetch_add(1, std::memory_order_relaxed)) {
+            fn(i);
+        }
+    }
+
+    void worker_loop() {
+        in_worker() = true;
+        const size_t id = [this] {
+            std::lock_guard<std::mutex> lk(mu_);
+            return next_id_++;
+        }();
+        uint64_t seen = 0;
+        std::unique_lock<std::mutex> lk(mu_);
+        for (;;) {
+            cv_.wait(lk, [&] { return stop_ || generation_ != seen; });
+            if (stop_) return;
+            seen = generation_;
+            const auto* fn = job_;
+            const size_t n = job_n_;
+            const bool participate = id < job_helpers_;
+            lk.unlock();
+            if (participate) run_chunks(*fn, n);
+            lk.lock();
+            if (--pending_ == 0) done_cv_.notify_one();
+        }
+    }
+
+    std::vector<std::thread> workers_;
+    std::mutex call_mu_;
+    std::mutex mu_;                 // protege job_*, pending_, generation_, stop_
+    std::condition_variable cv_;
+    std::condition_variable done_cv_;
+    const std::function<void(size_t)>* job_ = nullptr;
+    size_t job_n_ = 0;
+    size_t job_helpers_ = 0;
+    size_t pending_ = 0;
+    size_t next_id_ = 0;
+    uint64_t generation_ = 0;
+    bool stop_ = false;
+    std::atomic<size_t> next_{0};
+};
+
+enum class GemmMode {
+    Golden,  // triple bucle de CpuReference (acumulación double)
+    Blocked  // micro-kernel con registros + tiling L1/L2 + paneles B empaquetados, multihilo
+};
+
+enum class GemmInput {
+    F32, F16, BF16,
+    I8, // int8 por elemento + escala por grupo (load_tensor_int8), solo B
+    I4  // dos int4 por byte, nibble bajo = par (load_tensor_int4), solo B
+};
+
+/**
+ * @brief Escalas de pesos I8/I4: una escala FP32 por grupo de group_size
+ * elementos consecutivos del índice plano (scales[idx / group_size]).
+ */
+struct GemmQuant {
+    const float* scales = nullptr;
+    int group_size = 32;
+};
+
+/**
+ * @brief GEMM CPU de alto rendimiento (C = A * B, row-major, acumulación FP32).
+ *
+ * Esquema tipo BLIS: para cada panel de B (KC x NC) empaquetado en tiras de
+ * NR columnas (convertido a FP32 una sola vez), cada tarea empaqueta un bloque
+ * de A (MC x KC) en tiras de MR filas y recorre micro-tiles MR x NR que el
+ * compilador mantiene en registros. Las tareas (bloque de filas x grupo de
+ * tiras de B) se reparten en CpuThreadPool.
+ */
+class CpuGemm {
+public:
+    static constexpr int MR = 6;    // filas del micro-tile
+    static constexpr int NR = 16;   // columnas del micro-tile (vector contiguo)
+    static constexpr int KC = 256;  // profundidad: tira de B (KC x NR) en L1
+    static constexpr int MC = 96;   // bloque de A (MC x KC) en L2
+    static constexpr int NC = 2048; // panel de B (KC x NC) en L3
+
+    static void gemm(const float* A, const float* B, float* C, int M, int N, int K,
+                     GemmMode mode = GemmMode::Blocked, int threads = 0) {
+        if (mode == GemmMode::Golden) {
+            CpuReference::gemm(A, B, C, M, N, K);
+            return;
+        }
+        blocked(A, GemmInput::F32, B, GemmInput::F32, C, M, N, K, threads);
+    }
+
+    static void gemm_f16(const uint16_t* A, const uint16_t* B, float* C, int M, int N, int K,
+                         GemmMode mode = GemmMode::Blocked, int threads = 0) {
+        if (mode == GemmMode::Golden) {
+            CpuReference::gemm_f16(A, B, C, M, N, K);
+            return;
+        }
+        blocked(A, GemmInput::F16, B, GemmInput::F16, C, M, N, K, threads);
+    }
+
+    static void gemm_bf16(const uint16_t* A, const uint16_t* B, float* C, int M, int N, int K,
+                          GemmMode mode = GemmMode::Blocked, int threads = 0) {
+        if (mode == GemmMode::Golden) {
+            CpuReference::gemm_bf16(A, B, C, M, N, K);
+            return;
+        }
+        blocked(A, GemmInput::BF16, B, GemmInput::BF16, C, M, N, K, threads);
+    }
+
+    /**
+     * @brief C[M][N] = A * W^T con W INT8 [N][K] y escalas por grupo, mismos
+     * buffers que gemv_int8_wt_kernel (s_wq...). Decuantiza al vuelo.
+     */
+    static void gemm_int8(const float* A, const int8_t* W, const float* scales, float* C,
+                          int M, int N, int K, int group_size = 32,
+                          GemmMode mode = GemmMode::Blocked, int threads = 0) {
+        if (mode == GemmMode::Golden) {
+            CpuReference::gemm_int8_wt(A, W, scales, C, M, N, K, group_size);
+            return;
+        }
+        const GemmQuant q{scales, group_size};
+        linear(A, W, GemmInput::I8, C, M, N, K, threads, &q);
+    }
+
+    /**
+     * @brief C[M][N] = A * W^T con W INT4 empaquetado [N][K/2], escalas por
+     * grupo y, opcionalmente, escala por cabeza (sh_wq...) aplicada a la salida
+     * j como head_scales[j / head_dim], igual que gemv_int4_wt_kernel.
+     */
+    static void gemm_int4(const float* A, const uint8_t* W, const float* scales,
+                          const float* head_scales, float* C, int M, int N, int K,
+                          int group_size = 32, int head_dim = 0,
+                          GemmMode mode = GemmMode::Blocked, int threads = 0) {
+        if (mode == GemmMode::Golden) {
+            CpuReference::gemm_int4_wt(A, W, scales, head_scales, C, M, N, K, group_size, head_dim);
+            return;
+        }
+        const GemmQuant q{scales, group_size};
+        linear(A, W, GemmInput::I4, C, M, N, K, threads, &q);
+        if (head_scales && head_dim > 0) {
+            for (int i = 0; i < M; ++i) {
+                float* cr = C + static_cast<size_t>(i) * N;
+                for (int j = 0; j < N; ++j) cr[j] *= head_scales[j / head_dim];
+            }
+        }
+    }
+
+    static constexpr int kGemvMaxRows = 4;     // hasta aquí GEMV (decode), después blocked
+    static constexpr int kGemvRowsPerTask = 32;
+
+    /**
+     * @brief Capa lineal C[M][N] = A[M][K] * W^T con W en [N][K] (pesos
+     * [out][in]) de cualquier GemmInput. Con pocas filas (decode) el pack de B
+     * no se amortiza: GEMV por filas de W. FP16/BF16 se convierten fila a fila
+     * a FP32; I8/I4 se decuantizan dentro del producto escalar (dot_int8 /
+     * dot_int4), así el coste queda dominado por leer W y INT8/INT4 mueven
+     * 2x/4x menos bytes que FP16.
+     */
+    static void linear(const float* A, const void* W, GemmInput tw, float* C, int M, int N, int K,
+                       int threads = 0, const GemmQuant* qw = nullptr) {
+        if (M > kGemvMaxRows) {
+            blocked(A, GemmInput::F32, W, tw, C, M, N, K, threads, /*trans_b=*/true, qw);
+            return;
+        }
+        if (M <= 0 || N <= 0) return;
+        // Ruta fusionada: cada fila de W empieza en un grupo y los grupos son
+        // múltiplos del bloque del kernel (16 pesos INT8, 32 INT4)
+        const bool fused =
+            (tw == GemmInput::I8 && K % qw->group_size == 0 && qw->group_size % 16 == 0) ||
+            (tw == GemmInput::I4 && K % qw->group_size == 0 && qw->group_size % 32 == 0);
+        // INT4 lleva pares/impares en nibbles: A desentrelazado una vez por llamada
+        std::vector<float> a_split;
+        if (fused && tw == GemmInput::I4) {
+            a_split.resize(static_cast<size_t>(M) * K);
+            for (int i = 0; i < M; ++i) {
+                const float* a = A + static_cast<size_t>(i) * K;
+                float* even = a_split.data() + static_cast<size_t>(i) * K;
+                float* odd = even + K / 2;
+                for (int p = 0; p < K / 2; ++p) {
+                    even[p] = a[2 * p];
+                    odd[p] = a[2 * p + 1];
+                }
+            }
+        }
+        const size_t tasks = (static_cast<size_t>(N) + kGemvRowsPerTask - 1) / kGemvRowsPerTask;
+        CpuThreadPool::instance().parallel_for(tasks, [&](size_t t) {
+            thread_local std::vector<float> wrow;
+            if (!fused) wrow.resize(static_cast<size_t>(K));
+            const int j0 = static_cast<int>(t) * kGemvRowsPerTask;
+            const int j1 = std::min(N, j0 + kGemvRowsPerTask);
+            for (int j = j0; j < j1; ++j) {
+                const size_t row = static_cast<size_t>(j) * K;
+                if (!fused) load_row(W, tw, row, K, wrow.data(), qw);
+                for (int i = 0; i < M; ++i) {
+                    const float* a = A + static_cast<size_t>(i) * K;
+                    float& c = C[static_cast<size_t>(i) * N + j];
+                    if (!fused) {
+                        c = dot(a, wrow.data(), static_cast<size_t>(K));
+                    } else if (tw == GemmInput::I8) {
+                        c = dot_int8(a, static_cast<const int8_t*>(W) + row,
+                                     qw->scales + row / qw->group_size, qw->group_size,
+                                     static_cast<size_t>(K));
+                    } else {
+                        const float* even = a_split.data() + static_cast<size_t>(i) * K;
+                        c = dot_int4(even, even + K / 2, static_cast<const uint8_t*>(W) + row / 2,
+                                     qw->scales + row / qw->group_size, qw->group_size,
+                                     static_cast<size_t>(K));
+                    }
+                }
+            }
+        }, static_cast<size_t>(threads));
+    }
+
+    /**
+     * @brief sum_k x[k] * (w[k] * scales[k / group_size]) sobre una fila INT8
+     * que empieza en un grupo (group_size múltiplo de 16, n de group_size).
+     * Mismo producto FP32 por peso que gemv_int8_wt_kernel.
+     */
+    static float dot_int8(const float* x, const int8_t* w, const float* scales, int group_size,
+                          size_t n) {
+        const size_t gs = static_cast<size_t>(group_size);
+        float acc[16] = {};
+        for (size_t g = 0; g < n; g += gs) {
+            const float s = scales[g / gs];
+            for (size_t i = g; i < g + gs; i += 16) {
+#pragma GCC unroll 16
+                for (size_t j = 0; j < 16; ++j)
+                    acc[j] += x[i + j] * (static_cast<float>(w[i + j]) * s);
+            }
+        }
+        float sum = 0.0f;
+        for (size_t j = 0; j < 16; ++j) sum += acc[j];
+        return sum;
+    }
+
+    /**
+     * @brief Como dot_int8 para una fila INT4 empaquetada (n pesos, n/2
+     * bytes; group_size múltiplo de 32). x_even/x_odd son los elementos
+     * pares/impares de x, así cada byte aporta nibble bajo * x_even[b] y
+     * nibble alto * x_odd[b] con accesos contiguos (vectorizable).
+     */
+    static float dot_int4(const float* x_even, const float* x_odd, const uint8_t* w,
+                          const float* scales, int group_size, size_t n) {
+        const size_t gb = static_cast<size_t>(group_size) / 2; // bytes por grupo
+        float acc[16] = {};
+        for (size_t g = 0; g < n / 2; g += gb) {
+            const float s = scales[g / gb];
+            for (size_t b = g; b < g + gb; b += 16) {
+                int32_t lo[16], hi[16];
+                unpack_int4(w + b, lo, hi);
+#pragma GCC unroll 16
+                for (size_t j = 0; j < 16; ++j)
+                    acc[j] += x_even[b + j] * (static_cast<float>(lo[j]) * s);
+#pragma GCC unroll 16
+                for (size_t j = 0; j < 16; ++j)
+                    acc[j] += x_odd[b + j] * (static_cast<float>(hi[j]) * s);
+            }
+        }
+        float sum = 0.0f;
+        for (size_t j = 0; j < 16; ++j) sum += acc[j];
+        return sum;
+    }
+
+    /// Producto escalar FP32 con 16 acumuladores (vectorizable sin -ffast-math)
+    static float dot(const float* a, const float* b, size_t n) {
+        constexpr size_t W = 16;
+        float acc[W] = {};
+        size_t i = 0;
+        for (; i + W <= n; i += W) {
+#pragma GCC unroll 16
+            for (size_t j = 0; j < W; ++j) acc[j] += a[i + j] * b[i + j];
+        }
+        float sum = 0.0f;
+        for (size_t j = 0; j < W; ++j) sum += acc[j];
+        for (; i < n; ++i) sum += a[i] * b[i];
+        return sum;
+    }
+
+    /**
+     * @brief Decuantiza n pesos INT8 desde el índice plano idx:
+     * dst[i] = w[idx + i] * scales[(idx + i) / group_size] (mismo producto FP32
+     * que el kernel GPU). Dentro de cada grupo la escala es constante y el
+     * bucle va en bloques de 16 desenrollados.
+     */
+    static void dequant_int8(const int8_t* w, const float* scales, int group_size, size_t idx,
+                             size_t n, float* dst) {
+        const size_t gs = static_cast<size_t>(group_size);
+        size_t i = 0;
+        while (i < n) {
+            const size_t g = (idx + i) / gs;
+            const size_t end = std::min(n, (g + 1) * gs - idx);
+            const float s = scales[g];
+            const int8_t* src = w + idx;
+            for (; i + 16 <= end; i += 16) {
+#pragma GCC unroll 16
+                for (size_t j = 0; j < 16; ++j) dst[i + j] = static_cast<float>(src[i + j]) * s;
+            }
+            for (; i < end; ++i) dst[i] = static_cast<float>(src[i]) * s;
+        }
+    }
+
+    /// Como dequant_int8 para INT4 empaquetado (ver CpuReference::int4_value)
+    static void dequant_int4(const uint8_t* w, const float* scales, int group_size, size_t idx,
+                             size_t n, float* dst) {
+        const size_t gs = static_cast<size_t>(group_size);
+        size_t i = 0;
+        while (i < n) {
+            const size_t g = (idx + i) / gs;
+            const size_t end = std::min(n, (g + 1) * gs - idx);
+            const float s = scales[g];
+            if (((idx + i) & 1) == 0) {
+                // inicio par: 16 bytes completos -> 32 pesos
+                for (; i + 32 <= end; i += 32) {
+                    int32_t lo[16], hi[16];
+                    unpack_int4(w + ((idx + i) >> 1), lo, hi);
+#pragma GCC unroll 16
+                    for (size_t j = 0; j < 16; ++j) {
+                        dst[i + 2 * j] = static_cast<float>(lo[j]) * s;
+                        dst[i + 2 * j + 1] = static_cast<float>(hi[j]) * s;
+                    }
+                }
+            }
+            for (; i < end; ++i) dst[i] = static_cast<float>(CpuReference::int4_value(w, idx + i)) * s;
+        }
+    }
+
+    /// 16 bytes INT4 -> nibbles bajos/altos con signo (desplazamientos en 32 bits, vectorizable)
+    static void unpack_int4(const uint8_t* b, int32_t* lo, int32_t* hi) {
+#pragma GCC unroll 16
+        for (size_t j = 0; j < 16; ++j) {
+            const int32_t v = static_cast<int8_t>(b[j]);
+            lo[j] = static_cast<int32_t>(static_cast<uint32_t>(v) << 28) >> 28;
+            hi[j] = v >> 4;
+        }
+    }
+
+    /**
+     * @brief FP16 -> FP32 sin ramas (vectorizable); mismos bits que
+     * CpuReference::half_to_float, incluidos subnormales, Inf y NaN.
+     * Reescala el exponente con un producto exacto por 2^112 (requiere que
+     * no esté activo DAZ, p.ej. -ffast-math, o los subnormales FP16 serían 0).
+     */
+    static float half_to_float_fast(uint16_t h) {
+        const uint32_t em = static_cast<uint32_t>(h & 0x7FFF) << 13;
+        const float f = CpuReference::bits_float(em) * 0x1p112f;
+        // exponente FP16 = 31 (Inf/NaN) queda en 2^16 tras reescalar
+        const uint32_t m_inf = 0u - static_cast<uint32_t>(f >= 65536.0f);
+        const uint32_t x = CpuReference::float_bits(f) | (m_inf & 0x7F800000);
+        return CpuReference::bits_float(x | (static_cast<uint32_t>(h & 0x8000) << 16));
+    }
+
+    /// Conversión FP16 -> FP32 de n elementos contiguos (bloques de 16 desenrollados)
+    static void halves_to_floats(const uint16_t* src, float* dst, size_t n) {
+        size_t i = 0;
+        for (; i + 16 <= n; i += 16) {
+#pragma GCC unroll 16
+            for (size_t j = 0; j < 16; ++j) dst[i + j] = half_to_float_fast(src[i + j]);
+        }
+        for (; i < n; ++i) dst[i] = half_to_float_fast(src[i]);
+    }
+
+    /**
+     * @brief Ruta bloqueada con tipos de entrada independientes para A y B.
+     * threads = 0 usa todo el pool. trans_b: B se guarda como [N][K] (pesos
+     * [out][in] de un Linear, C = A * B^T) y se transpone al empaquetar.
+     * qb: escalas de B cuando tb es I8/I4 (se decuantiza al empaquetar).
+     */
+    static void blocked(const void* A, GemmInput ta, const void* B, GemmInput tb, float* C,
+                        int M, int N, int K, int threads = 0, bool trans_b = false,
+                        const GemmQuant* qb = nullptr) {
+        if (M <= 0 || N <= 0) return;
+        if (K <= 0) {
+            std::fill(C, C + static_cast<size_t>(M) * N, 0.0f);
+            return;
+        }
+        auto& pool = CpuThreadPool::instance();
+        const size_t nthreads = threads > 0 ? static_cast<size_t>(threads) : pool.size();
+        std::vector<float> bpack(static_cast<size_t>(KC) * round_up(std::min(N, NC), NR));
+
+        for (int jc = 0; jc < N; jc += NC) {
+            const int nc = std::min(NC, N - jc);
+            const int slivers = (nc + NR - 1) / NR;
+            const int row_blocks = (M + MC - 1) / MC;
+            // Suficientes tareas para todos los hilos aunque M sea pequeño (decode)
+            const int groups = std::clamp(static_cast<int>((2 * nthreads + row_blocks - 1) / row_blocks),
+                                          1, slivers);
+            const int per_group = (slivers + groups - 1) / groups;
+
+            for (int pc = 0; pc < K; pc += KC) {
+                const int kc = std::min(KC, K - pc);
+                const bool accumulate = pc > 0;
+
+                pool.parallel_for(static_cast<size_t>(slivers), [&](size_t s) {
+                    pack_b(B, tb, qb, trans_b ? K : N, trans_b, pc, kc, jc + static_cast<int>(s) * NR,
+                           std::min(NR, nc - static_cast<int>(s) * NR),
+                           bpack.data() + s * static_cast<size_t>(KC) * NR);
+                }, nthreads);
+
+                pool.parallel_for(static_cast<size_t>(row_blocks) * groups, [&](size_t t) {
+                    const int ic = static_cast<int>(t / groups) * MC;
+                    const int s0 = static_cast<int>(t % groups) * per_group;
+                    const int s1 = std::min(slivers, s0 + per_group);
+                    if (s0 >= s1) return;
+                    const int mc = std::min(MC, M - ic);
+                    thread_local std::vector<float> apack;
+                    apack.resize(static_cast<size_t>(round_up(MC, MR)) * KC);
+                    pack_a(A, ta, K, ic, mc, pc, kc, apack.data());
+                    for (int s = s0; s < s1; ++s) {
+                        const int jr = s * NR;
+                        const int nr = std::min(NR, nc - jr);
+                        const float* bp = bpack.data() + static_cast<size_t>(s) * KC * NR;
+                        for (int ir = 0; ir < mc; ir += MR) {
+                            micro_kernel(kc, apack.data() + static_cast<size_t>(ir) * kc, bp,
+                                         C + static_cast<size_t>(ic + ir) * N + jc + jr, N,
+                                         std::min(MR, mc - ir), nr, accumulate);
+                        }
+                    }
+                }, nthreads);
+            }
+        }
+    }
+
+private:
+    static int round_up(int x, int m) { return (x + m - 1) / m * m; }
+
+    // Convierte n elementos contiguos a FP32 (bucles por tipo, vectorizables)
+    static void load_row(const void* p, GemmInput t, size_t idx, int n, float* dst,
+                         const GemmQuant* q = nullptr) {
+        switch (t) {
+        case GemmInput::I8:
+            dequant_int8(static_cast<const int8_t*>(p), q->scales, q->group_size, idx,
+                         static_cast<size_t>(n), dst);
+            break;
+        case GemmInput::I4:
+            dequant_int4(static_cast<const uint8_t*>(p), q->scales, q->group_size, idx,
+                         static_cast<size_t>(n), dst);
+            break;
+        case GemmInput::F16:
+            halves_to_floats(static_cast<const uint16_t*>(p) + idx, dst, static_cast<size_t>(n));
+            break;
+        case GemmInput::BF16: {
+            const uint16_t* src = static_cast<const uint16_t*>(p) + idx;
+            for (int i = 0; i < n; ++i) dst[i] = CpuReference::bf16_to_float(src[i]);
+            break;
+        }
+        default: {
+            const float* src = static_cast<const float*>(p) + idx;
+            for (int i = 0; i < n; ++i) dst[i] = src[i];
+        }
+        }
+    }
+
+    // Tira de B: kc filas x NR columnas contiguas, relleno con ceros
+    static void pack_b(const void* B, GemmInput tb, const GemmQuant* qb, int ldb, bool trans,
+                       int pc, int kc, int j0, int nr, float* dst) {
+        if (trans) {
+            // B^T: cada columna j es una fila contigua de B, se convierte una vez
+            thread_local std::vector<float> col;
+            col.resize(kc);
+            for (int j = 0; j < nr; ++j) {
+                load_row(B, tb, static_cast<size_t>(j0 + j) * ldb + pc, kc, col.data(), qb);
+                for (int p = 0; p < kc; ++p) dst[static_cast<size_t>(p) * NR + j] = col[p];
+            }
+            for (int p = 0; p < kc; ++p)
+                for (int j = nr; j < NR; ++j) dst[static_cast<size_t>(p) * NR + j] = 0.0f;
+            return;
+        }
+        for (int p = 0; p < kc; ++p) {
+            float* d = dst + static_cast<size_t>(p) * NR;
+            load_row(B, tb, static_cast<size_t>(pc + p) * ldb + j0, nr, d, qb);
+            for (int j = nr; j < NR; ++j) d[j] = 0.0f;
+        }
+    }
+
+    // Bloque de A: tiras de MR filas, cada una kc x MR (columna de k contigua)
+    static void pack_a(const void* A, GemmInput ta, int lda, int ic, int mc, int pc, int kc, float* dst) {
+        thread_local std::vector<float> row;
+        row.resize(kc);
+        for (int ir = 0; ir < mc; ir += MR) {
+            const int mr = std::min(MR, mc - ir);
+            float* d = dst + static_cast<size_t>(ir) * kc;
+            for (int i = 0; i < MR; ++i) {
+                if (i >= mr) {
+                    for (int p = 0; p < kc; ++p) d[static_cast<size_t>(p) * MR + i] = 0.0f;
+                    continue;
+                }
+                load_row(A, ta, static_cast<size_t>(ic + ir + i) * lda + pc, kc, row.data());
+                for (int p = 0; p < kc; ++p) d[static_cast<size_t>(p) * MR + i] = row[p];
+            }
+        }
+    }
+
+    // Micro-tile MR x NR: acumuladores en registros, B vectorizado en j
+    static void micro_kernel(int kc, const float* a, const float* b, float* c, int ldc,
+                             int mr, int nr, bool accumulate) {
+        float acc[MR][NR] = {};
+        for (int p = 0; p < kc; ++p) {
+            const float* ap = a + static_cast<size_t>(p) * MR;
+            const float* bp = b + static_cast<size_t>(p) * NR;
+#pragma GCC unroll 8
+            for (int i = 0; i < MR; ++i) {
+                const float av = ap[i];
+#pragma GCC unroll 16
+                for (int j = 0; j < NR; ++j) acc[i][j] += av * bp[j];
+            }
+        }
+        for (int i = 0; i < mr; ++i) {
+            float* cr = c + static_cast<size_t>(i) * ldc;
+            if (accumulate) {
+                for (int j = 0; j < nr; ++j) cr[j] += acc[i][j];
+            } else {
+                for (int j = 0; j < nr; ++j) cr[j] = acc[i][j];
+            }
+        }
+    }
+};
+
+} // namespace gcore::rt::ref
@@ -3,21 +3,26 @@
 #include <algorithm>
 #include <cmath>
 #include <cstdint>
+#include <cstring>
 #include <vector>
-#include <bit>
 
 namespace gcore::rt::ref {
 
 /**
  * @brief Operaciones de referencia en CPU para validación de correctitud.
  * Estas implementaciones priorizan la claridad y la precisión sobre el rendimiento.
+ * Para GEMM rápida (bloqueada, multihilo) ver cpu_gemm.hpp; estas son el modo "golden".
  */
 class CpuReference {
 public:
     // --- Helpers de Precisión ---
 
+    // memcpy en lugar de std::bit_cast: el header se usa también desde C++17 (inference)
+    static uint32_t float_bits(float f) { uint32_t x; std::memcpy(&x, &f, 4); return x; }
+    static float bits_float(uint32_t x) { float f; std::memcpy(&f, &x, 4); return f; }
+
     static uint16_t float_to_half(float f) {
-        uint32_t x = std::bit_cast<uint32_t>(f);
+        uint32_t x = float_bits(f);
         uint32_t sign = (x >> 31) & 0x1;
         int exp = int((x >> 23) & 0xFF) - 127;
         uint32_t mant = x & 0x7FFFFF;
@@ -47,7 +52,18 @@ public:
             else { exp = 127 - 14; while ((mant & 0x400) == 0) { mant <<= 1; exp--; } mant &= 0x3FF; out = (sign << 31) | (exp << 23) | (mant << 13); }
         } else if (exp == 31) out = (sign << 31) | 0x7F800000 | (mant << 13);
         else { exp = exp + (127 - 15); out = (sign << 31) | (exp << 23) | (mant << 13); }
-        return std::bit_cast<float>(out);
+        return bits_float(out);
+    }
+
+    static uint16_t float_to_bf16(float f) {
+        uint32_t x = float_bits(f);
+        if ((x & 0x7FFFFFFF) > 0x7F800000) return static_cast<uint16_t>((x >> 16) | 0x40); // NaN
+        x += 0x7FFF + ((x >> 16) & 1); // round-to-nearest-even
+        return static_cast<uint16_t>(x >> 16);
+    }
+
+    static float bf16_to_float(uint16_t h) {
+        return bits_float(static_cast<uint32_t>(h) << 16);
     }
 
     // --- Kernels de Referencia ---
@@ -67,6 +83,91 @@ public:
         }
     }
 
+    /**
+     * @brief GEMM FP16 de referencia (entradas half, acumulación en double, salida FP32)
+     */
+    static void gemm_f16(const uint16_t* A, const uint16_t* B, float* C, int M, int N, int K) {
+        for (int i = 0; i < M; ++i) {
+            for (int j = 0; j < N; ++j) {
+                double acc = 0.0;
+                for (int k = 0; k < K; ++k) {
+                    acc += static_cast<double>(half_to_float(A[i * K + k])) *
+                           static_cast<double>(half_to_float(B[k * N + j]));
+                }
+                C[i * N + j] = static_cast<float>(acc);
+            }
+        }
+    }
+
+    /**
+     * @brief GEMM BF16 de referencia (entradas bf16, acumulación en double, salida FP32)
+     */
+    static void gemm_bf16(const uint16_t* A, const uint16_t* B, float* C, int M, int N, int K) {
+        for (int i = 0; i < M; ++i) {
+            for (int j = 0; j < N; ++j) {
+                double acc = 0.0;
+                for (int k = 0; k < K; ++k) {
+                    acc += static_cast<double>(bf16_to_float(A[i * K + k])) *
+                           static_cast<double>(bf16_to_float(B[k * N + j]));
+                }
+                C[i * N + j] = static_cast<float>(acc);
+            }
+        }
+    }
+
+    // --- Pesos cuantizados (layouts de load_tensor_int8 / load_tensor_int4) ---
+
+    /**
+     * @brief Valor INT4 del elemento idx: dos por byte, nibble bajo = elemento
+     * par, nibble alto = impar, con signo en [-8, 7].
+     */
+    static int int4_value(const uint8_t* w, size_t idx) {
+        const int v = (idx & 1) ? (w[idx >> 1] >> 4) : (w[idx >> 1] & 0x0F);
+        return (v ^ 8) - 8;
+    }
+
+    /**
+     * @brief GEMM de referencia con pesos INT8 [N][K] (C = A * W^T, como
+     * gemv_int8_wt_kernel). Una escala FP32 por grupo de group_size elementos
+     * consecutivos del índice plano n*K + k; el peso se decuantiza en FP32.
+     */
+    static void gemm_int8_wt(const float* A, const int8_t* W, const float* scales, float* C,
+                             int M, int N, int K, int group_size = 32) {
+        for (int i = 0; i < M; ++i) {
+            for (int j = 0; j < N; ++j) {
+                double acc = 0.0;
+                for (int k = 0; k < K; ++k) {
+                    const size_t idx = static_cast<size_t>(j) * K + k;
+                    const float w = static_cast<float>(W[idx]) * scales[idx / group_size];
+                    acc += static_cast<double>(A[static_cast<size_t>(i) * K + k]) * w;
+                }
+                C[static_cast<size_t>(i) * N + j] = static_cast<float>(acc);
+            }
+        }
+    }
+
+    /**
+     * @brief GEMM de referencia con pesos INT4 empaquetados [N][K/2] (como
+     * gemv_int4_wt_kernel). Escalas por grupo igual que INT8; si head_scales
+     * no es nulo, la salida j se multiplica por head_scales[j / head_dim].
+     */
+    static void gemm_int4_wt(const float* A, const uint8_t* W, const float* scales,
+                             const float* head_scales, float* C, int M, int N, int K,
+                             int group_size = 32, int head_dim = 0) {
+        for (int i = 0; i < M; ++i) {
+            for (int j = 0; j < N; ++j) {
+                double acc = 0.0;
+                for (int k = 0; k < K; ++k) {
+                    const size_t idx = static_cast<size_t>(j) * K + k;
+                    const float w = static_cast<float>(int4_value(W, idx)) * scales[idx / group_size];
+                    acc += static_cast<double>(A[static_cast<size_t>(i) * K + k]) * w;
+                }
+                const float h = (head_scales && head_dim > 0) ? head_scales[j / head_dim] : 1.0f;
+                C[static_cast<size_t>(i) * N + j] = static_cast<float>(acc) * h;
+            }
+        }
+    }
+
     /**
      * @brief RMSNorm de referencia
      */
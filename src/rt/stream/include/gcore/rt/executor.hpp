@@ -0,0 +1,118 @@
+#pragma once
+
+#include <atomic>
+#include <condition_variable>
+#include <cstddef>
+#include <cstdint>
+#include <deque>
+#include <functional>
+#include <memory>
+#include <mutex>
+#include <thread>
+#include <vector>
+
+namespace gcore::rt {
+
+// Executor: pool of N worker threads shared by all Streams.
+// - Each worker owns a lock-free Chase-Lev deque: it pushes/pops at the
+//   bottom (LIFO, cache-warm) and idle workers steal from the top.
+// - Submissions from outside the pool go through a small injection queue.
+// - Idle workers spin briefly and then sleep; submitters only touch the
+//   condvar when someone is actually asleep.
+// Streams run on top as ordered lanes (see Stream), so in-order semantics
+// are per stream while different streams execute in parallel.
+class Executor final {
+public:
+  // Unit of work. The executor does not own jobs: run() is responsible for
+  // the job's lifetime (a Stream lane re-submits itself, a FunctionJob
+  // deletes itself).
+  class Job {
+  public:
+    virtual ~Job() = default;
+    virtual void run() = 0;
+  };
+
+  // threads = 0 -> default_threads().
+  explicit Executor(size_t threads = 0);
+  ~Executor();
+
+  Executor(const Executor &) = delete;
+  Executor &operator=(const Executor &) = delete;
+
+  // Process-wide executor used by Streams.
+  static Executor &instance();
+
+  // GRETA_RT_THREADS or hardware_concurrency().
+  static size_t default_threads();
+
+  // Schedule a job. From a worker of this executor it goes to the worker's
+  // own deque; otherwise to the injection queue.
+  void submit(Job *job);
+
+  // Convenience: schedule an unordered callable.
+  void submit(std::function<void()> fn);
+
+  // Executor whose worker is the calling thread (nullptr outside pools).
+  static Executor *current();
+
+  // From one of this executor's workers: run one pending job, if any.
+  // Blocking waits inside a job use it to keep the pool making progress.
+  bool run_one();
+
+  size_t size() const { return workers_.size(); }
+
+  struct Stats {
+    uint64_t executed = 0; // jobs run
+    uint64_t stolen = 0;   // jobs taken from another worker's deque
+    uint64_t sleeps = 0;   // times a worker went to sleep
+  };
+  Stats stats() const;
+
+private:
+  // Fixed-capacity Chase-Lev deque (Le et al., "Correct and Efficient
+  // Work-Stealing for Weak Memory Models"). Full -> push() fails and the
+  // job goes to the injection queue.
+  class WorkDeque {
+  public:
+    static constexpr int64_t kCapacity = 1024; // potencia de 2
+
+    bool push(Job *job);
+    Job *pop();   // owner only
+    Job *steal(); // any thread
+    bool empty() const;
+
+  private:
+    alignas(64) std::atomic<int64_t> top_{0};
+    alignas(64) std::atomic<int64_t> bottom_{0};
+    std::atomic<Job *> buf_[kCapacity] = {};
+  };
+
+  struct Worker {
+    WorkDeque deque;
+    std::thread thread;
+    std::atomic<uint64_t> executed{0};
+    std::atomic<uint64_t> stolen{0};
+    std::atomic<uint64_t> sleeps{0};
+  };
+
+  void worker_loop(size_t id);
+  Job *find_job(size_t id);
+  bool has_work() const;
+  void wake_one();
+  void push_injected(Job *job);
+  Job *pop_injected();
+
+  std::vector<std::unique_ptr<Worker>> workers_;
+
+  std::mutex inject_mu_;
+  std::deque<Job *> inject_;
+  std::atomic<size_t> inject_size_{0};
+
+  std::mutex sleep_mu_;
+  std::condition_variable sleep_cv_;
+  std::atomic<uint32_t> sleepers_{0};
+  uint64_t wake_epoch_ = 0; // protegido por sleep_mu_
+  std::atomic<bool> stop_{false};
+};
+
+} // namespace gcore::rt
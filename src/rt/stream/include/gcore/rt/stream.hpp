@@ -1,17 +1,16 @@
 #pragma once
 
 #include <atomic>
-#include <chrono>
 #include <condition_variable>
 #include <cstdint>
 #include <functional>
-#include <memory>
 #include <mutex>
-#include <queue>
-#include <thread>
+
+#include "gcore/rt/executor.hpp"
 
 namespace gcore::rt {
 
+class Histogram;
 class Stream;
 
 // Event: can be recorded on a Stream, waited on, and used for elapsed time.
@@ -20,11 +19,12 @@ public:
   Event();
   ~Event();
 
-  // Ahora Event es copiable/movible (handle)
-  Event(const Event &) = default;
-  Event &operator=(const Event &) = default;
-  Event(Event &&) noexcept = default;
-  Event &operator=(Event &&) noexcept = default;
+  // Ahora Event es copiable/movible (handle con refcount intrusivo; el
+  // estado vuelve a un pool al soltar la última copia)
+  Event(const Event &other);
+  Event &operator=(const Event &other);
+  Event(Event &&other) noexcept;
+  Event &operator=(Event &&other) noexcept;
 
   // Record: completa cuando el stream ejecute el marker.
   void record(Stream &stream);
@@ -38,14 +38,24 @@ public:
   // Runtime-internal: marca el evento como completo.
   void signal();
 
+  // Ejecuta fn al completarse el evento: en el hilo que lo señala, o ya
+  // mismo si está completo. Debe ser corto (p.ej. programar un job).
+  void on_complete(std::function<void()> fn) const;
+
+  struct State; // runtime-internal
+
 private:
-  struct State;
-  std::shared_ptr<State> st_;
+  friend class Stream;
+  State *st_;
 };
 
+// Stream: ordered lane on the shared Executor. Tasks of one stream run
+// in order (never concurrently); different streams run in parallel on the
+// executor's workers. No thread per stream.
 class Stream final {
 public:
   Stream();
+  explicit Stream(Executor &exec);
   ~Stream();
 
   Stream(const Stream &) = delete;
@@ -54,25 +64,64 @@ public:
   // Enqueue a task for execution in-order.
   void enqueue(std::function<void()> fn);
 
-  // Blocks until all queued tasks are finished.
+  // Enqueue a task and signal `done` right after it (no extra wrapper).
+  void enqueue(std::function<void()> fn, const Event &done);
+
+  // Later tasks of this stream wait for `ev` (recorded on any stream).
+  // Non-blocking: the lane parks and the executor resumes it when `ev`
+  // completes; no thread sleeps on the dependency.
+  void wait_event(const Event &ev);
+
+  // Blocks (no spinning) until all tasks queued so far are finished.
   void flush();
 
+  // Task latency (enqueue -> task finished, ns) of one task every
+  // 2^sample_shift goes into `h`; nullptr disables it. Default: the
+  // global registry's "stream.task_ns", 1 in 64 (two clock reads per task
+  // would double the cost of a small task). Call before enqueueing.
+  void set_latency_histogram(Histogram *h, uint32_t sample_shift = 6);
+
+  struct Node; // runtime-internal
+
 private:
-  struct Task {
-    std::function<void()> fn;
+  // Job que drena la cola en el executor; sólo uno activo a la vez
+  class Lane final : public Executor::Job {
+  public:
+    explicit Lane(Stream &s) : s_(s) {}
+    void run() override { s_.drain(); }
+
+  private:
+    Stream &s_;
   };
 
-  std::mutex mu_;
-  std::condition_variable cv_;
-  std::queue<Task> q_;
-  std::thread worker_;
-  std::atomic<bool> stop_{false};
+  void push_task(std::function<void()> fn, Event::State *done,
+                 Event::State *wait = nullptr);
+  void push(Node *node);
+  Node *pop();
+  void drain();
+  void recycle(Node *node);
+
+  Executor &exec_;
+  Lane lane_{*this};
+
+  // Cola MPSC intrusiva (Vyukov): productores en head_, el Lane en tail_
+  alignas(64) std::atomic<Node *> head_;
+  alignas(64) Node *tail_;
+  Node *stub_;
+  Node *parked_ = nullptr; // wait_event pendiente (sólo lo toca el Lane)
+
+  Histogram *latency_ = nullptr;
+  uint64_t sample_mask_ = 0;
+
+  // Tareas encoladas y aún no extraídas; 0 -> 1 programa el Lane
+  std::atomic<uint64_t> pending_{0};
 
   // For flush semantics
   std::atomic<uint64_t> enqueued_{0};
   std::atomic<uint64_t> completed_{0};
-
-  void worker_loop();
+  std::atomic<uint32_t> waiters_{0};
+  std::mutex mu_;
+  std::condition_variable cv_;
 };
 
 } // namespace gcore::rt
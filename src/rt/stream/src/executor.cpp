@@ -0,0 +1,251 @@
+#include "gcore/rt/executor.hpp"
+#include "gcore/rt/span_tracer.hpp"
+
+#include <algorithm>
+#include <cstdlib>
+#include <string>
+
+namespace gcore::rt {
+
+namespace {
+
+// Worker identity: submit() from inside the pool uses the local deque.
+thread_local Executor *tls_executor = nullptr;
+thread_local size_t tls_worker = 0;
+
+// Rondas de búsqueda (con yield) antes de dormir: cubre ráfagas de submit
+// sin pagar el despertar del condvar.
+constexpr int kSpinRounds = 64;
+
+class FunctionJob final : public Executor::Job {
+public:
+  explicit FunctionJob(std::function<void()> fn) : fn_(std::move(fn)) {}
+  void run() override {
+    fn_();
+    delete this;
+  }
+
+private:
+  std::function<void()> fn_;
+};
+
+} // namespace
+
+// ---------------- WorkDeque ----------------
+
+bool Executor::WorkDeque::push(Job *job) {
+  const int64_t b = bottom_.load(std::memory_order_relaxed);
+  const int64_t t = top_.load(std::memory_order_acquire);
+  if (b - t >= kCapacity)
+    return false;
+  buf_[b & (kCapacity - 1)].store(job, std::memory_order_relaxed);
+  std::atomic_thread_fence(std::memory_order_release);
+  bottom_.store(b + 1, std::memory_order_relaxed);
+  return true;
+}
+
+Executor::Job *Executor::WorkDeque::pop() {
+  const int64_t b = bottom_.load(std::memory_order_relaxed) - 1;
+  bottom_.store(b, std::memory_order_relaxed);
+  std::atomic_thread_fence(std::memory_order_seq_cst);
+  int64_t t = top_.load(std::memory_order_relaxed);
+  if (t > b) { // vacío
+    bottom_.store(b + 1, std::memory_order_relaxed);
+    return nullptr;
+  }
+  Job *job = buf_[b & (kCapacity - 1)].load(std::memory_order_relaxed);
+  if (t == b) {
+    // Último elemento: compite con los ladrones por top
+    if (!top_.compare_exchange_strong(t, t + 1, std::memory_order_seq_cst,
+                                      std::memory_order_relaxed))
+      job = nullptr;
+    bottom_.store(b + 1, std::memory_order_relaxed);
+  }
+  return job;
+}
+
+Executor::Job *Executor::WorkDeque::steal() {
+  int64_t t = top_.load(std::memory_order_acquire);
+  std::atomic_thread_fence(std::memory_order_seq_cst);
+  const int64_t b = bottom_.load(std::memory_order_acquire);
+  if (t >= b)
+    return nullptr;
+  Job *job = buf_[t & (kCapacity - 1)].load(std::memory_order_relaxed);
+  if (!top_.compare_exchange_strong(t, t + 1, std::memory_order_seq_cst,
+                                    std::memory_order_relaxed))
+    return nullptr; // otro ladrón (o el dueño) ganó
+  return job;
+}
+
+bool Executor::WorkDeque::empty() const {
+  return bottom_.load(std::memory_order_acquire) <=
+         top_.load(std::memory_order_acquire);
+}
+
+// ---------------- Executor ----------------
+
+Executor::Executor(size_t threads) {
+  const size_t n = threads > 0 ? threads : default_threads();
+  for (size_t i = 0; i < n; i++)
+    workers_.push_back(std::make_unique<Worker>());
+  // Start after every deque exists: workers steal from each other
+  for (size_t i = 0; i < n; i++)
+    workers_[i]->thread = std::thread([this, i] { worker_loop(i); });
+}
+
+Executor::~Executor() {
+  stop_.store(true, std::memory_order_seq_cst);
+  {
+    std::lock_guard<std::mutex> lk(sleep_mu_);
+    ++wake_epoch_;
+  }
+  sleep_cv_.notify_all();
+  for (auto &w : workers_)
+    if (w->thread.joinable())
+      w->thread.join();
+}
+
+Executor &Executor::instance() {
+  static Executor exec;
+  return exec;
+}
+
+size_t Executor::default_threads() {
+  if (const char *v = std::getenv("GRETA_RT_THREADS")) {
+    const long n = std::strtol(v, nullptr, 10);
+    if (n > 0)
+      return static_cast<size_t>(n);
+  }
+  return std::max(1u, std::thread::hardware_concurrency());
+}
+
+void Executor::submit(Job *job) {
+  if (tls_executor != this ||
+      !workers_[tls_worker]->deque.push(job))
+    push_injected(job);
+  wake_one();
+}
+
+void Executor::submit(std::function<void()> fn) {
+  submit(new FunctionJob(std::move(fn)));
+}
+
+Executor *Executor::current() { return tls_executor; }
+
+bool Executor::run_one() {
+  if (tls_executor != this)
+    return false;
+  Job *job = find_job(tls_worker);
+  if (!job)
+    return false;
+  job->run();
+  workers_[tls_worker]->executed.fetch_add(1, std::memory_order_relaxed);
+  return true;
+}
+
+Executor::Stats Executor::stats() const {
+  Stats s;
+  for (const auto &w : workers_) {
+    s.executed += w->executed.load(std::memory_order_relaxed);
+    s.stolen += w->stolen.load(std::memory_order_relaxed);
+    s.sleeps += w->sleeps.load(std::memory_order_relaxed);
+  }
+  return s;
+}
+
+void Executor::push_injected(Job *job) {
+  std::lock_guard<std::mutex> lk(inject_mu_);
+  inject_.push_back(job);
+  inject_size_.store(inject_.size(), std::memory_order_relaxed);
+}
+
+Executor::Job *Executor::pop_injected() {
+  if (inject_size_.load(std::memory_order_relaxed) == 0)
+    return nullptr;
+  std::lock_guard<std::mutex> lk(inject_mu_);
+  if (inject_.empty())
+    return nullptr;
+  Job *job = inject_.front();
+  inject_.pop_front();
+  inject_size_.store(inject_.size(), std::memory_order_relaxed);
+  return job;
+}
+
+void Executor::wake_one() {
+  // Pareja del fetch_add de sleepers_ en worker_loop: o el worker ve el
+  // trabajo al re-comprobar, o nosotros vemos que duerme (Dekker).
+  std::atomic_thread_fence(std::memory_order_seq_cst);
+  if (sleepers_.load(std::memory_order_relaxed) == 0)
+    return;
+  {
+    std::lock_guard<std::mutex> lk(sleep_mu_);
+    ++wake_epoch_;
+  }
+  sleep_cv_.notify_one();
+}
+
+bool Executor::has_work() const {
+  if (inject_size_.load(std::memory_order_relaxed) != 0)
+    return true;
+  for (const auto &w : workers_)
+    if (!w->deque.empty())
+      return true;
+  return false;
+}
+
+Executor::Job *Executor::find_job(size_t id) {
+  Worker &self = *workers_[id];
+  if (Job *job = self.deque.pop())
+    return job;
+  if (Job *job = pop_injected())
+    return job;
+  const size_t n = workers_.size();
+  for (size_t k = 1; k < n; k++) {
+    if (Job *job = workers_[(id + k) % n]->deque.steal()) {
+      self.stolen.fetch_add(1, std::memory_order_relaxed);
+      return job;
+    }
+  }
+  return nullptr;
+}
+
+void Executor::worker_loop(size_t id) {
+  tls_executor = this;
+  tls_worker = id;
+  Worker &self = *workers_[id];
+  if (SpanTracer::enabled()) {
+    SpanTracer &tracer = SpanTracer::instance();
+    tracer.set_thread_name(
+        tracer.intern("rt.worker." + std::to_string(id)));
+  }
+  for (;;) {
+    Job *job = find_job(id);
+    for (int i = 0; !job && i < kSpinRounds; i++) {
+      std::this_thread::yield();
+      job = find_job(id);
+    }
+    if (job) {
+      job->run();
+      self.executed.fetch_add(1, std::memory_order_relaxed);
+      continue;
+    }
+    if (stop_.load(std::memory_order_acquire))
+      return;
+
+    uint64_t epoch;
+    {
+      std::lock_guard<std::mutex> lk(sleep_mu_);
+      epoch = wake_epoch_;
+    }
+    sleepers_.fetch_add(1, std::memory_order_seq_cst);
+    std::atomic_thread_fence(std::memory_order_seq_cst);
+    if (!has_work() && !stop_.load(std::memory_order_seq_cst)) {
+      self.sleeps.fetch_add(1, std::memory_order_relaxed);
+      std::unique_lock<std::mutex> lk(sleep_mu_);
+      sleep_cv_.wait(lk, [&] { return wake_epoch_ != epoch; });
+    }
+    sleepers_.fetch_sub(1, std::memory_order_relaxed);
+  }
+}
+
+} // namespace gcore::rt
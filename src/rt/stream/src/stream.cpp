@@ -1,44 +1,235 @@
 #include "gcore/rt/stream.hpp"
+#include "gcore/rt/span_tracer.hpp"
+#include "gcore/rt/telemetry.hpp"
+
+#include <chrono>
+#include <thread>
+#include <vector>
 
 namespace gcore::rt {
+
+namespace {
+
+// Pool de objetos: caché por hilo + reserva global con mutex para los
+// objetos que migran de hilo (se crean en el productor y se liberan en un
+// worker). La reserva global no se destruye nunca (los workers del
+// Executor estático devuelven objetos durante la salida del proceso).
+template <typename T> class FreeList {
+public:
+  static FreeList &instance() {
+    static FreeList *pool = new FreeList();
+    return *pool;
+  }
+
+  T *get() {
+    Cache &c = cache();
+    if (c.items.empty())
+      refill(c.items);
+    if (c.items.empty())
+      return new T();
+    T *x = c.items.back();
+    c.items.pop_back();
+    return x;
+  }
+
+  void put(T *x) {
+    Cache &c = cache();
+    c.items.push_back(x);
+    if (c.items.size() > kCacheMax)
+      spill(c.items, kCacheMax / 2);
+  }
+
+private:
+  static constexpr size_t kCacheMax = 256;
+  static constexpr size_t kBatch = 64;
+
+  struct Cache {
+    std::vector<T *> items;
+    ~Cache() { FreeList::instance().spill(items, items.size()); }
+  };
+
+  static Cache &cache() {
+    thread_local Cache c;
+    return c;
+  }
+
+  void refill(std::vector<T *> &dst) {
+    std::lock_guard<std::mutex> lk(mu_);
+    const size_t n = std::min(kBatch, global_.size());
+    dst.insert(dst.end(), global_.end() - n, global_.end());
+    global_.resize(global_.size() - n);
+  }
+
+  void spill(std::vector<T *> &src, size_t n) {
+    std::lock_guard<std::mutex> lk(mu_);
+    global_.insert(global_.end(), src.end() - n, src.end());
+    src.resize(src.size() - n);
+  }
+
+  std::mutex mu_;
+  std::vector<T *> global_;
+};
+
+// Espera bloqueante (sin spin) hasta done(). Dentro de un worker del
+// Executor se ayuda a ejecutar otros jobs mientras tanto: si no, un stream
+// que espera a otro podría dejar sin workers al que debe completarlo.
+template <typename Pred>
+void block_until(std::atomic<uint32_t> &waiters, std::mutex &mu,
+                 std::condition_variable &cv, Pred done) {
+  if (done())
+    return;
+  Executor *helper = Executor::current();
+  waiters.fetch_add(1, std::memory_order_seq_cst);
+  while (!done()) {
+    if (helper && helper->run_one())
+      continue;
+    std::unique_lock<std::mutex> lk(mu);
+    if (helper)
+      cv.wait_for(lk, std::chrono::milliseconds(1), done);
+    else
+      cv.wait(lk, done);
+  }
+  waiters.fetch_sub(1, std::memory_order_release);
+}
+
+// Pareja de block_until: el completado ya es visible (seq_cst) antes de
+// mirar waiters, así o el que espera lo ve o nosotros lo despertamos.
+void wake_waiters(std::atomic<uint32_t> &waiters, std::mutex &mu,
+                  std::condition_variable &cv) {
+  if (waiters.load(std::memory_order_seq_cst) == 0)
+    return;
+  { std::lock_guard<std::mutex> lk(mu); }
+  cv.notify_all();
+}
+
+} // namespace
+
 struct Event::State {
-  mutable std::mutex mu;
-  mutable std::condition_variable cv;
-  bool completed = false;
+  std::atomic<uint32_t> refs{1};
+  std::atomic<bool> completed{false};
+  std::atomic<uint32_t> waiters{0};
+  std::mutex mu;
+  std::condition_variable cv;
   std::chrono::steady_clock::time_point tp{};
+  // Continuaciones (on_complete); has_conts evita el mutex en signal
+  std::atomic<bool> has_conts{false};
+  std::vector<std::function<void()>> conts;
 };
 
-// ---------------- Event ----------------
+struct Stream::Node {
+  std::atomic<Node *> next{nullptr};
+  std::function<void()> fn;
+  Event::State *done = nullptr; // se señala tras fn
+  Event::State *wait = nullptr; // barrera de wait_event
+  uint64_t t_enqueue = 0;       // != 0: tarea muestreada para latencia
+};
+
+namespace {
+
+Event::State *acquire_state() {
+  Event::State *st = FreeList<Event::State>::instance().get();
+  st->refs.store(1, std::memory_order_relaxed);
+  st->completed.store(false, std::memory_order_relaxed);
+  st->has_conts.store(false, std::memory_order_relaxed);
+  st->conts.clear();
+  st->tp = {};
+  return st;
+}
+
+void retain(Event::State *st) {
+  if (st)
+    st->refs.fetch_add(1, std::memory_order_relaxed);
+}
 
-Event::Event() : st_(std::make_shared<State>()) {}
-Event::~Event() = default;
+void release(Event::State *st) {
+  if (st && st->refs.fetch_sub(1, std::memory_order_acq_rel) == 1)
+    FreeList<Event::State>::instance().put(st);
+}
 
-void Event::signal() {
+void signal_state(Event::State *st) {
+  st->tp = std::chrono::steady_clock::now();
+  st->completed.store(true, std::memory_order_seq_cst);
+  wake_waiters(st->waiters, st->mu, st->cv);
+  // Pareja de add_continuation: o vemos has_conts o el que registra ve
+  // completed y ejecuta su continuación él mismo (bajo mu, una sola vez)
+  if (st->has_conts.load(std::memory_order_seq_cst)) {
+    std::vector<std::function<void()>> conts;
+    {
+      std::lock_guard<std::mutex> lk(st->mu);
+      conts.swap(st->conts);
+    }
+    for (auto &fn : conts)
+      fn();
+  }
+}
+
+void add_continuation(Event::State *st, std::function<void()> fn) {
   {
-    std::lock_guard<std::mutex> lk(st_->mu);
-    st_->completed = true;
-    st_->tp = std::chrono::steady_clock::now();
+    std::lock_guard<std::mutex> lk(st->mu);
+    if (!st->completed.load(std::memory_order_seq_cst)) {
+      st->conts.push_back(std::move(fn));
+      st->has_conts.store(true, std::memory_order_seq_cst);
+      if (!st->completed.load(std::memory_order_seq_cst))
+        return; // la ejecutará signal_state
+      fn = std::move(st->conts.back());
+      st->conts.pop_back();
+    }
+  }
+  fn();
+}
+
+// Tareas por turno del Lane antes de devolver el worker (reparto entre streams)
+constexpr uint64_t kLaneBudget = 64;
+
+Histogram &default_latency_histogram() {
+  static Histogram &h = MetricsRegistry::global().histogram("stream.task_ns");
+  return h;
+}
+
+} // namespace
+
+// ---------------- Event ----------------
+
+Event::Event() : st_(acquire_state()) {}
+Event::~Event() { release(st_); }
+
+Event::Event(const Event &other) : st_(other.st_) { retain(st_); }
+
+Event &Event::operator=(const Event &other) {
+  if (st_ != other.st_) {
+    retain(other.st_);
+    release(st_);
+    st_ = other.st_;
   }
-  st_->cv.notify_all();
+  return *this;
+}
+
+Event::Event(Event &&other) noexcept : st_(other.st_) { other.st_ = nullptr; }
+
+Event &Event::operator=(Event &&other) noexcept {
+  std::swap(st_, other.st_);
+  return *this;
+}
+
+void Event::signal() { signal_state(st_); }
+
+void Event::on_complete(std::function<void()> fn) const {
+  add_continuation(st_, std::move(fn));
 }
 
 void Event::wait() const {
-  std::unique_lock<std::mutex> lk(st_->mu);
-  st_->cv.wait(lk, [&] { return st_->completed; });
+  State *st = st_;
+  block_until(st->waiters, st->mu, st->cv, [st] {
+    return st->completed.load(std::memory_order_seq_cst);
+  });
 }
 
 uint64_t Event::elapsed_ns(const Event &other) const {
-  // Lock ordenado para evitar deadlock (por dirección del puntero)
-  const State *a = st_.get();
-  const State *b = other.st_.get();
-  if (a == b)
+  if (st_ == other.st_)
     return 0;
-
-  State *first = const_cast<State *>((a < b) ? a : b);
-  State *second = const_cast<State *>((a < b) ? b : a);
-
-  std::scoped_lock lk(first->mu, second->mu);
-  if (!st_->completed || !other.st_->completed)
+  // tp se escribe antes de publicar completed
+  if (!st_->completed.load(std::memory_order_acquire) ||
+      !other.st_->completed.load(std::memory_order_acquire))
     return 0;
 
   auto dt = other.st_->tp - st_->tp;
@@ -46,60 +237,160 @@ uint64_t Event::elapsed_ns(const Event &other) const {
       std::chrono::duration_cast<std::chrono::nanoseconds>(dt).count());
 }
 
-void Event::record(Stream &stream) {
-  auto local = *this; // copia del handle
-  stream.enqueue([local]() mutable { local.signal(); });
-}
+void Event::record(Stream &stream) { stream.enqueue(nullptr, *this); }
 
 // ---------------- Stream ----------------
 
-Stream::Stream() {
-  worker_ = std::thread([this] { worker_loop(); });
+Stream::Stream() : Stream(Executor::instance()) {}
+
+Stream::Stream(Executor &exec)
+    : exec_(exec), head_(nullptr), tail_(nullptr), stub_(new Node()) {
+  head_.store(stub_, std::memory_order_relaxed);
+  tail_ = stub_;
+  set_latency_histogram(&default_latency_histogram());
 }
 
 Stream::~Stream() {
   flush();
-  stop_.store(true, std::memory_order_release);
-  cv_.notify_all();
-  if (worker_.joinable())
-    worker_.join();
+  // El Lane toca pending_ justo después de publicar completed_: esperar a
+  // que lo suelte (ventana de unas pocas instrucciones)
+  while (pending_.load(std::memory_order_acquire) != 0)
+    std::this_thread::yield();
+  delete stub_;
 }
 
 void Stream::enqueue(std::function<void()> fn) {
-  {
-    std::lock_guard<std::mutex> lk(mu_);
-    q_.push(Task{std::move(fn)});
-    enqueued_.fetch_add(1, std::memory_order_relaxed);
-  }
-  cv_.notify_one();
+  push_task(std::move(fn), nullptr);
+}
+
+void Stream::enqueue(std::function<void()> fn, const Event &done) {
+  push_task(std::move(fn), done.st_);
+}
+
+void Stream::wait_event(const Event &ev) {
+  push_task(nullptr, nullptr, ev.st_);
+}
+
+void Stream::set_latency_histogram(Histogram *h, uint32_t sample_shift) {
+  latency_ = h;
+  sample_mask_ = sample_shift >= 63 ? ~uint64_t{0}
+                                    : (uint64_t{1} << sample_shift) - 1;
+}
+
+void Stream::push_task(std::function<void()> fn, Event::State *done,
+                       Event::State *wait) {
+  Node *node = FreeList<Node>::instance().get();
+  node->fn = std::move(fn);
+  node->done = done;
+  node->wait = wait;
+  retain(done);
+  retain(wait);
+  const uint64_t seq = enqueued_.fetch_add(1, std::memory_order_release);
+  // Muestreo con el contador que ya existe: sin atomics extra
+  node->t_enqueue = latency_ && (seq & sample_mask_) == 0 ? now_ns() : 0;
+  push(node);
+  if (pending_.fetch_add(1, std::memory_order_acq_rel) == 0)
+    exec_.submit(&lane_);
 }
 
 void Stream::flush() {
   // Wait until completed >= enqueued snapshot
   const uint64_t target = enqueued_.load(std::memory_order_acquire);
-  while (completed_.load(std::memory_order_acquire) < target) {
-    std::this_thread::yield();
+  block_until(waiters_, mu_, cv_, [&] {
+    return completed_.load(std::memory_order_seq_cst) >= target;
+  });
+}
+
+void Stream::push(Node *node) {
+  node->next.store(nullptr, std::memory_order_relaxed);
+  Node *prev = head_.exchange(node, std::memory_order_acq_rel);
+  prev->next.store(node, std::memory_order_release);
+}
+
+Stream::Node *Stream::pop() {
+  Node *tail = tail_;
+  Node *next = tail->next.load(std::memory_order_acquire);
+  if (tail == stub_) {
+    if (!next)
+      return nullptr;
+    tail_ = next;
+    tail = next;
+    next = next->next.load(std::memory_order_acquire);
+  }
+  if (next) {
+    tail_ = next;
+    return tail;
   }
+  if (tail != head_.load(std::memory_order_acquire))
+    return nullptr; // un productor está a mitad de push
+  push(stub_);
+  next = tail->next.load(std::memory_order_acquire);
+  if (next) {
+    tail_ = next;
+    return tail;
+  }
+  return nullptr;
 }
 
-void Stream::worker_loop() {
-  for (;;) {
-    Task task;
-    {
-      std::unique_lock<std::mutex> lk(mu_);
-      cv_.wait(lk, [&] {
-        return stop_.load(std::memory_order_acquire) || !q_.empty();
-      });
-      if (stop_.load(std::memory_order_acquire) && q_.empty())
-        return;
-      task = std::move(q_.front());
-      q_.pop();
-    }
+void Stream::recycle(Node *node) {
+  release(node->done);
+  release(node->wait);
+  node->fn = nullptr;
+  node->done = nullptr;
+  node->wait = nullptr;
+  node->t_enqueue = 0;
+  FreeList<Node>::instance().put(node);
+}
 
-    // Execute outside lock
-    task.fn();
-    completed_.fetch_add(1, std::memory_order_release);
+void Stream::drain() {
+  Executor &exec = exec_;
+  const uint64_t avail = pending_.load(std::memory_order_acquire);
+  const uint64_t budget = avail < kLaneBudget ? avail : kLaneBudget;
+  uint64_t done = 0;
+  // Un span por turno del Lane (no por tarea): arg = tareas ejecutadas
+  TraceScope span("stream.lane", "stream");
+  if (parked_) { // reanudado por el evento del wait_event
+    recycle(parked_);
+    parked_ = nullptr;
+    done++;
+  }
+  Event::State *blocked = nullptr;
+  while (done < budget) {
+    Node *node = pop();
+    if (!node) { // contado en pending_ pero aún enlazándose
+      std::this_thread::yield();
+      continue;
+    }
+    if (node->wait &&
+        !node->wait->completed.load(std::memory_order_acquire)) {
+      // Aparcar: la barrera sigue contada en pending_, así ningún enqueue
+      // vuelve a programar el Lane hasta que el evento lo reanude
+      parked_ = node;
+      blocked = node->wait;
+      break;
+    }
+    if (node->fn)
+      node->fn();
+    if (node->done)
+      signal_state(node->done);
+    if (node->t_enqueue && latency_)
+      latency_->record(now_ns() - node->t_enqueue);
+    recycle(node);
+    done++;
+  }
+  span.set_arg(done);
+  completed_.fetch_add(done, std::memory_order_seq_cst);
+  wake_waiters(waiters_, mu_, cv_);
+  if (blocked) {
+    pending_.fetch_sub(done, std::memory_order_acq_rel);
+    // Último acceso: la continuación puede lanzar otro drain en seguida
+    Lane *lane = &lane_;
+    add_continuation(blocked, [&exec, lane] { exec.submit(lane); });
+    return;
   }
+  // Último acceso al stream si no quedan tareas (ver ~Stream)
+  if (pending_.fetch_sub(done, std::memory_order_acq_rel) != done)
+    exec.submit(&lane_);
 }
 
 } // namespace gcore::rt
@@ -0,0 +1,131 @@
+#pragma once
+
+#include "gcore/rt/telemetry.hpp"
+
+#include <atomic>
+#include <cstddef>
+#include <cstdint>
+#include <memory>
+#include <mutex>
+#include <string>
+#include <string_view>
+#include <unordered_set>
+#include <vector>
+
+namespace gcore::rt {
+
+// In-process span tracer: every thread records into its own ring buffer
+// (the oldest events are overwritten when it is full, no lock on the
+// record path) and the whole trace is exported as Chrome trace-event JSON
+// (chrome://tracing, ui.perfetto.dev). Disabled it costs one relaxed load
+// per TraceScope.
+//
+// Names, categories and details are stored as pointers: use string
+// literals or intern().
+//
+// GRETA_SPAN_TRACE=<path> starts the tracer when the program loads and
+// writes <path> at exit; GRETA_SPAN_TRACE_EVENTS=N sets the ring size
+// (events per thread, default 65536).
+class SpanTracer final {
+public:
+  static constexpr uint64_t kNoArg = ~uint64_t{0};
+
+  struct Event {
+    uint64_t ts_ns = 0;
+    uint64_t dur_ns = 0;
+    const char *name = nullptr;
+    const char *cat = nullptr;
+    const char *detail = nullptr; // args.detail
+    uint64_t arg = kNoArg;        // args.v
+    char ph = 'X';                // B, E, X, i
+  };
+
+  struct Stats {
+    uint64_t events = 0;  // currently held in the rings
+    uint64_t dropped = 0; // overwritten by newer events
+    uint64_t threads = 0;
+  };
+
+  static SpanTracer &instance();
+  static bool enabled() { return on_.load(std::memory_order_relaxed); }
+
+  // Start recording; rings hold `events_per_thread` events (rings already
+  // created keep their size until clear()).
+  void start(std::size_t events_per_thread = 65536);
+  void stop();
+  // Drop every recorded event (call while no thread is recording).
+  void clear();
+
+  void begin(const char *name, const char *cat);
+  void end(const char *name, const char *cat);
+  void instant(const char *name, const char *cat,
+               const char *detail = nullptr);
+  void complete(const char *name, const char *cat, uint64_t start_ns,
+                uint64_t end_ns, const char *detail = nullptr,
+                uint64_t arg = kNoArg);
+
+  // Stable copy of s for the lifetime of the process.
+  const char *intern(std::string_view s);
+  // Name of the calling thread in the trace (literal or intern()).
+  void set_thread_name(const char *name);
+
+  Stats stats() const;
+
+  // Chrome trace-event JSON of everything recorded so far. Meant for a
+  // quiet moment (after stop(), at exit): a ring being written meanwhile
+  // may show a torn oldest event.
+  std::string to_chrome_json() const;
+  bool write(const std::string &path, std::string *err = nullptr) const;
+
+  // GRETA_SPAN_TRACE handling (runs once at load time).
+  bool start_from_env();
+
+private:
+  struct ThreadRing;
+
+  SpanTracer() = default;
+  ThreadRing &ring();
+  void record(const Event &ev);
+
+  static std::atomic<bool> on_;
+
+  std::atomic<std::size_t> capacity_{65536};
+  uint64_t epoch_ns_ = 0;
+
+  mutable std::mutex mu_;
+  std::vector<std::unique_ptr<ThreadRing>> rings_;
+  std::unordered_set<std::string> strings_;
+  std::string exit_path_;
+};
+
+// RAII span: one complete ('X') event from construction to destruction,
+// so spans survive ring wrap-around.
+class TraceScope final {
+public:
+  explicit TraceScope(const char *name, const char *cat = "rt",
+                      const char *detail = nullptr,
+                      uint64_t arg = SpanTracer::kNoArg)
+      : name_(name), cat_(cat), detail_(detail), arg_(arg),
+        start_(SpanTracer::enabled() ? now_ns() : 0) {}
+
+  ~TraceScope() {
+    if (start_)
+      SpanTracer::instance().complete(name_, cat_, start_, now_ns(), detail_,
+                                      arg_);
+  }
+
+  TraceScope(const TraceScope &) = delete;
+  TraceScope &operator=(const TraceScope &) = delete;
+
+  bool active() const { return start_ != 0; }
+  void set_arg(uint64_t v) { arg_ = v; }
+
+private:
+  const char *name_;
+  const char *cat_;
+  const char *detail_;
+  uint64_t arg_;
+  uint64_t start_;
+};
+
+} // namespace gcore::rt
@@ -2,7 +2,14 @@
 
 #include <atomic>
 #include <cstdint>
+#include <functional>
+#include <map>
+#include <memory>
+#include <mutex>
+#include <string>
 #include <string_view>
+#include <utility>
+#include <vector>
 
 namespace gcore::rt {
 
@@ -20,24 +27,113 @@ public:
   void inc(uint64_t v = 1);
   uint64_t value() const;
   std::string_view name() const;
+  void reset();
 
 private:
   std::atomic<uint64_t> v_{0};
   std::string_view name_;
 };
 
-// Scoped timer that accumulates elapsed time into a counter (ns).
+// Log-linear latency histogram (HDR-style): values below 16 have their own
+// bucket, above that every power of two is split into 16 linear buckets,
+// so any value lands in a bucket at most 6.25% wide. record() is lock-free
+// (relaxed atomics, no allocation); percentiles come from a snapshot.
+class Histogram final {
+public:
+  static constexpr int kSubBits = 4;
+  static constexpr int kSub = 1 << kSubBits;
+  static constexpr int kBuckets = (65 - kSubBits) * kSub; // whole uint64 range
+
+  struct Snapshot {
+    uint64_t count = 0;
+    uint64_t sum = 0;
+    uint64_t min = 0;
+    uint64_t max = 0;
+    std::vector<uint64_t> buckets; // kBuckets entries
+
+    // Value at percentile p (0..100): upper bound of the bucket holding
+    // that rank, clamped to [min, max]. 0 when empty.
+    uint64_t percentile(double p) const;
+    double mean() const;
+  };
+
+  explicit Histogram(std::string_view name);
+
+  Histogram(const Histogram &) = delete;
+  Histogram &operator=(const Histogram &) = delete;
+
+  void record(uint64_t v);
+
+  // Consistent per bucket, not across buckets while writers are active.
+  Snapshot snapshot() const;
+  void reset();
+  std::string_view name() const;
+
+  static int bucket_of(uint64_t v);
+  static uint64_t bucket_lower(int b);
+  static uint64_t bucket_upper(int b); // inclusive
+
+private:
+  std::unique_ptr<std::atomic<uint64_t>[]> buckets_;
+  std::atomic<uint64_t> sum_{0};
+  std::atomic<uint64_t> min_{UINT64_MAX};
+  std::atomic<uint64_t> max_{0};
+  std::string_view name_;
+};
+
+// Scoped timer that accumulates elapsed time into a counter (ns) or
+// records it into a histogram.
 class ScopedTimer final {
 public:
   explicit ScopedTimer(Counter &sink_ns);
+  explicit ScopedTimer(Histogram &sink_ns);
   ~ScopedTimer();
 
   ScopedTimer(const ScopedTimer &) = delete;
   ScopedTimer &operator=(const ScopedTimer &) = delete;
 
 private:
-  Counter &sink_;
+  Counter *counter_ = nullptr;
+  Histogram *histogram_ = nullptr;
   uint64_t start_;
 };
 
+// Named metrics. counter()/histogram() create on first use and return a
+// reference that stays valid for the registry's lifetime; look them up
+// once and keep the reference on hot paths.
+class MetricsRegistry final {
+public:
+  struct Snapshot {
+    std::vector<std::pair<std::string, uint64_t>> counters; // by name
+    std::vector<std::pair<std::string, Histogram::Snapshot>> histograms;
+  };
+
+  MetricsRegistry() = default;
+
+  MetricsRegistry(const MetricsRegistry &) = delete;
+  MetricsRegistry &operator=(const MetricsRegistry &) = delete;
+
+  // Process-wide registry used by Dispatcher, Stream and the Generator
+  // (never destroyed: workers may record during process exit).
+  static MetricsRegistry &global();
+
+  Counter &counter(std::string_view name);
+  Histogram &histogram(std::string_view name);
+
+  Snapshot snapshot() const;
+  void reset();
+
+  // {"counters":{...},"histograms":{"name":{"count":..,"p50":..,...}}}
+  std::string to_json() const;
+  // Prometheus text format: counters as `counter`, histograms as `summary`
+  // (p50/p90/p99/p999 quantiles, _sum, _count). Names are prefixed and
+  // anything outside [a-zA-Z0-9_:] becomes '_'.
+  std::string to_prometheus(std::string_view prefix = "greta_") const;
+
+private:
+  mutable std::mutex mu_;
+  std::map<std::string, std::unique_ptr<Counter>, std::less<>> counters_;
+  std::map<std::string, std::unique_ptr<Histogram>, std::less<>> histograms_;
+};
+
 } // namespace gcore::rt
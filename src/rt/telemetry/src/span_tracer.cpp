@@ -0,0 +1,274 @@
+#include "gcore/rt/span_tracer.hpp"
+
+#include <algorithm>
+#include <cstdio>
+#include <cstdlib>
+#include <fstream>
+#include <iostream>
+#include <sstream>
+
+#include <unistd.h>
+
+namespace gcore::rt {
+
+// Anillo de un hilo: sólo su hilo escribe; head se publica tras el evento
+struct SpanTracer::ThreadRing {
+  explicit ThreadRing(std::size_t cap, uint32_t id)
+      : events(cap), tid(id) {}
+
+  std::vector<Event> events;
+  std::atomic<uint64_t> head{0};
+  uint32_t tid;
+  const char *name = nullptr;
+};
+
+std::atomic<bool> SpanTracer::on_{false};
+
+namespace {
+
+void json_escaped(std::ostringstream &os, const char *s) {
+  os << '"';
+  for (; s && *s; ++s) {
+    const char c = *s;
+    if (c == '"' || c == '\\')
+      os << '\\' << c;
+    else if (static_cast<unsigned char>(c) < 0x20)
+      os << ' ';
+    else
+      os << c;
+  }
+  os << '"';
+}
+
+void json_us(std::ostringstream &os, uint64_t ns) {
+  // Chrome usa microsegundos; 3 decimales conservan los ns
+  char buf[32];
+  std::snprintf(buf, sizeof(buf), "%llu.%03llu",
+                static_cast<unsigned long long>(ns / 1000),
+                static_cast<unsigned long long>(ns % 1000));
+  os << buf;
+}
+
+// Arranque por entorno al cargar el programa
+const bool g_env_started = SpanTracer::instance().start_from_env();
+
+} // namespace
+
+SpanTracer &SpanTracer::instance() {
+  // Nunca se destruye: hay workers que registran durante la salida
+  static SpanTracer *tracer = new SpanTracer();
+  return *tracer;
+}
+
+void SpanTracer::start(std::size_t events_per_thread) {
+  {
+    std::lock_guard<std::mutex> lk(mu_);
+    capacity_.store(std::max<std::size_t>(events_per_thread, 16),
+                    std::memory_order_relaxed);
+    if (epoch_ns_ == 0)
+      epoch_ns_ = now_ns();
+  }
+  on_.store(true, std::memory_order_release);
+}
+
+void SpanTracer::stop() { on_.store(false, std::memory_order_release); }
+
+void SpanTracer::clear() {
+  std::lock_guard<std::mutex> lk(mu_);
+  const std::size_t cap = capacity_.load(std::memory_order_relaxed);
+  for (auto &r : rings_) {
+    r->events.assign(cap, Event{});
+    r->head.store(0, std::memory_order_release);
+  }
+}
+
+SpanTracer::ThreadRing &SpanTracer::ring() {
+  thread_local ThreadRing *tls = nullptr;
+  if (!tls) {
+    std::lock_guard<std::mutex> lk(mu_);
+    rings_.push_back(std::make_unique<ThreadRing>(
+        capacity_.load(std::memory_order_relaxed),
+        static_cast<uint32_t>(rings_.size() + 1)));
+    tls = rings_.back().get();
+  }
+  return *tls;
+}
+
+void SpanTracer::record(const Event &ev) {
+  ThreadRing &r = ring();
+  const uint64_t h = r.head.load(std::memory_order_relaxed);
+  r.events[h % r.events.size()] = ev;
+  r.head.store(h + 1, std::memory_order_release);
+}
+
+void SpanTracer::begin(const char *name, const char *cat) {
+  if (!enabled())
+    return;
+  Event ev;
+  ev.ts_ns = now_ns();
+  ev.name = name;
+  ev.cat = cat;
+  ev.ph = 'B';
+  record(ev);
+}
+
+void SpanTracer::end(const char *name, const char *cat) {
+  if (!enabled())
+    return;
+  Event ev;
+  ev.ts_ns = now_ns();
+  ev.name = name;
+  ev.cat = cat;
+  ev.ph = 'E';
+  record(ev);
+}
+
+void SpanTracer::instant(const char *name, const char *cat,
+                         const char *detail) {
+  if (!enabled())
+    return;
+  Event ev;
+  ev.ts_ns = now_ns();
+  ev.name = name;
+  ev.cat = cat;
+  ev.detail = detail;
+  ev.ph = 'i';
+  record(ev);
+}
+
+void SpanTracer::complete(const char *name, const char *cat,
+                          uint64_t start_ns, uint64_t end_ns,
+                          const char *detail, uint64_t arg) {
+  Event ev;
+  ev.ts_ns = start_ns;
+  ev.dur_ns = end_ns > start_ns ? end_ns - start_ns : 0;
+  ev.name = name;
+  ev.cat = cat;
+  ev.detail = detail;
+  ev.arg = arg;
+  ev.ph = 'X';
+  record(ev);
+}
+
+const char *SpanTracer::intern(std::string_view s) {
+  std::lock_guard<std::mutex> lk(mu_);
+  return strings_.emplace(s).first->c_str();
+}
+
+void SpanTracer::set_thread_name(const char *name) { ring().name = name; }
+
+SpanTracer::Stats SpanTracer::stats() const {
+  std::lock_guard<std::mutex> lk(mu_);
+  Stats s;
+  s.threads = rings_.size();
+  for (const auto &r : rings_) {
+    const uint64_t h = r->head.load(std::memory_order_acquire);
+    const uint64_t cap = r->events.size();
+    s.events += std::min(h, cap);
+    s.dropped += h > cap ? h - cap : 0;
+  }
+  return s;
+}
+
+std::string SpanTracer::to_chrome_json() const {
+  std::lock_guard<std::mutex> lk(mu_);
+  const long pid = static_cast<long>(::getpid());
+  std::ostringstream os;
+  os << "{\"traceEvents\":[";
+  bool first = true;
+  uint64_t dropped = 0;
+  auto sep = [&] {
+    if (!first)
+      os << ",\n";
+    first = false;
+  };
+  for (const auto &r : rings_) {
+    if (r->name) {
+      sep();
+      os << "{\"name\":\"thread_name\",\"ph\":\"M\",\"pid\":" << pid
+         << ",\"tid\":" << r->tid << ",\"args\":{\"name\":";
+      json_escaped(os, r->name);
+      os << "}}";
+    }
+    const uint64_t h = r->head.load(std::memory_order_acquire);
+    const uint64_t cap = r->events.size();
+    // Con el anillo lleno el más antiguo puede estar reescribiéndose
+    uint64_t from = h > cap ? h - cap + 1 : 0;
+    dropped += from;
+    for (uint64_t i = from; i < h; i++) {
+      const Event &ev = r->events[i % cap];
+      if (!ev.name)
+        continue;
+      sep();
+      os << "{\"name\":";
+      json_escaped(os, ev.name);
+      os << ",\"cat\":";
+      json_escaped(os, ev.cat ? ev.cat : "rt");
+      os << ",\"ph\":\"" << ev.ph << "\",\"ts\":";
+      json_us(os, ev.ts_ns >= epoch_ns_ ? ev.ts_ns - epoch_ns_ : 0);
+      if (ev.ph == 'X') {
+        os << ",\"dur\":";
+        json_us(os, ev.dur_ns);
+      } else if (ev.ph == 'i') {
+        os << ",\"s\":\"t\"";
+      }
+      os << ",\"pid\":" << pid << ",\"tid\":" << r->tid;
+      if (ev.detail || ev.arg != kNoArg) {
+        os << ",\"args\":{";
+        if (ev.detail) {
+          os << "\"detail\":";
+          json_escaped(os, ev.detail);
+        }
+        if (ev.arg != kNoArg)
+          os << (ev.detail ? "," : "") << "\"v\":" << ev.arg;
+        os << '}';
+      }
+      os << '}';
+    }
+  }
+  os << "],\"displayTimeUnit\":\"ns\",\"otherData\":{\"dropped\":" << dropped
+     << "}}\n";
+  return os.str();
+}
+
+bool SpanTracer::write(const std::string &path, std::string *err) const {
+  std::ofstream out(path, std::ios::binary | std::ios::trunc);
+  if (!out.is_open()) {
+    if (err)
+      *err = "SpanTracer: cannot open " + path;
+    return false;
+  }
+  out << to_chrome_json();
+  if (!out.good()) {
+    if (err)
+      *err = "SpanTracer: write failed for " + path;
+    return false;
+  }
+  return true;
+}
+
+bool SpanTracer::start_from_env() {
+  const char *path = std::getenv("GRETA_SPAN_TRACE");
+  if (!path || !*path)
+    return false;
+  std::size_t cap = 65536;
+  if (const char *n = std::getenv("GRETA_SPAN_TRACE_EVENTS")) {
+    const long long v = std::strtoll(n, nullptr, 10);
+    if (v > 0)
+      cap = static_cast<std::size_t>(v);
+  }
+  exit_path_ = path;
+  start(cap);
+  std::atexit([] {
+    SpanTracer &t = SpanTracer::instance();
+    t.stop();
+    std::string err;
+    if (!t.write(t.exit_path_, &err))
+      std::cerr << "[GRETA_SPAN_TRACE] " << err << std::endl;
+    else
+      std::cerr << "[GRETA_SPAN_TRACE] wrote " << t.exit_path_ << std::endl;
+  });
+  return true;
+}
+
+} // namespace gcore::rt
@@ -1,6 +1,9 @@
 #include "gcore/rt/telemetry.hpp"
 
 #include <chrono>
+#include <cmath>
+#include <iomanip>
+#include <sstream>
 
 namespace gcore::rt {
 
@@ -11,6 +14,8 @@ uint64_t now_ns() {
           .count());
 }
 
+// ---------------- Counter ----------------
+
 Counter::Counter(std::string_view name) : name_(name) {}
 
 void Counter::inc(uint64_t v) { v_.fetch_add(v, std::memory_order_relaxed); }
@@ -19,11 +24,251 @@ uint64_t Counter::value() const { return v_.load(std::memory_order_relaxed); }
 
 std::string_view Counter::name() const { return name_; }
 
-ScopedTimer::ScopedTimer(Counter &sink_ns) : sink_(sink_ns), start_(now_ns()) {}
+void Counter::reset() { v_.store(0, std::memory_order_relaxed); }
+
+// ---------------- Histogram ----------------
+
+Histogram::Histogram(std::string_view name)
+    : buckets_(new std::atomic<uint64_t>[kBuckets]), name_(name) {
+  for (int b = 0; b < kBuckets; b++)
+    buckets_[b].store(0, std::memory_order_relaxed);
+}
+
+int Histogram::bucket_of(uint64_t v) {
+  if (v < static_cast<uint64_t>(kSub))
+    return static_cast<int>(v);
+  // e = posición del bit alto; los kSubBits siguientes eligen el sub-bucket
+  const int e = 63 - __builtin_clzll(v);
+  const int sub = static_cast<int>(v >> (e - kSubBits)) - kSub;
+  return (e - kSubBits + 1) * kSub + sub;
+}
+
+uint64_t Histogram::bucket_lower(int b) {
+  if (b < kSub)
+    return static_cast<uint64_t>(b);
+  const int group = b / kSub;
+  const uint64_t sub = static_cast<uint64_t>(b % kSub);
+  return (static_cast<uint64_t>(kSub) + sub) << (group - 1);
+}
+
+uint64_t Histogram::bucket_upper(int b) {
+  if (b < kSub)
+    return static_cast<uint64_t>(b);
+  const int group = b / kSub;
+  return bucket_lower(b) + ((uint64_t{1} << (group - 1)) - 1);
+}
+
+void Histogram::record(uint64_t v) {
+  buckets_[bucket_of(v)].fetch_add(1, std::memory_order_relaxed);
+  sum_.fetch_add(v, std::memory_order_relaxed);
+  uint64_t cur = min_.load(std::memory_order_relaxed);
+  while (v < cur &&
+         !min_.compare_exchange_weak(cur, v, std::memory_order_relaxed))
+    ;
+  cur = max_.load(std::memory_order_relaxed);
+  while (v > cur &&
+         !max_.compare_exchange_weak(cur, v, std::memory_order_relaxed))
+    ;
+}
+
+Histogram::Snapshot Histogram::snapshot() const {
+  Snapshot s;
+  s.buckets.resize(kBuckets);
+  for (int b = 0; b < kBuckets; b++) {
+    s.buckets[b] = buckets_[b].load(std::memory_order_relaxed);
+    s.count += s.buckets[b];
+  }
+  s.sum = sum_.load(std::memory_order_relaxed);
+  if (s.count) {
+    s.min = min_.load(std::memory_order_relaxed);
+    s.max = max_.load(std::memory_order_relaxed);
+  }
+  return s;
+}
+
+void Histogram::reset() {
+  for (int b = 0; b < kBuckets; b++)
+    buckets_[b].store(0, std::memory_order_relaxed);
+  sum_.store(0, std::memory_order_relaxed);
+  min_.store(UINT64_MAX, std::memory_order_relaxed);
+  max_.store(0, std::memory_order_relaxed);
+}
+
+std::string_view Histogram::name() const { return name_; }
+
+uint64_t Histogram::Snapshot::percentile(double p) const {
+  if (count == 0 || buckets.empty())
+    return 0;
+  p = p < 0.0 ? 0.0 : (p > 100.0 ? 100.0 : p);
+  uint64_t rank =
+      static_cast<uint64_t>(std::ceil(p / 100.0 * static_cast<double>(count)));
+  if (rank == 0)
+    rank = 1;
+  uint64_t seen = 0;
+  for (size_t b = 0; b < buckets.size(); b++) {
+    seen += buckets[b];
+    if (seen >= rank) {
+      const uint64_t v = bucket_upper(static_cast<int>(b));
+      return v < min ? min : (v > max ? max : v);
+    }
+  }
+  return max;
+}
+
+double Histogram::Snapshot::mean() const {
+  return count ? static_cast<double>(sum) / static_cast<double>(count) : 0.0;
+}
+
+// ---------------- ScopedTimer ----------------
+
+ScopedTimer::ScopedTimer(Counter &sink_ns)
+    : counter_(&sink_ns), start_(now_ns()) {}
+
+ScopedTimer::ScopedTimer(Histogram &sink_ns)
+    : histogram_(&sink_ns), start_(now_ns()) {}
 
 ScopedTimer::~ScopedTimer() {
   uint64_t end = now_ns();
-  sink_.inc(end - start_);
+  if (counter_)
+    counter_->inc(end - start_);
+  else
+    histogram_->record(end - start_);
+}
+
+// ---------------- MetricsRegistry ----------------
+
+namespace {
+
+struct Quantile {
+  const char *json;
+  const char *prom;
+  double p;
+};
+
+constexpr Quantile kQuantiles[] = {{"p50", "0.5", 50.0},
+                                   {"p90", "0.9", 90.0},
+                                   {"p99", "0.99", 99.0},
+                                   {"p999", "0.999", 99.9}};
+
+void json_string(std::ostringstream &os, std::string_view s) {
+  os << '"';
+  for (char c : s) {
+    if (c == '"' || c == '\\')
+      os << '\\' << c;
+    else if (static_cast<unsigned char>(c) < 0x20)
+      os << "\\u" << std::hex << std::setw(4) << std::setfill('0')
+         << static_cast<int>(c) << std::dec << std::setfill(' ');
+    else
+      os << c;
+  }
+  os << '"';
+}
+
+std::string prom_name(std::string_view prefix, std::string_view name) {
+  std::string out(prefix);
+  out += name;
+  for (char &c : out) {
+    const bool ok = (c >= 'a' && c <= 'z') || (c >= 'A' && c <= 'Z') ||
+                    (c >= '0' && c <= '9') || c == '_' || c == ':';
+    if (!ok)
+      c = '_';
+  }
+  if (!out.empty() && out[0] >= '0' && out[0] <= '9')
+    out.insert(out.begin(), '_');
+  return out;
+}
+
+} // namespace
+
+MetricsRegistry &MetricsRegistry::global() {
+  static MetricsRegistry *reg = new MetricsRegistry();
+  return *reg;
+}
+
+Counter &MetricsRegistry::counter(std::string_view name) {
+  std::lock_guard<std::mutex> lk(mu_);
+  auto it = counters_.find(name);
+  if (it == counters_.end()) {
+    it = counters_.emplace(std::string(name), nullptr).first;
+    // El nombre apunta a la clave del map (estable)
+    it->second = std::make_unique<Counter>(it->first);
+  }
+  return *it->second;
+}
+
+Histogram &MetricsRegistry::histogram(std::string_view name) {
+  std::lock_guard<std::mutex> lk(mu_);
+  auto it = histograms_.find(name);
+  if (it == histograms_.end()) {
+    it = histograms_.emplace(std::string(name), nullptr).first;
+    it->second = std::make_unique<Histogram>(it->first);
+  }
+  return *it->second;
+}
+
+MetricsRegistry::Snapshot MetricsRegistry::snapshot() const {
+  std::lock_guard<std::mutex> lk(mu_);
+  Snapshot s;
+  s.counters.reserve(counters_.size());
+  for (const auto &[name, c] : counters_)
+    s.counters.emplace_back(name, c->value());
+  s.histograms.reserve(histograms_.size());
+  for (const auto &[name, h] : histograms_)
+    s.histograms.emplace_back(name, h->snapshot());
+  return s;
+}
+
+void MetricsRegistry::reset() {
+  std::lock_guard<std::mutex> lk(mu_);
+  for (auto &kv : counters_)
+    kv.second->reset();
+  for (auto &kv : histograms_)
+    kv.second->reset();
+}
+
+std::string MetricsRegistry::to_json() const {
+  const Snapshot s = snapshot();
+  std::ostringstream os;
+  os << "{\"counters\":{";
+  for (size_t i = 0; i < s.counters.size(); i++) {
+    if (i)
+      os << ',';
+    json_string(os, s.counters[i].first);
+    os << ':' << s.counters[i].second;
+  }
+  os << "},\"histograms\":{";
+  for (size_t i = 0; i < s.histograms.size(); i++) {
+    const auto &h = s.histograms[i].second;
+    if (i)
+      os << ',';
+    json_string(os, s.histograms[i].first);
+    os << ":{\"count\":" << h.count << ",\"sum\":" << h.sum
+       << ",\"min\":" << h.min << ",\"max\":" << h.max << ",\"mean\":"
+       << std::fixed << std::setprecision(3) << h.mean();
+    for (const auto &q : kQuantiles)
+      os << ",\"" << q.json << "\":" << h.percentile(q.p);
+    os << '}';
+  }
+  os << "}}";
+  return os.str();
+}
+
+std::string MetricsRegistry::to_prometheus(std::string_view prefix) const {
+  const Snapshot s = snapshot();
+  std::ostringstream os;
+  for (const auto &[name, value] : s.counters) {
+    const std::string n = prom_name(prefix, name);
+    os << "# TYPE " << n << " counter\n" << n << ' ' << value << '\n';
+  }
+  for (const auto &[name, h] : s.histograms) {
+    const std::string n = prom_name(prefix, name);
+    os << "# TYPE " << n << " summary\n";
+    for (const auto &q : kQuantiles)
+      os << n << "{quantile=\"" << q.prom << "\"} " << h.percentile(q.p)
+         << '\n';
+    os << n << "_sum " << h.sum << '\n' << n << "_count " << h.count << '\n';
+  }
+  return os.str();
 }
 
 } // namespace gcore::rt
@@ -1,6 +1,7 @@
 #include "gcore/rt/allocator.hpp"
 
 #include <algorithm>
+#include <atomic>
 #include <chrono>
 #include <cstdint>
 #include <iomanip>
@@ -32,47 +33,87 @@ int main(int argc, char **argv) {
   const int max_kb = argi(argc, argv, "--max-kb", 256);
   const uint64_t seed =
       static_cast<uint64_t>(argu(argc, argv, "--seed", 12345));
+  // --threads T: T threads run the same loop on one shared allocator
+  const int threads = std::max(1, argi(argc, argv, "--threads", 1));
+  const int rounds = std::max(1, argi(argc, argv, "--rounds", 50));
 
   std::cout << "GRETA CORE Runtime Bench: alloc_bench\n";
   std::cout << "iters=" << iters << " ops=" << ops_per_iter
-            << " max_kb=" << max_kb << " seed=" << seed << "\n";
+            << " max_kb=" << max_kb << " seed=" << seed
+            << " threads=" << threads << " rounds=" << rounds << "\n";
 
   gcore::rt::HostAllocator alloc;
 
-  std::mt19937_64 rng(seed);
-  std::uniform_int_distribution<int> size_dist(1, max_kb * 1024);
-
-  std::vector<void *> ptrs(static_cast<size_t>(ops_per_iter), nullptr);
-
-  // Warmup
-  for (int i = 0; i < 10000; i++) {
-    void *p = alloc.alloc(static_cast<size_t>(size_dist(rng)), 64);
-    alloc.free(p);
+  // Each thread: own rng stream and batch; the round is timed between a
+  // common start and the last thread finishing
+  struct Worker {
+    std::mt19937_64 rng;
+    std::vector<void *> ptrs;
+    uint64_t null_allocs = 0;
+  };
+  std::vector<Worker> workers(static_cast<size_t>(threads));
+  for (int t = 0; t < threads; t++) {
+    workers[static_cast<size_t>(t)].rng.seed(seed + static_cast<uint64_t>(t));
+    workers[static_cast<size_t>(t)].ptrs.assign(
+        static_cast<size_t>(ops_per_iter), nullptr);
   }
+  std::uniform_int_distribution<int> size_dist(1, max_kb * 1024);
 
-  std::vector<double> secs;
-  secs.reserve(50);
-
-  for (int round = 0; round < 50; round++) {
-    auto t0 = std::chrono::steady_clock::now();
-
-    for (int i = 0; i < iters; i++) {
+  auto run_loop = [&](Worker &w, int loop_iters) {
+    auto dist = size_dist;
+    for (int i = 0; i < loop_iters; i++) {
       // allocate batch
       for (int j = 0; j < ops_per_iter; j++) {
-        ptrs[static_cast<size_t>(j)] =
-            alloc.alloc(static_cast<size_t>(size_dist(rng)), 64);
+        void *p = alloc.alloc(static_cast<size_t>(dist(w.rng)), 64);
+        w.null_allocs += p == nullptr;
+        w.ptrs[static_cast<size_t>(j)] = p;
       }
       // free batch
       for (int j = 0; j < ops_per_iter; j++) {
-        alloc.free(ptrs[static_cast<size_t>(j)]);
-        ptrs[static_cast<size_t>(j)] = nullptr;
+        alloc.free(w.ptrs[static_cast<size_t>(j)]);
+        w.ptrs[static_cast<size_t>(j)] = nullptr;
       }
     }
+  };
+
+  std::vector<double> secs;
+  secs.reserve(static_cast<size_t>(rounds));
+
+  // Persistent threads; round r starts when `go` reaches r + 1
+  std::atomic<int> go{0};
+  std::atomic<int> done{0};
+  std::vector<std::thread> pool;
+  for (int t = 1; t < threads; t++) {
+    pool.emplace_back([&, t] {
+      Worker &w = workers[static_cast<size_t>(t)];
+      run_loop(w, 10000 / ops_per_iter + 1); // warmup
+      for (int r = 0; r < rounds; r++) {
+        while (go.load(std::memory_order_acquire) <= r)
+          std::this_thread::yield();
+        run_loop(w, iters);
+        done.fetch_add(1, std::memory_order_acq_rel);
+      }
+    });
+  }
+
+  // Warmup
+  run_loop(workers[0], 10000 / ops_per_iter + 1);
+
+  for (int round = 0; round < rounds; round++) {
+    done.store(0, std::memory_order_relaxed);
+    auto t0 = std::chrono::steady_clock::now();
+    go.store(round + 1, std::memory_order_release);
+
+    run_loop(workers[0], iters);
+    while (done.load(std::memory_order_acquire) < threads - 1)
+      std::this_thread::yield();
 
     auto t1 = std::chrono::steady_clock::now();
     std::chrono::duration<double> dt = t1 - t0;
     secs.push_back(dt.count());
   }
+  for (auto &t : pool)
+    t.join();
 
   std::sort(secs.begin(), secs.end());
   double mean = 0.0;
@@ -85,11 +126,14 @@ int main(int argc, char **argv) {
       std::min<size_t>(secs.size() - 1, (secs.size() * 99) / 100))];
 
   const double total_ops = static_cast<double>(iters) *
-                           static_cast<double>(ops_per_iter) *
+                           static_cast<double>(ops_per_iter) * threads *
                            2.0; // alloc+free
   auto ops_per_sec = [&](double s) { return total_ops / s; };
 
   auto st = alloc.stats();
+  uint64_t null_allocs = 0;
+  for (const auto &w : workers)
+    null_allocs += w.null_allocs;
 
   std::cout << std::fixed << std::setprecision(3);
   std::cout << "RESULT alloc_bench:\n";
@@ -99,6 +143,8 @@ int main(int argc, char **argv) {
             << "\n";
   std::cout << "  p99_sec=" << p99 << "   p99_ops_per_sec=" << ops_per_sec(p99)
             << "\n";
+  std::cout << "  p50_ops_per_sec_per_thread=" << ops_per_sec(p50) / threads
+            << "\n";
 
   std::cout << "ALLOCATOR stats snapshot:\n";
   std::cout << "  alloc_calls=" << st.alloc_calls
@@ -106,6 +152,11 @@ int main(int argc, char **argv) {
             << " reuse_hits=" << st.reuse_hits << " os_allocs=" << st.os_allocs
             << " bytes_in_use=" << st.bytes_in_use
             << " bytes_reserved=" << st.bytes_reserved << "\n";
+  std::cout << "  thread_cache_hits=" << st.thread_cache_hits
+            << " large_cache_hits=" << st.large_cache_hits
+            << " large_bytes_cached=" << st.large_bytes_cached
+            << " threads=" << st.threads << " null_allocs=" << null_allocs
+            << "\n";
 
-  return 0;
+  return null_allocs == 0 ? 0 : 1;
 }
@@ -1,4 +1,5 @@
 #include <assert.h>
+#include <gcore/rt/ref/cpu_gemm.hpp>
 #include <gcore/rt/ref/cpu_reference.hpp>
 #include <iostream>
 #include <vector>
@@ -23,6 +24,96 @@ void test_gemm() {
   std::cout << "GEMM OK" << std::endl;
 }
 
+void test_gemm_blocked() {
+  std::cout << "Testing blocked GEMM..." << std::endl;
+  // Shapes that exercise partial micro-tiles and several KC/MC blocks
+  const int shapes[][3] = {{1, 1, 1}, {7, 17, 5}, {97, 33, 300}, {130, 70, 513}};
+  for (const auto &s : shapes) {
+    const int M = s[0], N = s[1], K = s[2];
+    std::vector<float> A(M * K), B(K * N), ref(M * N), C(M * N);
+    std::vector<uint16_t> Ah(M * K), Bh(K * N);
+    for (int i = 0; i < M * K; ++i)
+      A[i] = static_cast<float>(i % 13 - 6) * 0.25f;
+    for (int i = 0; i < K * N; ++i)
+      B[i] = static_cast<float>(i % 7 - 3) * 0.5f;
+
+    CpuGemm::gemm(A.data(), B.data(), ref.data(), M, N, K, GemmMode::Golden);
+    CpuGemm::gemm(A.data(), B.data(), C.data(), M, N, K, GemmMode::Blocked);
+    for (int i = 0; i < M * N; ++i)
+      assert(C[i] == ref[i]); // exact: small integers * powers of two
+
+    // fp16 / bf16 represent these inputs exactly too
+    for (int i = 0; i < M * K; ++i)
+      Ah[i] = CpuReference::float_to_half(A[i]);
+    for (int i = 0; i < K * N; ++i)
+      Bh[i] = CpuReference::float_to_half(B[i]);
+    CpuGemm::gemm_f16(Ah.data(), Bh.data(), C.data(), M, N, K);
+    for (int i = 0; i < M * N; ++i)
+      assert(C[i] == ref[i]);
+
+    for (int i = 0; i < M * K; ++i)
+      Ah[i] = CpuReference::float_to_bf16(A[i]);
+    for (int i = 0; i < K * N; ++i)
+      Bh[i] = CpuReference::float_to_bf16(B[i]);
+    CpuGemm::gemm_bf16(Ah.data(), Bh.data(), C.data(), M, N, K, GemmMode::Blocked, 2);
+    for (int i = 0; i < M * N; ++i)
+      assert(C[i] == ref[i]);
+
+    // trans_b: fp32 A x fp16 B stored as [N][K] (Linear weight layout)
+    std::vector<uint16_t> Bt(N * K);
+    for (int k = 0; k < K; ++k)
+      for (int j = 0; j < N; ++j)
+        Bt[j * K + k] = CpuReference::float_to_half(B[k * N + j]);
+    CpuGemm::blocked(A.data(), GemmInput::F32, Bt.data(), GemmInput::F16, C.data(), M, N, K,
+                     0, /*trans_b=*/true);
+    for (int i = 0; i < M * N; ++i)
+      assert(C[i] == ref[i]);
+  }
+  std::cout << "Blocked GEMM OK" << std::endl;
+}
+
+void test_gemm_quant() {
+  std::cout << "Testing INT8/INT4 weight GEMM..." << std::endl;
+  // M <= 4 takes the GEMV path, larger M the blocked path. K = 48 makes the
+  // 32-element scale groups straddle weight rows (flat-index grouping).
+  const int shapes[][3] = {{1, 40, 96}, {3, 17, 48}, {9, 40, 96}, {13, 21, 48}};
+  const float pow2[] = {0.25f, 0.5f, 1.0f, 2.0f};
+  for (const auto &s : shapes) {
+    const int M = s[0], N = s[1], K = s[2], head_dim = 8;
+    std::vector<float> A(M * K), scales((N * K + 31) / 32), heads((N + 7) / 8);
+    std::vector<int8_t> W8(N * K);
+    std::vector<uint8_t> W4(N * K / 2, 0);
+    std::vector<float> ref(M * N), C(M * N);
+    for (int i = 0; i < M * K; ++i)
+      A[i] = static_cast<float>(i % 13 - 6) * 0.25f;
+    for (size_t g = 0; g < scales.size(); ++g)
+      scales[g] = pow2[g % 4];
+    for (size_t h = 0; h < heads.size(); ++h)
+      heads[h] = pow2[(h + 1) % 4];
+    for (int i = 0; i < N * K; ++i) {
+      W8[i] = static_cast<int8_t>(i * 37 % 255 - 127);
+      const int v4 = i * 5 % 16 - 8;
+      W4[i / 2] |= static_cast<uint8_t>((v4 & 0x0F) << ((i & 1) * 4));
+    }
+    for (int i = 0; i < N * K; ++i)
+      assert(CpuReference::int4_value(W4.data(), i) == i * 5 % 16 - 8);
+
+    CpuGemm::gemm_int8(A.data(), W8.data(), scales.data(), ref.data(), M, N, K, 32,
+                       GemmMode::Golden);
+    CpuGemm::gemm_int8(A.data(), W8.data(), scales.data(), C.data(), M, N, K);
+    for (int i = 0; i < M * N; ++i)
+      assert(C[i] == ref[i]); // exact: small integers * powers of two
+
+    CpuGemm::gemm_int4(A.data(), W4.data(), scales.data(), heads.data(), ref.data(), M, N,
+                       K, 32, head_dim, GemmMode::Golden);
+    CpuGemm::gemm_int4(A.data(), W4.data(), scales.data(), heads.data(), C.data(), M, N, K,
+                       32, head_dim, GemmMode::Blocked, 2);
+    for (int i = 0; i < M * N; ++i)
+      assert(C[i] == ref[i]);
+  }
+  std::cout << "INT8/INT4 weight GEMM OK" << std::endl;
+}
+
 void test_rmsnorm() {
   std::cout << "Testing RMSNorm..." << std::endl;
   int rows = 1, cols = 4;
@@ -43,6 +134,8 @@ void test_rmsnorm() {
 
 int main() {
   test_gemm();
+  test_gemm_blocked();
+  test_gemm_quant();
   test_rmsnorm();
   std::cout << "All tests passed!" << std::endl;
   return 0;
@@ -0,0 +1,181 @@
+#include "gcore/inference/gguf_quant.hpp"
+
+#include <omp.h>
+
+#include <chrono>
+#include <cstdint>
+#include <cstring>
+#include <iomanip>
+#include <iostream>
+#include <random>
+#include <string>
+#include <vector>
+
+namespace quant = gcore::inference::quant;
+
+static int parse_arg_int(int argc, char **argv, const std::string &key,
+                         int def) {
+  for (int i = 1; i + 1 < argc; i++) {
+    if (argv[i] == key)
+      return std::stoi(argv[i + 1]);
+  }
+  return def;
+}
+
+static bool check(bool ok, const std::string &what) {
+  std::cout << (ok ? "PASS: " : "FAIL: ") << what << "\n";
+  return ok;
+}
+
+template <typename Fn> static double best_of(int iters, Fn &&fn) {
+  double best = 1e30;
+  for (int it = 0; it < iters; it++) {
+    auto t0 = std::chrono::steady_clock::now();
+    fn();
+    auto t1 = std::chrono::steady_clock::now();
+    best = std::min(best, std::chrono::duration<double>(t1 - t0).count());
+  }
+  return best;
+}
+
+static double mbps(size_t bytes, double sec) {
+  return sec > 0 ? static_cast<double>(bytes) / (1024.0 * 1024.0) / sec : 0.0;
+}
+
+// Bloques aleatorios con escalas fp16 finitas en sus posiciones
+static std::vector<uint8_t> random_blocks(quant::BlockType t, size_t n_blocks,
+                                          std::mt19937 &rng) {
+  const size_t bytes = quant::block_bytes(t);
+  std::vector<uint8_t> v(n_blocks * bytes);
+  std::uniform_int_distribution<int> byte(0, 255);
+  std::uniform_real_distribution<float> scale(-0.05f, 0.05f);
+  for (auto &b : v)
+    b = static_cast<uint8_t>(byte(rng));
+  for (size_t b = 0; b < n_blocks; b++) {
+    uint8_t *blk = v.data() + b * bytes;
+    auto put = [&](size_t off) {
+      const uint16_t h = quant::fp32_to_fp16(scale(rng));
+      std::memcpy(blk + off, &h, 2);
+    };
+    if (t == quant::BlockType::Q6_K) {
+      put(208);
+    } else {
+      put(0);
+      if (t == quant::BlockType::Q4_K)
+        put(2);
+    }
+  }
+  return v;
+}
+
+static const char *type_name(quant::BlockType t) {
+  switch (t) {
+  case quant::BlockType::Q4_0:
+    return "Q4_0";
+  case quant::BlockType::Q8_0:
+    return "Q8_0";
+  case quant::BlockType::Q4_K:
+    return "Q4_K";
+  case quant::BlockType::Q6_K:
+    return "Q6_K";
+  }
+  return "?";
+}
+
+int main(int argc, char **argv) {
+  const size_t mb = static_cast<size_t>(parse_arg_int(argc, argv, "--mb", 64));
+  const int iters = parse_arg_int(argc, argv, "--iters", 3);
+  const int threads = omp_get_max_threads();
+  std::mt19937 rng(1234);
+  bool ok = true;
+
+  std::cout << "GRETA CORE: GGUF dequant/requant bench\n";
+  std::cout << "source=" << mb << " MB per type, threads=" << threads
+            << " (OMP_NUM_THREADS), best of " << iters << "\n\n";
+  std::cout << std::left << std::setw(10) << "type" << std::right
+            << std::setw(14) << "ref MB/s" << std::setw(14) << "1T MB/s"
+            << std::setw(14) << "NT MB/s" << std::setw(14) << "NT fp16"
+            << std::setw(10) << "speedup" << "\n";
+
+  std::vector<float> sample; // FP32 de Q4_K para la recuantización
+  for (quant::BlockType t :
+       {quant::BlockType::Q4_0, quant::BlockType::Q8_0, quant::BlockType::Q4_K,
+        quant::BlockType::Q6_K}) {
+    const size_t bytes = quant::block_bytes(t), elems = quant::block_elems(t);
+    const size_t n_blocks = (mb << 20) / bytes;
+    const std::vector<uint8_t> src = random_blocks(t, n_blocks, rng);
+    std::vector<float> ref(n_blocks * elems), out(ref.size());
+    std::vector<uint16_t> out16(ref.size());
+
+    const double t_ref = best_of(iters, [&] {
+      for (size_t b = 0; b < n_blocks; b++)
+        quant::dequantize_block_ref(t, src.data() + b * bytes,
+                                    ref.data() + b * elems);
+    });
+    omp_set_num_threads(1);
+    auto run_f32 = [&] {
+      quant::dequantize_f32(t, src.data(), n_blocks, out.data());
+    };
+    const double t_1 = best_of(iters, run_f32);
+    omp_set_num_threads(threads);
+    const double t_n = best_of(iters, run_f32);
+    const double t_16 = best_of(iters, [&] {
+      quant::dequantize_fp16(t, src.data(), n_blocks, out16.data());
+    });
+
+    std::cout << std::left << std::setw(10) << type_name(t) << std::right
+              << std::fixed << std::setprecision(0) << std::setw(14)
+              << mbps(src.size(), t_ref) << std::setw(14)
+              << mbps(src.size(), t_1) << std::setw(14)
+              << mbps(src.size(), t_n) << std::setw(14)
+              << mbps(src.size(), t_16) << std::setw(9)
+              << std::setprecision(2) << t_ref / t_n << "x\n";
+
+    bool exact16 = true;
+    for (size_t i = 0; i < ref.size() && exact16; i++)
+      exact16 = out16[i] == quant::fp32_to_fp16(ref[i]);
+    ok &= check(std::memcmp(out.data(), ref.data(), ref.size() * 4) == 0 &&
+                    exact16,
+                std::string(type_name(t)) + " FP32/FP16 bit-exact vs scalar");
+    if (t == quant::BlockType::Q4_K)
+      sample = ref;
+  }
+
+  // Recuantización al layout INT8/INT4 de GRETA (cola de 17 y un grupo a 0)
+  sample.resize(sample.size() - 15);
+  std::fill(sample.begin(), sample.begin() + 32, 0.0f);
+  const size_t n = sample.size(), groups = (n + 31) / 32;
+  std::vector<int8_t> q8_ref(n), q8(n);
+  std::vector<uint8_t> q4_ref((n + 1) / 2), q4((n + 1) / 2);
+  std::vector<float> s_ref(groups), s8(groups), s4_ref(groups), s4(groups);
+  const size_t in_bytes = n * 4;
+
+  const double r8 = best_of(iters, [&] {
+    quant::quantize_int8_ref(sample.data(), n, q8_ref.data(), s_ref.data());
+  });
+  const double e8 = best_of(iters, [&] {
+    quant::quantize_int8(sample.data(), n, q8.data(), s8.data());
+  });
+  const double r4 = best_of(iters, [&] {
+    quant::quantize_int4_ref(sample.data(), n, q4_ref.data(), s4_ref.data());
+  });
+  const double e4 = best_of(iters, [&] {
+    quant::quantize_int4(sample.data(), n, q4.data(), s4.data());
+  });
+  std::cout << "\n" << std::left << std::setw(10) << "requant" << std::right
+            << std::setw(14) << "ref MB/s" << std::setw(14) << "NT MB/s"
+            << std::setw(10) << "speedup" << "\n";
+  std::cout << std::left << std::setw(10) << "INT8" << std::right
+            << std::setprecision(0) << std::setw(14) << mbps(in_bytes, r8)
+            << std::setw(14) << mbps(in_bytes, e8) << std::setw(9)
+            << std::setprecision(2) << r8 / e8 << "x\n";
+  std::cout << std::left << std::setw(10) << "INT4" << std::right
+            << std::setprecision(0) << std::setw(14) << mbps(in_bytes, r4)
+            << std::setw(14) << mbps(in_bytes, e4) << std::setw(9)
+            << std::setprecision(2) << r4 / e4 << "x\n";
+  ok &= check(q8 == q8_ref && s8 == s_ref, "INT8 weights/scales bit-exact");
+  ok &= check(q4 == q4_ref && s4 == s4_ref, "INT4 weights/scales bit-exact");
+
+  std::cout << "\nSTATUS=" << (ok ? "OK" : "FAIL") << "\n";
+  return ok ? 0 : 1;
+}
@@ -5,7 +5,9 @@
 #include <cstdint>
 #include <iomanip>
 #include <iostream>
+#include <memory>
 #include <string>
+#include <thread>
 #include <vector>
 
 static int argi(int argc, char **argv, const char *key, int def) {
@@ -18,32 +20,61 @@ static int argi(int argc, char **argv, const char *key, int def) {
 
 int main(int argc, char **argv) {
   const int n = argi(argc, argv, "--n", 500000);
+  // Streams, each fed by its own producer thread through the shared
+  // Dispatcher (1 = original single-stream run on the calling thread)
+  const int streams = std::max(1, argi(argc, argv, "--streams", 1));
 
   std::cout << "GRETA CORE Runtime Bench: dispatch_bench\n";
-  std::cout << "n=" << n << "\n";
+  std::cout << "n=" << n << " streams=" << streams
+            << " executor_threads=" << gcore::rt::Executor::instance().size()
+            << "\n";
 
-  gcore::rt::Stream stream;
+  std::vector<std::unique_ptr<gcore::rt::Stream>> pool;
+  for (int i = 0; i < streams; i++)
+    pool.push_back(std::make_unique<gcore::rt::Stream>());
   gcore::rt::Dispatcher disp;
 
-  std::vector<double> secs;
+  std::vector<double> secs, submit_secs;
   secs.reserve(20);
+  submit_secs.reserve(20);
 
   for (int round = 0; round < 20; round++) {
     auto t0 = std::chrono::steady_clock::now();
+    std::vector<double> submit(streams, 0.0);
 
     // Submit N trabajos no-op. No guardamos todos los Events (evita overhead de
     // vector). Esperamos al último Event, que implica que todo lo anterior
     // terminó.
-    gcore::rt::Event last;
-    for (int i = 0; i < n; i++) {
-      last = disp.submit(stream, [] {});
+    auto produce = [&](int id) {
+      gcore::rt::Stream &stream = *pool[id];
+      const int count = n / streams + (id < n % streams ? 1 : 0);
+      auto p0 = std::chrono::steady_clock::now();
+      gcore::rt::Event last;
+      for (int i = 0; i < count; i++) {
+        last = disp.submit(stream, [] {});
+      }
+      submit[id] = std::chrono::duration<double>(
+                       std::chrono::steady_clock::now() - p0)
+                       .count();
+      last.wait();
+    };
+    if (streams == 1) {
+      produce(0);
+    } else {
+      std::vector<std::thread> producers;
+      for (int id = 0; id < streams; id++)
+        producers.emplace_back(produce, id);
+      for (auto &t : producers)
+        t.join();
     }
-    last.wait();
 
     auto t1 = std::chrono::steady_clock::now();
     std::chrono::duration<double> dt = t1 - t0;
     secs.push_back(dt.count());
+    submit_secs.push_back(*std::max_element(submit.begin(), submit.end()));
   }
+  std::sort(submit_secs.begin(), submit_secs.end());
+  const double submit_p50 = submit_secs[submit_secs.size() / 2];
 
   std::sort(secs.begin(), secs.end());
   double mean = 0.0;
@@ -64,6 +95,8 @@ int main(int argc, char **argv) {
   std::cout << "  mean_ns_per_submit_and_exec=" << ns_per(mean) << "\n";
   std::cout << "  p50_ns_per_submit_and_exec=" << ns_per(p50) << "\n";
   std::cout << "  p99_ns_per_submit_and_exec=" << ns_per(p99) << "\n";
+  std::cout << "  p50_submit_ns=" << ns_per(submit_p50) * streams << "\n";
+  std::cout << "  p50_tasks_per_sec=" << static_cast<double>(n) / p50 << "\n";
 
   std::cout << "DISPATCH stats snapshot:\n";
   std::cout << "  submits=" << st.submits << " completed=" << st.completed
@@ -1,4 +1,6 @@
-#include <bit>
+#include <gcore/rt/ref/cpu_gemm.hpp>
+
+#include <algorithm>
 #include <chrono>
 #include <cmath>
 #include <cstdint>
@@ -7,6 +9,11 @@
 #include <string>
 #include <vector>
 
+using gcore::rt::ref::CpuGemm;
+using gcore::rt::ref::CpuReference;
+using gcore::rt::ref::CpuThreadPool;
+using gcore::rt::ref::GemmMode;
+
 static int parse_arg_int(int argc, char **argv, const std::string &key,
                          int def) {
   for (int i = 1; i + 1 < argc; i++) {
@@ -34,140 +41,149 @@ static float parse_arg_float(int argc, char **argv, const std::string &key,
   return def;
 }
 
-static uint16_t float_to_half(float f) {
-  uint32_t x = std::bit_cast<uint32_t>(f);
-  uint32_t sign = (x >> 31) & 0x1;
-  int exp = int((x >> 23) & 0xFF) - 127;
-  uint32_t mant = x & 0x7FFFFF;
-  if (exp > 15) {
-    return static_cast<uint16_t>((sign << 15) | 0x7C00);
-  }
-  if (exp < -14) {
-    if (exp < -24)
-      return static_cast<uint16_t>(sign << 15);
-    mant |= 0x800000;
-    int shift = -exp - 14;
-    uint32_t m = mant >> (shift + 13);
-    return static_cast<uint16_t>((sign << 15) | m);
-  }
-  uint32_t exp_h = static_cast<uint32_t>(exp + 15);
-  uint32_t mant_h = mant >> 13;
-  uint32_t round = mant & 0x1FFF;
-  if (round > 0x1000 || (round == 0x1000 && (mant_h & 0x1)))
-    mant_h++;
-  if (mant_h == 0x400) {
-    mant_h = 0;
-    exp_h++;
-    if (exp_h >= 31)
-      return static_cast<uint16_t>((sign << 15) | 0x7C00);
-  }
-  return static_cast<uint16_t>((sign << 15) | (exp_h << 10) | mant_h);
-}
+struct Inputs {
+  std::string precision;
+  std::vector<float> a_f, b_f;
+  std::vector<uint16_t> a_h, b_h;
+};
 
-static float half_to_float(uint16_t h) {
-  uint32_t sign = (h >> 15) & 0x1;
-  uint32_t exp = (h >> 10) & 0x1F;
-  uint32_t mant = h & 0x3FF;
-  uint32_t out;
-  if (exp == 0) {
-    if (mant == 0) {
-      out = sign << 31;
-    } else {
-      exp = 127 - 14;
-      while ((mant & 0x400) == 0) {
-        mant <<= 1;
-        exp--;
-      }
-      mant &= 0x3FF;
-      out = (sign << 31) | (exp << 23) | (mant << 13);
-    }
-  } else if (exp == 31) {
-    out = (sign << 31) | 0x7F800000 | (mant << 13);
+// C = A(m x k) * B(k x n) for `rows` rows of A starting at row0 (golden mode
+// can be restricted to a few rows at Llama-sized shapes)
+static void run_gemm(const Inputs &in, float *c, int row0, int rows, int n,
+                     int k, GemmMode mode, int threads) {
+  const size_t a_off = static_cast<size_t>(row0) * k;
+  if (in.precision == "fp16") {
+    CpuGemm::gemm_f16(in.a_h.data() + a_off, in.b_h.data(), c, rows, n, k,
+                      mode, threads);
+  } else if (in.precision == "bf16") {
+    CpuGemm::gemm_bf16(in.a_h.data() + a_off, in.b_h.data(), c, rows, n, k,
+                       mode, threads);
   } else {
-    exp = exp + (127 - 15);
-    out = (sign << 31) | (exp << 23) | (mant << 13);
+    CpuGemm::gemm(in.a_f.data() + a_off, in.b_f.data(), c, rows, n, k, mode,
+                  threads);
   }
-  return std::bit_cast<float>(out);
+}
+
+template <typename Fn> static double time_iters(int iters, Fn &&fn) {
+  auto t0 = std::chrono::steady_clock::now();
+  for (int it = 0; it < iters; it++)
+    fn();
+  auto t1 = std::chrono::steady_clock::now();
+  return std::chrono::duration<double>(t1 - t0).count();
 }
 
 int main(int argc, char **argv) {
   const int m = parse_arg_int(argc, argv, "--m", 128);
   const int n = parse_arg_int(argc, argv, "--n", 128);
   const int k = parse_arg_int(argc, argv, "--k", 128);
-  const int iters = parse_arg_int(argc, argv, "--iters", 1);
+  const int iters = std::max(1, parse_arg_int(argc, argv, "--iters", 1));
+  const int threads = parse_arg_int(argc, argv, "--threads", 0);
+  // golden | blocked | both. With "blocked", golden runs only on --check-rows
+  // rows (untimed) to validate the result.
+  const std::string mode = parse_arg_str(argc, argv, "--mode", "both");
+  const int check_rows =
+      std::clamp(parse_arg_int(argc, argv, "--check-rows", 8), 1, m);
   const std::string precision =
       parse_arg_str(argc, argv, "--precision", "fp32");
-  const float tol_default = (precision == "fp16") ? 1e-2f : 1e-4f;
-  const float tol = parse_arg_float(argc, argv, "--tol", tol_default);
+  // Relative to max |C|: fp32 accumulate vs double accumulate on the same inputs
+  const float tol = parse_arg_float(argc, argv, "--tol", 1e-5f);
 
-  std::vector<float> a_f(static_cast<size_t>(m) * k);
-  std::vector<float> b_f(static_cast<size_t>(k) * n);
-  std::vector<uint16_t> a_h;
-  std::vector<uint16_t> b_h;
-  if (precision == "fp16") {
-    a_h.resize(a_f.size());
-    b_h.resize(b_f.size());
+  if (precision != "fp32" && precision != "fp16" && precision != "bf16") {
+    std::cerr << "Unknown --precision " << precision
+              << " (fp32|fp16|bf16)\n";
+    return 2;
   }
+  const bool run_golden = (mode == "golden" || mode == "both");
+  const bool run_blocked = (mode == "blocked" || mode == "both");
 
-  for (size_t i = 0; i < a_f.size(); i++) {
+  Inputs in;
+  in.precision = precision;
+  in.a_f.resize(static_cast<size_t>(m) * k);
+  in.b_f.resize(static_cast<size_t>(k) * n);
+  if (precision != "fp32") {
+    in.a_h.resize(in.a_f.size());
+    in.b_h.resize(in.b_f.size());
+  }
+  auto to_h = precision == "bf16" ? CpuReference::float_to_bf16
+                                  : CpuReference::float_to_half;
+  for (size_t i = 0; i < in.a_f.size(); i++) {
     const int v = static_cast<int>(i % 251) - 125;
-    a_f[i] = static_cast<float>(v) * 0.01f;
-    if (!a_h.empty())
-      a_h[i] = float_to_half(a_f[i]);
+    in.a_f[i] = static_cast<float>(v) * 0.01f;
+    if (!in.a_h.empty())
+      in.a_h[i] = to_h(in.a_f[i]);
   }
-  for (size_t i = 0; i < b_f.size(); i++) {
+  for (size_t i = 0; i < in.b_f.size(); i++) {
     const int v = static_cast<int>(i % 197) - 98;
-    b_f[i] = static_cast<float>(v) * 0.02f;
-    if (!b_h.empty())
-      b_h[i] = float_to_half(b_f[i]);
+    in.b_f[i] = static_cast<float>(v) * 0.02f;
+    if (!in.b_h.empty())
+      in.b_h[i] = to_h(in.b_f[i]);
   }
 
-  std::vector<float> c_test(static_cast<size_t>(m) * n, 0.0f);
-  std::vector<double> c_ref(static_cast<size_t>(m) * n, 0.0);
+  const double flops = 2.0 * m * n * k;
+  std::vector<float> c_gold(static_cast<size_t>(m) * n, 0.0f);
+  std::vector<float> c_fast(static_cast<size_t>(m) * n, 0.0f);
+  double golden_sec = 0.0, blocked_sec = 0.0;
 
-  auto t0 = std::chrono::high_resolution_clock::now();
-  for (int it = 0; it < iters; it++) {
-    std::fill(c_test.begin(), c_test.end(), 0.0f);
-    std::fill(c_ref.begin(), c_ref.end(), 0.0);
-    for (int i = 0; i < m; i++) {
+  if (run_golden) {
+    golden_sec = time_iters(iters, [&] {
+      run_gemm(in, c_gold.data(), 0, m, n, k, GemmMode::Golden, threads);
+    });
+  }
+  if (run_blocked) {
+    run_gemm(in, c_fast.data(), 0, m, n, k, GemmMode::Blocked, threads); // warmup
+    blocked_sec = time_iters(iters, [&] {
+      run_gemm(in, c_fast.data(), 0, m, n, k, GemmMode::Blocked, threads);
+    });
+  }
+
+  // Validation: blocked vs golden on every row, or on check_rows spread rows
+  std::vector<int> rows;
+  if (run_golden) {
+    for (int i = 0; i < m; i++)
+      rows.push_back(i);
+  } else {
+    for (int r = 0; r < check_rows; r++) {
+      const int i = static_cast<int>(static_cast<int64_t>(r) * (m - 1) /
+                                     std::max(1, check_rows - 1));
+      run_gemm(in, c_gold.data() + static_cast<size_t>(i) * n, i, 1, n, k,
+               GemmMode::Golden, threads);
+      rows.push_back(i);
+    }
+  }
+  double max_abs_err = 0.0, max_ref = 0.0;
+  if (run_blocked) {
+    for (int i : rows) {
       for (int j = 0; j < n; j++) {
-        double acc_ref = 0.0;
-        float acc_test = 0.0f;
-        for (int kk = 0; kk < k; kk++) {
-          float av = a_h.empty()
-                         ? a_f[static_cast<size_t>(i) * k + kk]
-                         : half_to_float(a_h[static_cast<size_t>(i) * k + kk]);
-          float bv = b_h.empty()
-                         ? b_f[static_cast<size_t>(kk) * n + j]
-                         : half_to_float(b_h[static_cast<size_t>(kk) * n + j]);
-          acc_ref += static_cast<double>(av) * static_cast<double>(bv);
-          acc_test += av * bv;
-        }
-        c_ref[static_cast<size_t>(i) * n + j] = acc_ref;
-        c_test[static_cast<size_t>(i) * n + j] = acc_test;
+        const size_t idx = static_cast<size_t>(i) * n + j;
+        max_abs_err = std::max(
+            max_abs_err, std::abs(static_cast<double>(c_fast[idx]) - c_gold[idx]));
+        max_ref = std::max(max_ref, std::abs(static_cast<double>(c_gold[idx])));
       }
     }
   }
-  auto t1 = std::chrono::high_resolution_clock::now();
-  double sec =
-      std::chrono::duration_cast<std::chrono::duration<double>>(t1 - t0)
-          .count();
-
-  double max_abs_err = 0.0;
-  for (size_t i = 0; i < c_test.size(); i++) {
-    double err = std::abs(static_cast<double>(c_test[i]) - c_ref[i]);
-    if (err > max_abs_err)
-      max_abs_err = err;
-  }
+  const double max_rel_err = max_abs_err / std::max(1.0, max_ref);
 
   std::cout << "GRETA CORE Runtime Bench: gemm_ref_bench\n";
   std::cout << "m=" << m << " n=" << n << " k=" << k << " iters=" << iters
-            << " precision=" << precision << " tol=" << tol << "\n";
+            << " precision=" << precision << " mode=" << mode
+            << " threads=" << (threads > 0 ? threads : static_cast<int>(CpuThreadPool::instance().size()))
+            << " tol=" << tol << "\n";
   std::cout << std::fixed << std::setprecision(6);
   std::cout << "RESULT gemm_ref_bench:\n";
-  std::cout << "  total_sec=" << sec << "\n";
-  std::cout << "  max_abs_err=" << max_abs_err << "\n";
-  const bool ok = (max_abs_err <= tol);
+  if (run_golden) {
+    std::cout << "  golden_total_sec=" << golden_sec << "\n";
+    std::cout << "  golden_gflops=" << flops * iters / golden_sec * 1e-9 << "\n";
+  }
+  if (run_blocked) {
+    std::cout << "  blocked_total_sec=" << blocked_sec << "\n";
+    std::cout << "  blocked_gflops=" << flops * iters / blocked_sec * 1e-9 << "\n";
+    if (run_golden)
+      std::cout << "  speedup=" << golden_sec / blocked_sec << "\n";
+    std::cout << "  checked_rows=" << rows.size() << "\n";
+    std::cout << "  max_abs_err=" << max_abs_err << "\n";
+    std::cout << "  max_rel_err=" << max_rel_err << "\n";
+  }
+  const bool ok = !run_blocked || (max_rel_err <= tol);
   std::cout << "STATUS=" << (ok ? "OK" : "FAILED") << "\n";
   return ok ? 0 : 1;
 }
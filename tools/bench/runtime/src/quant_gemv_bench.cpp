@@ -0,0 +1,199 @@
+#include <gcore/rt/ref/cpu_gemm.hpp>
+
+#include <algorithm>
+#include <chrono>
+#include <cmath>
+#include <cstdint>
+#include <iomanip>
+#include <iostream>
+#include <string>
+#include <vector>
+
+using gcore::rt::ref::CpuGemm;
+using gcore::rt::ref::CpuReference;
+using gcore::rt::ref::CpuThreadPool;
+using gcore::rt::ref::GemmInput;
+using gcore::rt::ref::GemmMode;
+
+static int parse_arg_int(int argc, char **argv, const std::string &key,
+                         int def) {
+  for (int i = 1; i + 1 < argc; i++) {
+    if (argv[i] == key)
+      return std::stoi(argv[i + 1]);
+  }
+  return def;
+}
+
+static float parse_arg_float(int argc, char **argv, const std::string &key,
+                             float def) {
+  for (int i = 1; i + 1 < argc; i++) {
+    if (argv[i] == key)
+      return std::stof(argv[i + 1]);
+  }
+  return def;
+}
+
+// Same quantization as load_tensor_int8 / load_tensor_int4: one scale per
+// group of 32 consecutive elements, scale = max|x| / qmax
+static std::vector<float> group_scales(const std::vector<float> &w, int qmax) {
+  std::vector<float> s((w.size() + 31) / 32);
+  for (size_t g = 0; g < s.size(); g++) {
+    float m = 0.0f;
+    for (size_t i = g * 32; i < std::min(w.size(), (g + 1) * 32); i++)
+      m = std::max(m, std::abs(w[i]));
+    s[g] = m > 0.0f ? m / static_cast<float>(qmax) : 1.0f;
+  }
+  return s;
+}
+
+template <typename Fn> static double time_iters(int iters, Fn &&fn) {
+  auto t0 = std::chrono::steady_clock::now();
+  for (int it = 0; it < iters; it++)
+    fn();
+  auto t1 = std::chrono::steady_clock::now();
+  return std::chrono::duration<double>(t1 - t0).count();
+}
+
+static double max_rel_diff(const std::vector<float> &a,
+                           const std::vector<float> &b, size_t n) {
+  double diff = 0.0, ref = 0.0;
+  for (size_t i = 0; i < n; i++) {
+    diff = std::max(diff, std::abs(static_cast<double>(a[i]) - b[i]));
+    ref = std::max(ref, std::abs(static_cast<double>(b[i])));
+  }
+  return diff / std::max(1.0, ref);
+}
+
+int main(int argc, char **argv) {
+  // Defaults: one decode row through a Llama-7B sized projection
+  const int m = std::max(1, parse_arg_int(argc, argv, "--m", 1));
+  const int n = parse_arg_int(argc, argv, "--n", 4096);
+  const int k = parse_arg_int(argc, argv, "--k", 4096);
+  const int iters = std::max(1, parse_arg_int(argc, argv, "--iters", 10));
+  const int threads = parse_arg_int(argc, argv, "--threads", 0);
+  // Golden (double accumulate) only on the first --check-rows rows of A
+  const int check_rows =
+      std::clamp(parse_arg_int(argc, argv, "--check-rows", 1), 1, m);
+  // INT4 per-head scales (as for attn_q/k/v); 0 disables them
+  const int head_dim = parse_arg_int(argc, argv, "--head-dim", 128);
+  const float tol = parse_arg_float(argc, argv, "--tol", 1e-5f);
+
+  if (n <= 0 || k <= 0 || k % 2 != 0) {
+    std::cerr << "--n must be > 0 and --k even and > 0\n";
+    return 2;
+  }
+
+  const size_t nk = static_cast<size_t>(n) * k;
+  std::vector<float> a(static_cast<size_t>(m) * k), w(nk);
+  for (size_t i = 0; i < a.size(); i++)
+    a[i] = static_cast<float>(static_cast<int>(i % 251) - 125) * 0.01f;
+  for (size_t i = 0; i < nk; i++)
+    w[i] = static_cast<float>(static_cast<int>(i * 7 % 197) - 98) * 0.002f;
+
+  std::vector<uint16_t> w_f16(nk);
+  for (size_t i = 0; i < nk; i++)
+    w_f16[i] = CpuReference::float_to_half(w[i]);
+
+  const auto s8 = group_scales(w, 127);
+  std::vector<int8_t> w_i8(nk);
+  for (size_t i = 0; i < nk; i++)
+    w_i8[i] = static_cast<int8_t>(std::round(w[i] / s8[i / 32]));
+
+  const auto s4 = group_scales(w, 7);
+  std::vector<uint8_t> w_i4(nk / 2, 0);
+  for (size_t i = 0; i < nk; i++) {
+    const int q = std::clamp(static_cast<int>(std::round(w[i] / s4[i / 32])),
+                             -8, 7);
+    w_i4[i / 2] |= static_cast<uint8_t>((q & 0x0F) << ((i & 1) * 4));
+  }
+  std::vector<float> h4;
+  if (head_dim > 0) {
+    h4.resize((n + head_dim - 1) / head_dim);
+    for (size_t h = 0; h < h4.size(); h++)
+      h4[h] = 1.0f + 0.125f * static_cast<float>(h % 4);
+  }
+  const float *h4p = h4.empty() ? nullptr : h4.data();
+
+  struct Result {
+    const char *name;
+    double bytes, sec, err;
+  };
+  std::vector<Result> results;
+  const size_t out = static_cast<size_t>(m) * n;
+  const size_t checked = static_cast<size_t>(check_rows) * n;
+  std::vector<float> c(out), c_gold(checked);
+
+  auto run = [&](const char *name, double bytes, auto &&fast, auto &&golden) {
+    fast(); // warmup
+    const double sec = time_iters(iters, fast);
+    golden();
+    results.push_back({name, bytes, sec, max_rel_diff(c, c_gold, checked)});
+  };
+
+  std::vector<float> a_gold(a.begin(), a.begin() + static_cast<size_t>(check_rows) * k);
+  std::vector<uint16_t> a_h(a_gold.size());
+  for (size_t i = 0; i < a_h.size(); i++)
+    a_h[i] = CpuReference::float_to_half(a_gold[i]);
+  run("fp16", 2.0 * nk,
+      [&] {
+        CpuGemm::linear(a.data(), w_f16.data(), GemmInput::F16, c.data(), m, n,
+                        k, threads);
+      },
+      [&] {
+        // golden fp16 GEMM takes B as [K][N]: one row of W^T per output
+        for (int i = 0; i < check_rows; i++)
+          for (int j = 0; j < n; j++) {
+            double acc = 0.0;
+            for (int p = 0; p < k; p++)
+              acc += static_cast<double>(a_gold[static_cast<size_t>(i) * k + p]) *
+                     CpuReference::half_to_float(w_f16[static_cast<size_t>(j) * k + p]);
+            c_gold[static_cast<size_t>(i) * n + j] = static_cast<float>(acc);
+          }
+      });
+  run("int8", static_cast<double>(nk) + 4.0 * s8.size(),
+      [&] {
+        CpuGemm::gemm_int8(a.data(), w_i8.data(), s8.data(), c.data(), m, n, k,
+                           32, GemmMode::Blocked, threads);
+      },
+      [&] {
+        CpuGemm::gemm_int8(a.data(), w_i8.data(), s8.data(), c_gold.data(),
+                           check_rows, n, k, 32, GemmMode::Golden);
+      });
+  run("int4", 0.5 * nk + 4.0 * (s4.size() + h4.size()),
+      [&] {
+        CpuGemm::gemm_int4(a.data(), w_i4.data(), s4.data(), h4p, c.data(), m,
+                           n, k, 32, head_dim, GemmMode::Blocked, threads);
+      },
+      [&] {
+        CpuGemm::gemm_int4(a.data(), w_i4.data(), s4.data(), h4p,
+                           c_gold.data(), check_rows, n, k, 32, head_dim,
+                           GemmMode::Golden);
+      });
+
+  const double flops = 2.0 * m * n * k;
+  std::cout << "GRETA CORE Runtime Bench: quant_gemv_bench\n";
+  std::cout << "m=" << m << " n=" << n << " k=" << k << " iters=" << iters
+            << " threads="
+            << (threads > 0 ? threads
+                            : static_cast<int>(CpuThreadPool::instance().size()))
+            << " head_dim=" << head_dim << " check_rows=" << check_rows
+            << " tol=" << tol << "\n";
+  std::cout << std::fixed << std::setprecision(6);
+  std::cout << "RESULT quant_gemv_bench:\n";
+  bool ok = true;
+  for (const auto &r : results) {
+    const double per_iter = r.sec / iters;
+    std::cout << "  " << r.name << "_weight_bytes=" << static_cast<uint64_t>(r.bytes)
+              << "\n";
+    std::cout << "  " << r.name << "_ms=" << per_iter * 1e3 << "\n";
+    std::cout << "  " << r.name << "_weight_gbps=" << r.bytes / per_iter * 1e-9
+              << "\n";
+    std::cout << "  " << r.name << "_gflops=" << flops / per_iter * 1e-9 << "\n";
+    std::cout << "  " << r.name << "_speedup_vs_fp16=" << results[0].sec / r.sec
+              << "\n";
+    std::cout << "  " << r.name << "_max_rel_err=" << r.err << "\n";
+    ok &= r.err <= tol;
+  }
+  std::cout << "STATUS=" << (ok ? "OK" : "FAILED") << "\n";
+  return ok ? 0 : 1;
+}
@@ -0,0 +1,198 @@
+#include "gcore/inference/sampler.hpp"
+
+#include <algorithm>
+#include <chrono>
+#include <cmath>
+#include <cstdint>
+#include <iomanip>
+#include <iostream>
+#include <random>
+#include <string>
+#include <vector>
+
+using gcore::inference::Sampler;
+using gcore::inference::SamplingParams;
+
+static int parse_arg_int(int argc, char **argv, const std::string &key,
+                         int def) {
+  for (int i = 1; i + 1 < argc; i++) {
+    if (argv[i] == key)
+      return std::stoi(argv[i + 1]);
+  }
+  return def;
+}
+
+static bool check(bool ok, const std::string &what) {
+  std::cout << (ok ? "PASS: " : "FAIL: ") << what << "\n";
+  return ok;
+}
+
+template <typename Fn> static double best_of(int iters, Fn &&fn) {
+  double best = 1e30;
+  for (int it = 0; it < iters; it++) {
+    auto t0 = std::chrono::steady_clock::now();
+    fn();
+    auto t1 = std::chrono::steady_clock::now();
+    best = std::min(best, std::chrono::duration<double>(t1 - t0).count());
+  }
+  return best;
+}
+
+// Camino anterior de Generator::sample: exp sobre todo el vocabulario en un
+// vector nuevo y random_device + mt19937 nuevos en cada token (sin top-k/p)
+static int32_t legacy_sample(const float *logits, size_t vocab_size,
+                             const SamplingParams &params) {
+  std::vector<float> probs(vocab_size);
+  float sum = 0.0f;
+  float max_logit = -INFINITY;
+  for (size_t i = 0; i < vocab_size; ++i) {
+    if (logits[i] > max_logit)
+      max_logit = logits[i];
+  }
+  for (size_t i = 0; i < vocab_size; ++i) {
+    float p = std::exp((logits[i] - max_logit) / params.temperature);
+    probs[i] = p;
+    sum += p;
+  }
+  std::random_device rd;
+  std::mt19937 gen(rd());
+  std::uniform_real_distribution<float> dis(0, sum);
+  float r = dis(gen);
+  float cumulative = 0.0f;
+  for (size_t i = 0; i < vocab_size; ++i) {
+    cumulative += probs[i];
+    if (r <= cumulative)
+      return static_cast<int32_t>(i);
+  }
+  return 0;
+}
+
+// Top 5 del diagnóstico anterior: ordena el vocabulario entero
+static int32_t legacy_top5(const float *logits, size_t vocab_size) {
+  std::vector<std::pair<float, int>> top;
+  for (int i = 0; i < (int)vocab_size; ++i)
+    top.push_back({logits[i], i});
+  std::sort(top.rbegin(), top.rend());
+  return top[4].second;
+}
+
+int main(int argc, char **argv) {
+  const int iters = parse_arg_int(argc, argv, "--iters", 3);
+  const int tokens = parse_arg_int(argc, argv, "--tokens", 200);
+  const int rows = parse_arg_int(argc, argv, "--rows", 8);
+  const int only_vocab = parse_arg_int(argc, argv, "--vocab", 0);
+  bool ok = true;
+
+  std::cout << "GRETA CORE: Token sampling bench\n";
+  std::cout << "tokens=" << tokens << " iters=" << iters << " rows=" << rows
+            << "\n";
+
+  std::vector<size_t> vocabs = {32000, 128256};
+  if (only_vocab > 0)
+    vocabs = {static_cast<size_t>(only_vocab)};
+
+  for (size_t vocab : vocabs) {
+    // Logits tipo LLM: cuerpo gaussiano y unos pocos tokens destacados
+    std::mt19937 rng(1234);
+    std::normal_distribution<float> body(0.0f, 2.5f);
+    std::vector<float> logits(static_cast<size_t>(rows) * vocab);
+    for (float &v : logits)
+      v = body(rng);
+    for (int r = 0; r < rows; r++)
+      for (int j = 0; j < 8; j++)
+        logits[r * vocab + (j * 7919 + r * 131) % vocab] = 14.0f - j;
+    const float *row0 = logits.data();
+
+    std::cout << "\nvocab=" << vocab << "\n";
+    std::cout << std::left << std::setw(28) << "path" << std::right
+              << std::setw(12) << "us/token" << std::setw(10) << "speedup"
+              << "\n";
+    volatile int32_t sink = 0;
+    auto per_token = [&](double sec) { return sec * 1e6 / tokens; };
+
+    SamplingParams legacy_p;
+    const double t_legacy = per_token(best_of(iters, [&] {
+      for (int t = 0; t < tokens; t++)
+        sink = legacy_sample(row0, vocab, legacy_p);
+    }));
+    auto row = [&](const std::string &name, double us, double base) {
+      std::cout << std::left << std::setw(28) << name << std::right
+                << std::fixed << std::setprecision(2) << std::setw(12) << us
+                << std::setw(9) << (us > 0 ? base / us : 0.0) << "x\n";
+    };
+    row("legacy (full softmax)", t_legacy, t_legacy);
+
+    struct Case {
+      const char *name;
+      SamplingParams p;
+    };
+    std::vector<Case> cases(5);
+    cases[0].name = "greedy";
+    cases[0].p.greedy = true;
+    cases[1].name = "top_k=50";
+    cases[2].name = "top_k=50 top_p=0.9";
+    cases[2].p.top_p = 0.9f;
+    cases[3].name = "top_p=0.9";
+    cases[3].p.top_k = 0;
+    cases[3].p.top_p = 0.9f;
+    cases[4].name = "full vocab (top_k=0)";
+    cases[4].p.top_k = 0;
+
+    Sampler sampler(42);
+    for (const Case &c : cases) {
+      const double us = per_token(best_of(iters, [&] {
+        for (int t = 0; t < tokens; t++)
+          sink = sampler.sample(row0, vocab, c.p);
+      }));
+      row(c.name, us, t_legacy);
+    }
+
+    // Lote de filas (una por secuencia) con el mismo Sampler
+    std::vector<int32_t> out(rows);
+    const int batches = std::max(1, tokens / rows);
+    const double us_batch =
+        best_of(iters,
+                [&] {
+                  for (int b = 0; b < batches; b++)
+                    sampler.sample_batch(logits.data(), rows, vocab,
+                                         cases[2].p, out.data());
+                }) *
+        1e6 / (static_cast<double>(batches) * rows);
+    row("batch x" + std::to_string(rows) + " top_k=50 top_p=0.9", us_batch,
+        t_legacy);
+
+    // Diagnóstico top 5: ordenación completa vs selección
+    std::vector<std::pair<float, int32_t>> top;
+    const double us_sort = per_token(best_of(iters, [&] {
+      for (int t = 0; t < tokens; t++)
+        sink = legacy_top5(row0, vocab);
+    }));
+    const double us_top = per_token(best_of(iters, [&] {
+      for (int t = 0; t < tokens; t++) {
+        Sampler::top_k(row0, vocab, 5, top);
+        sink = top[4].second;
+      }
+    }));
+    row("debug top5 (full sort)", us_sort, us_sort);
+    row("debug top5 (top_k)", us_top, us_sort);
+    (void)sink;
+
+    // Mismo top 5 que la ordenación y greedy == argmax
+    ok &= check(top[4].second == legacy_top5(row0, vocab),
+                "top_k(5) matches full sort, vocab=" + std::to_string(vocab));
+    ok &= check(sampler.sample(row0, vocab, cases[0].p) ==
+                    Sampler::argmax(row0, vocab),
+                "greedy == argmax, vocab=" + std::to_string(vocab));
+    // top_k=50 nunca sale de los 50 mejores
+    Sampler::top_k(row0, vocab, 50, top);
+    const float kth = top.back().first;
+    bool inside = true;
+    for (int t = 0; t < 1000; t++)
+      inside &= row0[sampler.sample(row0, vocab, cases[1].p)] >= kth;
+    ok &= check(inside, "top_k=50 stays in the top 50, vocab=" +
+                            std::to_string(vocab));
+  }
+
+  std::cout << "\nSTATUS=" << (ok ? "OK" : "FAIL") << "\n";
+  return ok ? 0 : 1;
+}
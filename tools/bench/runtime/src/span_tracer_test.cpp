@@ -0,0 +1,172 @@
+#include "gcore/rt/dispatch.hpp"
+#include "gcore/rt/executor.hpp"
+#include "gcore/rt/span_tracer.hpp"
+#include "gcore/rt/stream.hpp"
+#include "gcore/rt/telemetry.hpp"
+
+#include <cstdint>
+#include <cstdio>
+#include <fstream>
+#include <iostream>
+#include <sstream>
+#include <string>
+#include <thread>
+#include <vector>
+
+using gcore::rt::Dispatcher;
+using gcore::rt::Executor;
+using gcore::rt::SpanTracer;
+using gcore::rt::Stream;
+using gcore::rt::TraceScope;
+
+static bool check(bool ok, const std::string &what) {
+  std::cout << (ok ? "PASS: " : "FAIL: ") << what << "\n";
+  return ok;
+}
+
+static size_t count_of(const std::string &s, const std::string &needle) {
+  size_t n = 0;
+  for (size_t pos = s.find(needle); pos != std::string::npos;
+       pos = s.find(needle, pos + needle.size()))
+    n++;
+  return n;
+}
+
+// Brackets balance outside strings and every string is closed
+static bool json_balanced(const std::string &s) {
+  int depth = 0;
+  bool in_str = false;
+  for (size_t i = 0; i < s.size(); i++) {
+    const char c = s[i];
+    if (in_str) {
+      if (c == '\\')
+        i++;
+      else if (c == '"')
+        in_str = false;
+      continue;
+    }
+    if (c == '"')
+      in_str = true;
+    else if (c == '{' || c == '[')
+      depth++;
+    else if (c == '}' || c == ']')
+      if (--depth < 0)
+        return false;
+  }
+  return depth == 0 && !in_str;
+}
+
+// Disabled: nothing is recorded and a scope costs a load and a branch
+static bool test_disabled() {
+  SpanTracer &t = SpanTracer::instance();
+  constexpr int kIters = 10000000;
+  const uint64_t t0 = gcore::rt::now_ns();
+  for (int i = 0; i < kIters; i++) {
+    TraceScope span("disabled", "test");
+    t.instant("disabled.instant", "test");
+  }
+  const double ns = double(gcore::rt::now_ns() - t0) / kIters;
+  std::cout << "  disabled scope+instant: " << ns << " ns\n";
+  return !SpanTracer::enabled() && t.stats().events == 0 && ns < 20.0;
+}
+
+// B/E/i/X events, arguments and escaping in the JSON
+static bool test_events() {
+  SpanTracer &t = SpanTracer::instance();
+  t.start();
+  t.clear();
+  t.set_thread_name("main");
+  {
+    TraceScope outer("outer", "test", "quote\"d", 7);
+    t.begin("manual", "test");
+    t.instant("mark", "test");
+    t.end("manual", "test");
+  }
+  const std::string json = t.to_chrome_json();
+  bool ok = t.stats().events == 4 && json_balanced(json);
+  ok &= json.find("\"name\":\"outer\",\"cat\":\"test\",\"ph\":\"X\"") !=
+        std::string::npos;
+  ok &= json.find("\"args\":{\"detail\":\"quote\\\"d\",\"v\":7}") !=
+        std::string::npos;
+  ok &= count_of(json, "\"ph\":\"B\"") == 1 &&
+        count_of(json, "\"ph\":\"E\"") == 1;
+  ok &= json.find("\"ph\":\"i\",\"ts\":") != std::string::npos;
+  ok &= json.find("\"name\":\"thread_name\",\"ph\":\"M\"") !=
+        std::string::npos;
+  ok &= json.find("\"otherData\":{\"dropped\":0}") != std::string::npos;
+  return ok;
+}
+
+// A full ring keeps the newest events and counts what it overwrote
+static bool test_wrap() {
+  SpanTracer &t = SpanTracer::instance();
+  t.start(16);
+  t.clear();
+  const char *names[] = {"e0", "e1", "e2", "e3", "e4", "e5", "e6", "e7", "e8",
+                         "e9"};
+  for (int i = 0; i < 100; i++)
+    t.instant(names[i % 10], "wrap");
+  const auto s = t.stats();
+  const std::string json = t.to_chrome_json();
+  bool ok = s.events == 16 && s.dropped == 84 && json_balanced(json);
+  // El más antiguo se omite al exportar (puede estar reescribiéndose)
+  ok &= count_of(json, "\"cat\":\"wrap\"") == 15;
+  ok &= json.find("\"otherData\":{\"dropped\":85}") != std::string::npos;
+  ok &= json.find("\"name\":\"e9\"") != std::string::npos;
+  t.start();
+  t.clear();
+  return ok;
+}
+
+// Several threads, the Stream lane and Dispatcher labels; write() to disk
+static bool test_runtime(Executor &exec) {
+  SpanTracer &t = SpanTracer::instance();
+  t.clear();
+  constexpr int kThreads = 4, kPer = 1000;
+  std::vector<std::thread> ts;
+  for (int i = 0; i < kThreads; i++)
+    ts.emplace_back([] {
+      for (int j = 0; j < kPer; j++)
+        TraceScope span("thread.work", "test");
+    });
+  for (auto &th : ts)
+    th.join();
+
+  Dispatcher d;
+  Stream s(exec);
+  std::string label = "dispatch.";
+  label += "dynamic"; // no literal: the tracer must copy it
+  for (int i = 0; i < 100; i++)
+    d.submit(s, [] {}, label);
+  s.flush();
+  label.assign("overwritten");
+
+  const std::string path = "span_tracer_test.json";
+  std::string err;
+  bool ok = t.write(path, &err);
+  std::ifstream in(path);
+  std::stringstream ss;
+  ss << in.rdbuf();
+  const std::string json = ss.str();
+  std::remove(path.c_str());
+
+  ok &= json_balanced(json);
+  ok &= count_of(json, "\"name\":\"thread.work\"") == kThreads * kPer;
+  ok &= count_of(json, "\"name\":\"dispatch.dynamic\"") == 100;
+  ok &= json.find("\"name\":\"stream.lane\"") != std::string::npos;
+  ok &= t.stats().threads >= 1 + kThreads;
+  t.stop();
+  return ok;
+}
+
+int main() {
+  std::cout << "GRETA CORE: Span Tracer Test\n";
+  bool ok = true;
+  ok &= check(test_disabled(), "disabled tracer records nothing, ~free");
+  Executor exec(2);
+  ok &= check(test_events(), "B/E/i/X events, args, thread names");
+  ok &= check(test_wrap(), "ring wrap keeps newest, counts dropped");
+  ok &= check(test_runtime(exec), "threads, Stream lanes, Dispatcher labels");
+  std::cout << "\nSTATUS=" << (ok ? "OK" : "FAIL") << "\n";
+  return ok ? 0 : 1;
+}
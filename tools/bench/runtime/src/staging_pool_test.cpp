@@ -0,0 +1,277 @@
+#include "gcore/rt/staging_pool.hpp"
+
+#include <condition_variable>
+#include <cstdint>
+#include <cstdio>
+#include <cstring>
+#include <deque>
+#include <filesystem>
+#include <fstream>
+#include <iostream>
+#include <mutex>
+#include <string>
+#include <thread>
+#include <vector>
+
+#include <unistd.h>
+
+using gcore::rt::HugePages;
+using gcore::rt::StagingCopier;
+using gcore::rt::StagingOptions;
+using gcore::rt::StagingPool;
+
+static bool check(bool ok, const std::string &what) {
+  std::cout << (ok ? "PASS: " : "FAIL: ") << what << "\n";
+  return ok;
+}
+
+// CPU stand-in for the DMA engine: a worker thread memcpy's the chunks in
+// issue order, so fills and copies really overlap as they would on a GPU
+class ThreadCopier final : public StagingCopier {
+public:
+  explicit ThreadCopier(int slots)
+      : issued_(static_cast<size_t>(slots), 0),
+        done_(static_cast<size_t>(slots), 0) {
+    worker_ = std::thread([this] { run(); });
+  }
+  ~ThreadCopier() override {
+    {
+      std::lock_guard<std::mutex> lk(mu_);
+      stop_ = true;
+    }
+    cv_.notify_all();
+    worker_.join();
+  }
+
+  bool pin(void *, std::size_t, std::string *) override {
+    pins++;
+    return true;
+  }
+  void unpin(void *) override { unpins++; }
+
+  bool copy_async(void *dst, std::size_t offset, const void *src,
+                  std::size_t bytes, int slot, std::string *err) override {
+    if (fail_after >= 0 && copies >= fail_after) {
+      if (err)
+        *err = "ThreadCopier: injected failure";
+      return false;
+    }
+    copies++;
+    std::lock_guard<std::mutex> lk(mu_);
+    jobs_.push_back({static_cast<uint8_t *>(dst) + offset, src, bytes, slot,
+                     ++issued_[static_cast<size_t>(slot)]});
+    cv_.notify_all();
+    return true;
+  }
+
+  bool wait(int slot, std::string *) override {
+    std::unique_lock<std::mutex> lk(mu_);
+    const auto s = static_cast<size_t>(slot);
+    cv_.wait(lk, [&] { return done_[s] == issued_[s]; });
+    return true;
+  }
+
+  int pins = 0, unpins = 0, copies = 0;
+  int fail_after = -1; // fail copy_async once `copies` reaches it
+
+private:
+  struct Job {
+    void *dst;
+    const void *src;
+    std::size_t bytes;
+    int slot;
+    uint64_t seq;
+  };
+
+  void run() {
+    std::unique_lock<std::mutex> lk(mu_);
+    for (;;) {
+      cv_.wait(lk, [&] { return stop_ || !jobs_.empty(); });
+      if (jobs_.empty())
+        return;
+      Job j = jobs_.front();
+      jobs_.pop_front();
+      lk.unlock();
+      std::memcpy(j.dst, j.src, j.bytes);
+      lk.lock();
+      done_[static_cast<size_t>(j.slot)] = j.seq;
+      cv_.notify_all();
+    }
+  }
+
+  std::mutex mu_;
+  std::condition_variable cv_;
+  std::deque<Job> jobs_;
+  std::vector<uint64_t> issued_, done_;
+  bool stop_ = false;
+  std::thread worker_;
+};
+
+static std::vector<uint8_t> pattern(std::size_t n, uint32_t seed) {
+  std::vector<uint8_t> v(n);
+  uint32_t x = seed;
+  for (auto &b : v) {
+    x = x * 1664525u + 1013904223u;
+    b = static_cast<uint8_t>(x >> 24);
+  }
+  return v;
+}
+
+// numa_node_of_pci against a fake sysfs tree
+static bool test_numa_of_pci() {
+  namespace fs = std::filesystem;
+  const fs::path root =
+      fs::temp_directory_path() / ("gcore_sysfs_" + std::to_string(::getpid()));
+  const fs::path dev = root / "bus/pci/devices/0000:0a:00.0";
+  fs::create_directories(dev);
+  std::ofstream(dev / "numa_node") << "1\n";
+  const fs::path dev2 = root / "bus/pci/devices/0000:04:00.0";
+  fs::create_directories(dev2);
+  std::ofstream(dev2 / "numa_node") << "-1\n";
+
+  // hipDeviceGetPCIBusId may report upper-case hex; sysfs is lower-case
+  bool ok = gcore::rt::numa_node_of_pci("0000:0a:00.0", root.string()) == 1;
+  ok &= gcore::rt::numa_node_of_pci("0000:0A:00.0", root.string()) == 1;
+  ok &= gcore::rt::numa_node_of_pci("0000:04:00.0", root.string()) == -1;
+  ok &= gcore::rt::numa_node_of_pci("0000:05:00.0", root.string()) == -1;
+  fs::remove_all(root);
+  return ok;
+}
+
+// Multi-chunk upload (last chunk partial): bytes and stats must match
+static bool test_upload(HugePages hp, const char *what) {
+  StagingOptions opt;
+  opt.chunk_bytes = 1 << 20;
+  opt.chunks = 2;
+  opt.huge_pages = hp;
+  ThreadCopier copier(opt.chunks);
+  bool ok = true;
+  {
+    StagingPool pool(opt, &copier);
+    std::string err;
+    if (!pool.init(&err)) {
+      std::cout << "  init: " << err << "\n";
+      return false;
+    }
+    const auto &pl = pool.placement();
+    std::cout << "  " << what << ": huge_pages=" << static_cast<int>(pl.huge_pages)
+              << " numa_observed=" << pl.numa_observed
+              << (pl.notes.empty() ? "" : " notes=" + pl.notes) << "\n";
+
+    const std::size_t n = (std::size_t{5} << 20) + 12345;
+    const auto src = pattern(n, 7);
+    std::vector<uint8_t> dst(n, 0);
+    ok &= pool.upload(dst.data(), src.data(), n, &err);
+    ok &= dst == src;
+
+    const auto st = pool.stats();
+    ok &= st.uploads == 1 && st.bytes == n && st.chunks_filled == 6;
+    ok &= copier.pins == opt.chunks && copier.copies == 6;
+    // Explicit may fall back to THP, never to unpinned memory
+    ok &= pl.pinned;
+    ok &= pl.huge_pages != HugePages::Explicit || hp == HugePages::Explicit;
+  }
+  ok &= copier.unpins == opt.chunks;
+  return ok;
+}
+
+// Fill callback: the producer writes straight into the pinned chunk
+static bool test_fill() {
+  StagingOptions opt;
+  opt.chunk_bytes = 256 << 10;
+  opt.chunks = 3;
+  opt.huge_pages = HugePages::Off;
+  ThreadCopier copier(opt.chunks);
+  StagingPool pool(opt, &copier);
+  std::string err;
+  if (!pool.init(&err))
+    return false;
+
+  const std::size_t count = (1 << 20) / sizeof(float) + 17;
+  std::vector<float> dst(count, 0.0f);
+  bool ok = pool.upload(
+      dst.data(), count * sizeof(float),
+      [](void *chunk, std::size_t offset, std::size_t bytes) {
+        auto *f = static_cast<float *>(chunk);
+        const std::size_t first = offset / sizeof(float);
+        for (std::size_t i = 0; i < bytes / sizeof(float); i++)
+          f[i] = static_cast<float>(first + i) * 0.5f;
+        return true;
+      },
+      &err);
+  for (std::size_t i = 0; ok && i < count; i++)
+    ok &= dst[i] == static_cast<float>(i) * 0.5f;
+
+  // A failing producer aborts the upload without counting it
+  ok &= !pool.upload(
+      dst.data(), 4096, [](void *, std::size_t, std::size_t) { return false; },
+      &err);
+  ok &= !err.empty() && pool.stats().uploads == 1;
+  return ok;
+}
+
+// NUMA placement is best-effort: node 0 exists on every Linux box, the
+// pool must come up and the data must land whatever mbind answered
+static bool test_numa_placement() {
+  StagingOptions opt;
+  opt.chunk_bytes = 1 << 20;
+  opt.numa_node = 0;
+  ThreadCopier copier(opt.chunks);
+  StagingPool pool(opt, &copier);
+  std::string err;
+  if (!pool.init(&err))
+    return false;
+  const auto &pl = pool.placement();
+  std::cout << "  numa: node=" << pl.numa_node
+            << " observed=" << pl.numa_observed
+            << (pl.notes.empty() ? "" : " notes=" + pl.notes) << "\n";
+  const auto src = pattern(3 << 20, 11);
+  std::vector<uint8_t> dst(src.size(), 0);
+  bool ok = pool.upload(dst.data(), src.data(), src.size(), &err);
+  ok &= dst == src;
+  ok &= pl.numa_node == 0 || pl.numa_node == -1;
+  ok &= pl.numa_node != 0 || pl.numa_observed == -1 || pl.numa_observed == 0;
+  return ok;
+}
+
+// Copier errors surface from upload(); the pool stays usable
+static bool test_copier_failure() {
+  StagingOptions opt;
+  opt.chunk_bytes = 64 << 10;
+  opt.huge_pages = HugePages::Off;
+  ThreadCopier copier(opt.chunks);
+  StagingPool pool(opt, &copier);
+  std::string err;
+  if (!pool.init(&err))
+    return false;
+
+  const auto src = pattern(256 << 10, 3);
+  std::vector<uint8_t> dst(src.size(), 0);
+  copier.fail_after = 2;
+  bool ok = !pool.upload(dst.data(), src.data(), src.size(), &err);
+  ok &= err.find("injected") != std::string::npos;
+
+  copier.fail_after = -1;
+  err.clear();
+  ok &= pool.upload(dst.data(), src.data(), src.size(), &err);
+  ok &= dst == src && pool.stats().uploads == 1;
+
+  StagingPool no_copier(opt);
+  ok &= !no_copier.init(&err);
+  return ok;
+}
+
+int main() {
+  std::cout << "GRETA CORE: Staging Pool Test\n";
+  bool ok = true;
+  ok &= check(test_numa_of_pci(), "numa_node_of_pci reads sysfs");
+  ok &= check(test_upload(HugePages::Transparent, "thp"),
+              "multi-chunk upload (THP)");
+  ok &= check(test_upload(HugePages::Explicit, "explicit"),
+              "multi-chunk upload (MAP_HUGETLB or fallback)");
+  ok &= check(test_fill(), "fill callback upload");
+  ok &= check(test_numa_placement(), "NUMA placement best-effort");
+  ok &= check(test_copier_failure(), "copier failure propagates");
+  std::cout << "\nSTATUS=" << (ok ? "OK" : "FAIL") << "\n";
+  return ok ? 0 : 1;
+}
@@ -0,0 +1,197 @@
+#include "gcore/rt/dispatch.hpp"
+#include "gcore/rt/executor.hpp"
+#include "gcore/rt/stream.hpp"
+#include "gcore/rt/task_graph.hpp"
+
+#include <atomic>
+#include <chrono>
+#include <iostream>
+#include <memory>
+#include <string>
+#include <thread>
+#include <vector>
+
+using gcore::rt::Dispatcher;
+using gcore::rt::Event;
+using gcore::rt::Executor;
+using gcore::rt::Stream;
+using gcore::rt::TaskGraph;
+
+static bool check(bool ok, const std::string &what) {
+  std::cout << (ok ? "PASS: " : "FAIL: ") << what << "\n";
+  return ok;
+}
+
+// Several producers, one stream each: every stream runs its tasks in
+// submission order and never two at once, while streams share the workers
+static bool test_ordering(Executor &exec) {
+  constexpr int kStreams = 4, kTasks = 20000;
+  std::vector<std::unique_ptr<Stream>> streams;
+  std::vector<int> last(kStreams, -1);
+  std::vector<std::atomic<int>> busy(kStreams);
+  std::atomic<int> errors{0};
+  for (int i = 0; i < kStreams; i++)
+    streams.push_back(std::make_unique<Stream>(exec));
+
+  std::vector<std::thread> producers;
+  for (int s = 0; s < kStreams; s++) {
+    producers.emplace_back([&, s] {
+      for (int i = 0; i < kTasks; i++) {
+        streams[s]->enqueue([&, s, i] {
+          if (busy[s].fetch_add(1) != 0 || last[s] != i - 1)
+            errors.fetch_add(1);
+          last[s] = i;
+          busy[s].fetch_sub(1);
+        });
+      }
+      streams[s]->flush();
+    });
+  }
+  for (auto &t : producers)
+    t.join();
+  bool ok = errors.load() == 0;
+  for (int s = 0; s < kStreams; s++)
+    ok &= last[s] == kTasks - 1;
+  return ok;
+}
+
+// Events: record/wait, elapsed time and reuse of pooled event states
+static bool test_events(Executor &exec) {
+  Stream s(exec);
+  bool ok = true;
+  for (int round = 0; round < 1000; round++) {
+    Event a, b;
+    a.record(s);
+    s.enqueue([] {});
+    b.record(s);
+    Event copy = b;
+    copy.wait();
+    ok &= a.elapsed_ns(b) < 1000000000ull;
+  }
+  Event a, never;
+  a.record(s);
+  a.wait();
+  ok &= a.elapsed_ns(never) == 0 && a.elapsed_ns(a) == 0;
+  return ok;
+}
+
+// A task that blocks on another stream must not starve a 1-worker pool:
+// waits inside a worker keep running other jobs
+static bool test_nested_wait() {
+  Executor single(1);
+  Stream a(single), b(single);
+  Event ready;
+  std::atomic<bool> b_ran{false};
+  a.enqueue([&] { ready.wait(); });
+  b.enqueue([&] { b_ran = true; }, ready);
+  a.flush();
+  return b_ran.load();
+}
+
+// wait_event parks the lane instead of a worker: with a single worker the
+// waiting stream must not block the stream that signals the event, and the
+// waiting stream keeps its order afterwards
+static bool test_wait_event() {
+  Executor single(1);
+  Stream a(single), b(single);
+  bool ok = true;
+  for (int round = 0; round < 200; round++) {
+    Event ready;
+    std::vector<int> order;
+    b.wait_event(ready);
+    b.enqueue([&] { order.push_back(2); });
+    b.enqueue([&] { order.push_back(3); });
+    a.enqueue([&] { order.push_back(1); }, ready);
+    b.flush();
+    ok &= order == std::vector<int>({1, 2, 3});
+  }
+  Event done; // ya completo: no aparca
+  done.signal();
+  std::atomic<int> ran{0};
+  b.wait_event(done);
+  b.enqueue([&] { ran++; });
+  b.flush();
+  return ok && ran.load() == 1;
+}
+
+// Diamond DAG plus independent sleepers: dependencies respected, the
+// sleepers overlap, and an invalid dependency is rejected before launch
+static bool test_task_graph(Executor &exec) {
+  Dispatcher disp;
+  bool ok = true;
+  for (int round = 0; round < 100; round++) {
+    TaskGraph g(disp, exec);
+    std::atomic<int> stage{0};
+    std::atomic<int> errors{0};
+    auto root = g.add([&] { stage = 1; }, {}, "read");
+    auto l = g.add([&] { errors += stage.load() < 1; }, {root}, "dequant_l");
+    auto r = g.add([&] { errors += stage.load() < 1; }, {root}, "dequant_r");
+    g.add([&] { errors += stage.exchange(2) != 1; }, {l, r}, "upload");
+    std::string err;
+    ok &= g.launch(&err) && !g.launch(&err);
+    g.wait();
+    ok &= errors.load() == 0 && stage.load() == 2;
+  }
+
+  TaskGraph g(disp, exec);
+  auto t0 = std::chrono::steady_clock::now();
+  std::vector<TaskGraph::TaskId> leaves;
+  for (int i = 0; i < 4; i++)
+    leaves.push_back(g.add(
+        [] { std::this_thread::sleep_for(std::chrono::milliseconds(20)); }));
+  g.add([] {}, leaves, "join");
+  ok &= g.launch();
+  g.wait();
+  const double ms = std::chrono::duration<double, std::milli>(
+                        std::chrono::steady_clock::now() - t0)
+                        .count();
+  ok &= ms < 70.0; // en serie serían 80 ms
+
+  TaskGraph bad(disp, exec);
+  bad.add([] {}, {1});
+  std::string err;
+  ok &= !bad.launch(&err) && !err.empty();
+  return ok;
+}
+
+static bool test_dispatcher(Executor &exec) {
+  Stream s1(exec), s2(exec);
+  Dispatcher disp;
+  std::atomic<int> sum{0};
+  Event e1, e2;
+  for (int i = 1; i <= 100; i++) {
+    e1 = disp.submit(s1, [&, i] { sum += i; });
+    e2 = disp.submit(s2, [&, i] { sum += i; });
+  }
+  e1.wait();
+  e2.wait();
+  const auto st = disp.stats();
+  return sum.load() == 2 * 5050 && st.submits == 200 && st.completed == 200;
+}
+
+static bool test_raw_jobs(Executor &exec) {
+  std::atomic<int> count{0};
+  for (int i = 0; i < 1000; i++)
+    exec.submit([&] { count++; });
+  while (count.load() < 1000)
+    std::this_thread::yield();
+  return count.load() == 1000 && exec.stats().executed >= 1000;
+}
+
+int main() {
+  std::cout << "GRETA CORE: Stream Executor Test\n";
+  bool ok = true;
+  Executor exec(4);
+
+  ok &= check(test_ordering(exec), "per-stream order across 4 producers");
+  ok &= check(test_events(exec), "event record/wait/elapsed with pooling");
+  ok &= check(test_nested_wait(), "nested wait on a 1-worker executor");
+  ok &= check(test_wait_event(), "wait_event parks the lane, not a worker");
+  ok &= check(test_dispatcher(exec), "dispatcher events and stats");
+  ok &= check(test_task_graph(exec), "task graph deps, overlap, validation");
+  ok &= check(test_raw_jobs(exec), "unordered executor jobs");
+  ok &= check(test_ordering(Executor::instance()), "default executor order");
+
+  std::cout << "\nSTATUS=" << (ok ? "OK" : "FAIL") << "\n";
+  return ok ? 0 : 1;
+}
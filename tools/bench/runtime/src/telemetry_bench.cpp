@@ -6,6 +6,7 @@
 #include <iomanip>
 #include <iostream>
 #include <string>
+#include <thread>
 #include <vector>
 
 static int argi(int argc, char **argv, const char *key, int def) {
@@ -16,11 +17,33 @@ static int argi(int argc, char **argv, const char *key, int def) {
   return def;
 }
 
+// Wall ns per Histogram::record (all threads) with `threads` threads
+// recording into one histogram
+static double record_ns(gcore::rt::Histogram &h, int iters, int threads) {
+  auto body = [&h, iters](uint64_t seed) {
+    uint64_t x = seed;
+    for (int i = 0; i < iters; i++) {
+      x = x * 6364136223846793005ull + 1442695040888963407ull;
+      h.record((x >> 40) & 0xFFFFF); // 0 .. ~1 ms
+    }
+  };
+  auto t0 = std::chrono::steady_clock::now();
+  std::vector<std::thread> pool;
+  for (int t = 1; t < threads; t++)
+    pool.emplace_back(body, static_cast<uint64_t>(t));
+  body(0);
+  for (auto &t : pool)
+    t.join();
+  std::chrono::duration<double> dt = std::chrono::steady_clock::now() - t0;
+  return dt.count() * 1e9 / (static_cast<double>(iters) * threads);
+}
+
 int main(int argc, char **argv) {
   const int iters = argi(argc, argv, "--iters", 2000000);
+  const int threads = std::max(1, argi(argc, argv, "--threads", 4));
 
   std::cout << "GRETA CORE Runtime Bench: telemetry_bench\n";
-  std::cout << "iters=" << iters << "\n";
+  std::cout << "iters=" << iters << " threads=" << threads << "\n";
 
   gcore::rt::Counter c("timer_ns");
 
@@ -62,5 +85,21 @@ int main(int argc, char **argv) {
   std::cout << "COUNTER snapshot:\n";
   std::cout << "  " << c.name() << "=" << c.value() << "\n";
 
+  // Histogram: record cost alone and with contention on the same buckets
+  gcore::rt::Histogram h("record_ns");
+  record_ns(h, iters / 10, 1); // warmup
+  h.reset();
+  const double ns_1 = record_ns(h, iters, 1);
+  const double ns_t = record_ns(h, iters, threads);
+  const auto snap = h.snapshot();
+  std::cout << "RESULT histogram_record:\n";
+  std::cout << "  ns_per_record_1t=" << ns_1 << "\n";
+  std::cout << "  ns_per_record_" << threads << "t=" << ns_t << "\n";
+  std::cout << "HISTOGRAM snapshot:\n";
+  std::cout << "  count=" << snap.count << " p50=" << snap.percentile(50)
+            << " p99=" << snap.percentile(99)
+            << " p999=" << snap.percentile(99.9) << " max=" << snap.max
+            << "\n";
+
   return 0;
 }
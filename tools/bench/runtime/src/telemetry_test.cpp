@@ -0,0 +1,146 @@
+#include "gcore/rt/dispatch.hpp"
+#include "gcore/rt/executor.hpp"
+#include "gcore/rt/stream.hpp"
+#include "gcore/rt/telemetry.hpp"
+
+#include <cstdint>
+#include <iostream>
+#include <string>
+#include <thread>
+#include <vector>
+
+using gcore::rt::Dispatcher;
+using gcore::rt::Executor;
+using gcore::rt::Histogram;
+using gcore::rt::MetricsRegistry;
+using gcore::rt::Stream;
+
+static bool check(bool ok, const std::string &what) {
+  std::cout << (ok ? "PASS: " : "FAIL: ") << what << "\n";
+  return ok;
+}
+
+// Buckets tile the whole uint64 range without gaps, each <= 6.25% wide
+static bool test_buckets() {
+  bool ok = Histogram::bucket_lower(0) == 0;
+  for (int b = 0; b + 1 < Histogram::kBuckets; b++) {
+    ok &= Histogram::bucket_upper(b) + 1 == Histogram::bucket_lower(b + 1);
+    const uint64_t lo = Histogram::bucket_lower(b);
+    const uint64_t width = Histogram::bucket_upper(b) - lo + 1;
+    ok &= lo < Histogram::kSub || width * Histogram::kSub <= lo;
+  }
+  ok &= Histogram::bucket_upper(Histogram::kBuckets - 1) == UINT64_MAX;
+  for (uint64_t v : {uint64_t{0}, uint64_t{15}, uint64_t{16}, uint64_t{17},
+                     uint64_t{1000}, uint64_t{123456789}, UINT64_MAX}) {
+    const int b = Histogram::bucket_of(v);
+    ok &= Histogram::bucket_lower(b) <= v && v <= Histogram::bucket_upper(b);
+  }
+  return ok;
+}
+
+// Percentiles of 1..100000 within the bucket resolution
+static bool test_percentiles() {
+  Histogram h("uniform");
+  for (uint64_t v = 1; v <= 100000; v++)
+    h.record(v);
+  const auto s = h.snapshot();
+  auto near = [](uint64_t got, double want) {
+    return got >= want && got <= want * 1.0625 + 1;
+  };
+  bool ok = s.count == 100000 && s.min == 1 && s.max == 100000;
+  ok &= s.sum == uint64_t{100000} * 100001 / 2;
+  ok &= near(s.percentile(50), 50000) && near(s.percentile(90), 90000);
+  ok &= near(s.percentile(99), 99000) && s.percentile(99.9) <= 100000;
+  ok &= s.percentile(100) == 100000 && s.percentile(0) == 1;
+  std::cout << "  p50=" << s.percentile(50) << " p90=" << s.percentile(90)
+            << " p99=" << s.percentile(99) << " p999=" << s.percentile(99.9)
+            << "\n";
+
+  h.reset();
+  ok &= h.snapshot().count == 0 && h.snapshot().percentile(50) == 0;
+  return ok;
+}
+
+// record() from several threads: no sample lost
+static bool test_concurrent() {
+  Histogram h("concurrent");
+  constexpr int kThreads = 4, kPer = 200000;
+  std::vector<std::thread> ts;
+  for (int t = 0; t < kThreads; t++)
+    ts.emplace_back([&, t] {
+      for (int i = 0; i < kPer; i++)
+        h.record(static_cast<uint64_t>(t * kPer + i));
+    });
+  for (auto &t : ts)
+    t.join();
+  const auto s = h.snapshot();
+  return s.count == uint64_t{kThreads} * kPer && s.min == 0 &&
+         s.max == uint64_t{kThreads} * kPer - 1;
+}
+
+// Registry lookups are stable; JSON and Prometheus carry every metric
+static bool test_registry_export() {
+  MetricsRegistry reg;
+  bool ok = &reg.counter("requests") == &reg.counter("requests");
+  ok &= &reg.histogram("step.ns") == &reg.histogram("step.ns");
+  reg.counter("requests").inc(3);
+  for (uint64_t v = 1; v <= 100; v++)
+    reg.histogram("step.ns").record(v * 1000);
+
+  const auto snap = reg.snapshot();
+  ok &= snap.counters.size() == 1 && snap.histograms.size() == 1;
+  ok &= snap.counters[0].second == 3 && snap.histograms[0].second.count == 100;
+
+  const std::string json = reg.to_json();
+  ok &= json.find("\"requests\":3") != std::string::npos;
+  ok &= json.find("\"step.ns\":{\"count\":100") != std::string::npos;
+  ok &= json.find("\"p999\":") != std::string::npos;
+
+  const std::string prom = reg.to_prometheus();
+  ok &= prom.find("# TYPE greta_requests counter\ngreta_requests 3\n") !=
+        std::string::npos;
+  ok &= prom.find("# TYPE greta_step_ns summary\n") != std::string::npos;
+  ok &= prom.find("greta_step_ns{quantile=\"0.99\"} ") != std::string::npos;
+  ok &= prom.find("greta_step_ns_count 100\n") != std::string::npos;
+
+  reg.reset();
+  ok &= reg.counter("requests").value() == 0;
+  return ok;
+}
+
+// Dispatcher records every task; a Stream with sample_shift 0 every task
+static bool test_runtime_hooks(Executor &exec) {
+  MetricsRegistry reg;
+  Dispatcher d(reg);
+  Stream s(exec);
+  s.set_latency_histogram(&reg.histogram("stream.task_ns"), 0);
+  constexpr int kTasks = 500;
+  for (int i = 0; i < kTasks; i++)
+    d.submit(s, [] {});
+  s.flush();
+  bool ok = reg.histogram("dispatch.task_ns").snapshot().count == kTasks;
+  ok &= reg.histogram("dispatch.latency_ns").snapshot().count == kTasks;
+  ok &= reg.histogram("stream.task_ns").snapshot().count == kTasks;
+  ok &= reg.histogram("dispatch.latency_ns").snapshot().min >=
+        reg.histogram("dispatch.task_ns").snapshot().min;
+
+  s.set_latency_histogram(nullptr);
+  for (int i = 0; i < 10; i++)
+    s.enqueue([] {});
+  s.flush();
+  ok &= reg.histogram("stream.task_ns").snapshot().count == kTasks;
+  return ok;
+}
+
+int main() {
+  std::cout << "GRETA CORE: Telemetry Test\n";
+  bool ok = true;
+  Executor exec(2);
+  ok &= check(test_buckets(), "log-linear buckets cover uint64, <= 6.25%");
+  ok &= check(test_percentiles(), "percentiles of a uniform distribution");
+  ok &= check(test_concurrent(), "concurrent record keeps every sample");
+  ok &= check(test_registry_export(), "registry snapshot, JSON, Prometheus");
+  ok &= check(test_runtime_hooks(exec), "Dispatcher/Stream latency hooks");
+  std::cout << "\nSTATUS=" << (ok ? "OK" : "FAIL") << "\n";
+  return ok ? 0 : 1;
+}
@@ -1,9 +1,10 @@
 #!/usr/bin/env python3
 import argparse
-import json
 from pathlib import Path
 from typing import Dict, Tuple
 
+from stage_trace_bin import load_stage_rows
+
 POINT_ORDER = [
     "x_in",
     "attn_out",
@@ -19,18 +20,8 @@ LAYER_ORDER = [0, 1, 2, 15, 31, 32, -1]
 
 
 def load_rows(path: Path):
-    rows = []
-    if not path.exists():
-        return rows
-    for line in path.read_text().splitlines():
-        line = line.strip()
-        if not line:
-            continue
-        try:
-            rows.append(json.loads(line))
-        except json.JSONDecodeError:
-            continue
-    return rows
+    # JSONL or binary (GRETA_TRACE_STAGE_FORMAT=bin), including rotated shards
+    return load_stage_rows(path)
 
 
 def sample_mae(a, b):
@@ -1,25 +1,16 @@
 #!/usr/bin/env python3
 import argparse
-import json
 from pathlib import Path
 from typing import Dict, Tuple, List
 
+from stage_trace_bin import load_stage_rows
+
 STAGES = ["q", "k", "v"]
 
 
 def load_rows(path: Path):
-    rows = []
-    if not path.exists():
-        return rows
-    for line in path.read_text().splitlines():
-        line = line.strip()
-        if not line:
-            continue
-        try:
-            rows.append(json.loads(line))
-        except json.JSONDecodeError:
-            continue
-    return rows
+    # JSONL or binary (GRETA_TRACE_STAGE_FORMAT=bin), including rotated shards
+    return load_stage_rows(path)
 
 
 def mae_max(a: List[float], b: List[float]):
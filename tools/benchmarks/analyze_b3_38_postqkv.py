@@ -1,9 +1,10 @@
 #!/usr/bin/env python3
 import argparse
-import json
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
+from stage_trace_bin import load_stage_rows
+
 ATTN_STAGES = ["q", "k", "v", "qk", "softmax", "pv", "attn_out"]
 POST_STAGES = [
     "x_after_attn",
@@ -18,18 +19,8 @@ STAGE_ORDER = ATTN_STAGES + POST_STAGES
 
 
 def load_rows(path: Path):
-    rows = []
-    if not path.exists():
-        return rows
-    for line in path.read_text().splitlines():
-        line = line.strip()
-        if not line:
-            continue
-        try:
-            rows.append(json.loads(line))
-        except json.JSONDecodeError:
-            continue
-    return rows
+    # JSONL or binary (GRETA_TRACE_STAGE_FORMAT=bin), including rotated shards
+    return load_stage_rows(path)
 
 
 def mae(a: List[float], b: List[float]) -> Optional[float]:
@@ -3,7 +3,8 @@
 B3.67 Equivalence Guardrail Analyzer
 
 Analiza comparaciones de hidden states entre prefill y decode para detectar drift.
-No requiere numpy - usa solo Python estándar.
+No requiere numpy - usa solo Python estándar. Si numpy está instalado, las métricas
+se calculan vectorizadas (--metrics-backend, default: auto).
 
 Features:
 - Completeness Guardrail: Detecta matrices incompletas (obligatorio si config.json existe)
@@ -15,7 +16,8 @@ Output:
 - summary.md: Reporte legible
 - summary.json: Datos estructurados para CI/automation
 
-P99 Computation: Exact method using sorted(diffs)[ceil(0.99*n)-1] (not streaming approximation)
+P99 Computation: Exact method using sorted(diffs)[int(0.99*n)-1] (not streaming approximation).
+The NumPy backend selects the same element with np.partition instead of a full sort.
 """
 
 import argparse
@@ -27,9 +29,67 @@ from collections import defaultdict
 from pathlib import Path
 import statistics
 import math
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timezone
 from typing import Union
 
+from diff_cache import DEFAULT_MAX_BYTES, DiffCache, default_cache_dir
+from logits_dump import iter_logits_entries, load_logits_entries
+from streaming_stats import BoundedTopK, LogLinearHistogram
+from trace_catalog import LazyPayload, TraceCatalog
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; stdlib path is the reference
+    np = None
+
+# Metrics backend: 'numpy' when available, else 'stdlib' (see --metrics-backend)
+METRICS_BACKEND = 'numpy' if np is not None else 'stdlib'
+
+
+# Logits diff mode (see --streaming / --p99-mode): None = in-memory,
+# 'exact' / 'approx' = row-by-row streaming with constant memory
+STREAMING_P99 = None
+
+# Bump when compute_logits_diff output changes; part of the diff cache key (B3.93)
+LOGITS_DIFF_METRIC_VERSION = 1
+
+# Content-addressed per-pair result cache (see --no-cache / --cache-dir)
+DIFF_CACHE = None
+
+
+def set_diff_cache(cache_config) -> None:
+    """Enable the diff cache with (cache_dir, max_bytes), or disable it with None."""
+    global DIFF_CACHE
+    if cache_config is None:
+        DIFF_CACHE = None
+    elif DIFF_CACHE is None or (str(DIFF_CACHE.cache_dir), DIFF_CACHE.max_bytes) != tuple(cache_config):
+        DIFF_CACHE = DiffCache(*cache_config)
+
+
+def diff_cache_config():
+    """Current cache settings in the form accepted by set_diff_cache."""
+    if DIFF_CACHE is None:
+        return None
+    return (str(DIFF_CACHE.cache_dir), DIFF_CACHE.max_bytes)
+
+
+def set_metrics_backend(backend: str) -> str:
+    """Select the metrics backend ('auto', 'numpy' or 'stdlib'); returns the active one."""
+    global METRICS_BACKEND
+    if backend == 'numpy' and np is None:
+        print("WARNING: NumPy not installed, falling back to stdlib metrics")
+        backend = 'stdlib'
+    elif backend == 'auto':
+        backend = 'numpy' if np is not None else 'stdlib'
+    METRICS_BACKEND = backend
+    return METRICS_BACKEND
+
+
+def p99_index(n: int) -> int:
+    """Index of the exact p99 element in an ascending order of n diffs."""
+    return max(0, min(int(n * 0.99) - 1, n - 1))
+
 
 def parse_trace_line(line):
     """Parse a single trace line (JSON or gzipped JSONL)."""
@@ -47,76 +107,37 @@ def load_traces(traces_dir: str) -> dict:
     Supports two formats:
     - B3.68 format: metadata.json + logits.jsonl.gz (preferred)
     - Legacy B3.66 format: config.json + *.jsonl.gz with hidden states
+    
+    Layout: kv_aligned_X/seed_Y/mode/. Indexed with TraceCatalog; config,
+    metadata and entries are loaded on first access.
     """
-    traces_dir = Path(traces_dir)
+    catalog = TraceCatalog(traces_dir)
     traces = defaultdict(lambda: defaultdict(dict))
     
-    for kv_aligned_dir in traces_dir.iterdir():
-        if not kv_aligned_dir.is_dir() or not kv_aligned_dir.name.startswith('kv_aligned_'):
-            continue
-        
-        kv_aligned = kv_aligned_dir.name.replace('kv_aligned_', '')
-        
-        for seed_dir in kv_aligned_dir.iterdir():
-            if not seed_dir.is_dir() or not seed_dir.name.startswith('seed_'):
-                continue
-            
-            seed = seed_dir.name.replace('seed_', '')
-            
-            for mode_dir in seed_dir.iterdir():
-                if not mode_dir.is_dir() or mode_dir.name not in ['prefill', 'decode']:
-                    continue
-                
-                mode = mode_dir.name
-                
-                # Try B3.68 format first (metadata.json)
-                metadata_path = mode_dir / 'metadata.json'
-                config_path = mode_dir / 'config.json'
-                
-                config = None
-                metadata = None
-                
-                if metadata_path.exists():
-                    # B3.68 format
-                    with open(metadata_path) as f:
-                        metadata = json.load(f)
-                    # Use metadata as config (it contains all the info we need)
-                    config = metadata
-                elif config_path.exists():
-                    # Legacy B3.66 format
-                    with open(config_path) as f:
-                        config = json.load(f)
-                
-                # Load trace entries from logits.jsonl.gz (B3.68) or *.jsonl.gz (legacy)
-                trace_entries = []
-                
-                # B3.68 format: logits.jsonl.gz
-                logits_path = mode_dir / 'logits.jsonl.gz'
-                if logits_path.exists():
-                    with gzip.open(logits_path, 'rt') as f:
-                        for line in f:
-                            entry = parse_trace_line(line)
-                            if entry:
-                                trace_entries.append(entry)
-                else:
-                    # Legacy: any *.jsonl.gz files
-                    for trace_file in mode_dir.glob('*.jsonl.gz'):
-                        with gzip.open(trace_file, 'rt') as f:
-                            for line in f:
-                                entry = parse_trace_line(line)
-                                if entry:
-                                    trace_entries.append(entry)
-                
-                traces[kv_aligned][seed][mode] = {
-                    'config': config,
-                    'metadata': metadata,  # B3.68 specific
-                    'entries': trace_entries,
-                    'logits_path': str(logits_path) if logits_path.exists() else None  # B3.69
-                }
+    for run in catalog.runs(layout=('kv_aligned', 'seed', 'mode')):
+        logits_path = run.logits_path()
+        traces[run.kv_aligned][run.seed][run.mode] = LazyPayload(
+            # B3.68 metadata.json doubles as config; legacy B3.66 has config.json
+            config=lambda run=run: run.read_json('metadata.json') if run.has('metadata.json') else run.read_json('config.json'),
+            metadata=lambda run=run: run.read_json('metadata.json'),  # B3.68 specific
+            entries=lambda run=run: _load_run_trace_entries(run),
+            logits_path=str(logits_path) if logits_path else None  # B3.69
+        )
     
     return traces
 
 
+def _load_run_trace_entries(run) -> list:
+    """Trace entries of a run: logits dump (B3.91/B3.68) or legacy *.jsonl.gz files."""
+    if run.logits_path() is not None:
+        return run.read_logits()
+    entries = []
+    for name in sorted(run.files):
+        if name.endswith('.jsonl.gz'):
+            entries.extend(run.read_jsonl_gz(name))
+    return entries
+
+
 def load_root_config(traces_dir: str) -> dict:
     """Load config.json from traces root directory if present."""
     config_path = Path(traces_dir) / 'config.json'
@@ -150,11 +171,17 @@ def extract_hidden_states(traces_dict: dict, layer: int = 32, point: str = None)
 
 def l2_norm(vec):
     """Compute L2 norm of a vector."""
+    if METRICS_BACKEND == 'numpy':
+        v = np.asarray(vec, dtype=np.float64)
+        return float(np.sqrt(np.dot(v, v)))
     return math.sqrt(sum(x * x for x in vec))
 
 
 def dot_product(vec1, vec2):
     """Compute dot product of two vectors."""
+    if METRICS_BACKEND == 'numpy':
+        return float(np.dot(np.asarray(vec1, dtype=np.float64),
+                            np.asarray(vec2, dtype=np.float64)))
     return sum(a * b for a, b in zip(vec1, vec2))
 
 
@@ -167,6 +194,46 @@ def cosine_similarity(vec1, vec2):
     return dot_product(vec1, vec2) / (norm1 * norm2)
 
 
+def _comparison_metrics_numpy(prefill_states: list, decode_states: list) -> dict:
+    """NumPy version of compute_comparison_metrics (same outputs, no per-element loops)."""
+    min_len = min(len(prefill_states), len(decode_states))
+    row_diffs = []
+    top1_matches = 0
+    cos_sims = []
+    
+    for i in range(min_len):
+        pf = np.asarray(prefill_states[i], dtype=np.float64)
+        dc = np.asarray(decode_states[i], dtype=np.float64)
+        
+        # Zero-pad the shorter vector, as the stdlib path does
+        max_len = max(pf.size, dc.size)
+        if pf.size < max_len:
+            pf = np.pad(pf, (0, max_len - pf.size))
+        if dc.size < max_len:
+            dc = np.pad(dc, (0, max_len - dc.size))
+        
+        row_diffs.append(np.abs(pf - dc))
+        if int(np.argmax(pf)) == int(np.argmax(dc)):
+            top1_matches += 1
+        
+        norm1 = float(np.sqrt(np.dot(pf, pf)))
+        norm2 = float(np.sqrt(np.dot(dc, dc)))
+        cos_sims.append(0.0 if norm1 == 0 or norm2 == 0 else float(np.dot(pf, dc)) / (norm1 * norm2))
+    
+    all_diffs = np.concatenate(row_diffs) if row_diffs else np.empty(0)
+    if all_diffs.size == 0:
+        return {'status': 'NO_MATCHING_DATA'}
+    
+    k = p99_index(all_diffs.size)
+    return {
+        'max_abs_diff': float(all_diffs.max()),
+        'p99_abs_diff': float(np.partition(all_diffs, k)[k]),
+        'top1_agreement': top1_matches / min_len,
+        'cos_sim_mean': statistics.mean(cos_sims),
+        'status': 'OK'
+    }
+
+
 def compute_comparison_metrics(prefill_states: list, decode_states: list) -> dict:
     """Compute comparison metrics between prefill and decode hidden states."""
     if not prefill_states or not decode_states:
@@ -178,6 +245,9 @@ def compute_comparison_metrics(prefill_states: list, decode_states: list) -> dic
             'status': 'MISSING_DATA'
         }
     
+    if METRICS_BACKEND == 'numpy':
+        return _comparison_metrics_numpy(prefill_states, decode_states)
+    
     max_diffs = []
     all_diffs = []
     top1_matches = 0
@@ -209,9 +279,7 @@ def compute_comparison_metrics(prefill_states: list, decode_states: list) -> dic
     
     if all_diffs:
         sorted_diffs = sorted(all_diffs)
-        p99_idx = int(len(sorted_diffs) * 0.99) - 1
-        p99_idx = max(0, min(p99_idx, len(sorted_diffs) - 1))
-        p99_diff = sorted_diffs[p99_idx]
+        p99_diff = sorted_diffs[p99_index(len(sorted_diffs))]
         
         metrics = {
             'max_abs_diff': float(max(max_diffs)) if max_diffs else None,
@@ -230,23 +298,44 @@ def compute_logits_diff(prefill_input: Union[str, list], decode_input: Union[str
     """Compare logits between prefill and decode.
     
     Args:
-        prefill_input: Path to logits.jsonl.gz OR list of entries
-        decode_input: Path to logits.jsonl.gz OR list of entries
+        prefill_input: Path to logits.bin / logits.jsonl.gz OR list of entries
+        decode_input: Path to logits.bin / logits.jsonl.gz OR list of entries
     
     Returns: dict with max_abs_diff, p99_abs_diff, top1_agreement, status
+    
+    For file inputs, OK results are served from / stored in DIFF_CACHE, keyed by
+    the content hash of both files and the metric version.
     """
+    if (DIFF_CACHE is None or isinstance(prefill_input, list) or isinstance(decode_input, list)
+            or not os.path.isfile(prefill_input) or not os.path.isfile(decode_input)):
+        return _compute_logits_diff_uncached(prefill_input, decode_input)
+    
+    key = DIFF_CACHE.make_key(
+        DIFF_CACHE.file_digest(prefill_input), DIFF_CACHE.file_digest(decode_input),
+        LOGITS_DIFF_METRIC_VERSION, STREAMING_P99 or 'inmemory')
+    metrics = DIFF_CACHE.get(key)
+    if metrics is None:
+        metrics = _compute_logits_diff_uncached(prefill_input, decode_input)
+        if metrics.get('status') == 'OK':
+            DIFF_CACHE.put(key, metrics)
+    return metrics
+
+
+def _compute_logits_diff_uncached(prefill_input: Union[str, list], decode_input: Union[str, list]) -> dict:
+    """compute_logits_diff without the result cache."""
+    if STREAMING_P99 and not isinstance(prefill_input, list) and not isinstance(decode_input, list):
+        return compute_logits_diff_streaming(prefill_input, decode_input, p99_mode=STREAMING_P99)
+    
+    use_numpy = METRICS_BACKEND == 'numpy'
+    
     def load_logits_file(path: str) -> list:
-        """Load logits entries from gzipped JSONL file."""
-        entries = []
+        """Load logits entries from logits.bin or gzipped JSONL file."""
         try:
-            with gzip.open(path, 'rt', encoding='utf-8') as f:
-                for line in f:
-                    line = line.strip()
-                    if line:
-                        entries.append(json.loads(line))
+            # NumPy backend keeps logits.bin rows as zero-copy views
+            return load_logits_entries(path, as_list=not use_numpy)
         except Exception as e:
             print(f"  Warning: Could not load logits from {path}: {e}")
-        return entries
+        return []
     
     # Load logits from inputs
     if isinstance(prefill_input, list):
@@ -267,6 +356,9 @@ def compute_logits_diff(prefill_input: Union[str, list], decode_input: Union[str
         return {'status': 'COUNT_MISMATCH', 'prefill_count': len(prefill_entries),
                 'decode_count': len(decode_entries)}
     
+    if use_numpy:
+        return _logits_diff_numpy(prefill_entries, decode_entries)
+    
     # Compare logits entry-by-entry
     all_diffs = []
     max_diffs = []
@@ -301,18 +393,206 @@ def compute_logits_diff(prefill_input: Union[str, list], decode_input: Union[str
     
     # Compute metrics
     sorted_diffs = sorted(all_diffs)
-    p99_idx = int(len(sorted_diffs) * 0.99) - 1
-    p99_idx = max(0, min(p99_idx, len(sorted_diffs) - 1))
     
     return {
         'max_abs_diff': max(max_diffs) if max_diffs else None,
-        'p99_abs_diff': sorted_diffs[p99_idx] if sorted_diffs else None,
+        'p99_abs_diff': sorted_diffs[p99_index(len(sorted_diffs))] if sorted_diffs else None,
         'top1_agreement': top1_matches / total if total > 0 else None,
         'entries_compared': total,
         'status': 'OK'
     }
 
 
+def _logits_diff_numpy(prefill_entries: list, decode_entries: list) -> dict:
+    """NumPy version of the compute_logits_diff row loop.
+    
+    Diffs are taken in float64 like the stdlib path, so max_abs_diff, p99_abs_diff
+    (np.partition on the same index) and top1_agreement (first argmax) are identical.
+    """
+    row_diffs = []
+    top1_matches = 0
+    total = 0
+    
+    for pf, dc in zip(prefill_entries, decode_entries):
+        pf_logits = np.asarray(pf.get('logits', []), dtype=np.float64)
+        dc_logits = np.asarray(dc.get('logits', []), dtype=np.float64)
+        
+        if not pf_logits.size or not dc_logits.size:
+            continue
+        
+        if pf_logits.size != dc_logits.size:
+            continue
+        
+        total += 1
+        row_diffs.append(np.abs(pf_logits - dc_logits))
+        if int(np.argmax(pf_logits)) == int(np.argmax(dc_logits)):
+            top1_matches += 1
+    
+    if total == 0:
+        return {'status': 'NO_VALID_ENTRIES'}
+    
+    all_diffs = np.concatenate(row_diffs)
+    k = p99_index(all_diffs.size)
+    
+    return {
+        'max_abs_diff': float(all_diffs.max()),
+        'p99_abs_diff': float(np.partition(all_diffs, k)[k]),
+        'top1_agreement': top1_matches / total,
+        'entries_compared': total,
+        'status': 'OK'
+    }
+
+
+def _iter_diff_rows(prefill_path: str, decode_path: str, stats: dict):
+    """Walk prefill/decode logits in lockstep, yielding (pf_row, dc_row) for valid pairs.
+    
+    Only one row per file is alive at a time. Fills stats with prefill_count,
+    decode_count and an 'error' message if a file cannot be read.
+    """
+    use_numpy = METRICS_BACKEND == 'numpy'
+    stats.update({'prefill_count': 0, 'decode_count': 0, 'error': None})
+    try:
+        pf_iter = iter_logits_entries(prefill_path, as_list=not use_numpy)
+        dc_iter = iter_logits_entries(decode_path, as_list=not use_numpy)
+        done = object()
+        while True:
+            pf = next(pf_iter, done)
+            dc = next(dc_iter, done)
+            if pf is done and dc is done:
+                return
+            if pf is not done:
+                stats['prefill_count'] += 1
+            if dc is not done:
+                stats['decode_count'] += 1
+            if pf is done or dc is done:
+                continue  # keep counting the longer file for COUNT_MISMATCH
+            
+            pf_logits = pf.get('logits', [])
+            dc_logits = dc.get('logits', [])
+            if use_numpy:
+                pf_logits = np.asarray(pf_logits, dtype=np.float64)
+                dc_logits = np.asarray(dc_logits, dtype=np.float64)
+            if not len(pf_logits) or not len(dc_logits) or len(pf_logits) != len(dc_logits):
+                continue
+            yield pf_logits, dc_logits
+    except Exception as e:
+        stats['error'] = str(e)
+
+
+def compute_logits_diff_streaming(prefill_path: str, decode_path: str, p99_mode: str = 'exact') -> dict:
+    """Constant-memory variant of compute_logits_diff over logits files.
+    
+    Rows are read in lockstep, one at a time. p99_mode:
+    - 'exact': second pass with a BoundedTopK of the largest n - p99_index(n) diffs;
+      same p99_abs_diff as the in-memory path, memory bounded by ~1% of diffs.
+    - 'approx': single pass, LogLinearHistogram upper-bound estimate (<= 1/64 rel. error).
+    """
+    use_numpy = METRICS_BACKEND == 'numpy'
+    io_stats = {}
+    hist = LogLinearHistogram() if p99_mode == 'approx' else None
+    max_diff = None
+    top1_matches = 0
+    total = 0
+    n_diffs = 0
+    
+    for pf_logits, dc_logits in _iter_diff_rows(prefill_path, decode_path, io_stats):
+        total += 1
+        if use_numpy:
+            diffs = np.abs(pf_logits - dc_logits)
+            row_max = float(diffs.max())
+            same_top1 = int(np.argmax(pf_logits)) == int(np.argmax(dc_logits))
+            n_diffs += int(diffs.size)
+        else:
+            diffs = [abs(p - d) for p, d in zip(pf_logits, dc_logits)]
+            row_max = max(diffs)
+            same_top1 = pf_logits.index(max(pf_logits)) == dc_logits.index(max(dc_logits))
+            n_diffs += len(diffs)
+        max_diff = row_max if max_diff is None else max(max_diff, row_max)
+        if same_top1:
+            top1_matches += 1
+        if hist is not None:
+            hist.add_many(diffs)
+    
+    if io_stats['error']:
+        print(f"  Warning: Could not stream logits ({prefill_path}, {decode_path}): {io_stats['error']}")
+    
+    if not io_stats['prefill_count'] or not io_stats['decode_count']:
+        return {'status': 'MISSING_LOGITS', 'prefill_count': io_stats['prefill_count'],
+                'decode_count': io_stats['decode_count']}
+    
+    if io_stats['prefill_count'] != io_stats['decode_count']:
+        return {'status': 'COUNT_MISMATCH', 'prefill_count': io_stats['prefill_count'],
+                'decode_count': io_stats['decode_count']}
+    
+    if total == 0:
+        return {'status': 'NO_VALID_ENTRIES'}
+    
+    k = p99_index(n_diffs)
+    if hist is not None:
+        p99_diff = hist.value_at_index(k)
+        p99_method = 'approx_loglinear'
+    else:
+        top = BoundedTopK(n_diffs - k)
+        for pf_logits, dc_logits in _iter_diff_rows(prefill_path, decode_path, io_stats):
+            if use_numpy:
+                top.push_many(np.abs(pf_logits - dc_logits))
+            else:
+                top.push_many([abs(p - d) for p, d in zip(pf_logits, dc_logits)])
+        p99_diff = top.min()
+        p99_method = 'exact'
+    
+    return {
+        'max_abs_diff': max_diff,
+        'p99_abs_diff': p99_diff,
+        'p99_method': p99_method,
+        'top1_agreement': top1_matches / total,
+        'entries_compared': total,
+        'status': 'OK'
+    }
+
+
+def _logits_diff_worker(task: tuple):
+    """Process-pool entry point: (prefill_path, decode_path, backend, streaming_p99, cache).
+    
+    Settings are passed explicitly so results do not depend on the start method.
+    Exceptions are returned, not raised, so one bad pair does not abort the map.
+    """
+    global STREAMING_P99
+    prefill_path, decode_path, backend, streaming_p99, cache_config = task
+    set_metrics_backend(backend)
+    set_diff_cache(cache_config)
+    STREAMING_P99 = streaming_p99
+    try:
+        return compute_logits_diff(prefill_path, decode_path)
+    except Exception as e:
+        return e
+
+
+def compute_logits_diff_many(path_pairs: list, jobs: int = 1) -> list:
+    """compute_logits_diff over [(prefill_path, decode_path), ...], in input order.
+    
+    jobs > 1 spreads pairs over a ProcessPoolExecutor with chunked scheduling;
+    ordering is preserved so reports are identical to the serial run. A pair
+    that raised yields the Exception object in its slot.
+    """
+    cache_config = diff_cache_config()
+    tasks = [(p, d, METRICS_BACKEND, STREAMING_P99, cache_config) for p, d in path_pairs]
+    if jobs <= 1 or len(tasks) <= 1:
+        return [_logits_diff_worker(t) for t in tasks]
+    
+    workers = min(jobs, len(tasks))
+    chunksize = max(1, len(tasks) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(_logits_diff_worker, tasks, chunksize=chunksize))
+
+
+def resolve_jobs(jobs: int) -> int:
+    """--jobs value to worker count (0 = all cores)."""
+    if jobs == 0:
+        return os.cpu_count() or 1
+    return max(1, jobs)
+
+
 # =============================================================================
 # B3.70-71-72 Sweep Mode Functions
 # =============================================================================
@@ -321,74 +601,34 @@ def load_traces_sweep(traces_dir: str) -> dict:
     """Load traces from B3.70-71-72 sweep directory structure.
     
     Structure: span_<N>/dtype_<dtype>/kv_aligned_<kv>/seed_<s>/<mode>/
-    Returns dict keyed by (span, dtype, kv_aligned, seed, mode)
+    Returns dict keyed by (span, dtype, kv_aligned, seed, mode); metadata,
+    perf and skip info are read lazily.
     """
-    traces_dir = Path(traces_dir)
+    catalog = TraceCatalog(traces_dir)
     traces = {}
     
-    for span_dir in traces_dir.iterdir():
-        if not span_dir.is_dir() or not span_dir.name.startswith('span_'):
+    for run in catalog.runs(layout=('span', 'dtype', 'kv_aligned', 'seed', 'mode')):
+        key = (run.span, run.dtype, run.kv_aligned, run.seed, run.mode)
+        
+        # Check for skip marker
+        if run.has('skip.json'):
+            traces[key] = LazyPayload(
+                status='SKIPPED',
+                skip_info=lambda run=run: run.read_json('skip.json'))
             continue
-        span = span_dir.name.replace('span_', '')
         
-        for dtype_dir in span_dir.iterdir():
-            if not dtype_dir.is_dir() or not dtype_dir.name.startswith('dtype_'):
-                continue
-            dtype = dtype_dir.name.replace('dtype_', '')
-            
-            for kv_dir in dtype_dir.iterdir():
-                if not kv_dir.is_dir() or not kv_dir.name.startswith('kv_aligned_'):
-                    continue
-                kv_aligned = kv_dir.name.replace('kv_aligned_', '')
-                
-                for seed_dir in kv_dir.iterdir():
-                    if not seed_dir.is_dir() or not seed_dir.name.startswith('seed_'):
-                        continue
-                    seed = seed_dir.name.replace('seed_', '')
-                    
-                    for mode_dir in seed_dir.iterdir():
-                        if not mode_dir.is_dir() or mode_dir.name not in ['prefill', 'decode']:
-                            continue
-                        mode = mode_dir.name
-                        
-                        key = (span, dtype, kv_aligned, seed, mode)
-                        
-                        # Check for skip marker
-                        skip_path = mode_dir / 'skip.json'
-                        if skip_path.exists():
-                            with open(skip_path) as f:
-                                traces[key] = {'status': 'SKIPPED', 'skip_info': json.load(f)}
-                            continue
-                        
-                        # Load metadata and logits path
-                        metadata_path = mode_dir / 'metadata.json'
-                        logits_path = mode_dir / 'logits.jsonl.gz'
-                        perf_path = mode_dir / 'perf.json'
-                        
-                        data = {
-                            'span': span,
-                            'dtype': dtype,
-                            'kv_aligned': kv_aligned,
-                            'seed': seed,
-                            'mode': mode,
-                            'metadata': None,
-                            'logits_path': str(logits_path) if logits_path.exists() else None,
-                            'perf': None,
-                            'status': 'OK'
-                        }
-                        
-                        if metadata_path.exists():
-                            with open(metadata_path) as f:
-                                data['metadata'] = json.load(f)
-                        
-                        if perf_path.exists():
-                            with open(perf_path) as f:
-                                data['perf'] = json.load(f)
-                        
-                        if not logits_path.exists():
-                            data['status'] = 'MISSING_LOGITS'
-                        
-                        traces[key] = data
+        logits_path = run.logits_path()
+        traces[key] = LazyPayload(
+            span=run.span,
+            dtype=run.dtype,
+            kv_aligned=run.kv_aligned,
+            seed=run.seed,
+            mode=run.mode,
+            metadata=lambda run=run: run.read_json('metadata.json'),
+            logits_path=str(logits_path) if logits_path else None,
+            perf=lambda run=run: run.read_json('perf.json'),
+            status='OK' if logits_path else 'MISSING_LOGITS'
+        )
     
     return traces
 
@@ -497,9 +737,11 @@ def aggregate_perf_summary(traces: dict) -> dict:
     return summary
 
 
-def run_sweep_analysis(traces_dir: str, output_path: str) -> int:
+def run_sweep_analysis(traces_dir: str, output_path: str, jobs: int = 1) -> int:
     """Run B3.70-71-72 sweep analysis.
     
+    jobs > 1 computes the pair logits diffs in parallel (see compute_logits_diff_many).
+    
     Returns exit code: 0 = PASS, 1 = FAIL
     """
     traces_dir = Path(traces_dir)
@@ -534,6 +776,16 @@ def run_sweep_analysis(traces_dir: str, output_path: str) -> int:
         
         pairs[pair_key][mode] = data
     
+    # Compute logits diffs for all complete pairs up front (parallel when jobs > 1)
+    diff_keys = [
+        pair_key for pair_key, modes in sorted(pairs.items())
+        if 'prefill' in modes and 'decode' in modes
+        and modes['prefill'].get('logits_path') and modes['decode'].get('logits_path')
+    ]
+    diff_metrics = dict(zip(diff_keys, compute_logits_diff_many(
+        [(pairs[k]['prefill']['logits_path'], pairs[k]['decode']['logits_path']) for k in diff_keys],
+        jobs)))
+    
     # Analyze each pair
     results = []
     warnings = []
@@ -562,7 +814,9 @@ def run_sweep_analysis(traces_dir: str, output_path: str) -> int:
             continue
         
         # Compute logits diff
-        metrics = compute_logits_diff(prefill_logits, decode_logits)
+        metrics = diff_metrics[pair_key]
+        if isinstance(metrics, Exception):
+            raise metrics
         
         # Determine verdict
         if int(kv) == 1:
@@ -805,67 +1059,18 @@ def load_traces_b3_73(traces_dir: str) -> dict:
     """Load traces for B3.73 with prompt_case dimension.
     
     Structure: kv_aligned_X/seed_Y/prompt_case/mode/{metadata.json,logits.jsonl.gz}
+    Payloads are read lazily.
     """
-    traces_dir = Path(traces_dir)
+    catalog = TraceCatalog(traces_dir)
     traces = defaultdict(lambda: defaultdict(lambda: defaultdict(dict)))
     
-    for kv_dir in traces_dir.iterdir():
-        if not kv_dir.is_dir() or not kv_dir.name.startswith('kv_aligned_'):
-            continue
-        
-        kv_aligned = kv_dir.name.replace('kv_aligned_', '')
-        
-        for seed_dir in kv_dir.iterdir():
-            if not seed_dir.is_dir() or not seed_dir.name.startswith('seed_'):
-                continue
-            
-            seed = seed_dir.name.replace('seed_', '')
-            
-            for prompt_dir in seed_dir.iterdir():
-                if not prompt_dir.is_dir():
-                    continue
-                
-                prompt_case = prompt_dir.name
-                
-                for mode_dir in prompt_dir.iterdir():
-                    if not mode_dir.is_dir():
-                        continue
-                    
-                    mode = mode_dir.name
-                    if mode not in ['prefill', 'decode']:
-                        continue
-                    
-                    # Load metadata
-                    metadata_file = mode_dir / 'metadata.json'
-                    if metadata_file.exists():
-                        with open(metadata_file) as f:
-                            metadata = json.load(f)
-                    else:
-                        metadata = {}
-                    
-                    # Load logits
-                    logits_file = mode_dir / 'logits.jsonl.gz'
-                    entries = []
-                    if logits_file.exists():
-                        with gzip.open(logits_file, 'rt') as f:
-                            for line in f:
-                                entry = parse_trace_line(line)
-                                if entry:
-                                    entries.append(entry)
-                    
-                    # Load perf
-                    perf_file = mode_dir / 'perf.json'
-                    perf = None
-                    if perf_file.exists():
-                        with open(perf_file) as f:
-                            perf = json.load(f)
-                    
-                    traces[kv_aligned][seed][prompt_case][mode] = {
-                        'metadata': metadata,
-                        'entries': entries,
-                        'perf': perf,
-                        'path': str(mode_dir)
-                    }
+    for run in catalog.runs(layout=('kv_aligned', 'seed', 'prompt_case', 'mode')):
+        traces[run.kv_aligned][run.seed][run.prompt_case][run.mode] = LazyPayload(
+            metadata=lambda run=run: run.read_json('metadata.json', {}),
+            entries=run.read_logits,
+            perf=lambda run=run: run.read_json('perf.json'),
+            path=run.path
+        )
     
     return traces
 
@@ -1335,60 +1540,27 @@ def load_traces_b3_74(traces_dir: str) -> dict:
     """Load traces for B3.74 Internal Drift Audit.
     
     Structure: kv_aligned_X/seed_Y/prompt_case/mode/{internal.jsonl.gz, logits.jsonl.gz}
-    Returns dict[kv][seed][prompt][mode] = {internal_entries, logits_path, metadata}
+    Returns dict[kv][seed][prompt][mode] = {internal, logits_path, metadata, path};
+    internal entries and metadata are read lazily.
     """
-    traces_dir = Path(traces_dir)
+    catalog = TraceCatalog(traces_dir)
     traces = defaultdict(lambda: defaultdict(lambda: defaultdict(dict)))
     
-    for kv_dir in traces_dir.iterdir():
-        if not kv_dir.is_dir() or not kv_dir.name.startswith('kv_aligned_'):
-            continue
-        kv_aligned = kv_dir.name.replace('kv_aligned_', '')
-        
-        for seed_dir in kv_dir.iterdir():
-            if not seed_dir.is_dir() or not seed_dir.name.startswith('seed_'):
-                continue
-            seed = seed_dir.name.replace('seed_', '')
-            
-            for prompt_dir in seed_dir.iterdir():
-                if not prompt_dir.is_dir():
-                    continue
-                prompt_case = prompt_dir.name
-                
-                for mode_dir in prompt_dir.iterdir():
-                    if not mode_dir.is_dir() or mode_dir.name not in ['prefill', 'decode']:
-                        continue
-                    mode = mode_dir.name
-                    
-                    # Load internal trace
-                    internal_file = mode_dir / 'internal.jsonl.gz'
-                    internal_entries = []
-                    if internal_file.exists():
-                        try:
-                            with gzip.open(internal_file, 'rt') as f:
-                                for line in f:
-                                    entry = parse_trace_line(line)
-                                    if entry:
-                                        internal_entries.append(entry)
-                        except Exception as e:
-                            print(f"WARNING: Failed to load {internal_file}: {e}")
-                    
-                    # Logits path (optional)
-                    logits_file = mode_dir / 'logits.jsonl.gz'
-                    
-                    # Metadata
-                    metadata_file = mode_dir / 'metadata.json'
-                    metadata = {}
-                    if metadata_file.exists():
-                        with open(metadata_file) as f:
-                            metadata = json.load(f)
-                    
-                    traces[kv_aligned][seed][prompt_case][mode] = {
-                        'internal': internal_entries,
-                        'logits_path': str(logits_file) if logits_file.exists() else None,
-                        'metadata': metadata,
-                        'path': str(mode_dir)
-                    }
+    def load_internal(run):
+        try:
+            return run.read_jsonl_gz('internal.jsonl.gz')
+        except Exception as e:
+            print(f"WARNING: Failed to load {run.file('internal.jsonl.gz')}: {e}")
+            return []
+    
+    for run in catalog.runs(layout=('kv_aligned', 'seed', 'prompt_case', 'mode')):
+        logits_file = run.logits_path()
+        traces[run.kv_aligned][run.seed][run.prompt_case][run.mode] = LazyPayload(
+            internal=lambda run=run: load_internal(run),
+            logits_path=str(logits_file) if logits_file else None,
+            metadata=lambda run=run: run.read_json('metadata.json', {}),
+            path=run.path
+        )
     
     return traces
 
@@ -1539,7 +1711,7 @@ def run_b3_74_internal_audit(traces_dir: str, output_path: str) -> int:
 
 def load_b3_75_runs(traces_dir: Path):
     """
-    Recursively find all perf.json files to identify runs.
+    Find all perf.json files (one TraceCatalog scan) to identify runs.
     Returns:
       - config: dict (from runs/config.json)
       - runs: list of dicts (perf data + paths)
@@ -1552,24 +1724,23 @@ def load_b3_75_runs(traces_dir: Path):
     with open(config_path, 'r') as f:
         config = json.load(f)
 
-    # Find all perf.json
     runs = []
     # Structure: .../seed_X/prompt_Y/mode/perf.json
-    for perf_path in traces_dir.rglob("perf.json"):
+    for run_dir in TraceCatalog(traces_dir).dirs():
+        if not run_dir.has('perf.json'):
+            continue
         try:
-            with open(perf_path, 'r') as f:
-                perf = json.load(f)
+            perf = run_dir.read_json('perf.json')
             
-            run_dir = perf_path.parent
             # Attach paths
-            perf['_path'] = str(run_dir)
-            perf['_logits'] = str(run_dir / "logits.jsonl.gz")
-            perf['_metadata'] = str(run_dir / "metadata.json")
-            perf['_internal'] = str(run_dir / "internal.jsonl.gz") if (run_dir / "internal.jsonl.gz").exists() else None
+            perf['_path'] = run_dir.path
+            perf['_logits'] = str(run_dir.logits_path() or Path(run_dir.path) / "logits.jsonl.gz")
+            perf['_metadata'] = str(Path(run_dir.path) / "metadata.json")
+            perf['_internal'] = str(run_dir.file("internal.jsonl.gz")) if run_dir.has("internal.jsonl.gz") else None
             
             runs.append(perf)
         except Exception as e:
-            print(f"[WARN] Failed to load {perf_path}: {e}")
+            print(f"[WARN] Failed to load {run_dir.file('perf.json')}: {e}")
 
     return config, runs
 
@@ -1671,7 +1842,7 @@ def generate_optimization_notes(runs, profile):
 
     return notes
 
-def run_b3_75_ci_analysis(traces_dir_str: str, output_path: str, baseline_path: str = "baselines/mi300x/b3_75_perf_baseline.json") -> int:
+def run_b3_75_ci_analysis(traces_dir_str: str, output_path: str, baseline_path: str = "baselines/mi300x/b3_75_perf_baseline.json", jobs: int = 1) -> int:
     traces_dir = Path(traces_dir_str)
     print(f"[B3.75] Loading runs from: {traces_dir}")
     
@@ -1705,6 +1876,12 @@ def run_b3_75_ci_analysis(traces_dir_str: str, output_path: str, baseline_path:
         'perf_regressions': 0, 'baseline_missing': 0
     }
     
+    # Logits diffs for complete pairs (parallel when jobs > 1)
+    diff_keys = [key for key, modes in pairs.items() if 'prefill' in modes and 'decode' in modes]
+    diff_metrics = dict(zip(diff_keys, compute_logits_diff_many(
+        [(pairs[k]['prefill']['_logits'], pairs[k]['decode']['_logits']) for k in diff_keys],
+        jobs)))
+    
     # Analyze Pairs
     for key, modes in pairs.items():
         span, dtype, kv, seed, prompt = key
@@ -1721,7 +1898,9 @@ def run_b3_75_ci_analysis(traces_dir_str: str, output_path: str, baseline_path:
             
             # Logits Equivalence
             try:
-                metrics = compute_logits_diff(p_run['_logits'], d_run['_logits'])
+                metrics = diff_metrics[key]
+                if isinstance(metrics, Exception):
+                    raise metrics
                 diff = metrics.get('max_abs_diff', 999.0)
                 row['logits_diff'] = diff
                 
@@ -1796,7 +1975,7 @@ def run_b3_75_ci_analysis(traces_dir_str: str, output_path: str, baseline_path:
 # -----------------------------------------------------------------------------
 
 def load_b3_76_runs(traces_dir: Path):
-    """Load B3.76 runs including vram.json."""
+    """Load B3.76 runs including vram.json (one TraceCatalog scan)."""
     config_path = traces_dir / "config.json"
     if not config_path.exists():
         return None, []
@@ -1806,27 +1985,26 @@ def load_b3_76_runs(traces_dir: Path):
 
     runs = []
     # Structure: .../context_N/gen_G/span_S/dtype_D/kv_K/seed_Z/batch_B/mode/perf.json
-    for perf_path in traces_dir.rglob("perf.json"):
+    for run_dir in TraceCatalog(traces_dir).dirs():
+        if not run_dir.has('perf.json'):
+            continue
         try:
-            with open(perf_path, 'r') as f:
-                perf = json.load(f)
+            perf = run_dir.read_json('perf.json')
             
-            run_dir = perf_path.parent
             # Attach paths
-            perf['_path'] = str(run_dir)
-            perf['_logits'] = str(run_dir / "logits.jsonl.gz")
-            perf['_tokens'] = str(run_dir / "tokens.jsonl.gz")
-            perf['_metadata'] = str(run_dir / "metadata.json")
+            perf['_path'] = run_dir.path
+            perf['_logits'] = str(run_dir.logits_path() or Path(run_dir.path) / "logits.jsonl.gz")
+            perf['_tokens'] = str(Path(run_dir.path) / "tokens.jsonl.gz")
+            perf['_metadata'] = str(Path(run_dir.path) / "metadata.json")
             
             # vram.json is peer to mode dirs
-            vram_path = run_dir.parent / "vram.json"
-            if vram_path.exists():
-                with open(vram_path, 'r') as f:
-                    perf['vram'] = json.load(f)
+            parent = run_dir.parent
+            if parent is not None and parent.has('vram.json'):
+                perf['vram'] = parent.read_json('vram.json')
             
             runs.append(perf)
         except Exception as e:
-            print(f"[WARN] Failed to load {perf_path}: {e}")
+            print(f"[WARN] Failed to load {run_dir.file('perf.json')}: {e}")
             
     return config, runs
 
@@ -1950,7 +2128,7 @@ def run_b3_78_80_suite_analysis(traces_dir_str: str, output_path: str) -> int:
     return 0 if global_verdict in ['PASS', 'PASS_EQUIV'] else 1
 
 
-def run_b3_76_memory_pressure_analysis(traces_dir_str: str, output_path: str, ticket: str = 'B3.76') -> int:
+def run_b3_76_memory_pressure_analysis(traces_dir_str: str, output_path: str, ticket: str = 'B3.76', jobs: int = 1) -> int:
     traces_dir = Path(traces_dir_str)
     print(f"[{ticket}] Loading runs from: {traces_dir}")
     
@@ -1981,6 +2159,17 @@ def run_b3_76_memory_pressure_analysis(traces_dir_str: str, output_path: str, ti
     THRESH_MAX = 5e-3
     THRESH_TOP1 = 0.999
 
+    # Logits diffs for complete pairs with both dumps on disk (parallel when jobs > 1)
+    diff_keys = [
+        key for key, modes in sorted(pairs.items())
+        if 'prefill' in modes and 'decode' in modes
+        and modes['prefill']['_logits'] and modes['decode']['_logits']
+        and os.path.exists(modes['prefill']['_logits']) and os.path.exists(modes['decode']['_logits'])
+    ]
+    diff_metrics = dict(zip(diff_keys, compute_logits_diff_many(
+        [(pairs[k]['prefill']['_logits'], pairs[k]['decode']['_logits']) for k in diff_keys],
+        jobs)))
+
     for key, modes in sorted(pairs.items()):
         context, kv = key
         row = {
@@ -2005,8 +2194,10 @@ def run_b3_76_memory_pressure_analysis(traces_dir_str: str, output_path: str, ti
             row['peak_vram'] = p_run.get('vram', {}).get('peak_vram_mb', 0)
             row['vram_meta'] = p_run.get('vram', {})
             
-            if p_run['_logits'] and d_run['_logits'] and os.path.exists(p_run['_logits']) and os.path.exists(d_run['_logits']):
-                metrics = compute_logits_diff(p_run['_logits'], d_run['_logits'])
+            if key in diff_metrics:
+                metrics = diff_metrics[key]
+                if isinstance(metrics, Exception):
+                    raise metrics
                 if metrics.get('status') == 'OK':
                     row['max_diff'] = metrics['max_abs_diff']
                     row['p99_diff'] = metrics['p99_abs_diff']
@@ -2647,8 +2838,36 @@ def main():
     parser.add_argument('--mode', type=str, default='b3_67', choices=['b3_67', 'b3_69', 'b3_70_71_72', 'b3_73', 'b3_74', 'b3_75', 'b3_76', 'b3_77', 'b3_78_80', 'b3_81', 'b3_82_84', 'b3_85', 'b3_86', 'b3_87', 'b3_88', 'b3_89'],
                         help='Analysis mode: b3_67 (metadata), b3_69 (logits), b3_70+ (sweep), b3_73 (reconcile), b3_74 (internal), b3_75 (CI), b3_76 (pressure), b3_77 (32k), b3_78_80 (suite), b3_81 (batch), b3_82_84 (steady), b3_85 (prefill_rca), b3_86 (attn_probe), b3_87 (decode_rca), b3_88 (32k_milestone), b3_89 (microbench)')
     
+    parser.add_argument('--metrics-backend', type=str, default='auto', choices=['auto', 'numpy', 'stdlib'],
+                        help='Metrics engine: numpy (vectorized) or stdlib (pure Python). auto = numpy if installed')
+    
+    parser.add_argument('--jobs', type=int, default=1,
+                        help='Parallel worker processes for pair comparisons (b3_70_71_72, b3_75, b3_76, b3_77); 0 = all cores')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Disable the content-addressed logits diff cache (B3.93)')
+    parser.add_argument('--cache-dir', type=str, default=None,
+                        help='Diff cache directory (default: $GRETA_ANALYZER_CACHE_DIR or ~/.cache/greta/guardrail_diff)')
+    parser.add_argument('--cache-max-mb', type=int, default=DEFAULT_MAX_BYTES // (1024 * 1024),
+                        help='Diff cache size bound in MiB; least recently used entries are evicted')
+    parser.add_argument('--streaming', action='store_true',
+                        help='Compare logits files row by row with constant memory (B3.92)')
+    parser.add_argument('--p99-mode', type=str, default='exact', choices=['exact', 'approx'],
+                        help='Streaming p99: exact (top-1%% heap, two passes) or approx (log-linear histogram, one pass)')
+    
     args = parser.parse_args()
     
+    backend = set_metrics_backend(args.metrics_backend)
+    print(f"Metrics backend: {backend}")
+    
+    global STREAMING_P99
+    if args.streaming:
+        STREAMING_P99 = args.p99_mode
+        print(f"Logits diff: streaming (p99 {args.p99_mode})")
+    
+    if not args.no_cache:
+        set_diff_cache((args.cache_dir or default_cache_dir(), args.cache_max_mb * 1024 * 1024))
+        print(f"Diff cache: {DIFF_CACHE.cache_dir}")
+    
     if args.synthetic:
         generate_synthetic_test_data(
             args.traces_dir,
@@ -2656,17 +2875,19 @@ def main():
             args.kv_aligned.split(',')
         )
     
+    jobs = resolve_jobs(args.jobs)
+    
     # B3.75 CI mode
     if args.mode == 'b3_75':
-        return run_b3_75_ci_analysis(args.traces_dir, args.output)
+        return run_b3_75_ci_analysis(args.traces_dir, args.output, jobs=jobs)
 
     # B3.76 Pressure mode
     if args.mode == 'b3_76':
-        return run_b3_76_memory_pressure_analysis(args.traces_dir, args.output)
+        return run_b3_76_memory_pressure_analysis(args.traces_dir, args.output, jobs=jobs)
 
     # B3.77 32k Probe mode
     if args.mode == 'b3_77':
-        return run_b3_76_memory_pressure_analysis(args.traces_dir, args.output, ticket='B3.77')
+        return run_b3_76_memory_pressure_analysis(args.traces_dir, args.output, ticket='B3.77', jobs=jobs)
 
     # B3.73 reconciliation mode: use dedicated analysis path
     if args.mode == 'b3_73':
@@ -2710,7 +2931,7 @@ def main():
 
     # B3.70-71-72 sweep mode: use dedicated analysis path
     if args.mode == 'b3_70_71_72':
-        return run_sweep_analysis(args.traces_dir, args.output)
+        return run_sweep_analysis(args.traces_dir, args.output, jobs=jobs)
     
     print(f"Loading traces from: {args.traces_dir}")
     
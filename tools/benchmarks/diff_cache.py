@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+B3.93 Guardrail Diff Cache
+
+Content-addressed on-disk cache for per-pair comparison results of
+analyze_b3_67_equivalence_guardrail.py. Keys hash the *contents* of both
+logits files plus the analyzer metric version, so re-running over a traces dir
+only recomputes new or changed pairs, wherever the files were copied to.
+
+Layout: <cache_dir>/<key[:2]>/<key>.json (metric dict as JSON). Hits refresh the
+file mtime; when the directory exceeds max_bytes the least recently used
+entries are evicted (LRU by mtime) down to 90% of the budget.
+
+Default cache_dir: $GRETA_ANALYZER_CACHE_DIR or ~/.cache/greta/guardrail_diff
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+_HASH_CHUNK = 1 << 20
+
+
+def default_cache_dir() -> str:
+    env = os.environ.get('GRETA_ANALYZER_CACHE_DIR')
+    if env:
+        return env
+    return str(Path.home() / '.cache' / 'greta' / 'guardrail_diff')
+
+
+class DiffCache:
+    """Size-bounded LRU cache of JSON-serializable results keyed by content hashes."""
+
+    def __init__(self, cache_dir: str = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.cache_dir = Path(cache_dir or default_cache_dir())
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._digests = {}   # (path, size, mtime_ns) -> digest
+        self._size = None    # lazily scanned bytes on disk
+
+    def file_digest(self, path) -> str:
+        """BLAKE2b digest of a file's contents (memoized per path/size/mtime)."""
+        st = os.stat(path)
+        memo_key = (os.path.realpath(path), st.st_size, st.st_mtime_ns)
+        digest = self._digests.get(memo_key)
+        if digest is None:
+            h = hashlib.blake2b(digest_size=20)
+            with open(path, 'rb') as f:
+                for chunk in iter(lambda: f.read(_HASH_CHUNK), b''):
+                    h.update(chunk)
+            digest = h.hexdigest()
+            self._digests[memo_key] = digest
+        return digest
+
+    @staticmethod
+    def make_key(*parts) -> str:
+        return hashlib.blake2b('|'.join(str(p) for p in parts).encode(), digest_size=20).hexdigest()
+
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f'{key}.json'
+
+    def get(self, key: str):
+        path = self._entry_path(key)
+        try:
+            with open(path) as f:
+                value = json.load(f)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+        try:
+            os.utime(path)  # LRU recency
+        except OSError:
+            pass
+        self.hits += 1
+        return value
+
+    def put(self, key: str, value) -> None:
+        path = self._entry_path(key)
+        tmp = None
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            data = json.dumps(value).encode()
+            try:
+                replaced = path.stat().st_size  # same key written again
+            except OSError:
+                replaced = 0
+            # Atomic publish: concurrent workers may write the same key
+            fd, tmp = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp, path)
+            tmp = None
+        except OSError as e:
+            print(f"  Warning: diff cache write failed ({path}): {e}")
+            return
+        finally:
+            if tmp is not None:
+                try:
+                    os.unlink(tmp)
+                except OSError:
+                    pass
+        if self._size is None:
+            self._size = self._scan_size()
+        else:
+            self._size += len(data) - replaced
+        if self._size > self.max_bytes:
+            self.trim()
+
+    def _entries(self):
+        entries = []
+        if not self.cache_dir.exists():
+            return entries
+        for sub in os.scandir(self.cache_dir):
+            if not sub.is_dir():
+                continue
+            for e in os.scandir(sub.path):
+                if e.name.endswith('.json'):
+                    try:
+                        st = e.stat()
+                    except OSError:
+                        continue
+                    entries.append((st.st_mtime_ns, st.st_size, e.path))
+        return entries
+
+    def _scan_size(self) -> int:
+        return sum(size for _, size, _ in self._entries())
+
+    def trim(self) -> int:
+        """Evict least recently used entries down to 90% of max_bytes; returns evicted count."""
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        target = int(self.max_bytes * 0.9)
+        evicted = 0
+        for _, size, path in entries:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            evicted += 1
+        self._size = total
+        return evicted
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+B3.91 Logits Dump Reader
+
+Reads the logits dumps written by `greta_infer --dump-logits`:
+
+- logits.bin (B3.91, `--dump-logits-format f32|f16`): fixed 64-byte header,
+  (token_idx, token_id) table and contiguous float32/float16 rows. Opened with
+  mmap; rows are zero-copy `numpy.memmap` views when NumPy is available.
+- logits.jsonl.gz (B3.69): one JSON object per row. Kept as fallback.
+
+Binary layout (little-endian):
+
+    offset 0   char[8]  magic "GRETALGT"
+           8   u32      version (1)
+          12   u32      dtype (0 = f32, 1 = f16)
+          16   u32      vocab
+          20   u32      rows
+          24   u64      prompt_len
+          32   u64      index_offset  -> rows x (u32 token_idx, i32 token_id)
+          40   u64      data_offset   -> rows x vocab elements (64B aligned)
+          48   u8[16]   reserved
+
+No requiere numpy - usa solo Python estándar si numpy no está instalado.
+"""
+
+import gzip
+import json
+import mmap
+import struct
+import sys
+from pathlib import Path
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional
+    np = None
+
+LOGITS_BIN_NAME = 'logits.bin'
+LOGITS_JSONL_NAME = 'logits.jsonl.gz'
+
+LOGITS_BIN_MAGIC = b'GRETALGT'
+LOGITS_BIN_VERSION = 1
+LOGITS_BIN_HEADER = struct.Struct('<8sIIIIQQQ16x')
+LOGITS_BIN_DTYPES = {0: ('f32', 'f', 4), 1: ('f16', 'e', 2)}
+
+
+def find_logits_file(mode_dir):
+    """Return the logits dump in a run directory (logits.bin preferred), or None."""
+    mode_dir = Path(mode_dir)
+    for name in (LOGITS_BIN_NAME, LOGITS_JSONL_NAME):
+        path = mode_dir / name
+        if path.exists():
+            return path
+    return None
+
+
+class LogitsDump:
+    """Memory-mapped view over a logits.bin file.
+
+    `rows` is a zero-copy (count, vocab) NumPy view when NumPy is available,
+    else None. `row(i)` always works and returns a NumPy view or a list.
+    """
+
+    def __init__(self, path):
+        self.path = str(path)
+        self._file = open(self.path, 'rb')
+        try:
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty file cannot be mapped
+            self._file.close()
+            raise ValueError(f"{self.path}: empty logits.bin")
+
+        if len(self._mm) < LOGITS_BIN_HEADER.size:
+            self.close()
+            raise ValueError(f"{self.path}: truncated header")
+
+        (magic, version, dtype_code, vocab, count, prompt_len,
+         index_offset, data_offset) = LOGITS_BIN_HEADER.unpack_from(self._mm, 0)
+        if magic != LOGITS_BIN_MAGIC:
+            self.close()
+            raise ValueError(f"{self.path}: bad magic {magic!r}")
+        if version != LOGITS_BIN_VERSION or dtype_code not in LOGITS_BIN_DTYPES:
+            self.close()
+            raise ValueError(f"{self.path}: unsupported version={version} dtype={dtype_code}")
+
+        self.dtype, self._fmt, self.itemsize = LOGITS_BIN_DTYPES[dtype_code]
+        self.vocab = vocab
+        self.count = count
+        self.prompt_len = prompt_len
+        self.data_offset = data_offset
+        self.row_bytes = vocab * self.itemsize
+
+        if data_offset + count * self.row_bytes > len(self._mm):
+            self.close()
+            raise ValueError(f"{self.path}: truncated data ({count} rows x {vocab})")
+
+        index = struct.unpack_from(f'<{2 * count}I', self._mm, index_offset)
+        self.token_idx = list(index[0::2])
+        # token_id is stored as i32; reinterpret the unsigned read
+        self.token_ids = [t - (1 << 32) if t >= (1 << 31) else t for t in index[1::2]]
+
+        self.rows = None
+        if np is not None and count > 0:
+            self.rows = np.frombuffer(
+                self._mm, dtype='<f4' if self.dtype == 'f32' else '<f2',
+                count=count * vocab, offset=data_offset).reshape(count, vocab)
+
+    def __len__(self):
+        return self.count
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def row(self, i):
+        """Row i as a NumPy view (zero-copy) or, without NumPy, a list of floats."""
+        if self.rows is not None:
+            return self.rows[i]
+        offset = self.data_offset + i * self.row_bytes
+        if self.dtype == 'f32' and sys.byteorder == 'little':
+            return memoryview(self._mm)[offset:offset + self.row_bytes].cast('f').tolist()
+        return list(struct.unpack_from(f'<{self.vocab}{self._fmt}', self._mm, offset))
+
+    def entries(self, as_list=True):
+        """Yield rows in the JSONL entry shape: {token_idx, token_id, logits}.
+
+        With as_list=False and NumPy available, `logits` is the zero-copy row view.
+        """
+        for i in range(self.count):
+            logits = self.row(i)
+            if self.rows is not None and as_list:
+                logits = logits.astype('f8').tolist()
+            yield {
+                'token_idx': self.token_idx[i],
+                'token_id': self.token_ids[i],
+                'logits': logits,
+            }
+
+    def close(self):
+        # Drop NumPy views before unmapping, otherwise mmap.close() raises
+        self.rows = None
+        mm = getattr(self, '_mm', None)
+        if mm is not None:
+            try:
+                mm.close()
+            except BufferError:
+                # A caller still holds a row view; the map is released with it
+                pass
+            self._mm = None
+        self._file.close()
+
+
+def iter_logits_entries(path, as_list=True):
+    """Yield logits entries from logits.bin or logits.jsonl.gz, one row at a time."""
+    path = str(path)
+    if path.endswith('.bin'):
+        with LogitsDump(path) as dump:
+            yield from dump.entries(as_list=as_list)
+        return
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+
+def load_logits_entries(path, as_list=True) -> list:
+    """Load all logits entries from logits.bin or logits.jsonl.gz."""
+    return list(iter_logits_entries(path, as_list=as_list))
@@ -0,0 +1,575 @@
+#!/usr/bin/env python3
+"""
+B3.96 Benchmark Results Store
+
+Local SQLite store for benchmark results, with statistical regression
+detection for CI gating.
+
+Ingest (format detected from content):
+- summary.json / perf_summary.json from analyze_b3_*.py (B3.x analyzers)
+- per-run perf.json under artifacts_remote/<date>/
+- results.json from run_bench.py (one sample per measured repetition)
+- bench_harness.py --json output
+- *_bench_summary.csv from tools/bench/*/scripts/gen_bench_csv.py
+- baselines/mi300x/*_baseline.json ("cells" format)
+
+Every numeric leaf becomes a measurement keyed by (scenario, config, metric).
+Config comes from the enclosing record's identifying fields (span, dtype,
+kv_aligned, batch_size, M/N/K, ...); seeds are treated as repetitions of the
+same config. Each ingested file is one run, tagged with a commit: --commit,
+else the commit recorded by run_bench.py (git HEAD for its results.json),
+else ``unknown-<artifact dir>``. Historical artifacts do not say which
+commit produced them, so they never merge with a real commit's runs.
+
+check: for every series, a one-sided Mann-Whitney U test compares the
+candidate commit's samples against the last N baseline runs. The test is exact
+for small samples without ties and uses a tie-corrected normal approximation
+otherwise. A series is a REGRESSION when p < alpha and the median is worse by
+more than --min-effect. The exit code is 1 if a gated metric regressed.
+
+    results_store.py ingest artifacts_remote/2026-02-10/ --commit abc123
+    results_store.py check --last 10 --metric ttft --metric tok_s
+    results_store.py history --scenario B3.75 --metric wall_time
+
+Solo usa la biblioteca estándar (sqlite3).
+"""
+
+import argparse
+import csv
+import hashlib
+import json
+import math
+import os
+import sqlite3
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+SCHEMA_VERSION = 1
+
+# Fields that identify a configuration rather than measure it
+CONFIG_KEYS = {
+    'span', 'dtype', 'kv_aligned', 'kv', 'mode', 'prompt', 'prompt_case',
+    'context', 'context_len', 'gen', 'gen_len', 'batch', 'batch_size', 'prompt_len',
+    'max_new_tokens', 'type', 'M', 'N', 'K', 'iters', 'compute_only', 'preset',
+    'env', 'tokenizer', 'profile',
+}
+
+# Replicate identifiers: neither config nor metric
+REPLICATE_KEYS = {'seed', 'rep', 'repetition'}
+
+# Default CI gate: TTFT, prefill time and decode throughput
+DEFAULT_GATE = ('ttft', 'prefill', 'tok_s')
+
+_HIGHER_BETTER = ('tok_s', 'tps', 'tflops', 'gflops', 'per_second', 'throughput',
+                  'agreement', 'gbps', 'mb_s')
+_LOWER_BETTER = ('_ms', 'ms_', '_s', 'sec', 'latency', 'ttft', 'time', 'bytes', 'diff')
+
+
+def default_db_path() -> str:
+    return os.environ.get('GRETA_RESULTS_DB') or str(SCRIPT_DIR / 'bench_results' / 'results.sqlite')
+
+
+def metric_direction(metric: str):
+    """+1 if higher is better, -1 if lower is better, None if unknown."""
+    m = metric.lower()
+    if any(t in m for t in _HIGHER_BETTER):
+        return 1
+    if any(t in m for t in _LOWER_BETTER) or m.endswith('_s'):
+        return -1
+    return None
+
+
+def git_commit(path='.') -> str:
+    try:
+        out = subprocess.run(['git', '-C', str(path), 'rev-parse', 'HEAD'],
+                             capture_output=True, text=True, timeout=10)
+        if out.returncode == 0:
+            return out.stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        pass
+    return 'unknown'
+
+
+# ---------------------------------------------------------------------------
+# Store
+# ---------------------------------------------------------------------------
+
+class ResultsStore:
+    """SQLite-backed results store (one row per run, one per measurement)."""
+
+    def __init__(self, path: str = None):
+        self.path = path or default_db_path()
+        if self.path != ':memory:':
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(self.path)
+        self.db.execute('PRAGMA foreign_keys = ON')
+        self._init_schema()
+
+    def close(self):
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _init_schema(self):
+        self.db.executescript('''
+            CREATE TABLE IF NOT EXISTS runs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                commit_sha TEXT NOT NULL,
+                source TEXT NOT NULL,
+                path TEXT,
+                content_hash TEXT NOT NULL,
+                run_timestamp TEXT,
+                ingested_at TEXT NOT NULL,
+                UNIQUE (content_hash, commit_sha)
+            );
+            CREATE TABLE IF NOT EXISTS measurements (
+                run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+                scenario TEXT NOT NULL,
+                config TEXT NOT NULL,
+                metric TEXT NOT NULL,
+                rep INTEGER NOT NULL,
+                value REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_series ON measurements (scenario, config, metric);
+            CREATE INDEX IF NOT EXISTS idx_run ON measurements (run_id);
+        ''')
+        self.db.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+        self.db.commit()
+
+    def add_run(self, commit: str, source: str, path: str, content_hash: str,
+                measurements, run_timestamp: str = None):
+        """Insert one run; returns its id, or None if already ingested."""
+        try:
+            cur = self.db.execute(
+                'INSERT INTO runs (commit_sha, source, path, content_hash, run_timestamp, ingested_at) '
+                'VALUES (?, ?, ?, ?, ?, ?)',
+                (commit, source, path, content_hash, run_timestamp,
+                 time.strftime('%Y-%m-%dT%H:%M:%S')))
+        except sqlite3.IntegrityError:
+            return None
+        run_id = cur.lastrowid
+        reps = {}
+        rows = []
+        for scenario, config, metric, value in measurements:
+            cfg = json.dumps({k: str(v) for k, v in (config or {}).items()}, sort_keys=True)
+            key = (scenario, cfg, metric)
+            rep = reps.get(key, 0)
+            reps[key] = rep + 1
+            rows.append((run_id, scenario, cfg, metric, rep, float(value)))
+        self.db.executemany(
+            'INSERT INTO measurements (run_id, scenario, config, metric, rep, value) VALUES (?, ?, ?, ?, ?, ?)',
+            rows)
+        self.db.commit()
+        return run_id
+
+    def latest_commit(self):
+        """Most recently ingested real commit (skips baseline-* and unknown* ids)."""
+        row = self.db.execute(
+            "SELECT commit_sha FROM runs WHERE commit_sha NOT LIKE 'baseline-%' "
+            "AND commit_sha NOT LIKE 'unknown%' ORDER BY id DESC LIMIT 1").fetchone()
+        return row[0] if row else None
+
+    def series(self, scenario=None, metric=None):
+        """Distinct (scenario, config, metric) keys, optionally filtered by substring."""
+        sql = 'SELECT DISTINCT scenario, config, metric FROM measurements WHERE 1=1'
+        params = []
+        if scenario:
+            sql += ' AND scenario LIKE ?'
+            params.append(f'%{scenario}%')
+        if metric:
+            sql += ' AND metric LIKE ?'
+            params.append(f'%{metric}%')
+        return self.db.execute(sql + ' ORDER BY scenario, config, metric', params).fetchall()
+
+    def samples(self, scenario, config, metric):
+        """[(run_id, commit, value)] in ingestion order."""
+        return self.db.execute(
+            'SELECT m.run_id, r.commit_sha, m.value FROM measurements m JOIN runs r ON r.id = m.run_id '
+            'WHERE m.scenario = ? AND m.config = ? AND m.metric = ? ORDER BY m.run_id, m.rep',
+            (scenario, config, metric)).fetchall()
+
+
+# ---------------------------------------------------------------------------
+# Ingest adapters
+# ---------------------------------------------------------------------------
+
+def _is_number(v):
+    return isinstance(v, (int, float)) and not isinstance(v, bool) and math.isfinite(v)
+
+
+def _split_config(d: dict):
+    return {k: v for k, v in d.items()
+            if k in CONFIG_KEYS and isinstance(v, (str, int)) and not isinstance(v, bool)}
+
+
+def _flatten(obj, scenario, config, prefix=''):
+    """Yield (scenario, config, metric, value) for every numeric leaf of obj."""
+    if isinstance(obj, dict):
+        config = {**config, **_split_config(obj)}
+        for k, v in obj.items():
+            if k in CONFIG_KEYS or k in REPLICATE_KEYS or k.startswith('_'):
+                continue
+            if _is_number(v):
+                yield scenario, config, prefix + k, v
+            elif isinstance(v, dict):
+                # Cells keyed by config ("span_128_dtype_bf16_decode": {span: ...}) do
+                # not contribute to the metric name
+                cell = bool(_split_config(v))
+                yield from _flatten(v, scenario, config, prefix if cell else f'{prefix}{k}.')
+            elif isinstance(v, list):
+                for item in v:
+                    if isinstance(item, dict):
+                        yield from _flatten(item, scenario, config, prefix)
+
+
+def _from_run_bench(doc):
+    for sc in doc.get('scenarios', []):
+        config = {k: sc.get(k) for k in ('type', 'batch_size', 'prompt_len', 'max_new_tokens')
+                  if sc.get(k) is not None}
+        for run in sc.get('runs', []):
+            for metric, value in (run.get('metrics') or {}).items():
+                if _is_number(value):
+                    yield sc.get('name'), config, metric, value
+
+
+def _from_bench_harness(doc):
+    for key in ('compute_only', 'e2e'):
+        res = doc.get(key)
+        if isinstance(res, dict):
+            config = {'tokenizer': res['tokenizer']} if res.get('tokenizer') else {}
+            for metric, value in res.items():
+                if _is_number(value):
+                    yield f'bench_harness.{key}', config, metric, value
+
+
+def _from_baseline(doc, path: Path):
+    # b3_75_perf_baseline.json -> scenario B3.75
+    stem = path.stem.split('_')
+    scenario = f'{stem[0].upper()}.{stem[1]}' if len(stem) > 1 and stem[0].lower().startswith('b') else path.stem
+    for cell in doc.get('cells', []):
+        yield from _flatten(cell, scenario, {})
+
+
+def _from_csv(path: Path):
+    with open(path, newline='') as f:
+        for row in csv.DictReader(f):
+            scenario = row.get('bench') or path.stem
+            config = {k: v for k, v in row.items() if k in CONFIG_KEYS and v not in (None, '')}
+            for k, v in row.items():
+                if k in CONFIG_KEYS or k in ('file', 'bench', 'status') or v in (None, ''):
+                    continue
+                try:
+                    value = float(v)
+                except ValueError:
+                    continue
+                if math.isfinite(value):
+                    yield scenario, config, k, value
+
+
+def parse_results_file(path):
+    """(source, run_timestamp, measurements, commit) for a supported file, or None.
+
+    commit is the one recorded in the file (run_bench.py results.json) or None.
+    """
+    path = Path(path)
+    if path.suffix == '.csv':
+        return 'gen_bench_csv', None, list(_from_csv(path)), None
+    if path.suffix != '.json':
+        return None
+    try:
+        with open(path) as f:
+            doc = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(doc, dict):
+        return None
+    ts = doc.get('timestamp') if isinstance(doc.get('timestamp'), str) else None
+    if isinstance(doc.get('scenarios'), list) and 'settings' in doc:
+        commit = doc.get('commit') if isinstance(doc.get('commit'), str) else None
+        return 'run_bench', ts, list(_from_run_bench(doc)), commit
+    if 'compute_only' in doc or 'e2e' in doc:
+        meta = doc.get('metadata') or {}
+        return 'bench_harness', str(meta.get('timestamp', '')) or None, list(_from_bench_harness(doc)), None
+    if isinstance(doc.get('cells'), list):
+        return 'baseline', doc.get('baseline_date'), list(_from_baseline(doc, path)), None
+    if path.name == 'perf.json':
+        return 'perf', ts, list(_flatten(doc, 'perf', {})), None
+    # Output dirs are usually dated, so they never name the scenario
+    scenario = doc.get('ticket') or doc.get('mode')
+    scenario = f'{scenario}/{path.stem}' if scenario else path.stem
+    return 'analyzer', ts, list(_flatten(doc, str(scenario), {})), None
+
+
+def iter_results_files(root):
+    """Supported result files under root (or root itself), sorted."""
+    root = Path(root)
+    if root.is_file():
+        yield root
+        return
+    for path in sorted(root.rglob('*')):
+        if not path.is_file():
+            continue
+        name = path.name
+        if (name in ('summary.json', 'perf_summary.json', 'perf.json', 'results.json')
+                or name.endswith('_bench_summary.csv') or name.endswith('_baseline.json')
+                or name.startswith('bench_harness')):
+            yield path
+
+
+def artifact_id(path: Path) -> str:
+    """Artifact directory of a result file, relative to the repo when inside it."""
+    parent = Path(path).resolve().parent
+    try:
+        return str(parent.relative_to(SCRIPT_DIR.parent.parent))
+    except ValueError:
+        return str(parent)
+
+
+def ingest_path(store: ResultsStore, root, commit: str = None, verbose=True) -> int:
+    """Ingest every supported file under root; returns number of new runs."""
+    added = 0
+    for path in iter_results_files(root):
+        parsed = parse_results_file(path)
+        if not parsed or not parsed[2]:
+            continue
+        source, ts, measurements, file_commit = parsed
+        if commit:
+            sha = commit
+        elif source == 'baseline':
+            sha = f"baseline-{ts or 'unknown'}"
+        elif source == 'run_bench':
+            # run_bench.py ingests its results.json right after writing it
+            sha = file_commit or git_commit(path.parent)
+        else:
+            # HEAD at ingest time says nothing about when these ran
+            sha = f"unknown-{artifact_id(path)}"
+        digest = hashlib.blake2b(path.read_bytes(), digest_size=20).hexdigest()
+        run_id = store.add_run(sha, source, str(path), digest, measurements, ts)
+        if verbose:
+            state = f"run {run_id}: {len(measurements)} measurements" if run_id else "already ingested"
+            label = sha[:12] if len(sha) == 40 else sha
+            print(f"[ingest] {path} ({source}, {label}) {state}")
+        if run_id:
+            added += 1
+    return added
+
+
+# ---------------------------------------------------------------------------
+# Mann-Whitney U
+# ---------------------------------------------------------------------------
+
+def _ranks(values):
+    order = sorted(range(len(values)), key=values.__getitem__)
+    ranks = [0.0] * len(values)
+    ties = []
+    i = 0
+    while i < len(order):
+        j = i
+        while j + 1 < len(order) and values[order[j + 1]] == values[order[i]]:
+            j += 1
+        avg = (i + j) / 2.0 + 1.0
+        for k in range(i, j + 1):
+            ranks[order[k]] = avg
+        if j > i:
+            ties.append(j - i + 1)
+        i = j + 1
+    return ranks, ties
+
+
+def _exact_upper_tail(n1, n2, u):
+    """P(U >= u) under H0 for sample sizes n1, n2 without ties."""
+    # counts[j][v]: number of arrangements of n1' x-items among j y-items with U = v
+    counts = [[1] + [0] * (n1 * n2) for _ in range(n2 + 1)]
+    for i in range(1, n1 + 1):
+        nxt = [[0] * (n1 * n2 + 1) for _ in range(n2 + 1)]
+        for j in range(n2 + 1):
+            for v in range(i * j + 1):
+                c = 0
+                if j > 0:
+                    c += nxt[j - 1][v]                 # largest item is a y
+                if v - j >= 0:
+                    c += counts[j][v - j]              # largest item is an x
+                nxt[j][v] = c
+        counts = nxt
+    dist = counts[n2]
+    total = sum(dist)
+    k = math.ceil(u - 1e-9)
+    return sum(dist[max(k, 0):]) / total
+
+
+def mann_whitney_greater(x, y):
+    """One-sided Mann-Whitney U test of H1: x tends to be larger than y.
+
+    Returns (U, p_value).
+    """
+    n1, n2 = len(x), len(y)
+    ranks, ties = _ranks(list(x) + list(y))
+    r1 = sum(ranks[:n1])
+    u = r1 - n1 * (n1 + 1) / 2.0
+    if not ties and n1 + n2 <= 40:
+        return u, _exact_upper_tail(n1, n2, u)
+    n = n1 + n2
+    tie_term = sum(t ** 3 - t for t in ties) / (n * (n - 1)) if n > 1 else 0.0
+    sigma = math.sqrt(n1 * n2 / 12.0 * ((n + 1) - tie_term))
+    if sigma == 0:
+        return u, 1.0
+    z = (u - n1 * n2 / 2.0 - 0.5) / sigma  # continuity correction
+    return u, 0.5 * math.erfc(z / math.sqrt(2))
+
+
+# ---------------------------------------------------------------------------
+# Regression detection
+# ---------------------------------------------------------------------------
+
+def check_regressions(store: ResultsStore, candidate=None, last=10, alpha=0.05,
+                      min_effect=0.03, min_baseline=3, scenario=None, metrics=None):
+    """Compare the candidate commit against the last `last` baseline runs of each series."""
+    candidate = candidate or store.latest_commit()
+    results = []
+    for sc, cfg, metric in store.series(scenario):
+        if metrics and not any(m in metric.lower() for m in metrics):
+            continue
+        rows = store.samples(sc, cfg, metric)
+        cand = [v for _, c, v in rows if c == candidate]
+        if not cand:
+            continue
+        base_runs = []
+        for run_id, c, _ in rows:
+            if c != candidate and run_id not in base_runs:
+                base_runs.append(run_id)
+        base_runs = set(base_runs[-last:])
+        base = [v for run_id, c, v in rows if run_id in base_runs]
+
+        direction = metric_direction(metric)
+        entry = {
+            'scenario': sc, 'config': json.loads(cfg), 'metric': metric,
+            'candidate_n': len(cand), 'baseline_n': len(base), 'baseline_runs': len(base_runs),
+            'candidate_median': statistics.median(cand),
+            'baseline_median': statistics.median(base) if base else None,
+            'direction': {1: 'higher_is_better', -1: 'lower_is_better'}.get(direction, 'unknown'),
+            'p_value': None, 'rel_change': None,
+        }
+        if len(base_runs) < min_baseline or not base:
+            entry['verdict'] = 'INSUFFICIENT'
+            results.append(entry)
+            continue
+
+        bm = entry['baseline_median']
+        rel = (entry['candidate_median'] - bm) / abs(bm) if bm else 0.0
+        entry['rel_change'] = rel
+        if direction is None:
+            # Unknown polarity: two-sided check, reported but never gated
+            p = min(1.0, 2 * min(mann_whitney_greater(cand, base)[1], mann_whitney_greater(base, cand)[1]))
+            entry['p_value'] = p
+            entry['verdict'] = 'CHANGED' if p < alpha and abs(rel) > min_effect else 'OK'
+        else:
+            worse_x, worse_y = (base, cand) if direction > 0 else (cand, base)
+            better_x, better_y = worse_y, worse_x
+            p_worse = mann_whitney_greater(worse_x, worse_y)[1]
+            p_better = mann_whitney_greater(better_x, better_y)[1]
+            worse_rel = -rel * direction
+            if p_worse < alpha and worse_rel > min_effect:
+                entry['verdict'], entry['p_value'] = 'REGRESSION', p_worse
+            elif p_better < alpha and -worse_rel > min_effect:
+                entry['verdict'], entry['p_value'] = 'IMPROVEMENT', p_better
+            else:
+                entry['verdict'], entry['p_value'] = 'OK', p_worse
+        results.append(entry)
+    return candidate, results
+
+
+def _fmt(v, spec='.4g'):
+    return 'N/A' if v is None else format(v, spec)
+
+
+def render_check(candidate, results, show_all=False) -> str:
+    lines = [f"Candidate commit: {candidate}"]
+    header = f"{'Verdict':<12} {'Scenario':<28} {'Metric':<32} {'cand':>10} {'base':>10} {'Δ%':>8} {'p':>8}  Config"
+    lines.append(header)
+    lines.append('-' * len(header))
+    for r in results:
+        if not show_all and r['verdict'] in ('OK', 'INSUFFICIENT'):
+            continue
+        cfg = ','.join(f'{k}={v}' for k, v in r['config'].items())
+        rel = None if r['rel_change'] is None else 100 * r['rel_change']
+        lines.append(f"{r['verdict']:<12} {r['scenario']:<28.28} {r['metric']:<32.32} "
+                     f"{_fmt(r['candidate_median']):>10} {_fmt(r['baseline_median']):>10} "
+                     f"{_fmt(rel, '+.1f'):>8} {_fmt(r['p_value'], '.3g'):>8}  {cfg}")
+    counts = {}
+    for r in results:
+        counts[r['verdict']] = counts.get(r['verdict'], 0) + 1
+    lines.append('')
+    lines.append('Series: ' + ', '.join(f'{k}={v}' for k, v in sorted(counts.items())))
+    return '\n'.join(lines) + '\n'
+
+
+def main():
+    ap = argparse.ArgumentParser(description='GRETA benchmark results store (SQLite)')
+    ap.add_argument('--db', default=default_db_path(), help='SQLite path (also GRETA_RESULTS_DB env)')
+    sub = ap.add_subparsers(dest='cmd', required=True)
+
+    p_ing = sub.add_parser('ingest', help='Ingest result files or directories')
+    p_ing.add_argument('paths', nargs='+')
+    p_ing.add_argument('--commit', default=None,
+                       help='Git commit (default: recorded by run_bench.py, else unknown-<artifact dir>)')
+
+    p_chk = sub.add_parser('check', help='Statistical regression check (Mann-Whitney U)')
+    p_chk.add_argument('--candidate', default=None, help='Commit to test (default: latest ingested)')
+    p_chk.add_argument('--last', type=int, default=10, help='Baseline: last N runs of other commits')
+    p_chk.add_argument('--alpha', type=float, default=0.05)
+    p_chk.add_argument('--min-effect', type=float, default=0.03, help='Minimum relative median change')
+    p_chk.add_argument('--min-baseline', type=int, default=3, help='Minimum baseline runs per series')
+    p_chk.add_argument('--scenario', default=None, help='Scenario substring filter')
+    p_chk.add_argument('--metric', action='append', default=None,
+                       help=f"Gated metric substring (repeatable, default: {', '.join(DEFAULT_GATE)})")
+    p_chk.add_argument('--all', action='store_true', help='Show OK/INSUFFICIENT series too')
+    p_chk.add_argument('--json', default=None, help='Write results as JSON')
+
+    p_his = sub.add_parser('history', help='Per-commit medians of matching series')
+    p_his.add_argument('--scenario', default=None)
+    p_his.add_argument('--metric', default=None)
+
+    args = ap.parse_args()
+    with ResultsStore(args.db) as store:
+        if args.cmd == 'ingest':
+            added = sum(ingest_path(store, p, commit=args.commit) for p in args.paths)
+            print(f"[ingest] {added} new run(s) in {args.db}")
+            return 0
+
+        if args.cmd == 'check':
+            metrics = [m.lower() for m in (args.metric or DEFAULT_GATE)]
+            candidate, results = check_regressions(
+                store, candidate=args.candidate, last=args.last, alpha=args.alpha,
+                min_effect=args.min_effect, min_baseline=args.min_baseline,
+                scenario=args.scenario, metrics=metrics)
+            if candidate is None:
+                print("[check] No run with a known commit; pass --candidate")
+                return 1
+            print(render_check(candidate, results, show_all=args.all), end='')
+            if args.json:
+                with open(args.json, 'w') as f:
+                    json.dump({'candidate': candidate, 'results': results}, f, indent=2)
+            return 1 if any(r['verdict'] == 'REGRESSION' for r in results) else 0
+
+        if args.cmd == 'history':
+            for sc, cfg, metric in store.series(args.scenario, args.metric):
+                print(f"{sc}  {metric}  {cfg}")
+                per_commit = {}
+                for _, commit, value in store.samples(sc, cfg, metric):
+                    per_commit.setdefault(commit, []).append(value)
+                for commit, values in per_commit.items():
+                    print(f"    {commit[:20]:<22} n={len(values):<4} median={statistics.median(values):.6g}")
+            return 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
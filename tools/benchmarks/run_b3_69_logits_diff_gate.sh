@@ -68,6 +68,14 @@ RUN_DIR="b3_69"
 DTYPE="bf16"
 MODEL="./models/greta-v1.gguf"
 PROMPT="tools/benchmarks/prompts/p0_short.txt"
+# B3.91: logits dump format (GRETA_DUMP_LOGITS_FORMAT=jsonl|f32|f16).
+# jsonl writes logits.jsonl.gz, f32/f16 write the mmap-able logits.bin
+LOGITS_FORMAT="${GRETA_DUMP_LOGITS_FORMAT:-jsonl}"
+if [ "$LOGITS_FORMAT" = "jsonl" ]; then
+    LOGITS_FILE="logits.jsonl.gz"
+else
+    LOGITS_FILE="logits.bin"
+fi
 
 # Arrays
 IFS=',' read -ra SEEDS_ARRAY <<< "$SEEDS"
@@ -84,7 +92,7 @@ echo "Node: $NODE_IP"
 echo "Date: $DATE"
 echo "KV aligned values: ${KV_ALIGNED_VALUES[*]}"
 echo "Seeds: ${SEEDS_ARRAY[*]}"
-echo "Span: $SPAN tokens (logits dump)"
+echo "Span: $SPAN tokens (logits dump, format=$LOGITS_FORMAT)"
 
 # -----------------------------------------------------------------------------
 # Lock exclusivo
@@ -176,6 +184,7 @@ for KV_VAL in "${KV_ALIGNED_VALUES[@]}"; do
                     --mode $MODE \
                     --dump-logits $OUTDIR \
                     --dump-logits-span $SPAN \
+                    --dump-logits-format $LOGITS_FORMAT \
                     --greedy \
                     2>&1 | tee $OUTDIR/run.log
 
@@ -184,8 +193,8 @@ for KV_VAL in "${KV_ALIGNED_VALUES[@]}"; do
                     echo 'ERROR: metadata.json not created!'
                     exit 1
                 fi
-                if [ ! -f $OUTDIR/logits.jsonl.gz ]; then
-                    echo 'ERROR: logits.jsonl.gz not created!'
+                if [ ! -f $OUTDIR/$LOGITS_FILE ]; then
+                    echo 'ERROR: $LOGITS_FILE not created!'
                     exit 1
                 fi
 
@@ -201,7 +210,7 @@ for KV_VAL in "${KV_ALIGNED_VALUES[@]}"; do
 
             # Copy files locally
             scp -o StrictHostKeyChecking=no "root@$NODE_IP:$OUTDIR/metadata.json" "$LOCAL_OUTDIR/" 2>/dev/null || true
-            scp -o StrictHostKeyChecking=no "root@$NODE_IP:$OUTDIR/logits.jsonl.gz" "$LOCAL_OUTDIR/" 2>/dev/null || true
+            scp -o StrictHostKeyChecking=no "root@$NODE_IP:$OUTDIR/$LOGITS_FILE" "$LOCAL_OUTDIR/" 2>/dev/null || true
             scp -o StrictHostKeyChecking=no "root@$NODE_IP:$OUTDIR/run.log" "$LOCAL_OUTDIR/" 2>/dev/null || true
 
             echo "    Done."
@@ -64,6 +64,14 @@ RUN_DIR="b3_70_71_72"
 
 MODEL="./models/greta-v1.gguf"
 PROMPT="tools/benchmarks/prompts/p0_short.txt"
+# B3.91: logits dump format (GRETA_DUMP_LOGITS_FORMAT=jsonl|f32|f16).
+# jsonl writes logits.jsonl.gz, f32/f16 write the mmap-able logits.bin
+LOGITS_FORMAT="${GRETA_DUMP_LOGITS_FORMAT:-jsonl}"
+if [ "$LOGITS_FORMAT" = "jsonl" ]; then
+    LOGITS_FILE="logits.jsonl.gz"
+else
+    LOGITS_FILE="logits.bin"
+fi
 
 # Parse arrays
 IFS=',' read -ra SPANS_ARRAY <<< "$SPANS"
@@ -173,11 +181,12 @@ for SPAN in "${SPANS_ARRAY[@]}"; do
                             --mode $MODE \
                             --dump-logits $OUTDIR \
                             --dump-logits-span $SPAN \
+                            --dump-logits-format $LOGITS_FORMAT \
                             --greedy \
                             2>&1 | tee $OUTDIR/run.log
 
                         # Verify outputs
-                        if [ -f $OUTDIR/metadata.json ] && [ -f $OUTDIR/logits.jsonl.gz ]; then
+                        if [ -f $OUTDIR/metadata.json ] && [ -f $OUTDIR/$LOGITS_FILE ]; then
                             echo 'FILES_OK'
                         else
                             echo 'FILES_MISSING'
@@ -205,13 +214,13 @@ for SPAN in "${SPANS_ARRAY[@]}"; do
 
                     # Copy files
                     scp -o StrictHostKeyChecking=no "root@$NODE_IP:$OUTDIR/metadata.json" "$LOCAL_OUTDIR/" 2>/dev/null || true
-                    scp -o StrictHostKeyChecking=no "root@$NODE_IP:$OUTDIR/logits.jsonl.gz" "$LOCAL_OUTDIR/" 2>/dev/null || true
+                    scp -o StrictHostKeyChecking=no "root@$NODE_IP:$OUTDIR/$LOGITS_FILE" "$LOCAL_OUTDIR/" 2>/dev/null || true
                     scp -o StrictHostKeyChecking=no "root@$NODE_IP:$OUTDIR/run.log" "$LOCAL_OUTDIR/" 2>/dev/null || true
 
                     # Generate perf.json
                     LOGITS_BYTES=0
-                    if [ -f "$LOCAL_OUTDIR/logits.jsonl.gz" ]; then
-                        LOGITS_BYTES=$(stat -c%s "$LOCAL_OUTDIR/logits.jsonl.gz" 2>/dev/null || echo 0)
+                    if [ -f "$LOCAL_OUTDIR/$LOGITS_FILE" ]; then
+                        LOGITS_BYTES=$(stat -c%s "$LOCAL_OUTDIR/$LOGITS_FILE" 2>/dev/null || echo 0)
                     fi
 
                     cat > "$LOCAL_OUTDIR/perf.json" << PERF_EOF
@@ -222,7 +231,8 @@ for SPAN in "${SPANS_ARRAY[@]}"; do
   "seed": $SEED,
   "mode": "$MODE",
   "wall_time_sec": $WALL_TIME,
-  "logits_gz_bytes": $LOGITS_BYTES
+  "logits_gz_bytes": $LOGITS_BYTES,
+  "logits_format": "$LOGITS_FORMAT"
 }
 PERF_EOF
 
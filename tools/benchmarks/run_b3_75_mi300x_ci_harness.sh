@@ -43,6 +43,14 @@ INTERNAL_TRACE_SPAN="32"
 DUMP_SPAN_DEFAULT="32"
 BASELINE="baselines/mi300x/b3_75_perf_baseline.json"
 OUT_ROOT="artifacts_remote"
+# B3.91: logits dump format (GRETA_DUMP_LOGITS_FORMAT=jsonl|f32|f16).
+# jsonl writes logits.jsonl.gz, f32/f16 write the mmap-able logits.bin
+LOGITS_FORMAT="${GRETA_DUMP_LOGITS_FORMAT:-jsonl}"
+if [ "$LOGITS_FORMAT" = "jsonl" ]; then
+    LOGITS_FILE="logits.jsonl.gz"
+else
+    LOGITS_FILE="logits.bin"
+fi
 DRY_RUN=0
 
 # Parse flags
@@ -293,7 +301,8 @@ cat > "$LOCAL_RUNS_DIR/config.json" << EOF
     "modes": ["prefill", "decode"]
   },
   "internal_trace_policy": "$INTERNAL_TRACE",
-  "dump_format_version": "B3.69 logits.jsonl.gz",
+  "dump_format_version": "B3.69 $LOGITS_FILE",
+  "logits_format": "$LOGITS_FORMAT",
   "timestamp": "$TIMESTAMP",
   "deterministic_env": [
     "HIP_LAUNCH_BLOCKING=1",
@@ -371,6 +380,7 @@ for SPAN in "${SPAN_ARR[@]}"; do
                                 --mode $MODE \
                                 --dump-logits $MODE_REMOTE_OUT \
                                 --dump-logits-span $SPAN \
+                                --dump-logits-format $LOGITS_FORMAT \
                                 --dtype $DTYPE \
                                 --max-tokens 1 \
                                 --greedy \
@@ -386,7 +396,7 @@ for SPAN in "${SPAN_ARR[@]}"; do
                         WALL_TIME=$(echo "$END_TS - $START_TS" | bc)
                         
                         # Verify Logic
-                        FILES_EXIST=$(ssh $SSH_OPTS "root@$HOST" "ls $MODE_REMOTE_OUT/logits.jsonl.gz 2>/dev/null")
+                        FILES_EXIST=$(ssh $SSH_OPTS "root@$HOST" "ls $MODE_REMOTE_OUT/$LOGITS_FILE 2>/dev/null")
                         
                         if [ -z "$FILES_EXIST" ]; then
                             echo "    [FAIL] $MODE: Missing logits!"
@@ -396,11 +406,11 @@ for SPAN in "${SPAN_ARR[@]}"; do
                             
                             # SCP Back
                             scp -q $SSH_OPTS "root@$HOST:$MODE_REMOTE_OUT/metadata.json" "$MODE_LOCAL_OUT/" || true
-                            scp -q $SSH_OPTS "root@$HOST:$MODE_REMOTE_OUT/logits.jsonl.gz" "$MODE_LOCAL_OUT/" || true
+                            scp -q $SSH_OPTS "root@$HOST:$MODE_REMOTE_OUT/$LOGITS_FILE" "$MODE_LOCAL_OUT/" || true
                             scp -q $SSH_OPTS "root@$HOST:$MODE_REMOTE_OUT/internal.jsonl.gz" "$MODE_LOCAL_OUT/" 2>/dev/null || true
                             
                             # Gen Perf JSON
-                            LOGITS_BYTES=$(stat -c%s "$MODE_LOCAL_OUT/logits.jsonl.gz" 2>/dev/null || echo 0)
+                            LOGITS_BYTES=$(stat -c%s "$MODE_LOCAL_OUT/$LOGITS_FILE" 2>/dev/null || echo 0)
                             INTERNAL_BYTES=$(stat -c%s "$MODE_LOCAL_OUT/internal.jsonl.gz" 2>/dev/null || echo 0)
                             METADATA_BYTES=$(stat -c%s "$MODE_LOCAL_OUT/metadata.json" 2>/dev/null || echo 0)
                             
@@ -415,6 +425,7 @@ for SPAN in "${SPAN_ARR[@]}"; do
   "mode": "$MODE",
   "wall_time_sec": $WALL_TIME,
   "logits_gz_bytes": $LOGITS_BYTES,
+  "logits_format": "$LOGITS_FORMAT",
   "metadata_bytes": $METADATA_BYTES,
   "internal_trace_bytes": $INTERNAL_BYTES
 }
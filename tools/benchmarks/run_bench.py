@@ -1,16 +1,53 @@
 #!/usr/bin/env python3
+import argparse
 import json
-import subprocess
+import math
 import os
+import random
+import shlex
+import statistics
+import subprocess
 import sys
+import time
+from pathlib import Path
 
 # ES — Runner de Benchmarks GRETA CORE
 # EN — GRETA CORE Benchmark Runner
+#
+# Runs every scenario of bench_suite.yaml with warmup + measured repetitions
+# and reports mean / median / p95 with bootstrap confidence intervals for
+# TTFT, prefill ms/token and decode tok/s. Writes results.json next to the
+# human-readable report.txt; --results-db also ingests it into the SQLite
+# results store (results_store.py) for regression checks.
+#
+# No requiere PyYAML: si no está instalado se usa un parser mínimo para el
+# subconjunto de YAML de bench_suite.yaml.
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+
+DEFAULTS = {
+    'warmup': 1,
+    'repetitions': 5,
+    'bootstrap': 2000,
+    'confidence': 0.95,
+}
+
+METRICS = [
+    # key, label, unit, higher_is_better
+    ('ttft_ms', 'TTFT', 'ms', False),
+    ('prefill_ms_per_token', 'Prefill', 'ms/token', False),
+    ('decode_tok_s', 'Decode', 'tok/s', True),
+]
+
+PROMPT_WORDS = ("the quick brown fox jumps over the lazy dog while a model "
+                "reads long context and keeps every token in cache").split()
+
 
 def run_command(cmd, env=None):
-    process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, shell=True, env=env)
+    process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, env=env)
     stdout, stderr = process.communicate()
-    return stdout.decode(), stderr.decode(), process.returncode
+    return stdout.decode(errors='replace'), stderr.decode(errors='replace'), process.returncode
+
 
 def parse_stats(output):
     stats = {}
@@ -23,53 +60,376 @@ def parse_stats(output):
             stats['tps'] = float(line.split(':')[-1].strip())
         if "Time to first token:" in line:
             stats['ttft'] = float(line.split(':')[-1].strip().split()[0])
+        if "Total time:" in line:
+            stats['total_ms'] = float(line.split(':')[-1].strip().split()[0])
     return stats
 
-def main():
-    # Load reference H100 data
-    with open('reference_h100_cuda.json', 'r') as f:
-        reference = json.load(f)
-
-    # Simplified scenario execution (since we don't assume PyYAML)
-    scenarios = [
-        {"name": "Llama-3-8B Prefill Short", "bs": 1, "tokens": 128},
-        {"name": "Llama-3-8B Decode Batch 1", "bs": 1, "tokens": 32},
-    ]
-
-    print(f"\n{'='*80}")
-    print(f"{'GRETA CORE BENCHMARK REPORT':^80}")
-    print(f"{'Target: MI300X vs Reference H100':^80}")
-    print(f"{'='*80}\n")
-
-    for s in scenarios:
-        print(f"[*] Running: {s['name']} (Batch Size: {s['bs']})")
-        
-        env = os.environ.copy()
-        env["GRETA_PROFILE_BLOCKS"] = "1"
-        
-        # Note: In a real run we would use actual weights, here we might run in demo mode if weights are missing
-        cmd = f"../inference/build/greta_infer --batch-size {s['bs']} --max-tokens {s['tokens']}"
-        
+
+def derive_metrics(stats):
+    """Per-run metrics from greta_infer stats (see bench_harness.py for decode)."""
+    ttft = stats.get('ttft')
+    prompt_tokens = stats.get('prompt_tokens', 0)
+    generated = stats.get('generated_tokens', 0)
+    total_ms = stats.get('total_ms')
+    metrics = {'ttft_ms': ttft, 'tps_e2e': stats.get('tps')}
+    metrics['prefill_ms_per_token'] = ttft / prompt_tokens if ttft is not None and prompt_tokens > 0 else None
+    # TotalTime = TTFT + DecodeTime; the first token is already in TTFT
+    decode_ms = (total_ms - ttft) if total_ms is not None and ttft is not None else 0
+    metrics['decode_tok_s'] = (generated - 1) / (decode_ms / 1000.0) if decode_ms > 0 and generated > 1 else None
+    return metrics
+
+
+# ---------------------------------------------------------------------------
+# Suite loading
+# ---------------------------------------------------------------------------
+
+def _yaml_scalar(text):
+    text = text.strip()
+    if not text:
+        return None
+    if text[0] in '"\'' and text[-1] == text[0]:
+        return text[1:-1]
+    if text in ('true', 'True', 'yes'):
+        return True
+    if text in ('false', 'False', 'no'):
+        return False
+    if text in ('null', '~'):
+        return None
+    try:
+        return int(text)
+    except ValueError:
+        pass
+    try:
+        return float(text)
+    except ValueError:
+        return text
+
+
+def _strip_comment(line):
+    quote = None
+    for i, ch in enumerate(line):
+        if ch in '"\'':
+            quote = None if quote == ch else (quote or ch)
+        elif ch == '#' and quote is None and (i == 0 or line[i - 1].isspace()):
+            return line[:i]
+    return line
+
+
+def parse_simple_yaml(text):
+    """Subset of YAML used by bench_suite.yaml: top-level scalars, or keys
+    holding a flat mapping or a list of flat mappings (`- key: value`)."""
+    doc = {}
+    key = None
+    item = None
+    for raw in text.splitlines():
+        line = _strip_comment(raw).rstrip()
+        if not line.strip():
+            continue
+        body = line.strip()
+        if not line[0].isspace():
+            key, _, value = body.partition(':')
+            key = key.strip()
+            doc[key] = _yaml_scalar(value)  # None until the first child line
+            item = None
+            continue
+        if key is None:
+            raise ValueError(f"unexpected indented line: {raw!r}")
+        if body.startswith('-'):
+            if doc[key] is None:
+                doc[key] = []
+            item = {}
+            doc[key].append(item)
+            body = body[1:].strip()
+            if not body:
+                continue
+        k, _, v = body.partition(':')
+        if isinstance(doc[key], list):
+            item[k.strip()] = _yaml_scalar(v)
+        else:
+            if doc[key] is None:
+                doc[key] = {}
+            doc[key][k.strip()] = _yaml_scalar(v)
+    return doc
+
+
+def load_suite(path):
+    text = Path(path).read_text()
+    try:
+        import yaml
+    except ImportError:
+        return parse_simple_yaml(text)
+    return yaml.safe_load(text)
+
+
+# ---------------------------------------------------------------------------
+# Statistics
+# ---------------------------------------------------------------------------
+
+def percentile(sorted_vals, q):
+    """Linear-interpolated percentile of an ascending list (q in [0, 100])."""
+    if not sorted_vals:
+        return None
+    if len(sorted_vals) == 1:
+        return sorted_vals[0]
+    pos = (len(sorted_vals) - 1) * q / 100.0
+    lo = math.floor(pos)
+    hi = min(lo + 1, len(sorted_vals) - 1)
+    return sorted_vals[lo] + (sorted_vals[hi] - sorted_vals[lo]) * (pos - lo)
+
+
+def bootstrap_ci(values, stat, iterations, confidence, rng):
+    """Percentile bootstrap confidence interval of stat(values)."""
+    if len(values) < 2 or iterations <= 0:
+        return None
+    n = len(values)
+    estimates = sorted(stat(rng.choices(values, k=n)) for _ in range(iterations))
+    alpha = (1.0 - confidence) / 2.0
+    return [percentile(estimates, 100 * alpha), percentile(estimates, 100 * (1 - alpha))]
+
+
+def summarize(values, iterations, confidence, rng):
+    values = [v for v in values if v is not None]
+    if not values:
+        return None
+    s = sorted(values)
+    p95 = lambda xs: percentile(sorted(xs), 95)
+    return {
+        'n': len(values),
+        'mean': statistics.fmean(values),
+        'median': statistics.median(values),
+        'p95': percentile(s, 95),
+        'stdev': statistics.stdev(values) if len(values) > 1 else 0.0,
+        'min': s[0],
+        'max': s[-1],
+        'mean_ci': bootstrap_ci(values, statistics.fmean, iterations, confidence, rng),
+        'median_ci': bootstrap_ci(values, statistics.median, iterations, confidence, rng),
+        'p95_ci': bootstrap_ci(values, p95, iterations, confidence, rng),
+    }
+
+
+# ---------------------------------------------------------------------------
+# Scenario execution
+# ---------------------------------------------------------------------------
+
+def make_prompt(n_words):
+    return ' '.join(PROMPT_WORDS[i % len(PROMPT_WORDS)] for i in range(max(1, n_words)))
+
+
+def scenario_command(args, sc):
+    cmd = [args.binary]
+    if args.model:
+        cmd += ['--model', args.model]
+    if sc.get('type') == 'prefill':
+        # Prefill: TTFT of a prompt_len prompt, a single generated token
+        max_tokens = 1
+        prompt_len = int(sc.get('prompt_len', 128))
+    else:
+        max_tokens = int(sc.get('max_new_tokens', 32))
+        prompt_len = int(sc.get('prompt_len', 16))
+    cmd += ['--prompt', make_prompt(prompt_len),
+            '--batch-size', str(sc.get('batch_size', 1)),
+            '--max-tokens', str(max_tokens),
+            '--greedy']
+    if args.demo_tokenizer:
+        cmd.append('--demo-tokenizer')
+    cmd += shlex.split(args.extra_args or '')
+    return cmd
+
+
+def run_scenario(args, sc, settings, rng):
+    env = os.environ.copy()
+    for k, v in (sc.get('env') or {}).items():
+        env[str(k)] = str(v)
+    cmd = scenario_command(args, sc)
+    warmup = int(sc.get('warmup', settings['warmup']))
+    reps = int(sc.get('repetitions', settings['repetitions']))
+
+    result = {
+        'name': sc.get('name'),
+        'type': sc.get('type'),
+        'batch_size': sc.get('batch_size', 1),
+        'prompt_len': sc.get('prompt_len'),
+        'max_new_tokens': sc.get('max_new_tokens'),
+        'target': sc.get('target'),
+        'warmup': warmup,
+        'repetitions': reps,
+        'command': cmd,
+        'runs': [],
+        'errors': [],
+    }
+
+    for i in range(warmup + reps):
+        measured = i >= warmup
+        label = f"rep {i - warmup + 1}/{reps}" if measured else f"warmup {i + 1}/{warmup}"
+        t0 = time.perf_counter()
         stdout, stderr, code = run_command(cmd, env=env)
-        
+        wall_s = time.perf_counter() - t0
         if code != 0:
-            print(f" [!] Error running benchmark: {stderr}")
+            msg = (stderr.strip().splitlines() or [f"exit code {code}"])[-1]
+            print(f"  [!] {label}: error ({msg})")
+            if measured:
+                result['errors'].append({'rep': i - warmup, 'code': code, 'stderr': stderr[-2000:]})
             continue
-
         stats = parse_stats(stdout)
-        
-        # Find competitive reference
-        ref_val = "N/A"
-        if "Decode" in s['name'] and s['bs'] == 1:
-            ref_val = reference['benchmarks']['decode'][0]['tokens_per_second']
-            perf_ratio = (stats['tps'] / ref_val) * 100
-            print(f"  - GRETA MI300X: {stats['tps']:.2f} tok/s")
-            print(f"  - CUDA H100 Ref: {ref_val:.2f} tok/s")
-            print(f"  - Performance: {perf_ratio:.1f}% of H100")
-        
-        print(f"{'-'*80}")
-
-    print("\n[✔] Benchmark complete. Audit logs captured in GRETA_L1_AUDIT.\n")
+        metrics = derive_metrics(stats)
+        print(f"  - {label}: TTFT {_fmt(metrics['ttft_ms'])} ms, "
+              f"decode {_fmt(metrics['decode_tok_s'])} tok/s")
+        if measured:
+            result['runs'].append({'stats': stats, 'metrics': metrics, 'wall_s': wall_s})
+
+    result['summary'] = {
+        key: summarize([r['metrics'][key] for r in result['runs']],
+                       settings['bootstrap'], settings['confidence'], rng)
+        for key, _, _, _ in METRICS
+    }
+    return result
+
+
+def reference_for(reference, sc):
+    """Matching H100 reference value for the scenario target, or None."""
+    if not reference:
+        return None
+    bench = reference.get('benchmarks', {})
+    if sc.get('type') == 'prefill':
+        for r in bench.get('prefill', []):
+            if r.get('prompt_len') == sc.get('prompt_len') and r.get('batch_size') == sc.get('batch_size', 1):
+                return {'metric': 'prefill_ms_per_token', 'value': r.get('ms_per_token')}
+    elif sc.get('type') == 'decode' and sc.get('batch_size', 1) == 1:
+        # Batched references are aggregate tok/s; greta_infer reports per-sequence
+        for r in bench.get('decode', []):
+            if r.get('batch_size') == sc.get('batch_size', 1):
+                return {'metric': 'decode_tok_s', 'value': r.get('tokens_per_second')}
+    return None
+
+
+# ---------------------------------------------------------------------------
+# Report
+# ---------------------------------------------------------------------------
+
+def _fmt(v, digits=2):
+    return "N/A" if v is None else f"{v:.{digits}f}"
+
+
+def _fmt_ci(ci, digits=2):
+    return "N/A" if not ci else f"[{ci[0]:.{digits}f}, {ci[1]:.{digits}f}]"
+
+
+def render_report(results, settings):
+    conf = int(round(settings['confidence'] * 100))
+    lines = []
+    lines.append('=' * 100)
+    lines.append(f"{'GRETA CORE BENCHMARK REPORT':^100}")
+    lines.append(f"{'Target: MI300X vs Reference H100':^100}")
+    lines.append('=' * 100)
+    lines.append(f"Suite: {results['suite']}")
+    lines.append(f"Binary: {results['binary']}")
+    lines.append(f"Bootstrap: {settings['bootstrap']} resamples, {conf}% CI")
+    lines.append('')
+    header = (f"{'Scenario':<30} {'Metric':<18} {'n':>3} {'mean':>10} {f'mean {conf}% CI':>22} "
+              f"{'median':>10} {'p95':>10} {'H100':>8}")
+    lines.append(header)
+    lines.append('-' * len(header))
+    for sc in results['scenarios']:
+        ref = sc.get('reference')
+        for key, label, unit, _ in METRICS:
+            s = sc['summary'].get(key)
+            if s is None:
+                continue
+            ref_txt = _fmt(ref['value']) if ref and ref['metric'] == key else ''
+            lines.append(f"{sc['name']:<30.30} {f'{label} ({unit})':<18} {s['n']:>3} {_fmt(s['mean']):>10} "
+                         f"{_fmt_ci(s['mean_ci']):>22} {_fmt(s['median']):>10} {_fmt(s['p95']):>10} {ref_txt:>8}")
+        if sc['errors']:
+            lines.append(f"{sc['name']:<30.30} {len(sc['errors'])} failed repetition(s)")
+        if ref and sc['summary'].get(ref['metric']) and ref['value']:
+            mean = sc['summary'][ref['metric']]['mean']
+            # Percent of H100: higher is better for tok/s, lower for ms/token
+            ratio = mean / ref['value'] if ref['metric'] == 'decode_tok_s' else ref['value'] / mean
+            lines.append(f"{'':<30} Performance: {ratio * 100:.1f}% of H100")
+        lines.append('-' * len(header))
+    return '\n'.join(lines) + '\n'
+
+
+def main():
+    ap = argparse.ArgumentParser(description='GRETA CORE benchmark suite runner')
+    ap.add_argument('--suite', default=str(SCRIPT_DIR / 'bench_suite.yaml'))
+    ap.add_argument('--binary', default=str(SCRIPT_DIR.parent / 'inference' / 'build' / 'greta_infer'))
+    ap.add_argument('--model', default=os.environ.get('GRETA_MODEL'), help='Model path (also GRETA_MODEL env)')
+    ap.add_argument('--reference', default=str(SCRIPT_DIR / 'reference_h100_cuda.json'))
+    ap.add_argument('--scenario', action='append', default=[],
+                    help='Run only scenarios whose name contains this text (repeatable)')
+    ap.add_argument('--warmup', type=int, help='Warmup runs per scenario (overrides suite)')
+    ap.add_argument('--reps', type=int, help='Measured repetitions per scenario (overrides suite)')
+    ap.add_argument('--bootstrap', type=int, help='Bootstrap resamples for CIs (overrides suite)')
+    ap.add_argument('--confidence', type=float, help='CI confidence level, e.g. 0.95 (overrides suite)')
+    ap.add_argument('--seed', type=int, default=0, help='Bootstrap RNG seed')
+    ap.add_argument('--demo-tokenizer', action='store_true')
+    ap.add_argument('--extra-args', default='', help='Extra greta_infer arguments')
+    ap.add_argument('--out-dir', default=None,
+                    help='Output directory (default: bench_results/<timestamp>)')
+    ap.add_argument('--results-db', nargs='?', const='', default=None,
+                    help='Ingest results.json into the results store (default DB: GRETA_RESULTS_DB '
+                         'or bench_results/results.sqlite)')
+    ap.add_argument('--commit', default=None, help='Commit recorded in results.json and the results store (default: git HEAD)')
+    args = ap.parse_args()
+
+    suite = load_suite(args.suite)
+    settings = dict(DEFAULTS)
+    settings.update({k: v for k, v in (suite.get('defaults') or {}).items() if k in DEFAULTS})
+    for key, value in (('warmup', args.warmup), ('repetitions', args.reps),
+                       ('bootstrap', args.bootstrap), ('confidence', args.confidence)):
+        if value is not None:
+            settings[key] = value
+
+    scenarios = suite.get('scenarios') or []
+    if args.scenario:
+        scenarios = [s for s in scenarios if any(f in s.get('name', '') for f in args.scenario)]
+    if not scenarios:
+        print("[!] No scenarios selected")
+        return 1
+
+    reference = None
+    if args.reference and Path(args.reference).exists():
+        with open(args.reference, 'r') as f:
+            reference = json.load(f)
+
+    out_dir = Path(args.out_dir) if args.out_dir else SCRIPT_DIR / 'bench_results' / time.strftime('%Y%m%d_%H%M%S')
+    out_dir.mkdir(parents=True, exist_ok=True)
+    rng = random.Random(args.seed)
+
+    from results_store import git_commit
+    print(f"[*] Suite: {args.suite} ({len(scenarios)} scenarios, "
+          f"warmup={settings['warmup']}, reps={settings['repetitions']})")
+    results = {
+        'suite': str(args.suite),
+        'binary': args.binary,
+        'model': args.model,
+        'settings': settings,
+        'seed': args.seed,
+        'commit': args.commit or git_commit(SCRIPT_DIR),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'scenarios': [],
+    }
+    for sc in scenarios:
+        print(f"[*] Running: {sc.get('name')} (Batch Size: {sc.get('batch_size', 1)})")
+        res = run_scenario(args, sc, settings, rng)
+        res['reference'] = reference_for(reference, sc)
+        results['scenarios'].append(res)
+
+    report = render_report(results, settings)
+    (out_dir / 'report.txt').write_text(report)
+    with open(out_dir / 'results.json', 'w') as f:
+        json.dump(results, f, indent=2)
+
+    print('\n' + report)
+    print(f"[✔] Results: {out_dir / 'results.json'}")
+    print(f"[✔] Report:  {out_dir / 'report.txt'}")
+    if args.results_db is not None:
+        from results_store import ResultsStore, ingest_path
+        with ResultsStore(args.results_db or None) as store:
+            ingest_path(store, out_dir / 'results.json', commit=args.commit)
+    failed = sum(1 for s in results['scenarios'] if not s['runs'])
+    return 1 if failed == len(results['scenarios']) else 0
+
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -0,0 +1,346 @@
+#!/usr/bin/env python3
+"""
+B3.95 Stage Trace Reader
+
+Reads StageTrace output written by greta_infer with GRETA_TRACE_STAGE=1:
+
+- Binary (GRETA_TRACE_STAGE_FORMAT=bin): stream of records, each an 8-byte
+  header (u32 type, u32 payload_bytes) plus payload. See StageTensorRecord /
+  StageLogitsRecord in src/inference/include/gcore/inference/stage_trace.hpp.
+
+      HEADER  "GRETASTG", u32 version     starts a file/shard/appended run
+      STRING  u32 id, utf-8 bytes         interned prompt_id/phase/point/...
+      TENSOR  StageTensorRecord (160 B) + sample_n float32
+      LOGITS  StageLogitsRecord (88 B)
+
+  load_stage_trace() returns NumPy structured arrays (`tensors`, `logits`)
+  plus one flat float32 `samples` array; string ids are remapped into a
+  single `strings` table.
+- JSONL (default): one JSON object per line.
+
+load_stage_rows() detects the format from the file contents and returns
+JSONL-shaped dicts for either, including rotated shards (<path>.1, ...).
+No requiere numpy para load_stage_rows (fallback con struct).
+"""
+
+import json
+import mmap
+import struct
+from pathlib import Path
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional
+    np = None
+
+STAGE_BIN_MAGIC = b'GRETASTG'
+STAGE_BIN_VERSION = 1
+
+REC_HEADER, REC_STRING, REC_TENSOR, REC_LOGITS = 0, 1, 2, 3
+RECORD_HEADER = struct.Struct('<II')
+
+TENSOR_FIELDS = [
+    ('token_index', '<u8'), ('stride_elems', '<u8'), ('ptr', '<u8'),
+    ('offset_bytes', '<u8'), ('hash', '<u8'), ('nz_count', '<u8'),
+    ('in_offset_bytes', '<u8'), ('in_alloc_bytes', '<u8'),
+    ('prompt_id', '<u4'), ('phase_id', '<u4'), ('point_id', '<u4'),
+    ('layer', '<i4'), ('step', '<u4'), ('pos_id', '<u4'), ('seq_len', '<u4'),
+    ('tokens_total', '<u4'), ('sample_n', '<u4'), ('nan', '<i4'), ('inf', '<i4'),
+    ('flags', '<u4'),
+    ('min', '<f4'), ('max', '<f4'), ('mean', '<f4'), ('abs_sum', '<f4'),
+    ('src_kind_id', '<u4'), ('token_index_used', '<u4'), ('prompt_tokens', '<u4'),
+    ('kv_pos', '<u4'), ('decode_step', '<u4'), ('token_id', '<u4'),
+    ('route_id', '<u4'), ('reserved', '<u4'),
+]
+
+LOGITS_FIELDS = [
+    ('hash', '<u8'), ('vocab', '<u8'), ('logits_ptr', '<u8'),
+    ('logits_offset_bytes', '<u8'),
+    ('prompt_id', '<u4'), ('phase_id', '<u4'), ('step', '<u4'), ('pos_id', '<u4'),
+    ('seq_len', '<u4'), ('tokens_total', '<u4'),
+    ('min', '<f4'), ('max', '<f4'), ('mean', '<f4'), ('top1_id', '<i4'),
+    ('top1_logit', '<f4'), ('top2_id', '<i4'), ('top2_logit', '<f4'), ('gap', '<f4'),
+]
+
+_STRUCT_CODES = {'<u8': 'Q', '<u4': 'I', '<i4': 'i', '<f4': 'f'}
+
+
+def _fields_struct(fields):
+    return struct.Struct('<' + ''.join(_STRUCT_CODES[t] for _, t in fields))
+
+
+TENSOR_STRUCT = _fields_struct(TENSOR_FIELDS)
+LOGITS_STRUCT = _fields_struct(LOGITS_FIELDS)
+assert TENSOR_STRUCT.size == 160 and LOGITS_STRUCT.size == 88
+
+# Per-record id columns that refer to the string table
+_TENSOR_ID_FIELDS = ('prompt_id', 'phase_id', 'point_id', 'src_kind_id', 'route_id')
+_LOGITS_ID_FIELDS = ('prompt_id', 'phase_id')
+
+
+def stage_trace_files(path) -> list:
+    """`path` followed by its rotated shards <path>.1, <path>.2, ... that exist."""
+    path = Path(path)
+    files = [path] if path.exists() else []
+    idx = 1
+    while True:
+        shard = path.with_name(f'{path.name}.{idx}')
+        if not shard.exists():
+            break
+        files.append(shard)
+        idx += 1
+    return files
+
+
+def is_stage_trace_bin(path) -> bool:
+    with open(path, 'rb') as f:
+        head = f.read(RECORD_HEADER.size + len(STAGE_BIN_MAGIC))
+    if len(head) < RECORD_HEADER.size + len(STAGE_BIN_MAGIC):
+        return False
+    rtype, _ = RECORD_HEADER.unpack_from(head, 0)
+    return rtype == REC_HEADER and head[RECORD_HEADER.size:] == STAGE_BIN_MAGIC
+
+
+class _Scan:
+    """Record offsets of one or more binary files, with ids remapped to one string table."""
+
+    def __init__(self):
+        self.strings = ['']
+        self._string_ids = {'': 0}
+        self.tensors = []   # (buf, payload_offset, payload_bytes, segment)
+        self.logits = []    # (buf, payload_offset, segment)
+        self.order = []     # (kind, index) in file order
+        self.luts = []      # per segment: local id -> global id
+
+    def _global_id(self, text: str) -> int:
+        gid = self._string_ids.get(text)
+        if gid is None:
+            gid = len(self.strings)
+            self._string_ids[text] = gid
+            self.strings.append(text)
+        return gid
+
+    def scan(self, buf, name: str):
+        pos = 0
+        size = len(buf)
+        seg = None
+        while pos + RECORD_HEADER.size <= size:
+            rtype, nbytes = RECORD_HEADER.unpack_from(buf, pos)
+            payload = pos + RECORD_HEADER.size
+            if payload + nbytes > size:
+                break  # truncated tail (process killed mid-write)
+            if rtype == REC_HEADER:
+                if bytes(buf[payload:payload + 8]) != STAGE_BIN_MAGIC:
+                    raise ValueError(f"{name}: bad magic at offset {pos}")
+                (version,) = struct.unpack_from('<I', buf, payload + 8)
+                if version != STAGE_BIN_VERSION:
+                    raise ValueError(f"{name}: unsupported version {version}")
+                self.luts.append({0: 0})
+                seg = len(self.luts) - 1
+            elif seg is None:
+                raise ValueError(f"{name}: missing GRETASTG header")
+            elif rtype == REC_STRING:
+                (local,) = struct.unpack_from('<I', buf, payload)
+                text = bytes(buf[payload + 4:payload + nbytes]).decode('utf-8', 'replace')
+                self.luts[seg][local] = self._global_id(text)
+            elif rtype == REC_TENSOR:
+                self.order.append((REC_TENSOR, len(self.tensors)))
+                self.tensors.append((buf, payload, nbytes, seg))
+            elif rtype == REC_LOGITS:
+                self.order.append((REC_LOGITS, len(self.logits)))
+                self.logits.append((buf, payload, seg))
+            # Unknown record types are skipped
+            pos = payload + nbytes
+
+    def lut_array(self, seg):
+        lut = self.luts[seg]
+        arr = np.zeros(max(lut) + 1, dtype=np.uint32)
+        for local, gid in lut.items():
+            arr[local] = gid
+        return arr
+
+
+class StageTrace:
+    """Binary stage trace as NumPy structured arrays.
+
+    tensors: TENSOR records; `sample_offset` indexes `samples` (sample_n values).
+    logits:  LOGITS records.
+    strings: table for every *_id column (prompt_id, phase_id, point_id, ...).
+    """
+
+    TENSOR_DTYPE = np.dtype(TENSOR_FIELDS) if np is not None else None
+    LOGITS_DTYPE = np.dtype(LOGITS_FIELDS) if np is not None else None
+
+    def __init__(self, tensors, samples, logits, strings, order):
+        self.tensors = tensors
+        self.samples = samples
+        self.logits = logits
+        self.strings = strings
+        self.order = order
+
+    def string(self, sid: int) -> str:
+        return self.strings[int(sid)]
+
+    def sample(self, i):
+        """float32 samples of tensor record i (view into `samples`)."""
+        off = int(self.tensors['sample_offset'][i])
+        return self.samples[off:off + int(self.tensors['sample_n'][i])]
+
+    def select(self, phase=None, point=None, layer=None, prompt_id=None):
+        """Boolean mask over `tensors` for the given phase/point/layer/prompt."""
+        t = self.tensors
+        mask = np.ones(len(t), dtype=bool)
+        for col, text in (('phase_id', phase), ('point_id', point), ('prompt_id', prompt_id)):
+            if text is not None:
+                sid = self.strings.index(text) if text in self.strings else -1
+                mask &= t[col] == sid
+        if layer is not None:
+            mask &= t['layer'] == layer
+        return mask
+
+
+def _remap_ids(arr, segs, scan, id_fields):
+    for seg in np.unique(segs).tolist():
+        lut = scan.lut_array(seg)
+        sel = segs == seg
+        for col in id_fields:
+            local = arr[col][sel]
+            # Ids never defined in this segment map to "" (0)
+            arr[col][sel] = np.where(local < len(lut), lut[np.minimum(local, len(lut) - 1)], 0)
+
+
+def load_stage_trace(path) -> StageTrace:
+    """Load a binary stage trace (and its rotated shards) into structured arrays."""
+    if np is None:
+        raise ImportError("load_stage_trace requires numpy; use load_stage_rows instead")
+    scan = _Scan()
+    maps = []
+    try:
+        for f in stage_trace_files(path):
+            with open(f, 'rb') as fh:
+                if fh.seek(0, 2) == 0:
+                    continue
+                mm = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+            maps.append(mm)
+            scan.scan(mm, str(f))
+
+        rec = TENSOR_STRUCT.size
+        tensor_raw = b''.join(buf[off:off + rec] for buf, off, _, _ in scan.tensors)
+        base = np.frombuffer(tensor_raw, dtype=StageTrace.TENSOR_DTYPE).copy()
+        tensors = np.zeros(len(base), dtype=StageTrace.TENSOR_DTYPE.descr + [('sample_offset', '<i8')])
+        for name in StageTrace.TENSOR_DTYPE.names:
+            tensors[name] = base[name]
+        sample_raw = b''.join(buf[off + rec:off + n] for buf, off, n, _ in scan.tensors)
+        samples = np.frombuffer(sample_raw, dtype='<f4')
+        if len(tensors):
+            counts = (np.array([n for _, _, n, _ in scan.tensors], dtype=np.int64) - rec) // 4
+            tensors['sample_offset'][1:] = np.cumsum(counts)[:-1]
+            _remap_ids(tensors, np.array([s for *_, s in scan.tensors]), scan, _TENSOR_ID_FIELDS)
+
+        rec = LOGITS_STRUCT.size
+        logits_raw = b''.join(buf[off:off + rec] for buf, off, _ in scan.logits)
+        logits = np.frombuffer(logits_raw, dtype=StageTrace.LOGITS_DTYPE).copy()
+        if len(logits):
+            _remap_ids(logits, np.array([s for *_, s in scan.logits]), scan, _LOGITS_ID_FIELDS)
+    finally:
+        for mm in maps:
+            mm.close()
+    return StageTrace(tensors, samples, logits, scan.strings, scan.order)
+
+
+def _tensor_row(values: dict, strings, sample) -> dict:
+    row = {'event': 'stage_trace'}
+    prompt = strings[values['prompt_id']]
+    if prompt:
+        row['prompt_id'] = prompt
+    row.update({
+        'phase': strings[values['phase_id']],
+        'point': strings[values['point_id']],
+    })
+    for key in ('layer', 'step', 'pos_id', 'seq_len', 'tokens_total', 'token_index',
+                'stride_elems', 'sample_n', 'ptr', 'offset_bytes', 'hash', 'min', 'max',
+                'mean', 'abs_sum', 'nan', 'inf', 'nz_count'):
+        row[key] = values[key]
+    row['sample'] = sample
+    if values['flags'] & 1:
+        row.update({
+            'src_kind': strings[values['src_kind_id']],
+            'token_index_used': values['token_index_used'],
+            'offset_bytes': values['in_offset_bytes'],
+            'alloc_bytes': values['in_alloc_bytes'],
+            'prompt_tokens': values['prompt_tokens'],
+            'kv_pos': values['kv_pos'],
+            'decode_step': values['decode_step'],
+            'token_id': values['token_id'],
+            'route': strings[values['route_id']],
+        })
+    return row
+
+
+def _logits_row(values: dict, strings) -> dict:
+    row = {'event': 'stage_logits'}
+    prompt = strings[values['prompt_id']]
+    if prompt:
+        row['prompt_id'] = prompt
+    row.update({'phase': strings[values['phase_id']], 'point': 'logits', 'layer': -1})
+    for key in ('step', 'pos_id', 'seq_len', 'tokens_total', 'hash', 'min', 'max', 'mean',
+                'top1_id', 'top1_logit', 'top2_id', 'top2_logit', 'gap', 'vocab',
+                'logits_ptr', 'logits_offset_bytes'):
+        row[key] = values[key]
+    return row
+
+
+def _iter_bin_rows(path):
+    """JSONL-shaped dicts from a binary stage trace, in file order.
+
+    Plain struct on purpose: per-row dicts are faster to build this way than
+    from NumPy columns. Use load_stage_trace() for vectorized analysis.
+    """
+    tensor_names = [n for n, _ in TENSOR_FIELDS]
+    logits_names = [n for n, _ in LOGITS_FIELDS]
+    for f in stage_trace_files(path):
+        data = Path(f).read_bytes()
+        if not data:
+            continue
+        scan = _Scan()
+        scan.scan(data, str(f))
+        for kind, idx in scan.order:
+            if kind == REC_TENSOR:
+                buf, off, nbytes, seg = scan.tensors[idx]
+                values = dict(zip(tensor_names, TENSOR_STRUCT.unpack_from(buf, off)))
+                lut = scan.luts[seg]
+                for col in _TENSOR_ID_FIELDS:
+                    values[col] = lut.get(values[col], 0)
+                n = (nbytes - TENSOR_STRUCT.size) // 4
+                sample = list(struct.unpack_from(f'<{n}f', buf, off + TENSOR_STRUCT.size))
+                yield _tensor_row(values, scan.strings, sample)
+            else:
+                buf, off, seg = scan.logits[idx]
+                values = dict(zip(logits_names, LOGITS_STRUCT.unpack_from(buf, off)))
+                lut = scan.luts[seg]
+                for col in _LOGITS_ID_FIELDS:
+                    values[col] = lut.get(values[col], 0)
+                yield _logits_row(values, scan.strings)
+
+
+def _iter_jsonl_rows(path):
+    for f in stage_trace_files(path):
+        with open(f) as fh:
+            for line in fh:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+
+
+def load_stage_rows(path) -> list:
+    """Stage trace rows as JSONL-shaped dicts, from JSONL or binary (auto-detected)."""
+    path = Path(path)
+    if not path.exists():
+        return []
+    if is_stage_trace_bin(path):
+        return list(_iter_bin_rows(path))
+    return list(_iter_jsonl_rows(path))
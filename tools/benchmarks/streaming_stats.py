@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+B3.92 Streaming Diff Statistics
+
+Constant-memory accumulators for the logits comparison (see
+analyze_b3_67_equivalence_guardrail.compute_logits_diff_streaming):
+
+- BoundedTopK: keeps the `capacity` largest values seen. With capacity set to
+  n - p99_index(n) its minimum is exactly the p99 used by the in-memory path.
+- LogLinearHistogram: HDR-style log-linear buckets (64 sub-buckets per power of
+  two, <= 1/64 relative error). Single pass, fixed size, approximate quantiles.
+  NaN and +Inf are counted apart and rank above every bucket.
+
+Both accept Python lists or NumPy arrays; NumPy is used when available.
+"""
+
+import heapq
+import math
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional
+    np = None
+
+
+class BoundedTopK:
+    """Keep the `capacity` largest values pushed so far."""
+
+    def __init__(self, capacity: int):
+        self.capacity = max(1, capacity)
+        self._heap = []        # stdlib: min-heap
+        self._top = None       # numpy: unordered array of kept values
+
+    def threshold(self) -> float:
+        """Smallest kept value once full (values <= threshold cannot enter)."""
+        if self._top is not None:
+            return float(self._top.min()) if self._top.size >= self.capacity else -math.inf
+        return self._heap[0] if len(self._heap) >= self.capacity else -math.inf
+
+    def push_many(self, values):
+        if np is not None and isinstance(values, np.ndarray):
+            self._push_array(values)
+            return
+        heap = self._heap
+        cap = self.capacity
+        for v in values:
+            if len(heap) < cap:
+                heapq.heappush(heap, v)
+            elif v > heap[0]:
+                heapq.heapreplace(heap, v)
+
+    def _push_array(self, values):
+        if self._heap:
+            # Mixed input: move stdlib state into the array representation
+            self._top = np.asarray(self._heap, dtype=np.float64)
+            self._heap = []
+        if self._top is None:
+            self._top = np.empty(0, dtype=np.float64)
+        thr = self.threshold()
+        cand = values[values > thr] if thr > -math.inf else values
+        if not cand.size:
+            return
+        top = np.concatenate([self._top, cand.astype(np.float64, copy=False)])
+        if top.size > self.capacity:
+            cut = top.size - self.capacity
+            top = np.partition(top, cut)[cut:]
+        self._top = top
+
+    def min(self):
+        """Smallest kept value (the k-th largest overall), or None if empty."""
+        if self._top is not None and self._top.size:
+            return float(self._top.min())
+        return self._heap[0] if self._heap else None
+
+
+class LogLinearHistogram:
+    """Log-linear histogram of non-negative values (HDR-style)."""
+
+    SUB_BUCKETS = 64
+
+    def __init__(self):
+        self.counts = {}      # (exponent, sub_bucket) -> count
+        self.zero_count = 0
+        self.nonfinite_count = 0  # NaN / +Inf, never bucketed
+        self.total = 0
+
+    def _key(self, v: float):
+        m, e = math.frexp(v)  # v = m * 2**e, 0.5 <= m < 1
+        return e, int((m - 0.5) * 2 * self.SUB_BUCKETS)
+
+    def add_many(self, values):
+        if np is not None and isinstance(values, np.ndarray):
+            self._add_array(values)
+            return
+        counts = self.counts
+        for v in values:
+            self.total += 1
+            if v <= 0.0:
+                self.zero_count += 1
+                continue
+            if not v < math.inf:  # NaN or +Inf
+                self.nonfinite_count += 1
+                continue
+            key = self._key(v)
+            counts[key] = counts.get(key, 0) + 1
+
+    def _add_array(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        self.total += int(values.size)
+        zeros = int(np.count_nonzero(values <= 0.0))
+        pos = values[(values > 0.0) & (values < math.inf)]
+        self.zero_count += zeros
+        self.nonfinite_count += int(values.size - zeros - pos.size)
+        if not pos.size:
+            return
+        m, e = np.frexp(pos)
+        sub = ((m - 0.5) * (2 * self.SUB_BUCKETS)).astype(np.int64)
+        keys, cnt = np.unique(e.astype(np.int64) * (2 * self.SUB_BUCKETS) + sub, return_counts=True)
+        counts = self.counts
+        for k, c in zip(keys.tolist(), cnt.tolist()):
+            key = divmod(k, 2 * self.SUB_BUCKETS)
+            counts[key] = counts.get(key, 0) + c
+
+    def _upper_edge(self, key) -> float:
+        e, sub = key
+        return math.ldexp(0.5 + (sub + 1) / (2 * self.SUB_BUCKETS), e)
+
+    def value_at_index(self, idx: int) -> float:
+        """Upper edge of the bucket holding the idx-th smallest value (conservative).
+
+        inf when idx falls on a NaN/+Inf value.
+        """
+        if self.total == 0:
+            return None
+        seen = self.zero_count
+        if idx < seen:
+            return 0.0
+        for key in sorted(self.counts):
+            seen += self.counts[key]
+            if idx < seen:
+                return self._upper_edge(key)
+        if self.nonfinite_count or not self.counts:
+            return math.inf if self.nonfinite_count else 0.0
+        return self._upper_edge(max(self.counts))
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+B3.92 streaming_stats checks: stdlib and NumPy paths must agree.
+
+Usage: python3 tools/benchmarks/test_streaming_stats.py
+"""
+
+import math
+import random
+import sys
+
+from streaming_stats import BoundedTopK, LogLinearHistogram, np
+
+
+def check(ok: bool, what: str) -> bool:
+    print(f"{'PASS' if ok else 'FAIL'}: {what}")
+    return ok
+
+
+def histograms(values):
+    """(stdlib, numpy) histograms fed the same values; numpy is None without NumPy."""
+    py = LogLinearHistogram()
+    py.add_many(values)
+    if np is None:
+        return py, None
+    arr = LogLinearHistogram()
+    arr.add_many(np.asarray(values, dtype=np.float64))
+    return py, arr
+
+
+def same(a: LogLinearHistogram, b: LogLinearHistogram) -> bool:
+    return (b is None or
+            (a.counts, a.zero_count, a.nonfinite_count, a.total) ==
+            (b.counts, b.zero_count, b.nonfinite_count, b.total))
+
+
+def main() -> int:
+    print("GRETA CORE: Streaming Stats Test")
+    if np is None:
+        print("NumPy not available: checking the stdlib path only")
+    ok = True
+    rng = random.Random(7)
+    values = [abs(rng.gauss(0.0, 1e-3)) for _ in range(10000)] + [0.0] * 50
+
+    py, arr = histograms(values)
+    ok &= check(same(py, arr), "stdlib and numpy histograms match")
+    k = int(0.99 * len(values)) - 1
+    exact = sorted(values)[k]
+    approx = py.value_at_index(k)
+    ok &= check(exact <= approx <= exact * (1 + 1 / 64),
+                "approx p99 is an upper bound within the bucket width")
+
+    # NaN/+Inf: ningún camino lanza ni los mete en un bucket
+    bad = values[:100] + [math.nan, math.inf, math.nan]
+    py, arr = histograms(bad)
+    ok &= check(py.nonfinite_count == 3 and py.total == len(bad) and
+                sum(py.counts.values()) + py.zero_count == len(bad) - 3,
+                "NaN and Inf are counted apart from the buckets")
+    ok &= check(same(py, arr), "NaN and Inf handled alike by both paths")
+    ok &= check(py.value_at_index(len(bad) - 1) == math.inf and
+                math.isfinite(py.value_at_index(len(bad) - 4)),
+                "non-finite values rank above every bucket")
+
+    top = BoundedTopK(100)
+    top.push_many(values)
+    ok &= check(top.min() == sorted(values)[-100], "BoundedTopK keeps the top k")
+
+    print(f"\nSTATUS={'OK' if ok else 'FAIL'}")
+    return 0 if ok else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
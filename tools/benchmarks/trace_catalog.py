@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+B3.94 Trace Catalog
+
+Single-pass, lazily loaded index of a traces/artifacts directory, shared by
+the loaders in analyze_b3_67_equivalence_guardrail.py.
+
+One os.scandir walk records every directory and its files (size, mtime).
+Path components are parsed into dimensions:
+
+    span_<N> / dtype_<D> / kv_aligned_<K> / seed_<S> / context_<C> /
+    gen_<G> / batch_<B> / <prompt_case> / prefill|decode
+
+Only kv_aligned_<K> is a kv dimension, as in the original loaders; the
+kv_<K> directories of the B3.75/B3.76 layouts parse as prompt_case (those
+loaders take kv_aligned from perf.json, not from the path).
+
+Directories named prefill/decode are runs. Nothing is decompressed or parsed
+during the scan: JSON and JSONL payloads are read on first access through
+TraceDir helpers or a LazyPayload mapping, and only for the runs selected.
+"""
+
+import gzip
+import json
+import os
+from collections.abc import Mapping
+from pathlib import Path
+
+from logits_dump import LOGITS_BIN_NAME, LOGITS_JSONL_NAME, load_logits_entries
+
+MODES = ('prefill', 'decode')
+
+_DIM_PREFIXES = (
+    ('kv_aligned_', 'kv_aligned'),
+    ('span_', 'span'),
+    ('dtype_', 'dtype'),
+    ('seed_', 'seed'),
+    ('context_', 'context'),
+    ('gen_', 'gen'),
+    ('batch_', 'batch'),
+)
+
+
+def _parse_component(name: str):
+    """Map a path component to (dimension, value)."""
+    if name in MODES:
+        return 'mode', name
+    for prefix, dim in _DIM_PREFIXES:
+        if name.startswith(prefix):
+            return dim, name[len(prefix):]
+    return 'prompt_case', name
+
+
+class LazyPayload(Mapping):
+    """Read-only mapping whose callable values are evaluated on first access."""
+
+    def __init__(self, **fields):
+        self._fields = fields
+        self._loaded = {}
+
+    def __getitem__(self, key):
+        if key in self._loaded:
+            return self._loaded[key]
+        value = self._fields[key]
+        if callable(value):
+            value = value()
+        self._loaded[key] = value
+        return value
+
+    def __iter__(self):
+        return iter(self._fields)
+
+    def __len__(self):
+        return len(self._fields)
+
+
+class TraceDir:
+    """One indexed directory: relative layout, parsed dimensions and file stats."""
+
+    __slots__ = ('catalog', 'path', 'layout', 'dims', 'files')
+
+    def __init__(self, catalog, path: str, rel_parts: tuple, files: dict):
+        self.catalog = catalog
+        self.path = path
+        self.files = files  # name -> (size, mtime)
+        self.dims = {}
+        layout = []
+        for part in rel_parts:
+            dim, value = _parse_component(part)
+            layout.append(dim)
+            self.dims[dim] = value
+        self.layout = tuple(layout)
+
+    def __getattr__(self, name):
+        # span / dtype / kv_aligned / seed / mode / prompt_case / ...
+        if name.startswith('_') or name in TraceDir.__slots__:
+            raise AttributeError(name)
+        try:
+            return self.dims[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    @property
+    def is_run(self) -> bool:
+        return bool(self.layout) and self.layout[-1] == 'mode'
+
+    @property
+    def size(self) -> int:
+        return sum(size for size, _ in self.files.values())
+
+    @property
+    def mtime(self) -> float:
+        return max((mtime for _, mtime in self.files.values()), default=0.0)
+
+    @property
+    def parent(self):
+        return self.catalog.dir(os.path.dirname(self.path))
+
+    def has(self, name: str) -> bool:
+        return name in self.files
+
+    def file(self, name: str):
+        """Path of a file in this directory, or None if it was not present at scan time."""
+        return Path(self.path) / name if name in self.files else None
+
+    def logits_path(self):
+        """logits.bin (preferred) or logits.jsonl.gz, or None."""
+        return self.file(LOGITS_BIN_NAME) or self.file(LOGITS_JSONL_NAME)
+
+    def read_json(self, name: str, default=None):
+        path = self.file(name)
+        if path is None:
+            return default
+        with open(path) as f:
+            return json.load(f)
+
+    def read_jsonl_gz(self, name: str) -> list:
+        path = self.file(name)
+        entries = []
+        if path is None:
+            return entries
+        with gzip.open(path, 'rt') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if entry:
+                    entries.append(entry)
+        return entries
+
+    def read_logits(self) -> list:
+        path = self.logits_path()
+        return load_logits_entries(path) if path is not None else []
+
+    def index_row(self) -> dict:
+        return {
+            'path': self.path,
+            'span': self.dims.get('span'),
+            'dtype': self.dims.get('dtype'),
+            'kv_aligned': self.dims.get('kv_aligned'),
+            'seed': self.dims.get('seed'),
+            'mode': self.dims.get('mode'),
+            'size': self.size,
+            'mtime': self.mtime,
+        }
+
+
+class TraceCatalog:
+    """Index of every directory under root, built with one os.scandir walk."""
+
+    def __init__(self, root):
+        self.root = str(root)
+        self._dirs = {}
+        self._scan()
+
+    def _scan(self):
+        seen = set()
+        stack = [(self.root, ())]
+        while stack:
+            path, rel = stack.pop()
+            real = os.path.realpath(path)
+            if real in seen:  # symlink loop
+                continue
+            seen.add(real)
+
+            files = {}
+            subdirs = []
+            try:
+                with os.scandir(path) as it:
+                    for entry in it:
+                        try:
+                            if entry.is_dir():
+                                subdirs.append(entry.name)
+                            elif entry.is_file():
+                                st = entry.stat()
+                                files[entry.name] = (st.st_size, st.st_mtime)
+                        except OSError:
+                            continue
+            except OSError:
+                continue
+
+            self._dirs[path] = TraceDir(self, path, rel, files)
+            # Reverse-sorted push -> sorted pre-order traversal
+            for name in sorted(subdirs, reverse=True):
+                stack.append((os.path.join(path, name), rel + (name,)))
+
+    def __len__(self):
+        return len(self._dirs)
+
+    def dir(self, path):
+        """TraceDir for an indexed path, or None."""
+        return self._dirs.get(str(path))
+
+    def dirs(self):
+        return list(self._dirs.values())
+
+    def runs(self, layout: tuple = None, **filters) -> list:
+        """prefill/decode run directories, optionally matching an exact layout and dimensions.
+
+        Filter values are compared as strings; None means "any".
+        """
+        selected = []
+        for d in self._dirs.values():
+            if not d.is_run:
+                continue
+            if layout is not None and d.layout != tuple(layout):
+                continue
+            if any(v is not None and d.dims.get(k) != str(v) for k, v in filters.items()):
+                continue
+            selected.append(d)
+        return selected
+
+    def files_named(self, name: str) -> list:
+        """Paths of every file called `name` in the tree, in sorted traversal order."""
+        return [Path(d.path) / name for d in self._dirs.values() if name in d.files]
+
+    def index(self) -> list:
+        """Lightweight index rows for all runs."""
+        return [d.index_row() for d in self.runs()]
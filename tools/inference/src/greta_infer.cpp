@@ -1,11 +1,18 @@
 #include "gcore/inference/block_scheduler.hpp"
+#include "gcore/inference/cpu_block_scheduler.hpp"
 #include "gcore/inference/generator.hpp"
 #include "gcore/inference/model_config.hpp"
 #include "gcore/inference/tokenizer.hpp"
+#include "gcore/inference/trace_sink.hpp"
 #include "gcore/inference/weight_loader.hpp"
+#include "gcore/rt/span_tracer.hpp"
 
+#include <algorithm>
 #include <cerrno>
 #include <chrono>
+#include <cmath>
+#include <cstdint>
+#include <cstdio>
 #include <cstdlib>
 #include <cstring>
 #include <fstream>
@@ -16,6 +23,238 @@
 #include <unistd.h>
 #include <zlib.h>
 
+// B3.91: Binary logits dump (logits.bin). Little-endian, 64-byte header,
+// followed by a (token_idx, token_id) table and contiguous rows of vocab
+// elements starting at data_offset (64-byte aligned) so readers can mmap it.
+static const char kLogitsBinMagic[8] = {'G', 'R', 'E', 'T', 'A', 'L', 'G', 'T'};
+static const uint32_t kLogitsBinVersion = 1;
+enum LogitsBinDtype : uint32_t { LOGITS_BIN_F32 = 0, LOGITS_BIN_F16 = 1 };
+
+struct LogitsBinHeader {
+  char magic[8];
+  uint32_t version;
+  uint32_t dtype;
+  uint32_t vocab;
+  uint32_t rows;
+  uint64_t prompt_len;
+  uint64_t index_offset;
+  uint64_t data_offset;
+  uint8_t reserved[16];
+};
+static_assert(sizeof(LogitsBinHeader) == 64, "logits.bin header must be 64B");
+
+static uint16_t logits_f32_to_f16(float f) {
+  uint32_t x;
+  std::memcpy(&x, &f, 4);
+  uint32_t sign = (x >> 16) & 0x8000;
+  uint32_t abs = x & 0x7FFFFFFF;
+  if (abs >= 0x7F800000) // Inf / NaN
+    return sign | 0x7C00 | (abs > 0x7F800000 ? 0x200 : 0);
+  int32_t exp = int32_t(abs >> 23) - 127 + 15;
+  uint32_t mant = abs & 0x7FFFFF;
+  if (exp >= 31)
+    return sign | 0x7C00;
+  if (exp <= 0) {
+    if (exp < -10)
+      return sign;
+    mant |= 0x800000;
+    uint32_t shift = uint32_t(14 - exp);
+    uint32_t h = mant >> shift;
+    uint32_t rem = mant & ((1u << shift) - 1);
+    uint32_t half = 1u << (shift - 1);
+    if (rem > half || (rem == half && (h & 1)))
+      h++;
+    return sign | h;
+  }
+  uint32_t h = (uint32_t(exp) << 10) | (mant >> 13);
+  uint32_t rem = mant & 0x1FFF;
+  if (rem > 0x1000 || (rem == 0x1000 && (h & 1)))
+    h++; // may carry into the exponent, which is the correct rounding
+  return sign | h;
+}
+
+template <typename Entry>
+static bool write_logits_bin(const std::string &path,
+                             const std::vector<Entry> &entries,
+                             size_t prompt_len, bool as_f16) {
+  FILE *fp = std::fopen(path.c_str(), "wb");
+  if (!fp)
+    return false;
+
+  const uint32_t rows = static_cast<uint32_t>(entries.size());
+  const uint32_t vocab =
+      rows > 0 ? static_cast<uint32_t>(entries[0].logits.size()) : 0;
+  const uint64_t index_offset = sizeof(LogitsBinHeader);
+  const uint64_t index_bytes = uint64_t(rows) * 2 * sizeof(uint32_t);
+  const uint64_t data_offset = (index_offset + index_bytes + 63) & ~uint64_t(63);
+
+  LogitsBinHeader hdr{};
+  std::memcpy(hdr.magic, kLogitsBinMagic, sizeof(hdr.magic));
+  hdr.version = kLogitsBinVersion;
+  hdr.dtype = as_f16 ? LOGITS_BIN_F16 : LOGITS_BIN_F32;
+  hdr.vocab = vocab;
+  hdr.rows = rows;
+  hdr.prompt_len = prompt_len;
+  hdr.index_offset = index_offset;
+  hdr.data_offset = data_offset;
+
+  bool ok = std::fwrite(&hdr, sizeof(hdr), 1, fp) == 1;
+
+  std::vector<uint32_t> index(size_t(rows) * 2);
+  for (uint32_t i = 0; i < rows; ++i) {
+    index[2 * i] = static_cast<uint32_t>(prompt_len + i);
+    std::memcpy(&index[2 * i + 1], &entries[i].token_id, sizeof(int32_t));
+  }
+  if (ok && rows > 0)
+    ok = std::fwrite(index.data(), sizeof(uint32_t), index.size(), fp) ==
+         index.size();
+
+  static const uint8_t pad[64] = {0};
+  size_t pad_bytes = data_offset - index_offset - index_bytes;
+  if (ok && pad_bytes > 0)
+    ok = std::fwrite(pad, 1, pad_bytes, fp) == pad_bytes;
+
+  std::vector<uint16_t> half_row;
+  for (uint32_t i = 0; ok && i < rows; ++i) {
+    const auto &row = entries[i].logits;
+    if (row.size() != vocab) {
+      // Rows are fixed-width; a ragged capture means the dump is unusable.
+      ok = false;
+      break;
+    }
+    if (as_f16) {
+      half_row.resize(vocab);
+      for (uint32_t j = 0; j < vocab; ++j)
+        half_row[j] = logits_f32_to_f16(row[j]);
+      ok = std::fwrite(half_row.data(), sizeof(uint16_t), vocab, fp) == vocab;
+    } else {
+      ok = std::fwrite(row.data(), sizeof(float), vocab, fp) == vocab;
+    }
+  }
+
+  ok = (std::fclose(fp) == 0) && ok;
+  return ok;
+}
+
+// B3.97: CPU backend. Same loop as Generator::generate_tokens (prefill the
+// whole prompt, then one token per forward) on CpuBlockScheduler, reusing
+// Generator::sample so greedy/temperature sampling match the HIP path.
+static gcore::inference::AlignmentStep
+make_alignment_step(uint32_t step_idx, int32_t token_id, const float *logits,
+                    size_t vocab) {
+  gcore::inference::AlignmentStep step;
+  step.step = step_idx;
+  step.token_id = token_id;
+  step.logit = logits[token_id];
+  step.logit_min = logits[0];
+  step.logit_max = logits[0];
+  step.nan_count = 0;
+  step.inf_count = 0;
+  double sum = 0;
+  std::vector<std::pair<float, int>> top;
+  for (size_t i = 0; i < vocab; ++i) {
+    float v = logits[i];
+    if (std::isnan(v))
+      step.nan_count++;
+    else if (std::isinf(v))
+      step.inf_count++;
+    else {
+      step.logit_min = std::min(step.logit_min, v);
+      step.logit_max = std::max(step.logit_max, v);
+      sum += v;
+    }
+    top.push_back({v, (int)i});
+  }
+  step.logit_mean = (float)(sum / vocab);
+  std::sort(top.rbegin(), top.rend());
+  for (size_t i = 0; i < 10 && i < vocab; ++i) {
+    step.topk_ids.push_back(top[i].second);
+    step.topk_logits.push_back(top[i].first);
+  }
+  step.full_logits.assign(logits, logits + vocab);
+  return step;
+}
+
+static std::vector<int32_t>
+cpu_generate_tokens(gcore::inference::CpuBlockScheduler &scheduler,
+                    gcore::inference::Generator &sampler,
+                    const std::vector<int32_t> &prompt_tokens,
+                    const gcore::inference::SamplingParams &params,
+                    int32_t eos_id, gcore::inference::GenerationStats *stats,
+                    std::string *err,
+                    const gcore::inference::AlignmentCallback &align_cb) {
+  using clock = std::chrono::high_resolution_clock;
+  const size_t vocab = scheduler.config().vocab_size;
+  std::vector<int32_t> output = prompt_tokens;
+  auto &metrics = gcore::inference::GeneratorMetrics::global();
+  const uint64_t start_ns = gcore::rt::now_ns();
+  auto start = clock::now();
+  auto first_token_time = start;
+  auto decode_start = start;
+  sampler.reseed(params.seed);
+
+  if (!prompt_tokens.empty() && params.max_tokens > 0 &&
+      scheduler.forward(prompt_tokens.data(), 0, prompt_tokens.size(), err)) {
+    int32_t next_token =
+        sampler.sample(scheduler.last_logits(), vocab, params);
+    if (align_cb)
+      align_cb(make_alignment_step(0, next_token, scheduler.last_logits(),
+                                   vocab));
+    output.push_back(next_token);
+    first_token_time = clock::now();
+    uint64_t token_t0 = gcore::rt::now_ns();
+    metrics.prefill_ns.record(token_t0 - start_ns);
+    metrics.ttft_ns.record(token_t0 - start_ns);
+    metrics.tokens.inc(1);
+    if (gcore::rt::SpanTracer::enabled())
+      gcore::rt::SpanTracer::instance().complete(
+          "cpu.prefill", "gen", start_ns, token_t0, nullptr,
+          prompt_tokens.size());
+    if (stats)
+      stats->prefill_time_ms =
+          std::chrono::duration<float, std::milli>(first_token_time - start)
+              .count();
+
+    decode_start = clock::now();
+    for (int i = 1; i < params.max_tokens; ++i) {
+      if (next_token == eos_id)
+        break;
+      const int32_t last_token_id = output.back();
+      if (!scheduler.forward(&last_token_id, output.size() - 1, 1, err))
+        break;
+      next_token = sampler.sample(scheduler.last_logits(), vocab, params);
+      if (align_cb)
+        align_cb(make_alignment_step(i, next_token, scheduler.last_logits(),
+                                     vocab));
+      output.push_back(next_token);
+      const uint64_t token_t1 = gcore::rt::now_ns();
+      metrics.token_ns.record(token_t1 - token_t0);
+      metrics.tokens.inc(1);
+      if (gcore::rt::SpanTracer::enabled())
+        gcore::rt::SpanTracer::instance().complete(
+            "cpu.decode_step", "gen", token_t0, token_t1, nullptr,
+            static_cast<uint64_t>(i));
+      token_t0 = token_t1;
+    }
+  }
+
+  auto end = clock::now();
+  if (stats) {
+    stats->decode_time_ms =
+        std::chrono::duration<float, std::milli>(end - decode_start).count();
+    stats->prompt_tokens = prompt_tokens.size();
+    stats->generated_tokens = output.size() - prompt_tokens.size();
+    stats->total_time_ms =
+        std::chrono::duration<float, std::milli>(end - start).count();
+    stats->time_to_first_token_ms =
+        std::chrono::duration<float, std::milli>(first_token_time - start)
+            .count();
+    stats->tokens_per_second =
+        stats->generated_tokens / (stats->total_time_ms / 1000.0f);
+  }
+  return output;
+}
+
 void print_usage() {
   std::cout
       << "Usage: greta_infer [options]\n"
@@ -26,7 +265,8 @@ void print_usage() {
       << "  --batch-size <n>    Batch size for inference (default: 1)\n"
       << "  --max-tokens <n>    Maximum tokens to generate (default: 32)\n"
       << "  --temperature <t>   Sampling temperature (default: 1.0)\n"
-      << "  --top-k <k>         Top-K sampling (default: 50)\n"
+      << "  --top-k <k>         Top-K sampling (default: 50, 0 = off)\n"
+      << "  --top-p <p>         Top-P nucleus sampling (default: 1.0 = off)\n"
       << "  --greedy            Use greedy decoding\n"
       << "  --seed <n>          Random seed (also reads GRETA_SEED env)\n"
       << "  --kv-aligned <0|1>  KV alignment mode (also reads GRETA_KV_ALIGNED "
@@ -35,6 +275,13 @@ void print_usage() {
       << "  --dump-logits <dir> Dump logits to directory (JSONL.gz + "
          "metadata.json)\n"
       << "  --dump-logits-span <n> Number of tokens to dump (default: 1)\n"
+      << "  --dump-logits-format <jsonl|f32|f16> Logits dump format: "
+         "logits.jsonl.gz or mmap-able logits.bin (also reads "
+         "GRETA_DUMP_LOGITS_FORMAT env, default: jsonl)\n"
+      << "  --metrics-out <path> Write telemetry metrics (latency histograms) "
+         "as JSON, or Prometheus text when path ends in .prom\n"
+      << "  --backend <hip|cpu> Execution backend (also reads GRETA_BACKEND "
+         "env, default: hip). cpu runs CpuBlockScheduler, no GPU needed\n"
       << "  --demo-tokenizer    Force fallback ASCII tokenizer\n"
       << "  --help              Show this help\n";
 }
@@ -64,7 +311,10 @@ int main(int argc, char *argv[]) {
   std::string exec_mode; // prefill or decode
   std::string dump_logits_dir;
   int dump_logits_span = 1; // B3.69: number of tokens to dump
+  std::string dump_logits_format; // B3.91: jsonl (default), f32 or f16
   int seed = -1;            // -1 = not set, read from env
+  std::string backend;      // B3.97: hip (default) or cpu
+  std::string metrics_out;  // B3.98: telemetry export (JSON or .prom)
 
   // Parse arguments
   for (int i = 1; i < argc; ++i) {
@@ -87,6 +337,8 @@ int main(int argc, char *argv[]) {
       params.temperature = std::atof(argv[++i]);
     } else if (strcmp(argv[i], "--top-k") == 0 && i + 1 < argc) {
       params.top_k = std::atoi(argv[++i]);
+    } else if (strcmp(argv[i], "--top-p") == 0 && i + 1 < argc) {
+      params.top_p = std::atof(argv[++i]);
     } else if (strcmp(argv[i], "--greedy") == 0) {
       params.greedy = true;
     } else if (strcmp(argv[i], "--demo-tokenizer") == 0) {
@@ -103,6 +355,12 @@ int main(int argc, char *argv[]) {
       dump_logits_dir = argv[++i];
     } else if (strcmp(argv[i], "--dump-logits-span") == 0 && i + 1 < argc) {
       dump_logits_span = std::atoi(argv[++i]);
+    } else if (strcmp(argv[i], "--dump-logits-format") == 0 && i + 1 < argc) {
+      dump_logits_format = argv[++i];
+    } else if (strcmp(argv[i], "--backend") == 0 && i + 1 < argc) {
+      backend = argv[++i];
+    } else if (strcmp(argv[i], "--metrics-out") == 0 && i + 1 < argc) {
+      metrics_out = argv[++i];
     } else if (strcmp(argv[i], "--help") == 0) {
       print_usage();
       // The original instruction implies a 'success' variable that is not
@@ -122,11 +380,32 @@ int main(int argc, char *argv[]) {
     if (seed_env)
       seed = std::atoi(seed_env);
   }
+  if (seed >= 0)
+    params.seed = seed;
   if (kv_aligned < 0) {
     const char *kv_env = std::getenv("GRETA_KV_ALIGNED");
     if (kv_env)
       kv_aligned = std::atoi(kv_env);
   }
+  if (dump_logits_format.empty()) {
+    const char *fmt_env = std::getenv("GRETA_DUMP_LOGITS_FORMAT");
+    dump_logits_format = fmt_env ? fmt_env : "jsonl";
+  }
+  if (backend.empty()) {
+    const char *backend_env = std::getenv("GRETA_BACKEND");
+    backend = backend_env ? backend_env : "hip";
+  }
+  if (backend != "hip" && backend != "cpu") {
+    std::cerr << "Invalid --backend: " << backend << " (expected hip or cpu)\n";
+    return 1;
+  }
+  const bool use_cpu = (backend == "cpu");
+  if (dump_logits_format != "jsonl" && dump_logits_format != "f32" &&
+      dump_logits_format != "f16") {
+    std::cerr << "Invalid --dump-logits-format: " << dump_logits_format
+              << " (expected jsonl, f32 or f16)\n";
+    return 1;
+  }
 
   std::cout << "Configuration:\n";
   std::cout << "  Model: " << (model_path.empty() ? "(demo mode)" : model_path)
@@ -135,7 +414,9 @@ int main(int argc, char *argv[]) {
   std::cout << "  Max tokens: " << params.max_tokens << "\n";
   std::cout << "  Temperature: " << params.temperature << "\n";
   std::cout << "  Top-K: " << params.top_k << "\n";
+  std::cout << "  Top-P: " << params.top_p << "\n";
   std::cout << "  Greedy: " << (params.greedy ? "yes" : "no") << "\n";
+  std::cout << "  Backend: " << backend << "\n";
   if (seed >= 0) {
     std::cout << "  Seed: " << seed << "\n";
   }
@@ -148,10 +429,11 @@ int main(int argc, char *argv[]) {
   if (!dump_logits_dir.empty()) {
     std::cout << "  Dump Logits: " << dump_logits_dir << "\n";
     std::cout << "  Dump Span: " << dump_logits_span << "\n";
+    std::cout << "  Dump Format: " << dump_logits_format << "\n";
   }
 
   const char *verbose_info = std::getenv("GRETA_VERBOSE_INFO");
-  if (verbose_info && std::string(verbose_info) == "1") {
+  if (verbose_info && std::string(verbose_info) == "1" && !use_cpu) {
     int hip_ver = 0;
     (void)hipRuntimeGetVersion(&hip_ver);
     hipDeviceProp_t prop;
@@ -170,8 +452,8 @@ int main(int argc, char *argv[]) {
   std::cout << "\n";
 
   std::string err;
-  if (gcore::rt::GretaContext::instance().initialize() !=
-      gcore::rt::GretaResult::SUCCESS) {
+  if (!use_cpu && gcore::rt::GretaContext::instance().initialize() !=
+                      gcore::rt::GretaResult::SUCCESS) {
     std::cerr << "Failed to initialize GRETA context\n";
     return 1;
   }
@@ -213,7 +495,8 @@ int main(int argc, char *argv[]) {
         << "[GUARD_RAIL] Continuing with potentially incompatible model...\n";
   }
 
-  if (!model_path.empty() && !guard_disabled) {
+  // The CPU backend has no compiled-in shapes: nothing to validate
+  if (!model_path.empty() && !guard_disabled && !use_cpu) {
     std::cout << "\n[GUARD_RAIL] Validating model compatibility...\n";
 
     // Valores esperados para GRETA v1 (basado en Llama-2-7B)
@@ -292,16 +575,20 @@ int main(int argc, char *argv[]) {
   std::cout << "[GRETA_MAIN] DEBUG: config.max_seq_len = " << config.max_seq_len
             << std::endl;
   gcore::inference::BlockScheduler scheduler;
-  if (!scheduler.init(config, &err)) {
+  gcore::inference::CpuBlockScheduler cpu_scheduler;
+  if (use_cpu ? !cpu_scheduler.init(config, &err)
+              : !scheduler.init(config, &err)) {
     std::cerr << "Scheduler init failed: " << err << "\n";
     return 1;
   }
-  std::cout << "[GRETA_MAIN] Initialized scheduler for "
-            << scheduler.num_layers() << " layers\n";
+  std::cout << "[GRETA_MAIN] Initialized " << (use_cpu ? "CPU " : "")
+            << "scheduler for "
+            << (use_cpu ? cpu_scheduler.num_layers() : scheduler.num_layers())
+            << " layers\n";
 
-  // Allocate buffers
+  // Allocate buffers (CPU weights are allocated while loading)
   std::cout << "Allocating buffers...\n";
-  if (!scheduler.allocate_weights(&err)) {
+  if (!use_cpu && !scheduler.allocate_weights(&err)) {
     std::cerr << "Weight allocation failed: " << err << "\n";
     return 1;
   }
@@ -315,8 +602,10 @@ int main(int argc, char *argv[]) {
                 << std::endl;
     }
   }
-  if (!scheduler.allocate_activations(batch_size, max_seq_len,
-                                      &err)) { // Configurable max_seq_len
+  if (use_cpu ? !cpu_scheduler.allocate_activations(batch_size, max_seq_len,
+                                                    &err)
+              : !scheduler.allocate_activations(batch_size, max_seq_len,
+                                                &err)) { // Configurable max_seq_len
     std::cerr << "Activation allocation failed: " << err << "\n";
     return 1;
   }
@@ -331,13 +620,18 @@ int main(int argc, char *argv[]) {
       std::cerr << "Failed to open model: " << err << "\n";
       return 1;
     }
-    if (!scheduler.load_weights(*loader, &err)) {
+    if (use_cpu ? !cpu_scheduler.load_weights(*loader, &err)
+                : !scheduler.load_weights(*loader, &err)) {
       std::cerr << "Weight loading failed: " << err << "\n";
       return 1;
     }
     auto end_load = std::chrono::high_resolution_clock::now();
     model_load_s = std::chrono::duration<float>(end_load - start_load).count();
     std::cout << "Weights loaded (vocab size: " << config.vocab_size << ")\n";
+    if (use_cpu)
+      std::cout << "[CPU_BACKEND] Host memory: "
+                << (cpu_scheduler.memory_bytes() / (1024.0 * 1024.0))
+                << " MiB, threads: " << cpu_scheduler.num_threads() << "\n";
   }
 
   // Initialize tokenizer
@@ -371,9 +665,9 @@ int main(int argc, char *argv[]) {
                                                   : "ASCII Fallback"))
             << "\n";
 
-  // Initialize generator
+  // Initialize generator (the CPU backend only uses it for sampling)
   gcore::inference::Generator generator;
-  if (!generator.init(config, &scheduler, &err)) {
+  if (!use_cpu && !generator.init(config, &scheduler, &err)) {
     std::cerr << "Generator init failed: " << err << "\n";
     return 1;
   }
@@ -441,8 +735,7 @@ int main(int argc, char *argv[]) {
   }
 
   gcore::inference::GenerationStats stats;
-  std::string output = generator.generate(
-      prompt, params, &stats,
+  gcore::inference::TokenCallback token_cb =
       [&captured_tokens, &stats, &dump_logits_dir](int32_t id,
                                                    const std::string &text) {
         // Collect token stream ONLY if dump_logits_dir is set (for
@@ -454,8 +747,32 @@ int main(int argc, char *argv[]) {
           t.token_id = id;
           captured_tokens.push_back(t);
         }
-      },
-      align_cb);
+      };
+  std::string output;
+  if (use_cpu) {
+    auto start_tokenize = std::chrono::high_resolution_clock::now();
+    auto prompt_tokens = tokenizer.encode(prompt);
+    stats.tokenize_time_ms = std::chrono::duration<float, std::milli>(
+                                 std::chrono::high_resolution_clock::now() -
+                                 start_tokenize)
+                                 .count();
+    err.clear();
+    auto output_tokens =
+        cpu_generate_tokens(cpu_scheduler, generator, prompt_tokens, params,
+                            tokenizer.eos_id(), &stats, &err, align_cb);
+    if (!err.empty())
+      std::cerr << "Generation error: " << err << "\n";
+    std::vector<int32_t> generated(output_tokens.begin() + prompt_tokens.size(),
+                                   output_tokens.end());
+    for (auto id : generated)
+      token_cb(id, tokenizer.decode_token(id));
+    output = tokenizer.decode(generated);
+  } else {
+    output = generator.generate(prompt, params, &stats, token_cb, align_cb);
+  }
+  // Stage/layer traces of this generation reach disk now, not at exit: a
+  // later crash or timeout kill would otherwise lose the buffered tail
+  gcore::inference::trace_sinks_flush_all();
 
   // Avoid printing massive prompts/outputs to stdout during long context
   // benchmarks
@@ -490,6 +807,8 @@ int main(int argc, char *argv[]) {
 #elif defined(GRETA_PREFILL_SEGMENTED)
   attn_tag = "v2_segmented";
 #endif
+  if (use_cpu)
+    attn_tag = "cpu_ref";
 
   std::cout << "[PERF_TIMING] {"
             << "\"model_load_s\":" << model_load_s << ","
@@ -498,6 +817,23 @@ int main(int argc, char *argv[]) {
             << "\"decode_s\":" << (stats.decode_time_ms / 1000.0) << ","
             << "\"attn_impl\":\"" << attn_tag << "\"}\n";
 
+  // B3.98: Latency distributions (per-token, prefill, TTFT, runtime tasks)
+  if (!metrics_out.empty()) {
+    const auto &reg = gcore::rt::MetricsRegistry::global();
+    const std::string prom_ext = ".prom";
+    const bool prom =
+        metrics_out.size() > prom_ext.size() &&
+        metrics_out.compare(metrics_out.size() - prom_ext.size(),
+                            prom_ext.size(), prom_ext) == 0;
+    std::ofstream mout(metrics_out);
+    if (mout.is_open()) {
+      mout << (prom ? reg.to_prometheus() : reg.to_json() + "\n");
+      std::cout << "[METRICS] Wrote " << metrics_out << "\n";
+    } else {
+      std::cerr << "[METRICS] ERROR: Could not write " << metrics_out << "\n";
+    }
+  }
+
   bool success = (stats.generated_tokens > 0 ||
                   (stats.prompt_tokens > 0 && params.max_tokens == 0));
   if (success) {
@@ -536,6 +872,7 @@ int main(int argc, char *argv[]) {
       // B3.69: Use dump_logits_span for count instead of hardcoded 1
       meta_out << "  \"token_span\": {\"start\": " << stats.prompt_tokens
                << ", \"count\": " << dump_logits_span << "},\n";
+      meta_out << "  \"logits_format\": \"" << dump_logits_format << "\",\n";
       meta_out << "  \"timestamp\": \"" << ts_stream.str() << "\",\n";
       meta_out << "  \"repo_branch\": \"main\"\n";
       meta_out << "}\n";
@@ -545,9 +882,32 @@ int main(int argc, char *argv[]) {
       std::cerr << "[B3.69] ERROR: Could not write " << metadata_path << "\n";
     }
 
+    // B3.91: Only one logits file per dir: readers prefer logits.bin, so a
+    // stale one from an earlier run must not shadow a fresh jsonl (and the
+    // other way round)
+    std::remove((dump_logits_dir + (dump_logits_format == "jsonl"
+                                        ? "/logits.bin"
+                                        : "/logits.jsonl.gz"))
+                    .c_str());
+
+    // B3.91: Binary dump (header + token table + contiguous rows)
+    if (dump_logits_format != "jsonl") {
+      std::string bin_path = dump_logits_dir + "/logits.bin";
+      if (write_logits_bin(bin_path, captured_logits, stats.prompt_tokens,
+                           dump_logits_format == "f16")) {
+        std::cout << "[B3.91] Wrote logits (" << captured_logits.size()
+                  << " entries, " << dump_logits_format
+                  << ") to: " << bin_path << "\n";
+      } else {
+        std::cerr << "[B3.91] ERROR: Could not write " << bin_path << "\n";
+      }
+    }
+
     // B3.69: Write real logits.jsonl.gz using captured_logits (zlib)
     std::string logits_path = dump_logits_dir + "/logits.jsonl.gz";
-    gzFile gz = gzopen(logits_path.c_str(), "wb");
+    gzFile gz = dump_logits_format == "jsonl"
+                    ? gzopen(logits_path.c_str(), "wb")
+                    : nullptr;
     if (gz) {
       size_t prompt_len = stats.prompt_tokens;
       for (size_t i = 0; i < captured_logits.size(); ++i) {
@@ -569,7 +929,7 @@ int main(int argc, char *argv[]) {
       gzclose(gz);
       std::cout << "[B3.69] Wrote logits (" << captured_logits.size()
                 << " entries) to: " << logits_path << "\n";
-    } else if (dump_logits_span > 0) {
+    } else if (dump_logits_format == "jsonl" && dump_logits_span > 0) {
       std::cerr << "[B3.69] ERROR: Could not write " << logits_path << "\n";
     }
 
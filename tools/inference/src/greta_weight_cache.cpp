@@ -0,0 +1,178 @@
+// greta_weight_cache: pre-warm and maintain the weight cache used by
+// greta_infer (GRETA_WEIGHT_CACHE_DIR, see weight_cache.hpp).
+#include "gcore/inference/block_scheduler.hpp"
+#include "gcore/inference/weight_cache.hpp"
+#include "gcore/inference/weight_loader.hpp"
+
+#include <chrono>
+#include <cstdlib>
+#include <cstring>
+#include <ctime>
+#include <iomanip>
+#include <iostream>
+#include <string>
+#include <vector>
+
+using gcore::inference::WeightCache;
+using gcore::inference::WeightCacheBlob;
+using gcore::inference::WeightCacheConfig;
+
+static void usage() {
+  std::cerr
+      << "Usage: greta_weight_cache [--dir DIR] <command>\n"
+         "  warm --model PATH [--int8|--int4]  load once through the cache\n"
+         "  list                               blobs, least recently used "
+         "first\n"
+         "  verify [BLOB...]                   full check incl. data hashes\n"
+         "  evict [--max-gb N]                 trim to N GiB (default "
+         "GRETA_WEIGHT_CACHE_MAX_GB)\n"
+         "  clear                              delete every blob\n"
+         "DIR defaults to GRETA_WEIGHT_CACHE_DIR. warm uses the quant mode "
+         "of the\nenvironment (GRETA_INT8_WEIGHTS / GRETA_INT4_WEIGHTS) "
+         "unless a flag is given.\n";
+}
+
+static double mib(uint64_t bytes) {
+  return static_cast<double>(bytes) / (1024.0 * 1024.0);
+}
+
+// Misma secuencia que greta_infer: config del modelo, scheduler, pesos
+static int warm(const std::string &model_path, const std::string &dir) {
+  setenv("GRETA_WEIGHT_CACHE_DIR", dir.c_str(), 1);
+  if (gcore::rt::GretaContext::instance().initialize() !=
+      gcore::rt::GretaResult::SUCCESS) {
+    std::cerr << "Failed to initialize GRETA context\n";
+    return 1;
+  }
+  std::string err;
+  auto loader = gcore::inference::create_weight_loader(model_path, &err);
+  if (!loader) {
+    std::cerr << "Failed to open model: " << err << "\n";
+    return 1;
+  }
+  auto config = loader->get_config();
+  if (config.num_heads_kv == 0)
+    config.num_heads_kv = config.num_heads;
+  config.head_dim = config.dim / config.num_heads;
+  config.max_seq_len = 32768; // como greta_infer
+
+  gcore::inference::BlockScheduler scheduler;
+  if (!scheduler.init(config, &err) || !scheduler.allocate_weights(&err)) {
+    std::cerr << "Scheduler setup failed: " << err << "\n";
+    return 1;
+  }
+  const auto t0 = std::chrono::steady_clock::now();
+  if (!scheduler.load_weights(*loader, &err)) {
+    std::cerr << "Weight loading failed: " << err << "\n";
+    return 1;
+  }
+  const double sec = std::chrono::duration<double>(
+                         std::chrono::steady_clock::now() - t0)
+                         .count();
+  const auto *cached =
+      dynamic_cast<const gcore::inference::CachedWeightLoader *>(loader.get());
+  std::cout << "warm: " << (cached && cached->last_load_hit() ? "hit" : "miss")
+            << " in " << sec << " s\n";
+  return 0;
+}
+
+static int list(const WeightCache &cache) {
+  const auto blobs = cache.list();
+  const int64_t now = static_cast<int64_t>(std::time(nullptr));
+  uint64_t total = 0;
+  std::cout << std::left << std::setw(40) << "blob" << std::right
+            << std::setw(12) << "MiB" << std::setw(8) << "quant"
+            << std::setw(9) << "tensors" << std::setw(12) << "idle (s)"
+            << "  status\n";
+  for (const WeightCacheBlob &b : blobs) {
+    const std::string name = b.path.substr(b.path.find_last_of('/') + 1);
+    std::cout << std::left << std::setw(40) << name << std::right
+              << std::setw(12) << std::fixed << std::setprecision(1)
+              << mib(b.bytes) << std::setw(8) << b.quant << std::setw(9)
+              << b.tensors << std::setw(12) << (now - b.last_used) << "  "
+              << (b.valid ? "ok" : b.error) << "\n";
+    total += b.bytes;
+  }
+  std::cout << blobs.size() << " blobs, " << mib(total) << " MiB in "
+            << cache.config().dir << " (limit "
+            << mib(cache.config().max_bytes) << " MiB)\n";
+  return 0;
+}
+
+static int verify(const WeightCache &cache, std::vector<std::string> blobs) {
+  if (blobs.empty())
+    for (const WeightCacheBlob &b : cache.list())
+      blobs.push_back(b.path);
+  int bad = 0;
+  for (const std::string &path : blobs) {
+    std::string err;
+    if (cache.validate(path, true, nullptr, &err)) {
+      std::cout << "OK   " << path << "\n";
+    } else {
+      std::cout << "BAD  " << path << ": " << err << "\n";
+      ++bad;
+    }
+  }
+  std::cout << blobs.size() - bad << "/" << blobs.size() << " blobs valid\n";
+  return bad ? 1 : 0;
+}
+
+int main(int argc, char *argv[]) {
+  WeightCacheConfig config = WeightCacheConfig::from_env();
+  std::string command, model_path;
+  std::vector<std::string> rest;
+  double max_gb = 0;
+  for (int i = 1; i < argc; ++i) {
+    if (strcmp(argv[i], "--dir") == 0 && i + 1 < argc) {
+      config.dir = argv[++i];
+    } else if (strcmp(argv[i], "--model") == 0 && i + 1 < argc) {
+      model_path = argv[++i];
+    } else if (strcmp(argv[i], "--max-gb") == 0 && i + 1 < argc) {
+      max_gb = std::atof(argv[++i]);
+    } else if (strcmp(argv[i], "--int8") == 0) {
+      setenv("GRETA_INT8_WEIGHTS", "1", 1);
+      unsetenv("GRETA_INT4_WEIGHTS");
+    } else if (strcmp(argv[i], "--int4") == 0) {
+      setenv("GRETA_INT4_WEIGHTS", "1", 1);
+      unsetenv("GRETA_INT8_WEIGHTS");
+    } else if (strcmp(argv[i], "--help") == 0 ||
+               strcmp(argv[i], "-h") == 0) {
+      usage();
+      return 0;
+    } else if (command.empty()) {
+      command = argv[i];
+    } else {
+      rest.push_back(argv[i]);
+    }
+  }
+  if (config.dir.empty()) {
+    std::cerr << "No cache directory: pass --dir or set "
+                 "GRETA_WEIGHT_CACHE_DIR\n";
+    usage();
+    return 1;
+  }
+  const WeightCache cache(config);
+
+  if (command == "warm") {
+    if (model_path.empty()) {
+      usage();
+      return 1;
+    }
+    return warm(model_path, config.dir);
+  }
+  if (command == "list")
+    return list(cache);
+  if (command == "verify")
+    return verify(cache, rest);
+  if (command == "evict" || command == "clear") {
+    const uint64_t limit =
+        command == "clear"
+            ? 0
+            : (max_gb > 0 ? static_cast<uint64_t>(max_gb * (1ull << 30))
+                          : config.max_bytes);
+    std::cout << "freed " << mib(cache.evict(limit)) << " MiB\n";
+    return 0;
+  }
+  usage();
+  return 1;
+}